@@ -31,14 +31,17 @@ def check_config_files():
     else:
         print(f"❌ {config_file} no encontrado")
     
-    # Verificar data/app_settings.json
-    settings_file = Path("data/app_settings.json")
+    # Verificar configuraciones en el almacén de estado (data/state.db)
+    settings_file = Path("data/state.db")
     if settings_file.exists():
         print(f"✅ {settings_file} encontrado")
         
         try:
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
+            sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+            from utils.state_store import StateStore
+            store = StateStore(data_dir="data", migrate=False)
+            settings = store.settings.load()
+            store.close()
             
             # Configuraciones importantes
             important_keys = [
@@ -54,11 +54,11 @@ def analyze_config():
         logger.info(f"show_server_console: {show_console} (tipo: {type(show_console)})")
         
         # Verificar otras configuraciones relacionadas
-        sections = config_manager.config.sections()
+        sections = config_manager.get_all_sections()
         logger.info(f"Secciones disponibles: {sections}")
         
         for section in sections:
-            items = dict(config_manager.config.items(section))
+            items = config_manager.get_section(section)
             logger.info(f"Sección [{section}]: {items}")
             
     except Exception as e:
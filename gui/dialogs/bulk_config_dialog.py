@@ -0,0 +1,236 @@
+"""
+Diálogo de configuración masiva: comparar y aplicar ajustes INI en varios servidores
+"""
+
+import threading
+import customtkinter as ctk
+
+from utils.bulk_config import BulkConfigEngine, INI_FILES
+from utils.config_versions import get_version_store
+from .custom_dialogs import _set_dialog_icon, ask_yes_no, show_error, show_info
+
+
+class BulkConfigDialog:
+    """Matriz de diferencias clave × servidor y aplicación de cambios en lote"""
+
+    MAX_ROWS = 200  # Filas de la matriz que se dibujan como máximo
+
+    def __init__(self, parent, config_manager, logger):
+        self.parent = parent
+        self.config_manager = config_manager
+        self.logger = logger
+        root_path = config_manager.get("server", "root_path", "").strip()
+        self.engine = BulkConfigEngine(root_path, logger=logger, versions=get_version_store(logger))
+        self.server_vars = {}
+        self.pending_changes = []  # [(archivo, sección, clave, valor)]
+        self.dialog = None
+
+    def show(self):
+        """Crear y mostrar la ventana"""
+        self.dialog = ctk.CTkToplevel(self.parent)
+        self.dialog.title("Configuración multi-servidor")
+        self.dialog.geometry("1000x700")
+        self.dialog.transient(self.parent)
+        self.dialog.after(200, lambda: _set_dialog_icon(self.dialog))
+
+        # Servidores
+        servers_frame = ctk.CTkFrame(self.dialog)
+        servers_frame.pack(fill="x", padx=10, pady=(10, 5))
+        ctk.CTkLabel(servers_frame, text="🖥️ Servidores:", font=ctk.CTkFont(weight="bold")).pack(side="left", padx=10)
+        servers = self.engine.discover_servers()
+        for server in servers:
+            var = ctk.BooleanVar(value=True)
+            ctk.CTkCheckBox(servers_frame, text=server, variable=var).pack(side="left", padx=5, pady=8)
+            self.server_vars[server] = var
+        if not servers:
+            ctk.CTkLabel(servers_frame, text="No se encontraron servidores en la ruta raíz", text_color="orange").pack(side="left")
+
+        # Filtros
+        filter_frame = ctk.CTkFrame(self.dialog)
+        filter_frame.pack(fill="x", padx=10, pady=5)
+        self.file_menu = ctk.CTkOptionMenu(filter_frame, values=list(INI_FILES), command=lambda _: self.refresh_matrix())
+        self.file_menu.pack(side="left", padx=10, pady=8)
+        self.filter_entry = ctk.CTkEntry(filter_frame, placeholder_text="Filtrar claves...", width=220)
+        self.filter_entry.pack(side="left", padx=5)
+        self.filter_entry.bind("<KeyRelease>", lambda _: self.refresh_matrix())
+        self.only_diff_var = ctk.BooleanVar(value=True)
+        ctk.CTkCheckBox(filter_frame, text="Solo diferencias", variable=self.only_diff_var,
+                        command=self.refresh_matrix).pack(side="left", padx=10)
+        ctk.CTkButton(filter_frame, text="🔄 Cargar", width=100, command=self.load).pack(side="left", padx=5)
+        self.status_label = ctk.CTkLabel(filter_frame, text="")
+        self.status_label.pack(side="right", padx=10)
+
+        # Matriz de diferencias
+        self.matrix_frame = ctk.CTkScrollableFrame(self.dialog)
+        self.matrix_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Editor de cambios
+        change_frame = ctk.CTkFrame(self.dialog)
+        change_frame.pack(fill="x", padx=10, pady=5)
+        self.section_entry = ctk.CTkEntry(change_frame, placeholder_text="Sección", width=220)
+        self.section_entry.pack(side="left", padx=(10, 5), pady=8)
+        self.key_entry = ctk.CTkEntry(change_frame, placeholder_text="Clave", width=220)
+        self.key_entry.pack(side="left", padx=5)
+        self.value_entry = ctk.CTkEntry(change_frame, placeholder_text="Valor (vacío = eliminar)", width=180)
+        self.value_entry.pack(side="left", padx=5)
+        ctk.CTkButton(change_frame, text="➕ Añadir", width=90, command=self.add_change).pack(side="left", padx=5)
+
+        actions_frame = ctk.CTkFrame(self.dialog)
+        actions_frame.pack(fill="x", padx=10, pady=(5, 10))
+        self.changes_label = ctk.CTkLabel(actions_frame, text="Sin cambios pendientes", anchor="w")
+        self.changes_label.pack(side="left", padx=10, fill="x", expand=True)
+        ctk.CTkButton(actions_frame, text="🗑️ Limpiar", width=90, command=self.clear_changes).pack(side="right", padx=5, pady=8)
+        ctk.CTkButton(actions_frame, text="↩️ Deshacer última", width=140, command=self.rollback_last).pack(side="right", padx=5)
+        ctk.CTkButton(actions_frame, text="🚀 Aplicar a seleccionados", width=180,
+                      fg_color=("green", "darkgreen"), command=self.apply_changes).pack(side="right", padx=5)
+
+        self.load()
+
+    def selected_servers(self):
+        return [server for server, var in self.server_vars.items() if var.get()]
+
+    def load(self):
+        """Cargar los INI de los servidores seleccionados en segundo plano"""
+        servers = self.selected_servers()
+        self.status_label.configure(text="⏳ Cargando...")
+
+        def worker():
+            try:
+                self.engine.load_all(servers)
+                self.dialog.after(0, self.refresh_matrix)
+            except Exception as e:
+                # `e` deja de existir al salir del except: se captura el texto para el callback
+                msg = str(e)
+                self.logger.error(f"Error al cargar configuraciones: {msg}")
+                self.dialog.after(0, lambda m=msg: self.status_label.configure(text=f"❌ {m}"))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def refresh_matrix(self):
+        """Dibujar la matriz clave × servidor con los filtros actuales"""
+        try:
+            for widget in self.matrix_frame.winfo_children():
+                widget.destroy()
+
+            matrix = self.engine.diff_matrix(
+                file_type=self.file_menu.get(),
+                only_different=self.only_diff_var.get()
+            )
+            text = self.filter_entry.get().strip().lower()
+            if text:
+                matrix = {row: values for row, values in matrix.items() if text in row[2].lower()}
+
+            servers = sorted(self.engine.documents)
+            ctk.CTkLabel(self.matrix_frame, text="Clave", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, padx=5, sticky="w")
+            for column, server in enumerate(servers, start=1):
+                ctk.CTkLabel(self.matrix_frame, text=server, font=ctk.CTkFont(weight="bold")).grid(row=0, column=column, padx=5)
+
+            for row, ((file_type, section, key), values) in enumerate(list(matrix.items())[:self.MAX_ROWS], start=1):
+                ctk.CTkButton(
+                    self.matrix_frame, text=f"[{section}] {key}", anchor="w", fg_color="transparent",
+                    command=lambda s=section, k=key, v=values: self.prefill_change(s, k, v)
+                ).grid(row=row, column=0, padx=5, sticky="ew")
+                distinct = set(values.values())
+                for column, server in enumerate(servers, start=1):
+                    value = values.get(server)
+                    ctk.CTkLabel(
+                        self.matrix_frame,
+                        text="—" if value is None else value[:30],
+                        text_color="gray" if value is None else ("#FFB74D" if len(distinct) > 1 else None)
+                    ).grid(row=row, column=column, padx=5)
+
+            shown = min(len(matrix), self.MAX_ROWS)
+            self.status_label.configure(text=f"📊 {len(matrix)} claves ({shown} mostradas) en {len(servers)} servidores")
+        except Exception as e:
+            self.logger.error(f"Error al mostrar la matriz: {e}")
+
+    def prefill_change(self, section, key, values):
+        """Rellenar el editor con la fila pulsada (valor más frecuente)"""
+        present = [value for value in values.values() if value is not None]
+        common = max(set(present), key=present.count) if present else ""
+        for entry, text in ((self.section_entry, section), (self.key_entry, key), (self.value_entry, common)):
+            entry.delete(0, "end")
+            entry.insert(0, text)
+
+    def add_change(self):
+        section = self.section_entry.get().strip()
+        key = self.key_entry.get().strip()
+        if not section or not key:
+            return
+        value = self.value_entry.get().strip() or None
+        file_type = self.file_menu.get()
+        self.pending_changes = [c for c in self.pending_changes if (c[0], c[1].lower(), c[2].lower()) != (file_type, section.lower(), key.lower())]
+        self.pending_changes.append((file_type, section, key, value))
+        self.update_changes_label()
+
+    def clear_changes(self):
+        self.pending_changes = []
+        self.update_changes_label()
+
+    def update_changes_label(self):
+        if not self.pending_changes:
+            self.changes_label.configure(text="Sin cambios pendientes")
+            return
+        summary = ", ".join(f"{key}={'(eliminar)' if value is None else value}" for _f, _s, key, value in self.pending_changes[:5])
+        extra = f" y {len(self.pending_changes) - 5} más" if len(self.pending_changes) > 5 else ""
+        self.changes_label.configure(text=f"📝 {len(self.pending_changes)} cambios: {summary}{extra}")
+
+    def apply_changes(self):
+        """Aplicar los cambios pendientes a los servidores seleccionados"""
+        servers = self.selected_servers()
+        if not self.pending_changes or not servers:
+            return
+        planned = self.engine.plan(self.pending_changes, servers)
+        if not planned:
+            show_info(self.dialog, "Sin cambios", "Todos los servidores ya tienen esos valores.")
+            return
+        targets = sorted({server for server, _file in planned})
+        if not ask_yes_no(self.dialog, "Confirmar", f"Se modificarán {len(planned)} archivos en {len(targets)} servidores:\n"
+                          f"{', '.join(targets)}\n\nSe guardará una instantánea para deshacer. ¿Continuar?"):
+            return
+
+        changes = list(self.pending_changes)
+        self.status_label.configure(text="⏳ Aplicando...")
+
+        def worker():
+            try:
+                result = self.engine.apply(changes, servers)
+            except Exception as e:
+                msg = str(e)
+                self.logger.error(f"Error al aplicar cambios masivos: {msg}")
+                self.dialog.after(0, lambda m=msg: self.on_apply_error(m))
+                return
+            self.dialog.after(0, lambda: self.on_applied(result))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def on_applied(self, result):
+        if result['failed']:
+            errors = "\n".join(f"{server}/{file_type}: {error}" for (server, file_type), error in result['failed'].items())
+            show_error(self.dialog, "Error", f"No se aplicó ningún cambio (se restauró la instantánea):\n{errors}")
+        else:
+            self.clear_changes()
+            self.status_label.configure(text=f"✅ {len(result['applied'])} archivos actualizados")
+        self.refresh_matrix()
+
+    def on_apply_error(self, message):
+        self.status_label.configure(text=f"❌ {message}")
+        show_error(self.dialog, "Error", f"No se pudieron aplicar los cambios:\n{message}")
+        self.refresh_matrix()
+
+    def rollback_last(self):
+        """Deshacer la última operación aplicada"""
+        snapshots = self.engine.list_snapshots()
+        if not snapshots:
+            show_info(self.dialog, "Deshacer", "No hay instantáneas disponibles.")
+            return
+        last = snapshots[0]
+        if not ask_yes_no(self.dialog, "Deshacer", f"¿Restaurar la instantánea del {last['created'][:19]}?\n{last.get('description', '')}"):
+            return
+        try:
+            restored = self.engine.rollback(last['id'])
+            self.status_label.configure(text=f"↩️ {restored} archivos restaurados")
+            self.load()
+        except Exception as e:
+            self.logger.error(f"Error al restaurar instantánea: {e}")
+            show_error(self.dialog, "Error", str(e))
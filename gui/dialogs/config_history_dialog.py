@@ -0,0 +1,142 @@
+"""
+Diálogo de historial de configuración: línea de tiempo de revisiones y restauración
+"""
+
+import os
+import customtkinter as ctk
+
+from utils.config_versions import get_version_store, target_for_path
+from .custom_dialogs import _set_dialog_icon, ask_yes_no, show_error
+
+
+class ConfigHistoryDialog:
+    """Línea de tiempo de revisiones de un archivo con restauración en un clic"""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, parent, logger, files, on_restored=None, before_restore=None):
+        """
+        Args:
+            files: {etiqueta: ruta} de los archivos cuyo historial se puede ver
+            on_restored: Llamada opcional tras restaurar (ruta)
+            before_restore: Llamada opcional antes de restaurar (ruta), p. ej.
+                para escribir cambios pendientes que si no pisarían la restauración
+        """
+        self.parent = parent
+        self.logger = logger
+        self.files = {label: path for label, path in files.items() if path}
+        self.on_restored = on_restored
+        self.before_restore = before_restore
+        self.versions = get_version_store(logger)
+        self.loaded = 0
+        self.dialog = None
+
+    def show(self):
+        self.dialog = ctk.CTkToplevel(self.parent)
+        self.dialog.title("Historial de configuración")
+        self.dialog.geometry("850x600")
+        self.dialog.transient(self.parent)
+        self.dialog.after(200, lambda: _set_dialog_icon(self.dialog))
+
+        top_frame = ctk.CTkFrame(self.dialog)
+        top_frame.pack(fill="x", padx=10, pady=(10, 5))
+        self.file_menu = ctk.CTkOptionMenu(
+            top_frame, values=list(self.files) or ["Sin archivos"],
+            command=lambda _: self.refresh()
+        )
+        self.file_menu.pack(side="left", padx=10, pady=8)
+        self.count_label = ctk.CTkLabel(top_frame, text="")
+        self.count_label.pack(side="left", padx=10)
+
+        self.timeline_frame = ctk.CTkScrollableFrame(self.dialog)
+        self.timeline_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        self.more_button = ctk.CTkButton(self.dialog, text="⬇️ Cargar más", command=self.load_more)
+        self.more_button.pack(pady=(0, 10))
+
+        self.refresh()
+
+    def current_path(self):
+        return self.files.get(self.file_menu.get())
+
+    def refresh(self):
+        """Volver a cargar la línea de tiempo desde la revisión más reciente"""
+        for widget in self.timeline_frame.winfo_children():
+            widget.destroy()
+        self.loaded = 0
+        path = self.current_path()
+        if not path:
+            return
+        # Registrar el estado actual por si el archivo se editó fuera de la aplicación
+        self.versions.track(path)
+        scope, file_type = target_for_path(path)
+        total = self.versions.count(scope, file_type)
+        self.count_label.configure(text=f"🕘 {total} revisiones de {os.path.basename(path)}")
+        self.load_more()
+
+    def load_more(self):
+        path = self.current_path()
+        if not path:
+            return
+        scope, file_type = target_for_path(path)
+        revisions = self.versions.timeline(scope, file_type, limit=self.PAGE_SIZE, offset=self.loaded)
+        for revision in revisions:
+            self.create_revision_row(revision, is_current=(self.loaded == 0 and revision is revisions[0]))
+        self.loaded += len(revisions)
+        if len(revisions) < self.PAGE_SIZE:
+            self.more_button.pack_forget()
+        else:
+            self.more_button.pack(pady=(0, 10))
+
+    def create_revision_row(self, revision, is_current=False):
+        row = ctk.CTkFrame(self.timeline_frame)
+        row.pack(fill="x", padx=5, pady=3)
+        row.grid_columnconfigure(1, weight=1)
+
+        ctk.CTkLabel(
+            row, text=f"#{revision['id']}", width=60,
+            font=ctk.CTkFont(weight="bold")
+        ).grid(row=0, column=0, rowspan=2, padx=5, pady=5)
+
+        changes = revision['changes']
+        title = revision['created'][:19].replace("T", " ")
+        if revision.get('note'):
+            title += f" — {revision['note']}"
+        elif changes:
+            title += f" — {len(changes)} cambios"
+        ctk.CTkLabel(row, text=title, anchor="w").grid(row=0, column=1, sticky="w", padx=5)
+
+        details = ", ".join(
+            f"{key}: {'—' if old is None else old} → {'—' if new is None else new}"
+            for _section, key, old, new in changes[:4]
+        )
+        if len(changes) > 4:
+            details += f" (+{len(changes) - 4})"
+        ctk.CTkLabel(
+            row, text=details or "Sin cambios de claves", anchor="w",
+            text_color="gray", font=ctk.CTkFont(size=11)
+        ).grid(row=1, column=1, sticky="w", padx=5)
+
+        if is_current:
+            ctk.CTkLabel(row, text="Actual", text_color="#4CAF50").grid(row=0, column=2, rowspan=2, padx=10)
+        else:
+            ctk.CTkButton(
+                row, text="↩️ Restaurar", width=100,
+                command=lambda revision_id=revision['id']: self.restore(revision_id)
+            ).grid(row=0, column=2, rowspan=2, padx=10)
+
+    def restore(self, revision_id):
+        path = self.current_path()
+        if not path or not ask_yes_no(self.dialog, "Restaurar",
+                                      f"¿Restaurar {os.path.basename(path)} a la revisión #{revision_id}?"):
+            return
+        try:
+            if self.before_restore:
+                self.before_restore(path)
+            self.versions.rollback(revision_id, path)
+            if self.on_restored:
+                self.on_restored(path)
+            self.refresh()
+        except Exception as e:
+            self.logger.error(f"Error al restaurar revisión #{revision_id}: {e}")
+            show_error(self.dialog, "Error", str(e))
@@ -11,6 +11,9 @@ from utils.config_manager import ConfigManager
 from utils.app_settings import AppSettings
 from utils.system_tray import SystemTray
 from utils.server_logger import ServerEventLogger
+from utils.metrics_exporter import MetricsExporter
+from utils.persistence import get_writer
+from utils.config_versions import get_version_store
 from .panels.principal_panel import PrincipalPanel
 from .panels.server_panel import ServerPanel
 from .panels.config_panel import ConfigPanel
@@ -22,6 +25,7 @@ from .panels.working_logs_panel import WorkingLogsPanel
 from .panels.rcon_panel import RconPanel
 from .panels.direct_commands_panel import DirectCommandsPanel
 from .panels.console_panel import ConsolePanel
+from .panels.metrics_panel import MetricsPanel
 from .dialogs.advanced_settings_dialog import AdvancedSettingsDialog
 from .dialogs.custom_dialogs import show_info, show_warning, show_error, ask_yes_no, ask_string
 from .panels.ini_config_panel import IniConfigPanel
@@ -36,6 +40,12 @@ class MainWindow:
         self.config_manager = config_manager
         self.logger = logger
         
+        # Cada guardado de config.ini queda en el historial de revisiones
+        try:
+            self.config_manager.version_store = get_version_store(logger)
+        except Exception as e:
+            logger.warning(f"Historial de configuración no disponible: {e}")
+        
         # Configuración de la ventana
         self.root.title("ARK Server Manager")
         self.root.geometry("1200x800")
@@ -66,6 +76,8 @@ class MainWindow:
         self.mods_panel = None
         self.monitoring_panel = None
         self.players_panel = None
+        self.metrics_panel = None
+        self.metrics_exporter = None
         self.advanced_backup_panel = None
         self.advanced_restart_panel = None
         self.dynamic_config_panel = None
@@ -230,6 +242,17 @@ class MainWindow:
         )
         self.update_button.grid(row=0, column=4, padx=2, pady=2)
         
+        self.repair_button = ctk.CTkButton(
+            admin_frame, 
+            text="Reparar Archivos", 
+            command=self.repair_shared_install,
+            fg_color="gray40",
+            hover_color="gray30",
+            width=120,
+            height=30
+        )
+        self.repair_button.grid(row=0, column=5, padx=2, pady=2)
+        
         # Frame para ruta raíz (fila 2)
         path_frame = ctk.CTkFrame(self.top_bar, fg_color="transparent")
         path_frame.grid(row=3, column=0, columnspan=3, padx=10, pady=5, sticky="ew")
@@ -378,6 +401,7 @@ class MainWindow:
         self.tab_ark_api_content = self.tabview.add("Comandos Directos")
         self.tab_console_content = self.tabview.add("Consola")
         self.tab_logs_content = self.tabview.add("Logs")
+        self.tab_metrics_content = self.tabview.add("Métricas")
         self.tab_configuraciones_content = self.tabview.add("Avanzado")
         
         # Crear paneles
@@ -397,6 +421,12 @@ class MainWindow:
         # Configurar el server_manager principal para que apunte al del server_panel
         self.server_manager = self.server_panel.server_manager
         
+        # Panel de métricas históricas (usa el recolector del server_panel)
+        self.metrics_panel = MetricsPanel(self.tab_metrics_content, self.config_manager, self.logger, self)
+        
+        # Endpoint OpenMetrics opcional para Prometheus
+        self.setup_metrics_exporter()
+        
         # Configurar callbacks para los botones
         self.setup_button_callbacks()
         
@@ -592,6 +622,14 @@ class MainWindow:
             if self.system_tray:
                 self.system_tray.stop_tray()
             
+            # Detener exportador de métricas
+            if self.metrics_exporter:
+                self.metrics_exporter.stop()
+            
+            # Escribir cambios de configuración pendientes del guardado diferido
+            self.config_manager.flush()
+            get_writer().flush()
+            
             self.add_log_message("🚪 Cerrando aplicación...")
             self.root.quit()
         except Exception as e:
@@ -965,6 +1003,33 @@ class MainWindow:
         
         self.status_label.configure(text=status, fg_color=color)
     
+    def setup_metrics_exporter(self):
+        """Iniciar el exportador OpenMetrics si está habilitado en [metrics]"""
+        try:
+            enabled = self.config_manager.get("metrics", "exporter_enabled", "false").lower() == "true"
+            if not enabled:
+                return
+            host = self.config_manager.get("metrics", "exporter_host", "0.0.0.0")
+            port = int(self.config_manager.get("metrics", "exporter_port", "9464"))
+            self.metrics_exporter = MetricsExporter(host=host, port=port, logger=self.logger)
+            
+            # Los gauges de proceso se actualizan con cada muestra del recolector (sin recorrer procesos en el scrape)
+            collector = self.server_panel.metrics_collector
+            collector.add_listener(
+                lambda sample: self.metrics_exporter.update_from_sample(collector.server_name, sample)
+            )
+            
+            def uptime_hook(registry):
+                labels = {"server": collector.server_name or "default"}
+                registry.set("ark_server_uptime_seconds", self.server_manager.get_uptime_seconds(), labels)
+                registry.set("ark_server_up", 1 if self.server_manager.server_running else 0, labels)
+            
+            self.metrics_exporter.add_scrape_hook(uptime_hook)
+            if self.metrics_exporter.start():
+                self.add_log_message(f"📈 Exportador de métricas activo en el puerto {self.metrics_exporter.port}")
+        except Exception as e:
+            self.logger.error(f"Error iniciando exportador de métricas: {e}")
+    
     def update_uptime(self, uptime):
         """Actualizar el tiempo activo del servidor"""
         self.uptime_label.configure(text=uptime)
@@ -1008,6 +1073,9 @@ class MainWindow:
             self.working_logs_panel.on_server_selection_changed(server_name)
         # Guardar última selección
         self.save_last_server_map_selection()
+        # Recargar los INI del nuevo servidor (usa la última selección guardada)
+        if self.ini_config_panel:
+            self.ini_config_panel.on_server_selected(server_name)
     
     def log_server_event(self, event_type, **kwargs):
         """Registrar eventos del servidor y mostrar en logs"""
@@ -1080,6 +1148,8 @@ class MainWindow:
                 message = self.server_event_logger.log_server_crash(
                     kwargs.get('error_details', '')
                 )
+                if self.metrics_exporter:
+                    self.metrics_exporter.registry.inc("ark_crashes", labels={"server": self.selected_server or "default"})
             elif event_type == "custom_event":
                 message = self.server_event_logger.log_custom_event(
                     kwargs.get('event_name', ''),
@@ -1434,6 +1504,11 @@ class MainWindow:
         if hasattr(self, 'server_panel'):
             self.server_panel.update_server()
     
+    def repair_shared_install(self):
+        """Repara la capa de instalación compartida de un servidor"""
+        if hasattr(self, 'server_panel'):
+            self.server_panel.repair_shared_install()
+    
     # ═══════════════════════════════════════════════════════════════
     # MÉTODOS DE HERRAMIENTAS
     # ═══════════════════════════════════════════════════════════════
@@ -1952,15 +2027,8 @@ Versión de la app: {self.APP_VERSION}
             
             if hasattr(self, 'principal_panel'):
                 # Usar el método de inicio completo con configuraciones
-                self.principal_panel.start_server_with_config()
-                self.add_log_message("✅ Auto-inicio del servidor completado")
-                
-                # Notificar en la bandeja si está disponible
-                if hasattr(self, 'system_tray') and self.system_tray.is_available():
-                    self.system_tray.show_notification(
-                        "ARK Server Manager",
-                        f"Servidor '{self.selected_server}' iniciado automáticamente"
-                    )
+                self.principal_panel.start_server_with_config(
+                    interactive=False, on_launched=self._on_auto_start_launched)
             else:
                 self.logger.error("Panel principal no disponible para auto-inicio")
                 self.add_log_message("❌ Error: Panel principal no disponible")
@@ -1976,6 +2044,25 @@ Versión de la app: {self.APP_VERSION}
                     "Error al auto-iniciar el servidor"
                 )
     
+    def _on_auto_start_launched(self, started):
+        """Registrar el resultado del auto-inicio cuando el arranque termina"""
+        if not started:
+            self.add_log_message("❌ Auto-inicio del servidor fallido, revisa los mensajes anteriores")
+            if hasattr(self, 'system_tray') and self.system_tray.is_available():
+                self.system_tray.show_notification(
+                    "ARK Server Manager - Error",
+                    "Error al auto-iniciar el servidor"
+                )
+            return
+        self.add_log_message("✅ Auto-inicio del servidor completado")
+        
+        # Notificar en la bandeja si está disponible
+        if hasattr(self, 'system_tray') and self.system_tray.is_available():
+            self.system_tray.show_notification(
+                "ARK Server Manager",
+                f"Servidor '{self.selected_server}' iniciado automáticamente"
+            )
+    
     def check_auto_start_fallback(self):
         """Verificar auto-inicio cuando no hay bandeja del sistema"""
         try:
@@ -2117,15 +2204,8 @@ Versión de la app: {self.APP_VERSION}
             
             if hasattr(self, 'principal_panel'):
                 # Usar el método de inicio completo con configuraciones
-                self.principal_panel.start_server_with_config()
-                self.add_log_message("✅ Auto-inicio del servidor completado")
-                
-                # Notificar en la bandeja si está disponible
-                if hasattr(self, 'system_tray') and self.system_tray.is_available():
-                    self.system_tray.show_notification(
-                        "ARK Server Manager",
-                        f"Servidor '{self.selected_server}' iniciado automáticamente"
-                    )
+                self.principal_panel.start_server_with_config(
+                    interactive=False, on_launched=self._on_auto_start_launched)
             else:
                 self.logger.error("Panel principal no disponible para auto-inicio")
                 self.add_log_message("❌ Error: Panel principal no disponible")
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from tkinter import filedialog
 # Importación de messagebox removida - usando solo CustomTkinter dialogs
 from pathlib import Path
+from utils.persistence import get_writer
+from utils.state_store import get_state_store
 
 class AdvancedBackupPanel(ctk.CTkFrame):
     def __init__(self, parent, config_manager, logger, main_window):
@@ -39,8 +41,11 @@ class AdvancedBackupPanel(ctk.CTkFrame):
             "saveworld_before_backup": True
         }
         
-        # Lista de backups realizados
+        # Backups más recientes mostrados en la interfaz; el historial completo
+        # vive en el almacén SQLite y se consulta paginado
         self.backup_history = []
+        self.history_page_size = 100
+        self.state_store = get_state_store(self.logger)
         
         self.create_widgets()
         self.pack(fill="both", expand=True)
@@ -887,6 +892,7 @@ class AdvancedBackupPanel(ctk.CTkFrame):
     
     def _backup_worker(self, is_manual=True):
         """Worker del proceso de backup"""
+        backup_started = time.time()
         try:
             self.backup_running = True
             # Usar el hilo principal de Tkinter para actualizar la UI
@@ -1038,8 +1044,15 @@ class AdvancedBackupPanel(ctk.CTkFrame):
             if hasattr(self.main_window, 'add_log_message'):
                 self.main_window.add_log_message(f"✅ Backup completado exitosamente - Tamaño: {size_mb:.1f} MB")
             
-            self.backup_history.append(backup_info)
-            self.save_backup_history()
+            self.append_backup_history(backup_info)
+            
+            # Publicar duración y tamaño en el exportador de métricas
+            exporter = getattr(self.main_window, 'metrics_exporter', None)
+            if exporter:
+                labels = {"server": server_name}
+                exporter.registry.set("ark_backup_duration_seconds", round(time.time() - backup_started, 3), labels)
+                exporter.registry.set("ark_backup_size_bytes", backup_info["size"], labels)
+                exporter.registry.inc("ark_backups", labels={"server": server_name, "type": backup_info["type"]})
             
             # Limpiar backups antiguos si es necesario
             self._cleanup_old_backups()
@@ -1132,11 +1145,10 @@ class AdvancedBackupPanel(ctk.CTkFrame):
                 self.logger.info("Límite de backups deshabilitado (0 = sin límite)")
                 return
             
-            current_count = len(self.backup_history)
+            current_count = self.state_store.backups.count()
             if current_count > max_backups:
-                # Ordenar por fecha (más antiguos primero)
-                self.backup_history.sort(key=lambda x: x['date'])
-                to_remove = self.backup_history[:-max_backups]
+                # Más antiguos primero, directamente desde el índice por fecha
+                to_remove = self.state_store.backups.oldest(current_count - max_backups)
                 removed_count = 0
                 
                 for backup in to_remove:
@@ -1146,7 +1158,7 @@ class AdvancedBackupPanel(ctk.CTkFrame):
                                 os.remove(backup['path'])
                             else:
                                 shutil.rmtree(backup['path'])
-                        self.backup_history.remove(backup)
+                        self.state_store.backups.remove(backup)
                         removed_count += 1
                         self.logger.info(f"Backup antiguo eliminado: {backup['name']}")
                     except Exception as e:
@@ -1154,7 +1166,7 @@ class AdvancedBackupPanel(ctk.CTkFrame):
                 
                 if removed_count > 0:
                     self.logger.info(f"Limpieza automática: {removed_count} backups antiguos eliminados (límite: {max_backups})")
-                    self.save_backup_history()
+                    self.load_backup_history(refresh=False)
             else:
                 self.logger.debug(f"No es necesario limpiar backups ({current_count}/{max_backups})")
                 
@@ -1274,7 +1286,7 @@ class AdvancedBackupPanel(ctk.CTkFrame):
     def update_backup_counter(self):
         """Actualizar contador de backups"""
         try:
-            current_count = len(self.backup_history)
+            current_count = self.state_store.backups.count()
             max_backups = int(self.max_backups_entry.get() or "10")
             
             if max_backups <= 0:
@@ -1459,9 +1471,8 @@ class AdvancedBackupPanel(ctk.CTkFrame):
                 else:
                     shutil.rmtree(backup['path'])
             
-            self.backup_history.remove(backup)
-            self.save_backup_history()
-            self.refresh_backup_history()
+            self.state_store.backups.remove(backup)
+            self.load_backup_history()
             
             self.show_ctk_info("Eliminado", f"Backup '{backup['name']}' eliminado exitosamente")
             
@@ -1574,9 +1585,7 @@ class AdvancedBackupPanel(ctk.CTkFrame):
                 "saveworld_before_backup": self.saveworld_before_backup_var.get()
             }
             
-            os.makedirs("data", exist_ok=True)
-            with open("data/backup_config.json", 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
+            get_writer().write_json("data/backup_config.json", config)
             
             self.show_ctk_info("Configuración guardada", "La configuración de backup ha sido guardada")
             
@@ -1584,27 +1593,26 @@ class AdvancedBackupPanel(ctk.CTkFrame):
             self.logger.error(f"Error al guardar configuración de backup: {e}")
             self.show_ctk_error("Error", f"No se pudo guardar la configuración: {e}")
     
-    def load_backup_history(self):
-        """Cargar historial de backups"""
+    def load_backup_history(self, refresh=True):
+        """Cargar la página más reciente del historial de backups"""
         try:
-            history_file = "data/backup_history.json"
-            if os.path.exists(history_file):
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    self.backup_history = json.load(f)
-                
+            # La consulta devuelve los más recientes primero; la lista se mantiene cronológica
+            recent = self.state_store.backups.list(limit=self.history_page_size)
+            self.backup_history = list(reversed(recent))
+            if refresh:
                 self.refresh_backup_history()
                 
         except Exception as e:
             self.logger.error(f"Error al cargar historial de backup: {e}")
             self.backup_history = []
     
-    def save_backup_history(self):
-        """Guardar historial de backups"""
+    def append_backup_history(self, backup_info):
+        """Registrar un backup nuevo (una fila en el almacén)"""
         try:
-            os.makedirs("data", exist_ok=True)
-            with open("data/backup_history.json", 'w', encoding='utf-8') as f:
-                json.dump(self.backup_history, f, indent=2)
-                
+            self.state_store.backups.add(backup_info)
+            self.backup_history.append(backup_info)
+            if len(self.backup_history) > self.history_page_size:
+                self.backup_history = self.backup_history[-self.history_page_size:]
         except Exception as e:
             self.logger.error(f"Error al guardar historial de backup: {e}")
     
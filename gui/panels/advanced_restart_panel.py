@@ -6,6 +6,10 @@ import time
 import schedule
 from datetime import datetime, timedelta
 from tkinter import messagebox
+from utils.memory_trend import MemoryTrendAnalyzer, MemoryWatchdog
+from utils.persistence import get_writer
+from utils.state_store import get_state_store
+from utils.mod_manifest import manifest_key
 
 class AdvancedRestartPanel(ctk.CTkFrame):
     def __init__(self, parent, config_manager, logger, main_window):
@@ -17,20 +21,25 @@ class AdvancedRestartPanel(ctk.CTkFrame):
         
         # Archivos de configuración
         self.restart_config_file = "data/restart_config.json"
-        self.restart_history_file = "data/restart_history.json"
         self.restart_configs = {}  # {server_name: {config_data}}
-        self.restart_history = {}  # {server_name: [{restart_info}]}
+        # Historial de reinicios por servidor en el almacén SQLite (sin límite, consultas paginadas)
+        self.state_store = get_state_store(self.logger)
         
         # Estado del programador
         self.restart_scheduler_enabled = False
         self.restart_scheduler_thread = None
         self.stop_restart_scheduler = threading.Event()
         
+        # Reinicio por necesidad según tendencia de memoria
+        self.memory_watchdog = None
+        
+        # Reinicio cuando se actualiza un mod del servidor (seguimiento en el panel de mods)
+        self.mod_update_listening = False
+        
 
         
         self.create_widgets()
         self.load_all_restart_configs()
-        self.load_restart_history()
         self.update_server_selection(self.main_window.selected_server if self.main_window else None)
         self.pack(fill="both", expand=True)
 
@@ -110,6 +119,12 @@ class AdvancedRestartPanel(ctk.CTkFrame):
         # Pestaña Opciones
         self.create_options_tab()
         
+        # Pestaña Memoria
+        self.create_memory_restart_tab()
+        
+        # Pestaña Mods
+        self.create_mod_update_tab()
+        
         # Pestaña Historial
         self.create_history_tab()
 
@@ -307,6 +322,310 @@ class AdvancedRestartPanel(ctk.CTkFrame):
         )
         save_config_button.grid(row=9, column=0, columnspan=3, padx=10, pady=20)
 
+    def create_memory_restart_tab(self):
+        """Crear pestaña de reinicio por crecimiento de memoria"""
+        memory_tab = self.config_tabview.add("🧠 Memoria")
+        memory_tab.grid_columnconfigure(1, weight=1)
+        
+        self.memory_restart_enabled_var = ctk.BooleanVar(value=False)
+        self.memory_restart_check = ctk.CTkCheckBox(
+            memory_tab,
+            text="Reiniciar solo cuando la memoria proyectada supere el límite",
+            variable=self.memory_restart_enabled_var,
+            command=self.on_memory_restart_change
+        )
+        self.memory_restart_check.grid(row=0, column=0, columnspan=2, padx=10, pady=10, sticky="w")
+        
+        # Campos numéricos: (atributo, etiqueta, valor por defecto)
+        fields = [
+            ("memory_limit_entry", "Límite de memoria (MB):", "24000"),
+            ("memory_window_entry", "Ventana de análisis (horas):", "6"),
+            ("memory_horizon_entry", "Horizonte de proyección (horas):", "2"),
+            ("memory_defer_entry", "Con jugadores, reiniciar si faltan menos de (horas):", "1"),
+        ]
+        for row, (attr, label_text, default) in enumerate(fields, start=1):
+            label = ctk.CTkLabel(memory_tab, text=label_text)
+            label.grid(row=row, column=0, padx=10, pady=5, sticky="w")
+            entry = ctk.CTkEntry(memory_tab, width=120)
+            entry.grid(row=row, column=1, padx=10, pady=5, sticky="w")
+            entry.insert(0, default)
+            setattr(self, attr, entry)
+        
+        self.memory_status_label = ctk.CTkLabel(
+            memory_tab,
+            text="Análisis de memoria inactivo",
+            font=ctk.CTkFont(size=10),
+            text_color="gray",
+            justify="left"
+        )
+        self.memory_status_label.grid(row=5, column=0, columnspan=2, padx=10, pady=(10, 5), sticky="w")
+        
+        buttons_frame = ctk.CTkFrame(memory_tab, fg_color="transparent")
+        buttons_frame.grid(row=6, column=0, columnspan=2, padx=10, pady=10, sticky="w")
+        
+        analyze_button = ctk.CTkButton(
+            buttons_frame,
+            text="📊 Analizar ahora",
+            command=self.analyze_memory_now,
+            width=150
+        )
+        analyze_button.pack(side="left", padx=(0, 10))
+        
+        save_button = ctk.CTkButton(
+            buttons_frame,
+            text="💾 Guardar Configuración",
+            command=self.save_restart_config,
+            width=200
+        )
+        save_button.pack(side="left")
+
+    def _build_memory_analyzer(self):
+        """Crear el analizador con los valores de la pestaña Memoria"""
+        return MemoryTrendAnalyzer(
+            memory_limit_mb=float(self.memory_limit_entry.get()),
+            window_hours=float(self.memory_window_entry.get()),
+            horizon_hours=float(self.memory_horizon_entry.get()),
+            player_defer_hours=float(self.memory_defer_entry.get())
+        )
+
+    def _get_metrics_collector(self):
+        """Obtener el recolector de métricas del panel de servidor"""
+        server_panel = getattr(self.main_window, 'server_panel', None)
+        return getattr(server_panel, 'metrics_collector', None)
+
+    def on_memory_restart_change(self):
+        """Activar o desactivar el reinicio por memoria"""
+        if self.memory_restart_enabled_var.get():
+            self.start_memory_watchdog()
+        else:
+            self.stop_memory_watchdog()
+
+    def start_memory_watchdog(self):
+        """Iniciar la vigilancia de la tendencia de memoria"""
+        self.stop_memory_watchdog()
+        collector = self._get_metrics_collector()
+        if collector is None:
+            self.logger.warning("Recolector de métricas no disponible para el reinicio por memoria")
+            self._safe_update_memory_status("⚠️ Métricas no disponibles")
+            return
+        try:
+            analyzer = self._build_memory_analyzer()
+        except ValueError:
+            self._safe_update_memory_status("❌ Valores numéricos inválidos")
+            return
+        self.memory_watchdog = MemoryWatchdog(collector, analyzer, self._memory_restart, self.logger)
+        self.memory_watchdog.start()
+        self._safe_update_memory_status(f"🔄 Vigilando memoria (límite {analyzer.memory_limit_mb:.0f} MB)")
+        self.logger.info("Reinicio por memoria activado")
+
+    def stop_memory_watchdog(self):
+        """Detener la vigilancia de la tendencia de memoria"""
+        if self.memory_watchdog:
+            self.memory_watchdog.stop()
+            self.memory_watchdog = None
+            self._safe_update_memory_status("Análisis de memoria inactivo")
+
+    def analyze_memory_now(self):
+        """Mostrar el análisis actual sin reiniciar"""
+        collector = self._get_metrics_collector()
+        if collector is None:
+            self._safe_update_memory_status("⚠️ Métricas no disponibles")
+            return
+        try:
+            analyzer = self._build_memory_analyzer()
+        except ValueError:
+            self._safe_update_memory_status("❌ Valores numéricos inválidos")
+            return
+        now = time.time()
+        points = [(ts, value) for ts, value in collector.query("memory_mb", now - analyzer.window_seconds, now) if value > 0]
+        analysis = analyzer.analyze(points, now)
+        latest = collector.latest() or {}
+        should_restart, reason = analyzer.decide(analysis, latest.get("players"))
+        self._safe_update_memory_status(self._format_memory_analysis(analysis, reason))
+
+    def _format_memory_analysis(self, analysis, reason):
+        """Texto resumen de un análisis de memoria"""
+        if analysis.get("current_mb") is None:
+            return f"Sin muestras suficientes ({analysis.get('samples', 0)})"
+        text = f"Actual: {analysis['current_mb']:.0f} MB"
+        if analysis.get("slope_mb_per_hour") is not None:
+            text += f" | Tendencia: {analysis['slope_mb_per_hour']:+.1f} MB/h (r²={analysis['r_squared']})"
+        if analysis.get("hours_to_limit") is not None:
+            text += f" | Límite en {analysis['hours_to_limit']:.1f} h"
+        return f"{text}\n{reason}"
+
+    def _memory_restart(self, reason, analysis):
+        """Disparar la secuencia de reinicio existente por crecimiento de memoria"""
+        restart_info = {
+            "type": "memoria",
+            "datetime": datetime.now().isoformat(),
+            "server": self.current_server_name or "Desconocido",
+            "backup_done": False,
+            "saveworld_done": False,
+            "update_done": False,
+            "success": False,
+            "reason": reason,
+            "warnings_sent": False,
+            "update_requested": False,
+            "memory_mb": analysis.get("current_mb"),
+            "memory_slope_mb_per_hour": analysis.get("slope_mb_per_hour")
+        }
+        self.show_message(f"🧠 Reinicio por memoria: {reason}")
+        if hasattr(self.main_window, 'log_server_event'):
+            self.main_window.log_server_event("automatic_restart_start", restart_info=restart_info)
+        if self.rcon_warnings_var.get():
+            self.after(0, lambda: self._send_rcon_warnings_and_restart(restart_info))
+        else:
+            self.after(0, lambda: self._execute_restart_sequence(restart_info))
+
+    def _safe_update_memory_status(self, text):
+        """Actualizar estado del análisis de memoria desde cualquier hilo"""
+        try:
+            self.after(0, lambda: self.memory_status_label.configure(text=text))
+        except Exception:
+            pass
+
+    def create_mod_update_tab(self):
+        """Crear pestaña de reinicio por actualización de mods"""
+        mods_tab = self.config_tabview.add("🧩 Mods")
+        
+        self.mod_update_restart_enabled_var = ctk.BooleanVar(value=False)
+        self.mod_update_restart_check = ctk.CTkCheckBox(
+            mods_tab,
+            text="Reiniciar cuando se actualice un mod instalado en este servidor",
+            variable=self.mod_update_restart_enabled_var,
+            command=self.on_mod_update_restart_change
+        )
+        self.mod_update_restart_check.pack(anchor="w", padx=10, pady=10)
+        
+        self.mod_update_status_label = ctk.CTkLabel(
+            mods_tab,
+            text="Sin actualizaciones de mods pendientes",
+            font=ctk.CTkFont(size=10),
+            text_color="gray",
+            justify="left"
+        )
+        self.mod_update_status_label.pack(anchor="w", padx=10, pady=(5, 5))
+        
+        buttons_frame = ctk.CTkFrame(mods_tab, fg_color="transparent")
+        buttons_frame.pack(anchor="w", padx=10, pady=10)
+        
+        check_button = ctk.CTkButton(
+            buttons_frame,
+            text="🔍 Comprobar ahora",
+            command=self.check_mod_updates_now,
+            width=150
+        )
+        check_button.pack(side="left", padx=(0, 10))
+        
+        save_button = ctk.CTkButton(
+            buttons_frame,
+            text="💾 Guardar Configuración",
+            command=self.save_restart_config,
+            width=200
+        )
+        save_button.pack(side="left")
+
+    def _get_mod_update_tracker(self):
+        """Obtener el seguimiento de versiones de mods del panel de mods"""
+        mods_panel = getattr(self.main_window, 'mods_panel', None)
+        return getattr(mods_panel, 'update_tracker', None)
+
+    def on_mod_update_restart_change(self):
+        """Suscribirse o no a las actualizaciones de mods"""
+        tracker = self._get_mod_update_tracker()
+        if tracker is None:
+            self._safe_update_mod_status("⚠️ Seguimiento de mods no disponible")
+            return
+        if self.mod_update_restart_enabled_var.get() and not self.mod_update_listening:
+            tracker.add_listener(self._on_mods_updated)
+            self.mod_update_listening = True
+            self.logger.info("Reinicio por actualización de mods activado")
+        elif not self.mod_update_restart_enabled_var.get() and self.mod_update_listening:
+            tracker.remove_listener(self._on_mods_updated)
+            self.mod_update_listening = False
+        self.refresh_mod_update_status()
+
+    def check_mod_updates_now(self):
+        """Comprobar las versiones de todos los mods instalados en segundo plano"""
+        tracker = self._get_mod_update_tracker()
+        if tracker is None:
+            self._safe_update_mod_status("⚠️ Seguimiento de mods no disponible")
+            return
+        self._safe_update_mod_status("🔍 Comprobando versiones de mods...")
+        
+        def check():
+            try:
+                tracker.check_now()
+            except Exception as e:
+                self.logger.error(f"Error comprobando actualizaciones de mods: {e}")
+            self.after(0, self.refresh_mod_update_status)
+        
+        threading.Thread(target=check, daemon=True).start()
+
+    def refresh_mod_update_status(self):
+        """Mostrar los mods actualizados pendientes de reinicio en el servidor actual"""
+        tracker = self._get_mod_update_tracker()
+        if tracker is None or not self.current_server_name:
+            return
+        try:
+            pending = tracker.pending_updates([self._current_mods_key()])
+            if tracker.last_error:
+                text = f"❌ Última comprobación fallida: {tracker.last_error}"
+            elif pending:
+                lines = [f"{key}: {tracker.describe(updates)}" for key, updates in pending.items()]
+                text = "🧩 Necesita reinicio por mods actualizados:\n" + "\n".join(lines)
+            else:
+                text = "✅ Mods al día"
+            if tracker.last_check:
+                text += f"\nÚltima comprobación: {tracker.last_check[:16].replace('T', ' ')}"
+            self._safe_update_mod_status(text)
+        except Exception as e:
+            self.logger.error(f"Error mostrando actualizaciones de mods: {e}")
+
+    def _current_mods_key(self):
+        """Clave exacta del manifiesto de mods del servidor/mapa actual"""
+        return manifest_key(self.current_server_name, getattr(self.main_window, 'selected_map', None))
+
+    def _on_mods_updated(self, updates_by_key):
+        """Mods actualizados (desde el hilo del seguimiento): reiniciar si afectan al servidor actual"""
+        affected = updates_by_key.get(self._current_mods_key(), []) if self.current_server_name else []
+        self.after(0, self.refresh_mod_update_status)
+        if affected and self.mod_update_restart_enabled_var.get():
+            self.after(0, lambda: self._mod_update_restart(affected))
+
+    def _mod_update_restart(self, updates):
+        """Disparar la secuencia de reinicio existente por actualización de mods"""
+        tracker = self._get_mod_update_tracker()
+        reason = f"Mods actualizados: {tracker.describe(updates) if tracker else len(updates)}"
+        restart_info = {
+            "type": "mods",
+            "datetime": datetime.now().isoformat(),
+            "server": self.current_server_name or "Desconocido",
+            "backup_done": False,
+            "saveworld_done": False,
+            "update_done": False,
+            "success": False,
+            "reason": reason,
+            "warnings_sent": False,
+            "update_requested": False,
+            "updated_mods": [update["mod_id"] for update in updates]
+        }
+        self.show_message(f"🧩 Reinicio por actualización de mods: {reason}")
+        if hasattr(self.main_window, 'log_server_event'):
+            self.main_window.log_server_event("automatic_restart_start", restart_info=restart_info)
+        if self.rcon_warnings_var.get():
+            self._send_rcon_warnings_and_restart(restart_info)
+        else:
+            self._execute_restart_sequence(restart_info)
+
+    def _safe_update_mod_status(self, text):
+        """Actualizar estado de las actualizaciones de mods desde cualquier hilo"""
+        try:
+            self.after(0, lambda: self.mod_update_status_label.configure(text=text))
+        except Exception:
+            pass
+
     def create_history_tab(self):
         """Crear pestaña de historial de reinicios"""
         history_tab = self.config_tabview.add("📚 Historial")
@@ -525,6 +844,9 @@ class AdvancedRestartPanel(ctk.CTkFrame):
             "update_requested": should_update
         }
         
+        if should_update:
+            self._prepare_update(restart_info)
+        
         # Registrar con el sistema de eventos del servidor
         if hasattr(self.main_window, 'log_server_event'):
             self.main_window.log_server_event("automatic_restart_start", restart_info=restart_info)
@@ -751,6 +1073,10 @@ class AdvancedRestartPanel(ctk.CTkFrame):
             self.restart_progress_bar.set(0.9)
             if self._start_server():
                 restart_info["success"] = True
+                tracker = self._get_mod_update_tracker()
+                if tracker and self.current_server_name:
+                    tracker.mark_restarted(self.current_server_name, getattr(self.main_window, 'selected_map', None))
+                    self.refresh_mod_update_status()
                 self.restart_progress_label.configure(text="✅ Reinicio completado exitosamente")
                 self.restart_progress_bar.set(1.0)
                 self.logger.info("Reinicio completado exitosamente")
@@ -832,42 +1158,77 @@ class AdvancedRestartPanel(ctk.CTkFrame):
         return False
 
     def _start_server(self):
-        """Iniciar servidor"""
+        """Iniciar servidor (sin diálogos: el reinicio puede ser desatendido)"""
         try:
             if hasattr(self.main_window, 'server_panel'):
-                self.main_window.server_panel.start_server()
+                self.main_window.server_panel.start_server(interactive=False)
                 return True
         except Exception as e:
             self.logger.error(f"Error iniciando servidor: {e}")
         return False
 
     def _execute_update(self):
-        """Ejecutar actualización del servidor"""
+        """
+        Ejecutar actualización del servidor (ya detenido)
+
+        Se llama directamente al gestor, sin el diálogo de confirmación, y se
+        espera al resultado antes de arrancar: si hay una actualización
+        pre-descargada solo se intercambia el staging.
+        """
         try:
-            if hasattr(self.main_window, 'server_panel'):
-                self.main_window.server_panel.update_server()
-                return True
+            server_manager = getattr(self.main_window, 'server_manager', None)
+            if server_manager and self.current_server_name:
+                results = []
+                server_manager.update_server(
+                    lambda kind, message: results.append(kind) if kind in ("success", "error") else None,
+                    self.current_server_name, wait=True
+                )
+                return "success" in results and "error" not in results
         except Exception as e:
             self.logger.error(f"Error actualizando servidor: {e}")
         return False
 
+    def _prepare_update(self, restart_info):
+        """
+        Comprobar el build y pre-descargar mientras el servidor sigue en marcha
+
+        Se ejecuta en el hilo del programador antes de los avisos, así el
+        servidor solo se detiene el tiempo de intercambiar el staging, y si no
+        hay build nuevo el reinicio no actualiza.
+        """
+        server_manager = getattr(self.main_window, 'server_manager', None)
+        if not server_manager or not self.current_server_name:
+            return
+        try:
+            info = server_manager.check_server_update(self.current_server_name)
+            if info and not info["update_needed"]:
+                restart_info["update_requested"] = False
+                self.logger.info(f"Sin build nuevo ({info['installed']}), el reinicio no actualizará")
+                return
+            server_manager.prestage_update(
+                lambda kind, message: self.logger.info(f"Pre-descarga: {message}") if kind in ("success", "error") else None,
+                self.current_server_name, wait=True
+            )
+        except Exception as e:
+            self.logger.error(f"Error preparando la actualización: {e}")
+
     def _save_restart_to_history(self, restart_info):
         """Guardar reinicio en historial"""
         try:
             server_name = restart_info.get("server", "Desconocido")
             
-            if server_name not in self.restart_history:
-                self.restart_history[server_name] = []
-            
-            self.restart_history[server_name].append(restart_info)
-            
-            # Mantener solo los últimos 50 reinicios por servidor
-            if len(self.restart_history[server_name]) > 50:
-                self.restart_history[server_name] = self.restart_history[server_name][-50:]
-            
-            self.save_restart_history()
+            self.state_store.restarts.add(server_name, restart_info)
             self.refresh_restart_history()
             
+            # Contabilizar el reinicio en el exportador de métricas
+            exporter = getattr(self.main_window, 'metrics_exporter', None)
+            if exporter:
+                exporter.registry.inc("ark_restarts", labels={
+                    "server": server_name,
+                    "type": restart_info.get("type", "manual"),
+                    "success": str(bool(restart_info.get("success"))).lower()
+                })
+            
         except Exception as e:
             self.logger.error(f"Error guardando reinicio en historial: {e}")
 
@@ -960,7 +1321,8 @@ class AdvancedRestartPanel(ctk.CTkFrame):
                 widget.destroy()
             
             server_name = self.current_server_name or "Desconocido"
-            history = self.restart_history.get(server_name, [])
+            # Últimos 20, más recientes primero
+            history = self.state_store.restarts.list(server_name, limit=20)
             
             if not history:
                 no_history_label = ctk.CTkLabel(
@@ -971,8 +1333,7 @@ class AdvancedRestartPanel(ctk.CTkFrame):
                 no_history_label.pack(pady=20)
                 return
             
-            # Mostrar historial más reciente primero
-            for i, restart in enumerate(reversed(history[-20:])):  # Últimos 20
+            for i, restart in enumerate(history):
                 self._create_history_item(restart, i)
                 
         except Exception as e:
@@ -988,7 +1349,7 @@ class AdvancedRestartPanel(ctk.CTkFrame):
         datetime_obj = datetime.fromisoformat(restart_info["datetime"])
         date_str = datetime_obj.strftime("%d/%m/%Y %H:%M:%S")
         
-        type_emoji = "🔄" if restart_info["type"] == "programado" else "👤"
+        type_emoji = {"programado": "🔄", "memoria": "🧠"}.get(restart_info["type"], "👤")
         status_emoji = "✅" if restart_info["success"] else "❌"
         
         title_text = f"{type_emoji} {restart_info['type'].title()} - {date_str} {status_emoji}"
@@ -1025,11 +1386,9 @@ class AdvancedRestartPanel(ctk.CTkFrame):
         """Limpiar historial de reinicios"""
         if self.show_ctk_confirm("Limpiar Historial", "¿Estás seguro de que quieres limpiar todo el historial de reinicios?"):
             server_name = self.current_server_name or "Desconocido"
-            if server_name in self.restart_history:
-                self.restart_history[server_name] = []
-                self.save_restart_history()
-                self.refresh_restart_history()
-                self.logger.info("Historial de reinicios limpiado")
+            self.state_store.restarts.clear(server_name)
+            self.refresh_restart_history()
+            self.logger.info("Historial de reinicios limpiado")
 
     def save_restart_config(self):
         """Guardar configuración de reinicios"""
@@ -1047,16 +1406,18 @@ class AdvancedRestartPanel(ctk.CTkFrame):
                 "saveworld_before_restart": self.saveworld_before_restart_var.get(),
                 "rcon_warnings_enabled": self.rcon_warnings_var.get(),
                 "warning_intervals": self.warning_intervals_entry.get(),
-                "warning_message": self.warning_message_text.get("0.0", "end-1c").strip()
+                "warning_message": self.warning_message_text.get("0.0", "end-1c").strip(),
+                "memory_restart_enabled": self.memory_restart_enabled_var.get(),
+                "memory_limit_mb": self.memory_limit_entry.get(),
+                "memory_window_hours": self.memory_window_entry.get(),
+                "memory_horizon_hours": self.memory_horizon_entry.get(),
+                "memory_defer_hours": self.memory_defer_entry.get(),
+                "mod_update_restart_enabled": self.mod_update_restart_enabled_var.get()
             }
             
             self.restart_configs[server_name] = config
             
-            # Crear directorio si no existe
-            os.makedirs("data", exist_ok=True)
-            
-            with open(self.restart_config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.restart_configs, f, indent=2, ensure_ascii=False)
+            get_writer().write_json(self.restart_config_file, self.restart_configs)
             
             self.logger.info(f"Configuración de reinicios guardada para {server_name}")
             
@@ -1065,6 +1426,9 @@ class AdvancedRestartPanel(ctk.CTkFrame):
                 self.stop_restart_scheduler_func()
                 self.start_restart_scheduler()
             
+            # Aplicar nuevos límites al reinicio por memoria
+            self.on_memory_restart_change()
+            
         except Exception as e:
             self.logger.error(f"Error guardando configuración de reinicios: {e}")
 
@@ -1078,25 +1442,6 @@ class AdvancedRestartPanel(ctk.CTkFrame):
             self.logger.error(f"Error cargando configuraciones de reinicios: {e}")
             self.restart_configs = {}
 
-    def save_restart_history(self):
-        """Guardar historial de reinicios"""
-        try:
-            os.makedirs("data", exist_ok=True)
-            with open(self.restart_history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.restart_history, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            self.logger.error(f"Error guardando historial de reinicios: {e}")
-
-    def load_restart_history(self):
-        """Cargar historial de reinicios"""
-        try:
-            if os.path.exists(self.restart_history_file):
-                with open(self.restart_history_file, 'r', encoding='utf-8') as f:
-                    self.restart_history = json.load(f)
-        except Exception as e:
-            self.logger.error(f"Error cargando historial de reinicios: {e}")
-            self.restart_history = {}
-
     def update_server_selection(self, server_name):
         """Actualizar selección de servidor"""
         self.current_server_name = server_name
@@ -1105,6 +1450,7 @@ class AdvancedRestartPanel(ctk.CTkFrame):
             self.load_server_config(server_name)
         
         self.refresh_restart_history()
+        self.refresh_mod_update_status()
 
     def load_server_config(self, server_name):
         """Cargar configuración específica del servidor"""
@@ -1147,6 +1493,23 @@ class AdvancedRestartPanel(ctk.CTkFrame):
             self.warning_message_text.delete("0.0", "end")
             self.warning_message_text.insert("0.0", warning_message)
             
+            # Cargar reinicio por memoria
+            memory_fields = [
+                (self.memory_limit_entry, "memory_limit_mb", "24000"),
+                (self.memory_window_entry, "memory_window_hours", "6"),
+                (self.memory_horizon_entry, "memory_horizon_hours", "2"),
+                (self.memory_defer_entry, "memory_defer_hours", "1"),
+            ]
+            for entry, key, default in memory_fields:
+                entry.delete(0, "end")
+                entry.insert(0, str(config.get(key, default)))
+            self.memory_restart_enabled_var.set(config.get("memory_restart_enabled", False))
+            self.on_memory_restart_change()
+            
+            # Cargar reinicio por actualización de mods
+            self.mod_update_restart_enabled_var.set(config.get("mod_update_restart_enabled", False))
+            self.on_mod_update_restart_change()
+            
             # Aplicar estado de los checkboxes
             self.on_update_mode_change()
             
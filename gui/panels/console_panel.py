@@ -4,6 +4,8 @@ import time
 import os
 import psutil
 from datetime import datetime
+from utils.launch_profile import get_launch_profiles, LaunchProfileError
+from utils.port_allocator import PortAllocator, profile_ports
 
 
 class ConsolePanel:
@@ -261,26 +263,11 @@ class ConsolePanel:
             self.main_window.update_server_status("Iniciando")
         
         try:
-            # Obtener argumentos del servidor desde el panel principal
-            if hasattr(self.main_window, 'principal_panel'):
-                server_args = self.main_window.principal_panel.build_server_arguments()
-                
-                self.server_manager.start_server_with_args(
-                    callback=self.on_server_status_change,
-                    server_name=self.main_window.selected_server,
-                    map_name=self.main_window.selected_map,
-                    custom_args=server_args
-                )
-            else:
-                # Fallback si no hay panel principal
-                self.server_manager.start_server_with_args(
-                    callback=self.on_server_status_change,
-                    server_name="Prueba",
-                    map_name="The Center"
-                )
-            
-            self.add_console_message("✅ Servidor iniciado automáticamente en modo de captura de consola")
+            server_args = self.get_server_arguments()
+            self.launch_server_checked(server_args, "✅ Servidor iniciado automáticamente en modo de captura de consola")
             
+        except LaunchProfileError as e:
+            self.report_launch_profile_errors(e)
         except Exception as e:
             self.add_console_message(f"❌ Error iniciando servidor automáticamente: {e}")
             self.logger.error(f"Error iniciando servidor automáticamente: {e}")
@@ -373,26 +360,77 @@ class ConsolePanel:
         if hasattr(self.main_window, 'update_server_status'):
             self.main_window.update_server_status("Iniciando")
         
-        # Obtener argumentos del servidor desde el panel principal
-        if hasattr(self.main_window, 'principal_panel'):
-            server_args = self.main_window.principal_panel.build_server_arguments()
-            
-            result = self.server_manager.start_server_with_args(
+        try:
+            server_args = self.get_server_arguments()
+        except LaunchProfileError as e:
+            self.report_launch_profile_errors(e)
+            return
+        
+        self.launch_server_checked(server_args, "🟢 Consola activada - Capturando salida del servidor...")
+    
+    def launch_server_checked(self, server_args, started_message):
+        """
+        Iniciar el servidor tras las mismas comprobaciones que el panel principal
+        
+        Se rechazan los conflictos de puertos y se revisan las dependencias de
+        mods sin preguntar (el arranque desde la consola suele ser desatendido).
+        """
+        server_name = self.main_window.selected_server
+        
+        def launch():
+            self.server_manager.start_server_with_args(
                 callback=self.on_server_status_change,
-                server_name=self.main_window.selected_server,
+                server_name=server_name,
                 map_name=self.main_window.selected_map,
-                custom_args=server_args
-            )
-        else:
-            # Fallback si no hay panel principal
-            result = self.server_manager.start_server_with_args(
-                callback=self.on_server_status_change,
-                server_name="Prueba",
-                map_name="The Center",
-                custom_args=[]
+                custom_args=server_args,
+                env=get_launch_profiles(self.logger).launch_env(server_name)
             )
+            self.add_console_message(started_message)
+        
+        def cancel():
+            self.add_console_message("⏹️ Inicio del servidor cancelado por las comprobaciones previas")
+            if hasattr(self.main_window, 'update_server_status'):
+                self.main_window.update_server_status("Error")
+        
+        principal_panel = getattr(self.main_window, 'principal_panel', None)
+        if principal_panel is not None:
+            principal_panel.check_launch_then(server_name, server_args, launch, interactive=False, on_cancel=cancel)
+            return
         
-        self.add_console_message("🟢 Consola activada - Capturando salida del servidor...")
+        # Sin panel principal (ni de mods) solo se pueden comprobar los puertos del perfil guardado
+        profiles = get_launch_profiles(self.logger)
+        conflicts = PortAllocator(profiles, logger=self.logger).conflicts(
+            server_name, profile_ports(profiles.get(server_name) or {}))
+        for conflict in conflicts:
+            self.add_console_message(f"❌ Conflicto de puertos: {conflict}")
+        if conflicts:
+            cancel()
+            return
+        launch()
+    
+    def get_server_arguments(self):
+        """
+        Argumentos de arranque del servidor seleccionado
+        
+        Se compilan desde el panel principal; sin él se usan los ya compilados
+        del perfil guardado.
+        
+        Raises:
+            LaunchProfileError: Si el perfil falta o tiene errores
+        """
+        principal_panel = getattr(self.main_window, 'principal_panel', None)
+        if principal_panel is not None:
+            return principal_panel.build_server_arguments()
+        return get_launch_profiles(self.logger).launch_args(self.main_window.selected_server)
+    
+    def report_launch_profile_errors(self, error):
+        """Avisar de que el perfil de arranque impide iniciar el servidor"""
+        self.add_console_message("❌ El perfil de arranque tiene errores, no se inicia el servidor:")
+        for message in error.errors:
+            self.add_console_message(f"   • {message}")
+        self.logger.error(f"Perfil de arranque inválido: {error}")
+        if hasattr(self.main_window, 'update_server_status'):
+            self.main_window.update_server_status("Error")
     
     def stop_console(self):
         """Detener la captura de la consola del servidor"""
@@ -1,5 +1,7 @@
 import customtkinter as ctk
-import configparser
+from utils.ini_document import IniDocument
+from utils.settings_catalog import get_schema
+from utils.config_versions import get_version_store
 import os
 import shutil
 from tkinter import filedialog, messagebox
@@ -13,9 +15,11 @@ class DynamicConfigPanel(ctk.CTkFrame):
         self.logger = logger
         
         # Diccionarios para almacenar widgets dinámicos
-        self.config_widgets = {}  # {section: {key: widget}}
-        self.config_data = {}     # {file_path: configparser_object}
+        self.config_widgets = {}  # {file_path: {section: {key: widget}}}
+        self.config_lines = {}    # {file_path: {section: {key: IniLine}}}
+        self.config_data = {}     # {file_path: IniDocument}
         self.config_files = []    # Lista de archivos de configuración encontrados
+        self.schema = get_schema()  # Tipos y rangos de los ajustes conocidos
         
         # Mapeo de tipos de datos comunes en ARK
         self.type_hints = {
@@ -239,6 +243,7 @@ class DynamicConfigPanel(ctk.CTkFrame):
             
             self.config_data = {}
             self.config_widgets = {}
+            self.config_lines = {}
             
             row_index = 0
             
@@ -304,44 +309,43 @@ class DynamicConfigPanel(ctk.CTkFrame):
         return file_frame
     
     def load_single_config(self, config_file, parent_frame):
-        """Cargar un archivo de configuración específico"""
+        """Cargar un archivo de configuración específico (incluidas claves duplicadas)"""
         try:
-            # Configurar parser para ser más permisivo
-            config = configparser.ConfigParser(
-                allow_no_value=True,
-                strict=False,
-                interpolation=None
-            )
-            config.optionxform = str  # Preservar mayúsculas/minúsculas en las claves
-            config.read(config_file, encoding='utf-8')
+            document = IniDocument.load(config_file)
             
-            self.config_data[config_file] = config
+            self.config_data[config_file] = document
             self.config_widgets[config_file] = {}
+            self.config_lines[config_file] = {}
             
             row_index = 1
             
             # Crear secciones y campos dinámicamente
-            for section_name in config.sections():
+            for section_name in document.sections():
+                option_lines = document.option_lines(section_name)
+                if not option_lines:  # Saltar secciones vacías
+                    continue
+                
                 section_frame = self.create_section_frame(
                     parent_frame, section_name, row_index
                 )
                 row_index += 1
                 
                 self.config_widgets[config_file][section_name] = {}
+                self.config_lines[config_file][section_name] = {}
                 
-                # Crear campos para cada opción en la sección
-                field_row = 0
-                for key, value in config[section_name].items():
+                # Crear un campo por cada línea; las claves repetidas se numeran solo en la UI
+                occurrences = {}
+                for field_row, line in enumerate(option_lines):
+                    count = occurrences.get(line.key.lower(), 0) + 1
+                    occurrences[line.key.lower()] = count
+                    widget_key = line.key if count == 1 else f"{line.key} #{count}"
+                    
                     widget = self.create_dynamic_field(
-                        section_frame, key, value, field_row
+                        section_frame, widget_key, line.value, field_row
                     )
-                    self.config_widgets[config_file][section_name][key] = widget
-                    field_row += 1
+                    self.config_widgets[config_file][section_name][widget_key] = widget
+                    self.config_lines[config_file][section_name][widget_key] = line
                     
-        except configparser.DuplicateOptionError as e:
-            self.logger.warning(f"Archivo con claves duplicadas {config_file}: {e}")
-            # Usar método alternativo para archivos con duplicados
-            self.load_config_with_duplicates(config_file, parent_frame)
         except Exception as e:
             self.logger.error(f"Error al cargar {config_file}: {e}")
             error_label = ctk.CTkLabel(
@@ -351,84 +355,6 @@ class DynamicConfigPanel(ctk.CTkFrame):
             )
             error_label.grid(row=1, column=0, padx=10, pady=5)
     
-    def load_config_with_duplicates(self, config_file, parent_frame):
-        """Cargar archivo de configuración con claves duplicadas usando lectura manual"""
-        try:
-            self.config_widgets[config_file] = {}
-            current_section = None
-            row_index = 1
-            
-            with open(config_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Parsear manualmente el archivo
-            config_data = {}
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('#') or line.startswith(';'):
-                    continue
-                
-                # Detectar sección
-                if line.startswith('[') and line.endswith(']'):
-                    current_section = line[1:-1]
-                    config_data[current_section] = {}
-                    continue
-                
-                # Detectar clave=valor
-                if '=' in line and current_section:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Si la clave ya existe, agregar un sufijo
-                    original_key = key
-                    counter = 1
-                    while key in config_data[current_section]:
-                        key = f"{original_key}_{counter}"
-                        counter += 1
-                    
-                    config_data[current_section][key] = value
-            
-            # Crear UI para los datos parseados
-            for section_name, section_data in config_data.items():
-                if not section_data:  # Saltar secciones vacías
-                    continue
-                    
-                section_frame = self.create_section_frame(
-                    parent_frame, section_name, row_index
-                )
-                row_index += 1
-                
-                self.config_widgets[config_file][section_name] = {}
-                
-                field_row = 0
-                for key, value in section_data.items():
-                    widget = self.create_dynamic_field(
-                        section_frame, key, value, field_row
-                    )
-                    self.config_widgets[config_file][section_name][key] = widget
-                    field_row += 1
-            
-            # Crear un objeto configparser simulado para compatibilidad
-            config = configparser.ConfigParser(allow_no_value=True)
-            config.optionxform = str  # Preservar mayúsculas/minúsculas en las claves
-            for section_name, section_data in config_data.items():
-                if section_name and section_data:
-                    config.add_section(section_name)
-                    for key, value in section_data.items():
-                        config.set(section_name, key, value)
-            
-            self.config_data[config_file] = config
-            
-        except Exception as e:
-            self.logger.error(f"Error al cargar archivo con duplicados {config_file}: {e}")
-            error_label = ctk.CTkLabel(
-                parent_frame,
-                text=f"❌ Error al cargar archivo con duplicados: {str(e)}",
-                text_color="red"
-            )
-            error_label.grid(row=1, column=0, padx=10, pady=5)
-    
     def create_section_frame(self, parent, section_name, row_index):
         """Crear frame para una sección de configuración"""
         section_frame = ctk.CTkFrame(parent)
@@ -497,6 +423,10 @@ class DynamicConfigPanel(ctk.CTkFrame):
     
     def detect_value_type(self, key, value):
         """Detectar el tipo de dato basado en la clave y valor"""
+        schema_type = self.schema.value_type(key)
+        if schema_type is not None:
+            return schema_type
+        
         key_lower = key.lower()
         value_lower = value.lower()
         
@@ -566,17 +496,17 @@ class DynamicConfigPanel(ctk.CTkFrame):
             self.status_label.configure(text=f"❌ Error al guardar: {str(e)}")
             messagebox.showerror("Error", f"Error al guardar configuraciones:\n{str(e)}")
     
-    def save_single_config(self, config_file, config_obj):
+    def save_single_config(self, config_file, document):
         """Guardar un archivo de configuración específico"""
         try:
             if config_file not in self.config_widgets:
                 return False
             
-            # Actualizar el objeto de configuración con los valores de los widgets
+            # Leer el valor de cada widget y validar los editados contra el esquema
+            values = []
+            errors = []
             for section_name, section_widgets in self.config_widgets[config_file].items():
-                if not config_obj.has_section(section_name):
-                    config_obj.add_section(section_name)
-                
+                section_lines = self.config_lines.get(config_file, {}).get(section_name, {})
                 for key, widget in section_widgets.items():
                     try:
                         # Obtener valor del widget según su tipo
@@ -586,21 +516,45 @@ class DynamicConfigPanel(ctk.CTkFrame):
                             value = widget.get("1.0", "end-1c")
                         else:  # CTkEntry
                             value = widget.get()
-                        
-                        config_obj.set(section_name, key, str(value))
-                        
                     except Exception as e:
                         self.logger.warning(f"Error al obtener valor de {key}: {e}")
                         continue
+                    
+                    line = section_lines.get(key)
+                    if line is None or value != line.value:
+                        error = self.schema.validate(key, value)
+                        if error:
+                            errors.append(f"[{section_name}] {error}")
+                    values.append((section_name, key, value, line))
+            
+            if errors:
+                self.logger.warning(f"{config_file} no guardado, valores inválidos: {errors}")
+                messagebox.showwarning(
+                    "Valores inválidos",
+                    f"{os.path.basename(config_file)} no se guardó:\n" + "\n".join(errors[:10])
+                )
+                return False
+            
+            # Actualizar cada línea del documento con el valor de su widget
+            for section_name, key, value, line in values:
+                if line is not None:
+                    document.set_line_value(line, value)
+                else:
+                    document.set(section_name, key, value)
+            
+            if not document.dirty:
+                return False
             
             # Crear backup del archivo original
             backup_path = f"{config_file}.backup"
             if os.path.exists(config_file):
                 shutil.copy2(config_file, backup_path)
             
-            # Guardar el archivo actualizado
-            with open(config_file, 'w', encoding='utf-8') as f:
-                config_obj.write(f)
+            # Guardar solo las líneas modificadas conservando el resto del archivo
+            versions = get_version_store(self.logger)
+            versions.track(config_file)  # Estado previo (por si se editó fuera)
+            document.save(config_file)
+            versions.track(config_file)
             
             self.logger.info(f"Configuración guardada: {config_file}")
             return True
@@ -1,5 +1,8 @@
 import customtkinter as ctk
-import configparser
+from utils.ini_document import IniDocument
+from utils.ini_watcher import IniFileWatcher, diff_documents
+from utils.settings_catalog import get_schema
+from utils.config_versions import get_version_store
 import os
 import re
 from pathlib import Path
@@ -286,12 +289,15 @@ class IniConfigPanel(ctk.CTkFrame):
         }
         
         # Variables de estado
-        self.ini_data = {}
-        self.original_file_content = {}
+        self.ini_data = {}  # {file_type: IniDocument}
         self.case_sensitive_keys = {}
         self.original_values = {}
         self.changed_values = {}
         self.field_mappings = {}  # Mapeo de campos a secciones/archivos
+        self.field_index = {}  # {campo: (archivo, sección, clave)} precalculado
+        self.key_locations = {}  # {clave.lower(): (archivo, sección)} de los INI cargados
+        self.field_widgets = {}  # {categoría: {campo: widget}} solo de categorías ya mostradas
+        self.schema = get_schema()  # Tipos y rangos de los ajustes conocidos
         
         # Empaquetar el frame principal
         self.pack(fill="both", expand=True)
@@ -304,8 +310,12 @@ class IniConfigPanel(ctk.CTkFrame):
         # self.load_ini_files()
         # self.populate_form_fields()
         
-        # Configurar auto-recarga cuando cambie el servidor
-        self.setup_auto_reload()
+        # Ediciones externas de los INI: vigilante en segundo plano. Los cambios de
+        # servidor llegan como evento desde MainWindow.on_server_selected
+        self._last_server = None
+        self.ini_watcher = IniFileWatcher(self.logger)
+        if self.main_window and getattr(self.main_window, 'selected_server', None):
+            self.after(0, lambda: self.on_server_selected(self.main_window.selected_server))
         
     def create_widgets(self):
         """Crear todos los widgets del panel"""
@@ -367,6 +377,24 @@ class IniConfigPanel(ctk.CTkFrame):
         )
         self.discard_button.pack(side="left", padx=(0, 10))
         
+        self.bulk_button = ctk.CTkButton(
+            control_frame,
+            text="🗂️ Multi-servidor",
+            command=self.open_bulk_config,
+            width=150,
+            height=35
+        )
+        self.bulk_button.pack(side="left", padx=(0, 10))
+        
+        self.history_button = ctk.CTkButton(
+            control_frame,
+            text="🕘 Historial",
+            command=self.open_config_history,
+            width=120,
+            height=35
+        )
+        self.history_button.pack(side="left", padx=(0, 10))
+        
         # Indicador de estado
         self.status_label = ctk.CTkLabel(
             control_frame,
@@ -651,22 +679,23 @@ class IniConfigPanel(ctk.CTkFrame):
             form_frame = ctk.CTkFrame(content_frame)
             form_frame.pack(fill="x", padx=10, pady=10)
             
-            # Crear campos del formulario
-            self.create_gus_form_fields(form_frame, category)
+            # Registrar los campos en el índice; los widgets se crean al expandir
+            self.register_fields(self.get_gus_fields(category), category, "GameUserSettings")
             
             # Guardar referencia
             self.gus_accordion_widgets[category] = {
                 'frame': accordion_frame,
                 'content': content_frame,
                 'expanded': False,
+                'built': False,
                 'form_frame': form_frame
             }
             
             # Ocultar contenido inicialmente
             content_frame.pack_forget()
             
-    def create_gus_form_fields(self, form_frame, category):
-        """Crear campos del formulario para GameUserSettings.ini"""
+    def get_gus_fields(self, category):
+        """Campos (nombre, etiqueta, tipo) de una categoría de GameUserSettings.ini"""
         if category == "PlayersAndTribes":
             fields = [
                 ("MaxNumbersofPlayersInTribe", "Máximo de jugadores por tribu", "int"),
@@ -876,8 +905,7 @@ class IniConfigPanel(ctk.CTkFrame):
         else:
             fields = []
         
-        # Crear campos para esta categoría en 2 columnas
-        self.create_fields_grid(form_frame, fields, category, "GameUserSettings")
+        return fields
         
     def toggle_gus_accordion(self, category):
         """Alternar la expansión de un acordeón de GUS"""
@@ -888,7 +916,8 @@ class IniConfigPanel(ctk.CTkFrame):
             accordion['content'].pack_forget()
             accordion['expanded'] = False
         else:
-            # Expandir
+            # Expandir (los widgets se crean solo la primera vez)
+            self.build_accordion_fields(category, accordion, self.get_gus_fields(category), "GameUserSettings")
             accordion['content'].pack(fill="x", padx=10, pady=(0, 10))
             accordion['expanded'] = True
             # Poblar los campos cuando se expande
@@ -1023,22 +1052,23 @@ class IniConfigPanel(ctk.CTkFrame):
             form_frame = ctk.CTkFrame(content_frame)
             form_frame.pack(fill="x", padx=10, pady=10)
             
-            # Crear campos del formulario
-            self.create_game_form_fields(form_frame, category)
+            # Registrar los campos en el índice; los widgets se crean al expandir
+            self.register_fields(self.get_game_fields(category), category, "Game")
             
             # Guardar referencia
             self.game_accordion_widgets[category] = {
                 'frame': accordion_frame,
                 'content': content_frame,
                 'expanded': False,
+                'built': False,
                 'form_frame': form_frame
             }
             
             # Ocultar contenido inicialmente
             content_frame.pack_forget()
             
-    def create_game_form_fields(self, form_frame, category):
-        """Crear campos del formulario para Game.ini"""
+    def get_game_fields(self, category):
+        """Campos (nombre, etiqueta, tipo) de una categoría de Game.ini"""
         if category == "ExperienceAndLevels":
             fields = [
                 ("LevelExperienceRampOverrides", "Curva de experiencia por nivel", "string"),
@@ -1156,8 +1186,7 @@ class IniConfigPanel(ctk.CTkFrame):
         else:
             fields = []
         
-        # Crear campos para esta categoría en 2 columnas
-        self.create_fields_grid(form_frame, fields, category, "Game")
+        return fields
         
     def toggle_game_accordion(self, category):
         """Alternar la expansión de un acordeón de Game.ini"""
@@ -1168,12 +1197,35 @@ class IniConfigPanel(ctk.CTkFrame):
             accordion['content'].pack_forget()
             accordion['expanded'] = False
         else:
-            # Expandir
+            # Expandir (los widgets se crean solo la primera vez)
+            self.build_accordion_fields(category, accordion, self.get_game_fields(category), "Game")
             accordion['content'].pack(fill="x", padx=10, pady=(0, 10))
             accordion['expanded'] = True
             # Poblar los campos cuando se expande
             self.populate_category_fields(category)
             
+    def register_fields(self, fields, category, file_type):
+        """Registrar campo → (archivo, sección, clave) sin crear widgets"""
+        if file_type == "GameUserSettings":
+            category_info = self.gus_categories.get(category, {})
+        else:
+            category_info = self.game_categories.get(category, {})
+        if not category_info:
+            return
+        for field_name, _label, _type in fields:
+            self.field_mappings[field_name] = {
+                'section': category_info['ini_section'],
+                'file': category_info['ini_file']
+            }
+            self.field_index[field_name] = (category_info['ini_file'], category_info['ini_section'], field_name)
+    
+    def build_accordion_fields(self, category, accordion, fields, file_type):
+        """Crear los widgets de una categoría la primera vez que se muestra"""
+        if accordion['built']:
+            return
+        self.create_fields_grid(accordion['form_frame'], fields, category, file_type)
+        accordion['built'] = True
+    
     def create_fields_grid(self, form_frame, fields, category, file_type):
         """Crear campos del formulario en una cuadrícula de 2 columnas"""
         # Configurar columnas para el layout de 2 columnas
@@ -1311,18 +1363,6 @@ class IniConfigPanel(ctk.CTkFrame):
                 self.field_widgets[category] = {}
             
             self.field_widgets[category][field_name] = field_widget
-            
-            # Mapear campo a su sección y archivo INI
-            if file_type == "GameUserSettings":
-                category_info = self.gus_categories.get(category, {})
-            else:
-                category_info = self.game_categories.get(category, {})
-                
-            if category_info:
-                self.field_mappings[field_name] = {
-                    'section': category_info['ini_section'],
-                    'file': category_info['ini_file']
-                }
         
         # Configurar el peso de las filas
         total_rows = (len(fields) + 1) // 2  # Calcular filas necesarias para 2 columnas
@@ -1348,6 +1388,13 @@ class IniConfigPanel(ctk.CTkFrame):
             
     def on_field_change(self, field_name, value):
         """Manejar cambios en los campos del formulario"""
+        # Un valor fuera de tipo o rango no se guarda
+        error = self.schema.validate(field_name, value)
+        if error:
+            self.changed_values.pop(field_name, None)
+            self.status_label.configure(text=f"⚠️ {error}", fg_color=("orange", "darkorange"))
+            return
+        
         # Marcar como cambiado
         self.changed_values[field_name] = value
         
@@ -1466,49 +1513,77 @@ class IniConfigPanel(ctk.CTkFrame):
         except Exception as e:
             self.logger.error(f"Error al cargar rutas INI: {e}")
     
-    def setup_auto_reload(self):
-        """Configurar auto-recarga de archivos INI"""
+    def on_server_selected(self, server_name):
+        """Evento de MainWindow: recargar los INI solo si cambió el servidor"""
         try:
-            # Programar recarga periódica cada 2 segundos para detectar cambios de servidor
-            if hasattr(self, 'main_window') and self.main_window:
-                self.main_window.root.after(2000, self.check_for_server_changes)
+            if not server_name or server_name == self._last_server:
+                return
+            self._last_server = server_name
+            self.logger.info(f"🔄 Servidor cambió a: {server_name}, recargando archivos INI...")
+            self.reload_for_new_server()
         except Exception as e:
-            self.logger.error(f"Error configurando auto-recarga: {e}")
+            self.logger.error(f"❌ Error procesando cambio de servidor: {e}")
+    
+    def watch_ini_files(self):
+        """Vigilar los INI cargados para reflejar ediciones externas"""
+        self.ini_watcher.unwatch_all()
+        for path in (self.game_user_settings_path, self.game_ini_path):
+            if path and os.path.exists(path):
+                self.ini_watcher.watch(path, self.on_ini_file_changed)
+    
+    def on_ini_file_changed(self, path, document):
+        """Callback del vigilante (hilo en segundo plano): pasar al hilo de la interfaz"""
+        self.after(0, lambda: self.apply_external_ini_change(path, document))
     
-    def check_for_server_changes(self):
-        """Verificar si el servidor seleccionado ha cambiado"""
+    def apply_external_ini_change(self, path, document):
+        """Aplicar una edición externa actualizando solo los campos afectados"""
         try:
-            if hasattr(self, 'main_window') and self.main_window:
-                current_server = getattr(self.main_window, 'selected_server', None)
-                
-                # Debug: mostrar servidor actual
-                if hasattr(self, '_last_server'):
-                    self.logger.debug(f"🔄 Verificando cambios - Servidor anterior: {self._last_server}, Servidor actual: {current_server}")
-                else:
-                    self.logger.debug(f"🔄 Primera verificación - Servidor actual: {current_server}")
-                
-                # Verificar si el servidor cambió
-                if not hasattr(self, '_last_server') or self._last_server != current_server:
-                    self._last_server = current_server
-                    if current_server:
-                        self.logger.info(f"🔄 Servidor cambió a: {current_server}, recargando archivos INI...")
-                        self.reload_for_new_server()
-                    else:
-                        self.logger.debug("Servidor no seleccionado, esperando...")
-                else:
-                    self.logger.debug(f"✅ Servidor sin cambios: {current_server}")
+            file_type = None
+            for candidate, candidate_path in (("GameUserSettings", self.game_user_settings_path),
+                                              ("Game", self.game_ini_path)):
+                if candidate_path and os.path.abspath(candidate_path) == path:
+                    file_type = candidate
+            if not file_type:
+                return
+            
+            changes = diff_documents(self.ini_data.get(file_type), document)
+            self.ini_data[file_type] = document
+            if not changes:
+                return
+            
+            # Índice clave → widget para no recorrer todo el formulario
+            widgets = {}
+            for fields in getattr(self, 'field_widgets', {}).values():
+                for field_name, widget in fields.items():
+                    widgets[field_name.lower()] = (field_name, widget)
+            
+            updated = 0
+            for section, key, old_value, new_value in changes:
+                self.case_sensitive_keys.setdefault(file_type, {}).setdefault(section, {})[key.lower()] = key
+                self.key_locations.setdefault(key.lower(), (file_type, section))
+                if new_value is not None:
+                    self.original_values[f"{section}.{key}"] = new_value
+                    self.original_values[key] = new_value
+                    self.original_values[key.lower()] = new_value
                 
-                # Programar próxima verificación
-                self.main_window.root.after(2000, self.check_for_server_changes)
-            else:
-                self.logger.debug("MainWindow no disponible, esperando...")
-                # Programar próxima verificación incluso si no hay main_window
-                if hasattr(self, 'root') and self.root:
-                    self.root.after(2000, self.check_for_server_changes)
+                field_name, widget = widgets.get(key.lower(), (None, None))
+                if widget is None or new_value is None:
+                    continue
+                if field_name in self.changed_values:
+                    # Cambio local pendiente: se conserva y se aplicará al guardar
+                    self.logger.warning(f"⚠️ {key} cambió en disco pero tiene una edición pendiente; se mantiene la local")
+                    continue
+                self.set_field_value(widget, new_value)
+                updated += 1
+            
+            self.logger.info(f"📝 {file_type}: {len(changes)} claves cambiadas externamente, {updated} campos actualizados")
+            if hasattr(self, 'status_label'):
+                self.status_label.configure(
+                    text=f"📝 {file_type}.ini modificado externamente ({len(changes)} cambios)",
+                    fg_color=("blue", "darkblue")
+                )
         except Exception as e:
-            self.logger.error(f"❌ Error verificando cambios de servidor: {e}")
-            import traceback
-            self.logger.error(f"Traceback completo: {traceback.format_exc()}")
+            self.logger.error(f"Error aplicando cambios externos en {path}: {e}")
     
     def reload_for_new_server(self):
         """Recargar archivos INI para el nuevo servidor seleccionado"""
@@ -1516,7 +1591,6 @@ class IniConfigPanel(ctk.CTkFrame):
             self.logger.info("🔄 Iniciando recarga de archivos INI para nuevo servidor...")
             
             # Limpiar datos de formato anterior
-            self.original_file_content.clear()
             self.case_sensitive_keys.clear()
             self.logger.debug("Datos de formato anterior limpiados")
             
@@ -1562,6 +1636,7 @@ class IniConfigPanel(ctk.CTkFrame):
         try:
             self.ini_data = {}
             self.original_values = {}
+            self.key_locations = {}
             
             # Cargar GameUserSettings.ini
             if self.game_user_settings_path and os.path.exists(self.game_user_settings_path):
@@ -1574,6 +1649,8 @@ class IniConfigPanel(ctk.CTkFrame):
             # Los valores se cargarán automáticamente después de crear los widgets
             # No llamar populate_form_fields aquí, se hará después de crear los widgets
             
+            self.watch_ini_files()
+            
             self.logger.info("Archivos INI cargados correctamente")
             self.update_status_indicator()
             
@@ -1589,112 +1666,45 @@ class IniConfigPanel(ctk.CTkFrame):
         try:
             self.logger.info(f"Cargando archivo {file_type} desde: {file_path}")
             
-            # Leer contenido original línea por línea para preservar formato
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_lines = f.readlines()
-            
-            self.logger.debug(f"Archivo {file_type} leído, {len(original_lines)} líneas")
-            
-            # Guardar contenido original
-            self.original_file_content[file_type] = original_lines
-            
-            # Crear un configparser que preserve las mayúsculas y sea tolerante a errores
-            config = configparser.RawConfigParser()
-            config.optionxform = str  # Preservar mayúsculas y minúsculas
-            
-            # Intentar cargar con manejo de errores más robusto
-            try:
-                config.read(file_path, encoding='utf-8')
-            except configparser.DuplicateOptionError as e:
-                    self.logger.warning(f"Archivo {file_type} tiene opciones duplicadas, intentando cargar manualmente: {e}")
-                    # Cargar manualmente línea por línea para evitar errores de duplicados
-                    config = self.load_ini_manually(original_lines, file_type)
-            except Exception as e:
-                    self.logger.error(f"Error al parsear {file_type}, intentando carga manual: {e}")
-                    config = self.load_ini_manually(original_lines, file_type)
-                
-            self.ini_data[file_type] = config
-                
-            self.logger.info(f"Archivo {file_type} parseado, secciones encontradas: {list(config.sections())}")
-                
-                # Construir mapeo de claves con formato original
+            # El documento conserva líneas, comentarios y duplicados tal cual
+            document = IniDocument.load(file_path)
+            self.ini_data[file_type] = document
+            
+            for section, key, count in document.duplicates():
+                self.logger.warning(f"Archivo {file_type}: clave duplicada {key} en [{section}] ({count} veces)")
+            
+            self.logger.info(f"Archivo {file_type} parseado, secciones encontradas: {document.sections()}")
+            
+            # Construir mapeo de claves con formato original
             if file_type not in self.case_sensitive_keys:
                 self.case_sensitive_keys[file_type] = {}
-                
-                # Guardar valores originales con mapeo completo
+            
+            # Guardar valores originales con mapeo completo
             total_fields = 0
-            for section in config.sections():
+            for section in document.sections():
                 if section not in self.case_sensitive_keys[file_type]:
-                        self.case_sensitive_keys[file_type][section] = {}
-                    
-                section_fields = list(config.items(section))
-                self.logger.debug(f"Sección {section} tiene {len(section_fields)} campos")
+                    self.case_sensitive_keys[file_type][section] = {}
+                
+                section_fields = document.items(section)
                 total_fields += len(section_fields)
-                        
-                for key, value in config.items(section):
-                        # Guardar la clave original con su formato
+                
+                for key, value in section_fields:
+                    # Guardar la clave original con su formato
                     self.case_sensitive_keys[file_type][section][key.lower()] = key
-                        
+                    self.key_locations.setdefault(key.lower(), (file_type, section))
+                    
                     full_key = f"{section}.{key}"
                     self.original_values[full_key] = value
-                        # También guardar solo el nombre del campo para búsquedas
+                    # También guardar solo el nombre del campo para búsquedas
                     self.original_values[key] = value
                     self.original_values[key.lower()] = value  # Para búsquedas insensibles a mayúsculas
-                        
-                self.logger.info(f"Archivo {file_type} cargado preservando formato original. Total campos: {total_fields}")
-                    
-        except Exception as e:
-                self.logger.error(f"Error al cargar {file_type}: {e}")
-                import traceback
-                self.logger.error(f"Traceback completo: {traceback.format_exc()}")
-            
-    def load_ini_manually(self, lines, file_type):
-        """Cargar archivo INI manualmente para evitar errores de duplicados"""
-        try:
-            config = configparser.RawConfigParser()
-            config.optionxform = str
-            
-            current_section = None
-            seen_options = set()
-            
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Líneas vacías o comentarios
-                if not line or line.startswith(';') or line.startswith('#'):
-                    continue
-                
-                # Nueva sección
-                if line.startswith('[') and line.endswith(']'):
-                    current_section = line[1:-1]
-                    if not config.has_section(current_section):
-                        config.add_section(current_section)
-                    seen_options.clear()
-                    continue
-                
-                # Opción key=value
-                if '=' in line and current_section:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Evitar duplicados
-                    option_key = f"{current_section}.{key}"
-                    if option_key not in seen_options:
-                        config.set(current_section, key, value)
-                        seen_options.add(option_key)
-                    else:
-                        self.logger.warning(f"Omitiendo opción duplicada en línea {line_num}: {key}")
             
-            self.logger.info(f"Archivo {file_type} cargado manualmente, secciones: {list(config.sections())}")
-            return config
+            self.logger.info(f"Archivo {file_type} cargado preservando formato original. Total campos: {total_fields}")
             
         except Exception as e:
-            self.logger.error(f"Error en carga manual de {file_type}: {e}")
-            # Crear config vacío como fallback
-            fallback_config = configparser.RawConfigParser()
-            fallback_config.optionxform = str  # Preservar mayúsculas/minúsculas en las claves
-            return fallback_config
+            self.logger.error(f"Error al cargar {file_type}: {e}")
+            import traceback
+            self.logger.error(f"Traceback completo: {traceback.format_exc()}")
             
     def populate_form_fields(self):
         """Poblar los campos del formulario con valores actuales"""
@@ -1710,9 +1720,6 @@ class IniConfigPanel(ctk.CTkFrame):
                     value = self.find_field_value(field_name)
                     if value is not None:
                         self.set_field_value(field_widget, value)
-                        self.logger.debug(f"Campo {field_name} poblado con valor: {value}")
-                    else:
-                        self.logger.debug(f"No se encontró valor para el campo: {field_name}")
                         
         except Exception as e:
             self.logger.error(f"Error al poblar campos: {e}")
@@ -1729,64 +1736,24 @@ class IniConfigPanel(ctk.CTkFrame):
                 value = self.find_field_value(field_name)
                 if value is not None:
                     self.set_field_value(field_widget, value)
-                    self.logger.debug(f"Campo {field_name} de categoría {category} poblado con valor: {value}")
-                else:
-                    self.logger.debug(f"No se encontró valor para el campo: {field_name} en categoría {category}")
                     
         except Exception as e:
             self.logger.error(f"Error al poblar campos de categoría {category}: {e}")
             
     def find_field_value(self, field_name):
-        """Buscar el valor de un campo en los archivos INI"""
-        # Debug: mostrar qué se está buscando
-        self.logger.debug(f"Buscando valor para campo: {field_name}")
-        
-        # Primero buscar en el mapeo de campos para encontrar la sección correcta
-        if field_name in self.field_mappings:
-            mapping = self.field_mappings[field_name]
-            target_file = mapping['file']
-            target_section = mapping['section']
-            
-            self.logger.debug(f"Campo {field_name} mapeado a: archivo={target_file}, sección={target_section}")
-            
-            # Buscar en el archivo y sección específicos
-            if target_file in self.ini_data:
-                config = self.ini_data[target_file]
-                self.logger.debug(f"Archivo {target_file} encontrado, secciones disponibles: {list(config.sections())}")
-                
-                if target_section in config:
-                    self.logger.debug(f"Sección {target_section} encontrada, campos disponibles: {list(config[target_section].keys())}")
-                    if field_name in config[target_section]:
-                        value = config[target_section][field_name]
-                        self.logger.debug(f"Valor encontrado para {field_name}: {value}")
-                        return value
-                    else:
-                        self.logger.debug(f"Campo {field_name} no encontrado en sección {target_section}")
-                else:
-                    self.logger.debug(f"Sección {target_section} no encontrada en archivo {target_file}")
-            else:
-                self.logger.debug(f"Archivo {target_file} no encontrado en ini_data")
-        else:
-            self.logger.debug(f"Campo {field_name} no tiene mapeo")
-        
-        # Fallback: buscar en todas las secciones de todos los archivos
-        self.logger.debug("Intentando búsqueda fallback...")
-        for file_type, config in self.ini_data.items():
-            self.logger.debug(f"Revisando archivo {file_type}, secciones: {list(config.sections())}")
-            for section in config.sections():
-                if field_name in config[section]:
-                    value = config[section][field_name]
-                    self.logger.debug(f"Valor encontrado en fallback: {field_name} = {value} (archivo: {file_type}, sección: {section})")
+        """Buscar el valor de un campo en los archivos INI (búsquedas por diccionario)"""
+        location = self.field_index.get(field_name)
+        if location:
+            document = self.ini_data.get(location[0])
+            if document is not None:
+                value = document.get(location[1], location[2])
+                if value is not None:
                     return value
         
-        # Si no se encuentra, buscar en valores originales
-        self.logger.debug("Buscando en valores originales...")
-        for key, value in self.original_values.items():
-            if key.endswith(f".{field_name}"):
-                self.logger.debug(f"Valor encontrado en originales: {key} = {value}")
-                return value
-                
-        self.logger.debug(f"Campo {field_name} no encontrado en ningún lugar")
+        # Clave fuera de su sección habitual: índice clave → (archivo, sección)
+        location = self.key_locations.get(field_name.lower())
+        if location and location[0] in self.ini_data:
+            return self.ini_data[location[0]].get(location[1], field_name)
         return None
         
     def set_field_value(self, widget, value):
@@ -1855,11 +1822,9 @@ class IniConfigPanel(ctk.CTkFrame):
             target_file = mapping['file']
             target_section = mapping['section']
             
-            # Aplicar cambio
+            # Aplicar cambio (solo se modifica la línea de la clave, o se agrega si no existe)
             if target_file in self.ini_data:
-                if target_section not in self.ini_data[target_file]:
-                    self.ini_data[target_file].add_section(target_section)
-                self.ini_data[target_file][target_section][field_name] = str(value)
+                self.ini_data[target_file].set(target_section, field_name, str(value))
                 
                 # Actualizar valores originales
                 full_key = f"{target_section}.{field_name}"
@@ -1881,94 +1846,53 @@ class IniConfigPanel(ctk.CTkFrame):
             self.logger.error(f"Error al guardar archivos INI: {e}")
             raise
             
-    def save_single_ini_file(self, file_path, config):
+    def save_single_ini_file(self, file_path, document):
         """Guardar un archivo INI específico preservando formato original"""
         try:
-            # Crear directorio si no existe
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # Determinar el tipo de archivo
-            file_type = "Game" if "Game.ini" in file_path else "GameUserSettings"
-            
-            # Si tenemos contenido original, preservar formato
-            if file_type in self.original_file_content:
-                self.save_ini_preserving_format(file_path, file_type, config)
-            else:
-                # Fallback al método original
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    config.write(f, space_around_delimiters=False)
+            # Solo se escriben las líneas modificadas; si no hay cambios no se toca el archivo
+            versions = get_version_store(self.logger)
+            versions.track(file_path)  # Estado previo (por si se editó fuera)
+            if document.save(file_path):
+                # Escritura propia: no debe llegar como cambio externo
+                self.ini_watcher.acknowledge(file_path)
+                versions.track(file_path)
+                self.logger.info(f"Archivo {file_path} guardado preservando formato original")
                 
         except Exception as e:
             self.logger.error(f"Error al guardar {file_path}: {e}")
             raise
-    
-    def save_ini_preserving_format(self, file_path, file_type, config):
-        """Guardar INI preservando formato original y solo modificando valores cambiados"""
+            
+    def open_bulk_config(self):
+        """Abrir la comparación y edición de INI de todos los servidores"""
         try:
-            original_lines = self.original_file_content[file_type]
-            modified_lines = []
+            from gui.dialogs.bulk_config_dialog import BulkConfigDialog
+            BulkConfigDialog(self, self.config_manager, self.logger).show()
+        except Exception as e:
+            self.logger.error(f"Error al abrir configuración multi-servidor: {e}")
             
-            current_section = None
+    def open_config_history(self):
+        """Abrir la línea de tiempo de revisiones de los INI del servidor y config.ini"""
+        try:
+            from gui.dialogs.config_history_dialog import ConfigHistoryDialog
+            files = {
+                "GameUserSettings.ini": getattr(self, 'game_user_settings_path', None),
+                "Game.ini": getattr(self, 'game_ini_path', None),
+                "config.ini": self.config_manager.config_file,
+            }
             
-            for line in original_lines:
-                original_line = line
-                stripped_line = line.strip()
-                
-                # Detectar sección
-                if stripped_line.startswith('[') and stripped_line.endswith(']'):
-                    current_section = stripped_line[1:-1]
-                    modified_lines.append(original_line)
-                    continue
-                
-                # Líneas vacías o comentarios
-                if not stripped_line or stripped_line.startswith(';') or stripped_line.startswith('#'):
-                    modified_lines.append(original_line)
-                    continue
-                
-                # Líneas con parámetros key=value
-                if '=' in stripped_line and current_section:
-                    key_part, value_part = stripped_line.split('=', 1)
-                    original_key = key_part.strip()
-                    
-                    # Buscar si este campo tiene un valor modificado usando el mapeo directo
-                    modified_value = None
-                    for field_name, new_value in self.changed_values.items():
-                        if field_name in self.field_mappings:
-                            mapping = self.field_mappings[field_name]
-                            if (mapping['file'] == file_type and 
-                                mapping['section'] == current_section):
-                                # Usar el mapeo directo para encontrar la clave exacta
-                                if field_name in self.field_to_ini_mapping:
-                                    ini_key = self.field_to_ini_mapping[field_name]
-                                    if ini_key.lower() == original_key.lower():
-                                        modified_value = str(new_value)
-                                        break
-                    
-                    if modified_value is not None:
-                        # Preservar espacios y formato original, solo cambiar el valor
-                        prefix = line[:line.find('=') + 1]
-                        suffix = '\n' if line.endswith('\n') else ''
-                        modified_line = f"{prefix}{modified_value}{suffix}"
-                        modified_lines.append(modified_line)
-                        self.logger.debug(f"Modificado: {original_key} = {modified_value}")
-                    else:
-                        # Mantener línea original
-                        modified_lines.append(original_line)
-                else:
-                    # Mantener línea original
-                    modified_lines.append(original_line)
+            def before_restore(path):
+                # Los cambios pendientes de config.ini se escriben antes (quedan en el historial)
+                if path == self.config_manager.config_file:
+                    self.config_manager.flush()
             
-            # Escribir archivo modificado
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(modified_lines)
-                
-            self.logger.info(f"Archivo {file_path} guardado preservando formato original")
+            def on_restored(path):
+                # Los INI del servidor los recarga el vigilante; config.ini se relee aquí sin volver a escribirlo
+                if path == self.config_manager.config_file:
+                    self.config_manager.reload_config(flush=False)
             
+            ConfigHistoryDialog(self, self.logger, files, on_restored, before_restore).show()
         except Exception as e:
-            self.logger.error(f"Error preservando formato de {file_path}: {e}")
-            # Fallback al método original
-            with open(file_path, 'w', encoding='utf-8') as f:
-                config.write(f, space_around_delimiters=False)
+            self.logger.error(f"Error al abrir historial de configuración: {e}")
             
     def reload_ini_files(self):
         """Recargar archivos INI desde disco"""
@@ -1977,7 +1901,6 @@ class IniConfigPanel(ctk.CTkFrame):
             
             # Limpiar cambios pendientes
             self.changed_values.clear()
-            self.original_file_content.clear()
             self.case_sensitive_keys.clear()
             
             # Recargar rutas
@@ -2012,7 +1935,6 @@ class IniConfigPanel(ctk.CTkFrame):
             self.changed_values.clear()
             self.ini_data.clear()
             self.original_values.clear()
-            self.original_file_content.clear()
             self.case_sensitive_keys.clear()
             
             # Recargar rutas
@@ -0,0 +1,162 @@
+import tkinter as tk
+import customtkinter as ctk
+import time
+from datetime import datetime
+from utils.metrics_collector import METRIC_NAMES, METRIC_LABELS
+
+
+class MetricsPanel(ctk.CTkFrame):
+    """Panel con gráficas históricas de las métricas del servidor"""
+
+    # Rangos disponibles (etiqueta -> segundos)
+    TIME_RANGES = {
+        "Última hora": 3600,
+        "Últimas 6 horas": 6 * 3600,
+        "Últimas 24 horas": 24 * 3600,
+        "Últimos 7 días": 7 * 86400,
+        "Últimos 30 días": 30 * 86400,
+    }
+
+    def __init__(self, parent, config_manager, logger, main_window=None):
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self.logger = logger
+        self.main_window = main_window
+        self.refresh_interval_ms = 5000
+
+        # Mapa etiqueta -> nombre interno de la métrica
+        self.label_to_metric = {METRIC_LABELS[name]: name for name in METRIC_NAMES}
+
+        self.pack(fill="both", expand=True)
+        self.create_widgets()
+        self.after(self.refresh_interval_ms, self.auto_refresh)
+
+    def get_collector(self):
+        """Obtener el recolector de métricas del panel de servidor"""
+        server_panel = getattr(self.main_window, 'server_panel', None)
+        return getattr(server_panel, 'metrics_collector', None)
+
+    def create_widgets(self):
+        """Crear controles y área de gráfica"""
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        controls_frame = ctk.CTkFrame(self)
+        controls_frame.grid(row=0, column=0, padx=10, pady=(10, 5), sticky="ew")
+
+        title_label = ctk.CTkLabel(
+            controls_frame,
+            text="📈 Métricas del Servidor",
+            font=ctk.CTkFont(size=16, weight="bold")
+        )
+        title_label.pack(side="left", padx=10, pady=5)
+
+        self.metric_var = ctk.StringVar(value=METRIC_LABELS["memory_mb"])
+        self.metric_menu = ctk.CTkOptionMenu(
+            controls_frame,
+            values=list(self.label_to_metric.keys()),
+            variable=self.metric_var,
+            command=lambda _: self.refresh_chart(),
+            width=200
+        )
+        self.metric_menu.pack(side="left", padx=5, pady=5)
+
+        self.range_var = ctk.StringVar(value="Última hora")
+        self.range_menu = ctk.CTkOptionMenu(
+            controls_frame,
+            values=list(self.TIME_RANGES.keys()),
+            variable=self.range_var,
+            command=lambda _: self.refresh_chart(),
+            width=160
+        )
+        self.range_menu.pack(side="left", padx=5, pady=5)
+
+        refresh_button = ctk.CTkButton(
+            controls_frame,
+            text="🔄 Actualizar",
+            command=self.refresh_chart,
+            width=100
+        )
+        refresh_button.pack(side="left", padx=5, pady=5)
+
+        self.summary_label = ctk.CTkLabel(controls_frame, text="", text_color="gray")
+        self.summary_label.pack(side="right", padx=10, pady=5)
+
+        self.chart_canvas = tk.Canvas(self, bg="#1e1e1e", highlightthickness=0)
+        self.chart_canvas.grid(row=1, column=0, padx=10, pady=(5, 10), sticky="nsew")
+        self.chart_canvas.bind("<Configure>", lambda e: self.refresh_chart())
+
+    def auto_refresh(self):
+        """Refrescar la gráfica periódicamente mientras la pestaña está visible"""
+        try:
+            if self.winfo_exists() and self.winfo_viewable():
+                self.refresh_chart()
+        except Exception as e:
+            self.logger.debug(f"Error refrescando métricas: {e}")
+        self.after(self.refresh_interval_ms, self.auto_refresh)
+
+    def refresh_chart(self):
+        """Redibujar la gráfica con la serie seleccionada"""
+        collector = self.get_collector()
+        canvas = self.chart_canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width < 50 or height < 50:
+            return
+
+        if collector is None:
+            canvas.create_text(width / 2, height / 2, text="Recolector de métricas no disponible", fill="gray")
+            return
+
+        metric = self.label_to_metric.get(self.metric_var.get(), "memory_mb")
+        span = self.TIME_RANGES.get(self.range_var.get(), 3600)
+        until = time.time()
+        since = until - span
+        points = collector.query(metric, since, until)
+
+        summary = collector.summary(metric, since, until)
+        if summary["count"]:
+            self.summary_label.configure(
+                text=f"Mín: {summary['min']}  Máx: {summary['max']}  Prom: {summary['avg']}"
+            )
+        else:
+            self.summary_label.configure(text="Sin datos en el rango")
+
+        if len(points) < 2:
+            canvas.create_text(width / 2, height / 2, text="Recopilando datos...", fill="gray")
+            return
+
+        # Reducir puntos al ancho disponible para no saturar el canvas
+        step = max(1, len(points) // width)
+        points = points[::step]
+
+        margin_left, margin_right, margin_top, margin_bottom = 60, 15, 15, 30
+        plot_w = width - margin_left - margin_right
+        plot_h = height - margin_top - margin_bottom
+        values = [value for _, value in points]
+        v_min, v_max = min(values), max(values)
+        if v_max == v_min:
+            v_max = v_min + 1
+
+        # Ejes y etiquetas
+        canvas.create_line(margin_left, margin_top, margin_left, margin_top + plot_h, fill="gray")
+        canvas.create_line(margin_left, margin_top + plot_h, margin_left + plot_w, margin_top + plot_h, fill="gray")
+        for i in range(5):
+            value = v_min + (v_max - v_min) * i / 4
+            y = margin_top + plot_h - plot_h * i / 4
+            canvas.create_line(margin_left, y, margin_left + plot_w, y, fill="#333333")
+            canvas.create_text(margin_left - 5, y, text=f"{value:.1f}", fill="gray", anchor="e")
+
+        time_format = "%H:%M" if span <= 86400 else "%d/%m %H:%M"
+        canvas.create_text(margin_left, height - 10, anchor="w", fill="gray",
+                           text=datetime.fromtimestamp(since).strftime(time_format))
+        canvas.create_text(width - margin_right, height - 10, anchor="e", fill="gray",
+                           text=datetime.fromtimestamp(until).strftime(time_format))
+
+        coords = []
+        for ts, value in points:
+            x = margin_left + plot_w * (ts - since) / span
+            y = margin_top + plot_h - plot_h * (value - v_min) / (v_max - v_min)
+            coords.extend((x, y))
+        canvas.create_line(*coords, fill="#3b8ed0", width=2)
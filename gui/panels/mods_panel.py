@@ -1,5 +1,4 @@
 import customtkinter as ctk
-import requests
 import json
 import threading
 import os
@@ -9,8 +8,24 @@ from tkinter import messagebox
 import webbrowser
 from PIL import Image, ImageTk
 import io
+from utils.state_store import get_state_store
+from utils.curseforge_client import CurseForgeClient, CurseForgeError
+from utils.mod_search import PagedModSearch
+from utils.mod_catalog import ModCatalog, FAVORITES, INSTALLED, SEARCH, mod_key
+from utils.image_cache import ThumbnailCache
+from utils.mod_dependencies import ModDependencyResolver
+from utils.mod_update_tracker import ModUpdateTracker
+from utils.mod_manifest import get_mod_manifest, manifest_key
+from utils.virtual_grid import row_count, visible_range, cell_position
 
 class ModsPanel(ctk.CTkFrame):
+    # Vista virtualizada: alto fijo por fila para calcular qué filas se ven
+    GRID_COLUMNS = 4
+    ROW_HEIGHTS = {"grid": 150, "list": 130}
+    OVERSCAN_ROWS = 2  # Filas extra por encima y por debajo de lo visible
+    LOGO_SIZES = {"grid": (40, 40), "list": (64, 64)}  # Tamaño mostrado en cada vista
+    LOGO_SOURCE_SIZE = (64, 64)  # Única miniatura descargada y cacheada, la mayor de las vistas
+    
     def __init__(self, parent, config_manager, logger, main_window=None):
         super().__init__(parent)
         self.config_manager = config_manager
@@ -22,16 +37,57 @@ class ModsPanel(ctk.CTkFrame):
         self.base_url = "https://api.curseforge.com/v1"
         self.game_id = 83374  # ARK: Survival Ascended
         
+        # Cliente con caché en disco: repetir una búsqueda no vuelve a descargarla
+        self.curseforge = CurseForgeClient(
+            self.api_key, base_url=self.base_url, game_id=self.game_id,
+            cache_dir=os.path.join(self.get_data_directory(), "curseforge_cache"),
+            logger=self.logger
+        )
+        threading.Thread(target=self.curseforge.prune_cache, daemon=True).start()
+        # Búsqueda paginada: páginas de 50 con precarga de la siguiente
+        self.mod_search = PagedModSearch(self.curseforge, logger=self.logger)
+        
+        # Logos: descarga y decodificación en segundo plano, una sola entrada por logo
+        # con una CTkImage por vista que escala la misma miniatura
+        self.thumbnails = ThumbnailCache(
+            cache_dir=os.path.join(self.get_data_directory(), "thumbnail_cache"),
+            image_factory=lambda image: {
+                view: ctk.CTkImage(light_image=image, dark_image=image, size=size)
+                for view, size in self.LOGO_SIZES.items()
+            },
+            logger=self.logger
+        )
+        self.logo_placeholders = {}
+        
+        # Dependencias entre mods (también la usa el panel principal antes de arrancar)
+        self.dependency_resolver = ModDependencyResolver(self.curseforge, self.logger)
+        
         # Variables del estado
         self.current_mods = []
-        self.installed_mods = []
-        self.favorite_mods = []
-        self.search_results = []
+        # Favoritos, instalados y resultados viven en un catálogo indexado por id
+        self.catalog = ModCatalog(self.logger)
+        self.catalog.add_listener(self.on_catalog_changed)
+        self.displayed_mods = []  # Mods del filtro actual, en orden
+        self.displayed_index = {}  # {id: posición en displayed_mods}
+        self.bound_cards = {}  # {posición: tarjeta} de las filas visibles
+        self.card_pool = {"grid": [], "list": []}  # Tarjetas libres para reutilizar
+        self.visible_range = None
+        self.render_pending = False
         
         # Estado actual del servidor/mapa
         self.current_server = None
         self.current_map = None
         
+        # Mods instalados, favoritos y contexto persisten en el almacén SQLite
+        self.state_store = get_state_store(self.logger)
+        # Listas de todos los servidores/mapas en memoria: cambiar de contexto no lee el disco
+        self.manifest = get_mod_manifest(self.logger)
+        
+        # Versiones de los mods de todos los servidores: una petición por lotes cada 30 minutos
+        # (el panel de reinicios se suscribe para reiniciar los servidores afectados)
+        self.update_tracker = ModUpdateTracker(self.curseforge, self.state_store, logger=self.logger)
+        self.update_tracker.start()
+        
         # Variables para filtros y vista
         self.current_view = "grid"  # "grid" o "list"
         self.current_filter = "all"  # "all", "favorites", "installed", "search"
@@ -48,6 +104,51 @@ class ModsPanel(ctk.CTkFrame):
         # Actualizar UI inicial después de cargar datos
         self.after(100, self.refresh_initial_tabs)
     
+    @property
+    def favorite_mods(self):
+        """Favoritos en orden (copia: para modificarlos usar el catálogo)"""
+        return self.catalog.members(FAVORITES)
+    
+    @favorite_mods.setter
+    def favorite_mods(self, mods):
+        self.catalog.set_group(FAVORITES, mods)
+    
+    @property
+    def installed_mods(self):
+        """Mods instalados del servidor/mapa actual (copia)"""
+        return self.catalog.members(INSTALLED)
+    
+    @installed_mods.setter
+    def installed_mods(self, mods):
+        self.catalog.set_group(INSTALLED, mods)
+    
+    @property
+    def search_results(self):
+        """Resultados de búsqueda cargados (copia)"""
+        return self.catalog.members(SEARCH)
+    
+    @search_results.setter
+    def search_results(self, mods):
+        self.catalog.set_group(SEARCH, mods)
+    
+    def on_catalog_changed(self, event, group, mod_ids):
+        """Mantener contadores y tarjetas al día ante cualquier cambio del catálogo"""
+        if not hasattr(self, "favorites_count_label"):
+            return
+        if group is not None:
+            self.update_stats()
+        if event == "reset" or group == SEARCH:
+            return  # Quien reemplaza un grupo o añade resultados ya redibuja
+        
+        # Solo se redibuja la lista si cambia qué mods aparecen; si no, la tarjeta en su sitio
+        if self.current_filter == group or (self.current_filter == "all" and any(
+                (mod_id in self.displayed_index) != (self.catalog.get(mod_id) is not None)
+                for mod_id in mod_ids)):
+            self.refresh_mods_display()
+        else:
+            for mod_id in mod_ids:
+                self.update_mod_card(mod_id)
+    
     def get_data_directory(self):
         """Obtener directorio de datos correcto para ejecutable y desarrollo"""
         try:
@@ -72,12 +173,14 @@ class ModsPanel(ctk.CTkFrame):
             self.refresh_mods_display()
             self.update_mods_ids_entry()
             
-            if self.favorite_mods or self.installed_mods:
+            favorites = self.catalog.count(FAVORITES)
+            installed = self.catalog.count(INSTALLED)
+            if favorites or installed:
                 status_msg = "✅ Mods cargados: "
-                if self.favorite_mods:
-                    status_msg += f"{len(self.favorite_mods)} favoritos "
-                if self.installed_mods:
-                    status_msg += f"{len(self.installed_mods)} instalados"
+                if favorites:
+                    status_msg += f"{favorites} favoritos "
+                if installed:
+                    status_msg += f"{installed} instalados"
                 self.show_message(status_msg, "success")
             else:
                 self.show_message("💡 Busca mods usando la barra de búsqueda o haz clic en 'Populares'", "info")
@@ -91,6 +194,7 @@ class ModsPanel(ctk.CTkFrame):
         # Frame principal con scroll
         main_frame = ctk.CTkScrollableFrame(self)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.main_scroll = main_frame
         
         # Título principal
         title_label = ctk.CTkLabel(
@@ -114,6 +218,15 @@ class ModsPanel(ctk.CTkFrame):
         
         # Frame de información de mods instalados
         self.create_installed_info_frame(main_frame)
+        
+        # Redibujar las filas visibles al redimensionar...
+        self.main_scroll.bind("<Configure>", self.on_viewport_changed, add="+")
+        self.bind("<Configure>", self.on_viewport_changed, add="+")
+        # ...y al desplazar: <Configure> no se genera con el scroll
+        self.hook_scroll_events()
+        
+        # Cargar la siguiente página al llegar al final del scroll
+        self.after(500, self.check_scroll_position)
     
     def create_search_frame(self, parent):
         """Crear frame de búsqueda mejorado"""
@@ -140,6 +253,8 @@ class ModsPanel(ctk.CTkFrame):
             font=ctk.CTkFont(size=14)
         )
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.search_entry.bind("<Return>", lambda e: self.search_mods())
+        self.search_entry.bind("<KeyRelease>", self.on_search_text_change)
         
         # Botón de búsqueda
         search_button = ctk.CTkButton(
@@ -331,15 +446,27 @@ class ModsPanel(ctk.CTkFrame):
         )
         self.mods_title_label.pack(pady=10)
         
-        # Frame para el contenido de mods
-        self.mods_content_frame = ctk.CTkFrame(self.mods_display_frame, fg_color="transparent")
-        self.mods_content_frame.pack(fill="both", expand=True, padx=15, pady=10)
+        # Frame para el contenido de mods: las tarjetas se colocan con place
+        # por fila, y su alto es el de todas las filas aunque solo existan las visibles
+        self.mods_content_frame = ctk.CTkFrame(self.mods_display_frame, fg_color="transparent", height=200)
+        self.mods_content_frame.pack(fill="x", padx=15, pady=10)
         
-        # Configurar grid para vista en cuadrícula
-        self.mods_content_frame.grid_columnconfigure(0, weight=1)
-        self.mods_content_frame.grid_columnconfigure(1, weight=1)
-        self.mods_content_frame.grid_columnconfigure(2, weight=1)
-        self.mods_content_frame.grid_columnconfigure(3, weight=1)
+        self.empty_label = ctk.CTkLabel(
+            self.mods_content_frame,
+            text="",
+            font=ctk.CTkFont(size=14),
+            justify="center"
+        )
+        
+        # Botón para cargar más resultados (además del scroll infinito)
+        self.load_more_button = ctk.CTkButton(
+            self.mods_display_frame,
+            text="⬇️ Cargar más resultados",
+            command=self.load_next_search_page,
+            height=32,
+            fg_color="#607D8B",
+            hover_color="#455A64"
+        )
     
     def create_installed_info_frame(self, parent):
         """Crear frame de información de mods instalados"""
@@ -476,59 +603,25 @@ class ModsPanel(ctk.CTkFrame):
     def refresh_mods_display(self):
         """Refrescar la visualización de mods"""
         try:
-            # Limpiar contenido anterior
-            for widget in self.mods_content_frame.winfo_children():
-                widget.destroy()
-            
-            # Obtener mods según el filtro
+            # Obtener mods según el filtro (y el filtro local, por índice de palabras)
             mods_to_show = self.get_mods_for_current_filter()
             
-            # Aplicar filtro local
-            if self.search_filter:
-                mods_to_show = [mod for mod in mods_to_show 
-                              if self.search_filter in mod.get("name", "").lower() 
-                              or self.search_filter in mod.get("summary", "").lower()]
-            
             # Actualizar título y estadísticas
             self.update_display_title(len(mods_to_show))
             self.update_stats()
+            self.update_load_more_button()
             
-            if not mods_to_show:
-                self.show_empty_state()
-                return
-            
-            # Mostrar mods según la vista
-            if self.current_view == "grid":
-                self.display_mods_grid(mods_to_show)
-            else:
-                self.display_mods_list(mods_to_show)
+            self.show_mods(mods_to_show)
                 
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error al refrescar visualización: {e}")
     
     def get_mods_for_current_filter(self):
-        """Obtener mods según el filtro actual"""
-        if self.current_filter == "favorites":
-            return self.favorite_mods
-        elif self.current_filter == "installed":
-            return self.installed_mods
-        elif self.current_filter == "search":
-            return self.search_results
-        else:  # "all"
-            all_mods = []
-            all_mods.extend(self.favorite_mods)
-            all_mods.extend(self.installed_mods)
-            all_mods.extend(self.search_results)
-            # Eliminar duplicados
-            seen_ids = set()
-            unique_mods = []
-            for mod in all_mods:
-                mod_id = str(mod.get("id", ""))
-                if mod_id not in seen_ids:
-                    seen_ids.add(mod_id)
-                    unique_mods.append(mod)
-            return unique_mods
+        """Obtener mods según el filtro actual y el filtro local"""
+        groups = {"favorites": FAVORITES, "installed": INSTALLED, "search": SEARCH}
+        # "all" recorre favoritos, instalados y resultados sin repetir
+        return self.catalog.filter(groups.get(self.current_filter), text=self.search_filter)
     
     def update_display_title(self, count):
         """Actualizar título de la visualización"""
@@ -544,9 +637,10 @@ class ModsPanel(ctk.CTkFrame):
     
     def update_stats(self):
         """Actualizar estadísticas"""
-        self.favorites_count_label.configure(text=f"⭐ Favoritos: {len(self.favorite_mods)}")
-        self.installed_count_label.configure(text=f"📦 Instalados: {len(self.installed_mods)}")
-        self.search_count_label.configure(text=f"🔍 Resultados: {len(self.search_results)}")
+        stats = self.catalog.stats()
+        self.favorites_count_label.configure(text=f"⭐ Favoritos: {stats[FAVORITES]}")
+        self.installed_count_label.configure(text=f"📦 Instalados: {stats[INSTALLED]}")
+        self.search_count_label.configure(text=f"🔍 Resultados: {stats[SEARCH]}")
         
         # Actualizar información del servidor
         if self.current_server and self.current_map:
@@ -556,150 +650,269 @@ class ModsPanel(ctk.CTkFrame):
     
     def show_empty_state(self):
         """Mostrar estado vacío"""
-        empty_frame = ctk.CTkFrame(self.mods_content_frame, fg_color="transparent")
-        empty_frame.pack(expand=True, pady=50)
-        
-        empty_label = ctk.CTkLabel(
-            empty_frame,
+        self.empty_label.configure(
             text="📭 No hay mods para mostrar\n\n" + 
                  ("💡 Busca mods usando la barra de búsqueda" if self.current_filter == "all" else
                   "⭐ Marca mods como favoritos desde la búsqueda" if self.current_filter == "favorites" else
                   "📦 Instala mods desde la búsqueda" if self.current_filter == "installed" else
-                  "🔍 No se encontraron resultados para tu búsqueda"),
-            font=ctk.CTkFont(size=14),
-            justify="center"
+                  "🔍 No se encontraron resultados para tu búsqueda")
         )
-        empty_label.pack()
+        self.mods_content_frame.configure(height=200)
+        self.empty_label.place(relx=0.5, y=50, anchor="n")
     
-    def display_mods_grid(self, mods):
-        """Mostrar mods en vista de cuadrícula"""
-        row = 0
-        col = 0
-        max_cols = 4
-        
+    # ------------------------------------------------------------------
+    # Vista virtualizada: solo existen las tarjetas de las filas visibles
+    # ------------------------------------------------------------------
+    def show_mods(self, mods):
+        """Reemplazar los mods mostrados conservando la posición del scroll"""
+        self.release_all_cards()
+        self.empty_label.place_forget()
+        self.displayed_mods = list(mods)
+        self.displayed_index = {mod_key(mod): index for index, mod in enumerate(self.displayed_mods)}
+        if not self.displayed_mods:
+            self.show_empty_state()
+            return
+        self.update_virtual_layout()
+    
+    def append_mods(self, mods):
+        """Añadir mods al final sin tocar las tarjetas ya colocadas"""
+        if not self.displayed_mods:
+            self.show_mods(mods)
+            return
         for mod in mods:
-            mod_card = self.create_compact_mod_card(mod)
-            mod_card.grid(row=row, column=col, padx=5, pady=5, sticky="ew")
+            self.displayed_index[mod_key(mod)] = len(self.displayed_mods)
+            self.displayed_mods.append(mod)
+        self.update_virtual_layout()
+    
+    def layout_metrics(self):
+        """(columnas, alto de fila) de la vista actual"""
+        if self.current_view == "grid":
+            return self.GRID_COLUMNS, self.ROW_HEIGHTS["grid"]
+        return 1, self.ROW_HEIGHTS["list"]
+    
+    def update_virtual_layout(self):
+        """Ajustar el alto total al número de filas y dibujar las visibles"""
+        columns, row_height = self.layout_metrics()
+        rows = row_count(len(self.displayed_mods), columns)
+        self.mods_content_frame.configure(height=max(rows * row_height, 1))
+        self.render_visible_cards()
+    
+    def hook_scroll_events(self):
+        """Avisar de cada desplazamiento del scroll principal (barra, rueda o teclado)"""
+        canvas = getattr(self.main_scroll, "_parent_canvas", None)
+        scrollbar = getattr(self.main_scroll, "_scrollbar", None)
+        if canvas is not None and scrollbar is not None:
+            # El canvas llama a yscrollcommand cada vez que cambia la vista
+            def on_yscroll(first, last):
+                scrollbar.set(first, last)
+                self.on_viewport_changed()
+            canvas.configure(yscrollcommand=on_yscroll)
+        else:
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                self.bind_all(sequence, self.on_viewport_changed, add="+")
+    
+    def on_viewport_changed(self, event=None):
+        """Agrupar los avisos de scroll/redimensión en un solo redibujado"""
+        if not self.render_pending:
+            self.render_pending = True
+            self.after_idle(self.render_visible_cards)
+    
+    def render_visible_cards(self):
+        """Asignar tarjetas del reciclaje a las filas que entran en pantalla"""
+        self.render_pending = False
+        try:
+            if not self.displayed_mods:
+                return
+            columns, row_height = self.layout_metrics()
+            # Parte visible del contenido: el panel hace de ventana del scroll principal
+            top = self.winfo_rooty() - self.mods_content_frame.winfo_rooty()
+            height = self.winfo_height() if self.winfo_height() > 1 else 800
+            first, last = visible_range(
+                top, height, row_height, columns, len(self.displayed_mods), self.OVERSCAN_ROWS
+            )
+            if (first, last) == self.visible_range and self.bound_cards:
+                return
+            self.visible_range = (first, last)
             
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
+            # Devolver al reciclaje las tarjetas que salieron de la ventana
+            for index in [index for index in self.bound_cards if not first <= index < last]:
+                self.release_card(self.bound_cards.pop(index))
+            
+            for index in range(first, last):
+                if index in self.bound_cards:
+                    continue
+                card = self.acquire_card()
+                self.bind_card(card, self.displayed_mods[index])
+                _row, col, y = cell_position(index, columns, row_height)
+                card["frame"].place(
+                    relx=col / columns, x=5, y=y + 5,
+                    relwidth=1 / columns, width=-10, height=row_height - 10
+                )
+                self.bound_cards[index] = card
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error al dibujar tarjetas visibles: {e}")
     
-    def display_mods_list(self, mods):
-        """Mostrar mods en vista de lista"""
-        for mod in mods:
-            mod_card = self.create_list_mod_card(mod)
-            mod_card.pack(fill="x", padx=5, pady=5)
+    def acquire_card(self):
+        """Tarjeta libre de la vista actual (se crea solo si no hay ninguna)"""
+        pool = self.card_pool[self.current_view]
+        if pool:
+            return pool.pop()
+        if self.current_view == "grid":
+            return self.create_compact_mod_card()
+        return self.create_list_mod_card()
+    
+    def release_card(self, card):
+        card["frame"].place_forget()
+        card["mod"] = None
+        self.card_pool[card["view"]].append(card)
+    
+    def release_all_cards(self):
+        for card in self.bound_cards.values():
+            self.release_card(card)
+        self.bound_cards = {}
+        self.visible_range = None
+    
+    def bind_card(self, card, mod):
+        """Mostrar un mod en una tarjeta existente"""
+        changed = card["mod"] is None or mod_key(card["mod"]) != mod_key(mod)
+        card["mod"] = mod
+        if card["view"] == "grid":
+            self.bind_compact_mod_card(card, mod)
+        else:
+            self.bind_list_mod_card(card, mod)
+        if changed:
+            self.bind_card_logo(card, mod)
+    
+    def get_logo_placeholder(self, view):
+        """Cuadro gris del tamaño del logo mientras llega la imagen"""
+        if view not in self.logo_placeholders:
+            size = self.LOGO_SIZES[view]
+            image = Image.new("RGBA", size, (96, 125, 139, 255))
+            self.logo_placeholders[view] = ctk.CTkImage(light_image=image, dark_image=image, size=size)
+        return self.logo_placeholders[view]
+    
+    def bind_card_logo(self, card, mod):
+        """Pintar el logo si ya está en memoria; si no, el marcador y pedirlo en segundo plano"""
+        url = (mod.get("logo") or {}).get("thumbnailUrl")
+        images = None
+        if url:
+            key = mod_key(mod)
+            # Mismo tamaño en ambas vistas: cambiar de vista reutiliza la entrada en memoria
+            images = self.thumbnails.request(
+                url, self.LOGO_SOURCE_SIZE,
+                lambda loaded, c=card, k=key: self.after(0, lambda: self.on_thumbnail_ready(c, k, loaded))
+            )
+        image = images[card["view"]] if images else None
+        card["logo_label"].configure(image=image or self.get_logo_placeholder(card["view"]))
+    
+    def on_thumbnail_ready(self, card, key, images):
+        """Cambiar el marcador por el logo descargado"""
+        # La tarjeta pudo reciclarse para otro mod mientras se descargaba
+        if card["mod"] is not None and mod_key(card["mod"]) == key:
+            card["logo_label"].configure(image=images[card["view"]])
+    
+    def update_mod_card(self, mod_id):
+        """Actualizar en su sitio la tarjeta de un mod (si está en pantalla)"""
+        index = self.displayed_index.get(mod_id)
+        if index is None:
+            return
+        mod = self.catalog.get(mod_id) or self.displayed_mods[index]
+        self.displayed_mods[index] = mod
+        card = self.bound_cards.get(index)
+        if card is not None:
+            self.bind_card(card, mod)
     
-    def create_compact_mod_card(self, mod):
-        """Crear tarjeta compacta para vista de cuadrícula"""
+    def toggle_installed(self, mod):
+        """Instalar o desinstalar según el estado actual"""
+        if self.catalog.is_installed(mod):
+            self.uninstall_mod(mod)
+        else:
+            self.install_mod(mod)
+    
+    def create_compact_mod_card(self):
+        """Crear tarjeta compacta (reutilizable) para vista de cuadrícula"""
         # Frame principal
         mod_frame = ctk.CTkFrame(self.mods_content_frame, corner_radius=8, border_width=1)
+        card = {"view": "grid", "frame": mod_frame, "mod": None}
         
-        # Información del mod
-        mod_id = mod.get("id", "")
-        mod_name = mod.get("name", "Sin nombre")
-        download_count = mod.get("downloadCount", 0)
+        # Header con logo y nombre
+        header_frame = ctk.CTkFrame(mod_frame, fg_color="transparent")
+        header_frame.pack(fill="x", padx=8, pady=(8, 2))
+        
+        card["logo_label"] = ctk.CTkLabel(header_frame, text="", image=self.get_logo_placeholder("grid"))
+        card["logo_label"].pack(side="left", padx=(0, 6))
         
-        # Header con nombre
-        name_label = ctk.CTkLabel(
-            mod_frame,
-            text=mod_name[:25] + "..." if len(mod_name) > 25 else mod_name,
+        title_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
+        title_frame.pack(side="left", fill="x", expand=True)
+        
+        card["name_label"] = ctk.CTkLabel(
+            title_frame,
+            text="",
             font=ctk.CTkFont(size=12, weight="bold"),
             anchor="w"
         )
-        name_label.pack(anchor="w", padx=8, pady=(8, 2))
+        card["name_label"].pack(anchor="w")
         
         # ID del mod
-        id_label = ctk.CTkLabel(
-            mod_frame,
-            text=f"ID: {mod_id}",
+        card["id_label"] = ctk.CTkLabel(
+            title_frame,
+            text="",
             font=ctk.CTkFont(size=10),
             text_color=("gray", "lightgray")
         )
-        id_label.pack(anchor="w", padx=8, pady=2)
+        card["id_label"].pack(anchor="w")
         
         # Estadísticas
         stats_frame = ctk.CTkFrame(mod_frame, fg_color="transparent")
         stats_frame.pack(fill="x", padx=8, pady=2)
         
-        downloads_label = ctk.CTkLabel(
+        card["downloads_label"] = ctk.CTkLabel(
             stats_frame,
-            text=f"📥 {download_count:,}",
+            text="",
             font=ctk.CTkFont(size=9),
             fg_color="#2196F3",
             corner_radius=3,
             padx=4,
             pady=1
         )
-        downloads_label.pack(side="left")
-        
-        # Estado del mod
-        is_favorite = any(fav.get("id") == str(mod_id) for fav in self.favorite_mods)
-        is_installed = any(inst.get("id") == str(mod_id) for inst in self.installed_mods)
+        card["downloads_label"].pack(side="left")
         
-        if is_favorite:
-            fav_label = ctk.CTkLabel(
-                stats_frame,
-                text="⭐",
-                font=ctk.CTkFont(size=12)
-            )
-            fav_label.pack(side="right", padx=2)
+        # Estado del mod (vacío si no aplica)
+        card["fav_label"] = ctk.CTkLabel(stats_frame, text="", font=ctk.CTkFont(size=12))
+        card["fav_label"].pack(side="right", padx=2)
+        card["inst_label"] = ctk.CTkLabel(stats_frame, text="", font=ctk.CTkFont(size=12))
+        card["inst_label"].pack(side="right", padx=2)
         
-        if is_installed:
-            inst_label = ctk.CTkLabel(
-                stats_frame,
-                text="📦",
-                font=ctk.CTkFont(size=12)
-            )
-            inst_label.pack(side="right", padx=2)
-        
-        # Botones de acción
+        # Botones de acción: leen el mod de la tarjeta en el momento del clic
         buttons_frame = ctk.CTkFrame(mod_frame, fg_color="transparent")
         buttons_frame.pack(fill="x", padx=8, pady=(5, 8))
         
         # Botón de favorito
-        fav_btn = ctk.CTkButton(
+        card["fav_btn"] = ctk.CTkButton(
             buttons_frame,
-            text="⭐" if not is_favorite else "💛",
-            command=lambda m=mod: self.toggle_favorite(m),
+            text="⭐",
+            command=lambda c=card: self.toggle_favorite(c["mod"]),
             width=30,
-            height=25,
-            fg_color="#FF9800" if is_favorite else "#607D8B",
-            hover_color="#F57C00" if is_favorite else "#455A64"
+            height=25
         )
-        fav_btn.pack(side="left", padx=2)
+        card["fav_btn"].pack(side="left", padx=2)
         
         # Botón de instalar/desinstalar
-        if is_installed:
-            install_btn = ctk.CTkButton(
-                buttons_frame,
-                text="🗑️",
-                command=lambda m=mod: self.uninstall_mod(m),
-                width=30,
-                height=25,
-                fg_color="#f44336",
-                hover_color="#d32f2f"
-            )
-            install_btn.pack(side="left", padx=2)
-        else:
-            install_btn = ctk.CTkButton(
-                buttons_frame,
-                text="📥",
-                command=lambda m=mod: self.install_mod(m),
-                width=30,
-                height=25,
-                fg_color="#4CAF50",
-                hover_color="#388E3C"
-            )
-            install_btn.pack(side="left", padx=2)
+        card["install_btn"] = ctk.CTkButton(
+            buttons_frame,
+            text="📥",
+            command=lambda c=card: self.toggle_installed(c["mod"]),
+            width=30,
+            height=25
+        )
+        card["install_btn"].pack(side="left", padx=2)
         
         # Botón de información
         info_btn = ctk.CTkButton(
             buttons_frame,
             text="ℹ️",
-            command=lambda m=mod: self.show_mod_info(m),
+            command=lambda c=card: self.show_mod_info(c["mod"]),
             width=30,
             height=25,
             fg_color="#9C27B0",
@@ -707,149 +920,137 @@ class ModsPanel(ctk.CTkFrame):
         )
         info_btn.pack(side="left", padx=2)
         
-        return mod_frame
+        return card
     
-    def create_list_mod_card(self, mod):
-        """Crear tarjeta de lista para vista de lista"""
+    def bind_compact_mod_card(self, card, mod):
+        """Rellenar una tarjeta compacta con los datos y el estado de un mod"""
+        mod_id = mod.get("id", "")
+        mod_name = mod.get("name", "Sin nombre")
+        download_count = mod.get("downloadCount", 0)
+        is_favorite = self.catalog.is_favorite(mod_id)
+        is_installed = self.catalog.is_installed(mod_id)
+        
+        card["name_label"].configure(text=mod_name[:25] + "..." if len(mod_name) > 25 else mod_name)
+        card["id_label"].configure(text=f"ID: {mod_id}")
+        card["downloads_label"].configure(text=f"📥 {download_count:,}")
+        card["fav_label"].configure(text="⭐" if is_favorite else "")
+        card["inst_label"].configure(text="📦" if is_installed else "")
+        card["fav_btn"].configure(
+            text="⭐" if not is_favorite else "💛",
+            fg_color="#FF9800" if is_favorite else "#607D8B",
+            hover_color="#F57C00" if is_favorite else "#455A64"
+        )
+        if is_installed:
+            card["install_btn"].configure(text="🗑️", fg_color="#f44336", hover_color="#d32f2f")
+        else:
+            card["install_btn"].configure(text="📥", fg_color="#4CAF50", hover_color="#388E3C")
+    
+    def create_list_mod_card(self):
+        """Crear tarjeta (reutilizable) para vista de lista"""
         # Frame principal
         mod_frame = ctk.CTkFrame(self.mods_content_frame, corner_radius=8, border_width=1)
+        card = {"view": "list", "frame": mod_frame, "mod": None}
         
         # Frame de contenido horizontal
         content_frame = ctk.CTkFrame(mod_frame, fg_color="transparent")
         content_frame.pack(fill="x", padx=10, pady=8)
         
-        # Información del mod
-        mod_id = mod.get("id", "")
-        mod_name = mod.get("name", "Sin nombre")
-        mod_summary = mod.get("summary", "Sin descripción")
-        download_count = mod.get("downloadCount", 0)
+        # Logo
+        card["logo_label"] = ctk.CTkLabel(content_frame, text="", image=self.get_logo_placeholder("list"))
+        card["logo_label"].pack(side="left", padx=(0, 10))
         
         # Columna izquierda - Información
         info_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         info_frame.pack(side="left", fill="x", expand=True)
         
         # Nombre del mod
-        name_label = ctk.CTkLabel(
+        card["name_label"] = ctk.CTkLabel(
             info_frame,
-            text=f"🎮 {mod_name}",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             anchor="w"
         )
-        name_label.pack(anchor="w")
+        card["name_label"].pack(anchor="w")
         
         # Descripción
-        if mod_summary:
-            desc_text = mod_summary[:100] + "..." if len(mod_summary) > 100 else mod_summary
-            desc_label = ctk.CTkLabel(
-                info_frame,
-                text=desc_text,
-                font=ctk.CTkFont(size=11),
-                anchor="w",
-                text_color=("gray", "lightgray")
-            )
-            desc_label.pack(anchor="w", pady=2)
+        card["desc_label"] = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+            text_color=("gray", "lightgray")
+        )
+        card["desc_label"].pack(anchor="w", pady=2)
         
         # Estadísticas
         stats_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
         stats_frame.pack(anchor="w", pady=5)
         
         # ID del mod
-        id_label = ctk.CTkLabel(
+        card["id_label"] = ctk.CTkLabel(
             stats_frame,
-            text=f"ID: {mod_id}",
+            text="",
             font=ctk.CTkFont(size=10, weight="bold"),
             fg_color="#607D8B",
             corner_radius=3,
             padx=6,
             pady=2
         )
-        id_label.pack(side="left", padx=(0, 5))
+        card["id_label"].pack(side="left", padx=(0, 5))
         
         # Descargas
-        downloads_label = ctk.CTkLabel(
+        card["downloads_label"] = ctk.CTkLabel(
             stats_frame,
-            text=f"📥 {download_count:,} descargas",
+            text="",
             font=ctk.CTkFont(size=10),
             fg_color="#2196F3",
             corner_radius=3,
             padx=6,
             pady=2
         )
-        downloads_label.pack(side="left", padx=(0, 5))
-        
-        # Estado del mod
-        is_favorite = any(fav.get("id") == str(mod_id) for fav in self.favorite_mods)
-        is_installed = any(inst.get("id") == str(mod_id) for inst in self.installed_mods)
-        
-        if is_favorite:
-            fav_status = ctk.CTkLabel(
-                stats_frame,
-                text="⭐ Favorito",
-                font=ctk.CTkFont(size=10),
-                fg_color="#FF9800",
-                corner_radius=3,
-                padx=6,
-                pady=2
-            )
-            fav_status.pack(side="left", padx=(0, 5))
+        card["downloads_label"].pack(side="left", padx=(0, 5))
         
-        if is_installed:
-            inst_status = ctk.CTkLabel(
+        # Estado del mod (transparente y vacío si no aplica)
+        for key in ("fav_status", "inst_status"):
+            card[key] = ctk.CTkLabel(
                 stats_frame,
-                text="📦 Instalado",
+                text="",
                 font=ctk.CTkFont(size=10),
-                fg_color="#4CAF50",
                 corner_radius=3,
                 padx=6,
                 pady=2
             )
-            inst_status.pack(side="left", padx=(0, 5))
+            card[key].pack(side="left", padx=(0, 5))
         
         # Columna derecha - Botones
         buttons_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         buttons_frame.pack(side="right", padx=(10, 0))
         
         # Botón de favorito
-        fav_btn = ctk.CTkButton(
+        card["fav_btn"] = ctk.CTkButton(
             buttons_frame,
-            text="⭐ Favorito" if not is_favorite else "💛 Quitar",
-            command=lambda m=mod: self.toggle_favorite(m),
+            text="⭐ Favorito",
+            command=lambda c=card: self.toggle_favorite(c["mod"]),
             width=100,
-            height=30,
-            fg_color="#FF9800" if is_favorite else "#607D8B",
-            hover_color="#F57C00" if is_favorite else "#455A64"
+            height=30
         )
-        fav_btn.pack(pady=2)
+        card["fav_btn"].pack(pady=2)
         
         # Botón de instalar/desinstalar
-        if is_installed:
-            install_btn = ctk.CTkButton(
-                buttons_frame,
-                text="🗑️ Desinstalar",
-                command=lambda m=mod: self.uninstall_mod(m),
-                width=100,
-                height=30,
-                fg_color="#f44336",
-                hover_color="#d32f2f"
-            )
-            install_btn.pack(pady=2)
-        else:
-            install_btn = ctk.CTkButton(
-                buttons_frame,
-                text="📥 Instalar",
-                command=lambda m=mod: self.install_mod(m),
-                width=100,
-                height=30,
-                fg_color="#4CAF50",
-                hover_color="#388E3C"
-            )
-            install_btn.pack(pady=2)
+        card["install_btn"] = ctk.CTkButton(
+            buttons_frame,
+            text="📥 Instalar",
+            command=lambda c=card: self.toggle_installed(c["mod"]),
+            width=100,
+            height=30
+        )
+        card["install_btn"].pack(pady=2)
         
         # Botón de información
         info_btn = ctk.CTkButton(
             buttons_frame,
             text="ℹ️ Info",
-            command=lambda m=mod: self.show_mod_info(m),
+            command=lambda c=card: self.show_mod_info(c["mod"]),
             width=100,
             height=30,
             fg_color="#9C27B0",
@@ -857,7 +1058,38 @@ class ModsPanel(ctk.CTkFrame):
         )
         info_btn.pack(pady=2)
         
-        return mod_frame
+        return card
+    
+    def bind_list_mod_card(self, card, mod):
+        """Rellenar una tarjeta de lista con los datos y el estado de un mod"""
+        mod_id = mod.get("id", "")
+        mod_name = mod.get("name", "Sin nombre")
+        mod_summary = mod.get("summary", "Sin descripción") or ""
+        download_count = mod.get("downloadCount", 0)
+        is_favorite = self.catalog.is_favorite(mod_id)
+        is_installed = self.catalog.is_installed(mod_id)
+        
+        card["name_label"].configure(text=f"🎮 {mod_name}")
+        card["desc_label"].configure(text=mod_summary[:100] + "..." if len(mod_summary) > 100 else mod_summary)
+        card["id_label"].configure(text=f"ID: {mod_id}")
+        card["downloads_label"].configure(text=f"📥 {download_count:,} descargas")
+        card["fav_status"].configure(
+            text="⭐ Favorito" if is_favorite else "",
+            fg_color="#FF9800" if is_favorite else "transparent"
+        )
+        card["inst_status"].configure(
+            text="📦 Instalado" if is_installed else "",
+            fg_color="#4CAF50" if is_installed else "transparent"
+        )
+        card["fav_btn"].configure(
+            text="⭐ Favorito" if not is_favorite else "💛 Quitar",
+            fg_color="#FF9800" if is_favorite else "#607D8B",
+            hover_color="#F57C00" if is_favorite else "#455A64"
+        )
+        if is_installed:
+            card["install_btn"].configure(text="🗑️ Desinstalar", fg_color="#f44336", hover_color="#d32f2f")
+        else:
+            card["install_btn"].configure(text="📥 Instalar", fg_color="#4CAF50", hover_color="#388E3C")
     
     def show_mod_info(self, mod):
         """Mostrar información detallada del mod"""
@@ -945,95 +1177,118 @@ class ModsPanel(ctk.CTkFrame):
         # Mostrar indicador de carga
         self.search_status_label.configure(text="🔄 Buscando mods...")
         
-        # Realizar búsqueda en hilo separado
-        threading.Thread(target=self._search_mods_thread, args=(query,), daemon=True).start()
+        # Realizar búsqueda en hilo separado (invalida la búsqueda anterior)
+        generation = self.mod_search.start(query)
+        threading.Thread(target=self._search_mods_thread, args=(generation,), daemon=True).start()
         
-    def _search_mods_thread(self, query):
+    def _search_mods_thread(self, generation):
         """Hilo para buscar mods"""
-        try:
-            headers = {
-                "x-api-key": self.api_key,
-                "Accept": "application/json"
-            }
-            
-            params = {
-                "gameId": self.game_id,
-                "searchFilter": query,
-                "sortField": 6,  # Popularidad
-                "sortOrder": "desc",
-                "pageSize": 20
-            }
-            
-            response = requests.get(f"{self.base_url}/mods/search", headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                mods = data.get("data", [])
-                
-                # Actualizar UI en hilo principal
-                self.after(0, lambda: self.display_search_results(mods))
-            else:
-                self.after(0, lambda: self.search_status_label.configure(f"❌ Error en la búsqueda: {response.status_code}"))
-                
-        except Exception as e:
-            self.logger.error(f"Error al buscar mods: {e}")
-            self.after(0, lambda: self.search_status_label.configure("❌ Error de conexión"))
+        self._load_search_page(generation, first=True, error_text="❌ Error en la búsqueda")
             
     def load_popular_mods(self):
         """Cargar mods populares"""
         self.search_status_label.configure(text="🔄 Cargando mods populares...")
-        threading.Thread(target=self._load_popular_mods_thread, daemon=True).start()
+        generation = self.mod_search.start("")
+        threading.Thread(target=self._load_popular_mods_thread, args=(generation,), daemon=True).start()
         
-    def _load_popular_mods_thread(self):
+    def _load_popular_mods_thread(self, generation):
         """Hilo para cargar mods populares"""
+        self._load_search_page(generation, first=True, error_text="❌ Error al cargar mods populares")
+    
+    def load_next_search_page(self):
+        """Cargar la siguiente página de la búsqueda activa"""
+        if not self.mod_search.has_more or self.mod_search.loading:
+            return
+        self.search_status_label.configure(text="🔄 Cargando más resultados...")
+        threading.Thread(
+            target=self._load_search_page,
+            args=(self.mod_search.generation, False, "❌ Error al cargar más resultados"),
+            daemon=True
+        ).start()
+    
+    def _load_search_page(self, generation, first, error_text):
+        """Descargar una página y mostrarla si la búsqueda sigue vigente"""
         try:
-            headers = {
-                "x-api-key": self.api_key,
-                "Accept": "application/json"
-            }
-            
-            params = {
-                "gameId": self.game_id,
-                "sortField": 6,  # Popularidad
-                "sortOrder": "desc",
-                "pageSize": 20
-            }
-            
-            response = requests.get(f"{self.base_url}/mods/search", headers=headers, params=params)
+            mods = self.mod_search.fetch_next(generation)
+            if mods is None:
+                return
             
-            if response.status_code == 200:
-                data = response.json()
-                mods = data.get("data", [])
-                
-                # Actualizar UI en hilo principal
-                self.after(0, lambda: self.display_search_results(mods))
-            else:
-                self.after(0, lambda: self.search_status_label.configure(f"❌ Error al cargar mods populares: {response.status_code}"))
+            # Actualizar UI en hilo principal
+            self.after(0, lambda: self.on_search_page(generation, mods, first))
                 
+        except CurseForgeError as e:
+            self.logger.error(f"{error_text}: {e}")
+            status = e.status_code or "conexión"
+            self.after(0, lambda: self.search_status_label.configure(text=f"{error_text}: {status}"))
+        except Exception as e:
+            self.logger.error(f"{error_text}: {e}")
+            self.after(0, lambda: self.search_status_label.configure(text="❌ Error de conexión"))
+    
+    def on_search_page(self, generation, mods, first):
+        """Recibir una página de resultados en el hilo principal"""
+        if not self.mod_search.is_current(generation):
+            return  # Llegó tarde: el usuario ya hizo otra búsqueda
+        if first:
+            self.display_search_results(mods)
+        else:
+            self.append_search_results(mods)
+        total = self.mod_search.total
+        self.search_status_label.configure(
+            text=f"✅ {self.catalog.count(SEARCH)} de {total:,} mods" if total else ""
+        )
+    
+    def on_search_text_change(self, event=None):
+        """Al cambiar el texto, dejar de paginar la búsqueda anterior"""
+        query = self.mod_search.query
+        if query and self.search_entry.get().strip() != query:
+            self.mod_search.cancel()
+            self.update_load_more_button()
+    
+    def check_scroll_position(self):
+        """Scroll infinito: pedir la siguiente página cerca del final"""
+        try:
+            if self.current_filter == "search" and self.mod_search.has_more and not self.mod_search.loading:
+                canvas = getattr(self.main_scroll, "_parent_canvas", None)
+                if canvas is not None and canvas.yview()[1] >= 0.95:
+                    self.load_next_search_page()
         except Exception as e:
-            self.logger.error(f"Error al cargar mods populares: {e}")
-            self.after(0, lambda: self.search_status_label.configure("❌ Error de conexión"))
+            self.logger.debug(f"Error al comprobar el scroll: {e}")
+        self.after(250, self.check_scroll_position)
+    
+    def update_load_more_button(self):
+        """Mostrar el botón de cargar más solo si quedan páginas"""
+        if self.current_filter == "search" and self.mod_search.has_more:
+            self.load_more_button.pack(pady=(0, 10))
+        else:
+            self.load_more_button.pack_forget()
     
     def display_search_results(self, mods):
         """Mostrar resultados de búsqueda"""
         # Guardar los resultados actuales
-        self.search_results = mods
+        self.catalog.set_group(SEARCH, mods)
         
         # Actualizar la pestaña de resultados
         self.set_filter("search")
-        self.refresh_mods_display()
-        
-        # Actualizar estadísticas
-        self.update_stats()
         
         # Mostrar mensaje de bienvenida
-        if self.search_results:
+        if self.catalog.count(SEARCH):
             status_msg = "✅ Mods encontrados: "
-            status_msg += f"{len(self.search_results)} mods"
+            status_msg += f"{self.catalog.count(SEARCH)} mods"
             self.show_message(status_msg, "success")
         else:
             self.show_message("💡 No se encontraron mods para tu búsqueda.", "info")
     
+    def append_search_results(self, mods):
+        """Añadir una página de resultados sin redibujar las tarjetas existentes"""
+        added = self.catalog.extend_group(SEARCH, mods)
+        if self.current_filter != "search" or self.search_filter:
+            self.refresh_mods_display()
+            return
+        self.append_mods([self.catalog.get(mod_id) for mod_id in added])
+        self.update_display_title(len(self.displayed_mods))
+        self.update_stats()
+        self.update_load_more_button()
+    
     def install_mod(self, mod):
         """Instalar mod"""
         try:
@@ -1041,21 +1296,17 @@ class ModsPanel(ctk.CTkFrame):
             mod_name = mod.get("name", "Sin nombre")
             
             # Verificar si ya está instalado
-            if any(inst.get("id") == mod_id for inst in self.installed_mods):
+            if self.catalog.is_installed(mod_id):
                 self.show_message(f"⚠️ El mod '{mod_name}' ya está instalado", "warning")
                 return
             
-            # Agregar a la lista de instalados
-            self.installed_mods.append(mod)
-            self.save_installed_mods()
+            # Agregar a la lista de instalados (una fila nueva en el almacén)
+            self.catalog.add(INSTALLED, mod)
+            self.manifest.add(self.get_mods_key(), mod)
             
-            # Actualizar entrada de IDs
+            # Actualizar entrada de IDs (la tarjeta y los contadores los actualiza el catálogo)
             self.update_mods_ids_entry()
             
-            # Actualizar visualización
-            self.refresh_mods_display()
-            self.update_stats()
-            
             self.show_message(f"✅ Mod '{mod_name}' instalado correctamente", "success")
             
         except Exception as e:
@@ -1070,16 +1321,12 @@ class ModsPanel(ctk.CTkFrame):
             mod_name = mod.get("name", "Sin nombre")
             
             # Remover de la lista de instalados
-            self.installed_mods = [inst for inst in self.installed_mods if inst.get("id") != mod_id]
-            self.save_installed_mods()
+            self.catalog.remove(INSTALLED, mod_id)
+            self.manifest.remove(self.get_mods_key(), mod_id)
             
-            # Actualizar entrada de IDs
+            # Actualizar entrada de IDs (la tarjeta y los contadores los actualiza el catálogo)
             self.update_mods_ids_entry()
             
-            # Actualizar visualización
-            self.refresh_mods_display()
-            self.update_stats()
-            
             self.show_message(f"✅ Mod '{mod_name}' desinstalado correctamente", "success")
             
         except Exception as e:
@@ -1094,23 +1341,19 @@ class ModsPanel(ctk.CTkFrame):
             mod_name = mod.get("name", "Sin nombre")
             
             # Verificar si ya está en favoritos
-            is_favorite = any(fav.get("id") == mod_id for fav in self.favorite_mods)
+            is_favorite = self.catalog.is_favorite(mod_id)
             
             if is_favorite:
                 # Remover de favoritos
-                self.favorite_mods = [fav for fav in self.favorite_mods if fav.get("id") != mod_id]
+                self.catalog.remove(FAVORITES, mod_id)
                 self.save_favorite_mods()
                 self.show_message(f"💔 Mod '{mod_name}' removido de favoritos", "info")
             else:
                 # Agregar a favoritos
-                self.favorite_mods.append(mod)
+                self.catalog.add(FAVORITES, mod)
                 self.save_favorite_mods()
                 self.show_message(f"⭐ Mod '{mod_name}' agregado a favoritos", "success")
             
-            # Actualizar visualización
-            self.refresh_mods_display()
-            self.update_stats()
-            
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error al alternar favorito: {e}")
@@ -1207,7 +1450,7 @@ class ModsPanel(ctk.CTkFrame):
     
     def update_mods_ids_entry(self):
         """Actualizar el campo de IDs de mods"""
-        mod_ids = [mod.get("id", "") for mod in self.installed_mods if mod.get("id")]
+        mod_ids = [mod_id for mod_id in self.catalog.ids(INSTALLED) if mod_id]
         ids_text = ",".join(mod_ids)
         
         self.mods_ids_entry.delete(0, "end")
@@ -1215,20 +1458,65 @@ class ModsPanel(ctk.CTkFrame):
             self.mods_ids_entry.insert(0, ids_text)
             
     def apply_mods_to_server(self):
-        """Aplicar mods al servidor"""
+        """Aplicar mods al servidor comprobando dependencias y orden de carga"""
         try:
             # Obtener IDs de mods instalados
-            mod_ids = [str(mod.get("id", "")) for mod in self.installed_mods if mod.get("id")]
+            mod_ids = [mod_id for mod_id in self.catalog.ids(INSTALLED) if mod_id]
             
             if not mod_ids:
                 self.show_message("⚠️ No hay mods instalados para aplicar", "warning")
                 return
             
-            # Actualizar entrada de IDs
+            self.search_status_label.configure(text="🔎 Comprobando dependencias de mods...")
+            threading.Thread(target=self._resolve_mods_thread, args=(mod_ids,), daemon=True).start()
+            
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error al aplicar mods: {e}")
+            self.show_message(f"❌ Error al aplicar mods: {e}", "error")
+    
+    def _resolve_mods_thread(self, mod_ids):
+        """Hilo para resolver dependencias (la caché del cliente evita repetir consultas)"""
+        try:
+            result = self.dependency_resolver.resolve(mod_ids)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error al resolver dependencias: {e}")
+            result = None
+        self.after(0, lambda: self.on_mods_resolved(mod_ids, result))
+    
+    def on_mods_resolved(self, mod_ids, result):
+        """Completar dependencias, ordenar y guardar los mods del servidor/mapa"""
+        try:
+            self.search_status_label.configure(text="")
+            order = mod_ids
+            if result is not None:
+                if result["missing"]:
+                    lines = "\n".join(self.dependency_resolver.describe({**result, "cycles": [], "conflicts": [], "unknown": []}))
+                    if messagebox.askyesno("Dependencias faltantes",
+                                           f"{lines}\n\n¿Añadir las {len(result['missing'])} dependencias a los mods instalados?"):
+                        for dep_id in result["missing"]:
+                            mod = {"id": dep_id, "name": result["names"].get(dep_id, f"Mod {dep_id}")}
+                            self.catalog.add(INSTALLED, mod)
+                        # Volver a resolver con la lista completa
+                        self.apply_mods_to_server()
+                        return
+                problems = self.dependency_resolver.describe({**result, "missing": {}})
+                if problems:
+                    self.logger.warning("Problemas en la lista de mods: " + "; ".join(problems))
+                    messagebox.showwarning("Mods con problemas", "\n".join(problems))
+                order = result["order"]
+            
+            # Guardar el orden de carga en la lista de instalados y en la configuración
+            if order != mod_ids:
+                self.installed_mods = [self.catalog.get(mod_id) for mod_id in order]
+                self.refresh_mods_display()
+            # El manifiesto es lo que se usa al arrancar el servidor
+            self.save_installed_mods()
             self.mods_ids_entry.delete(0, "end")
-            self.mods_ids_entry.insert(0, ",".join(mod_ids))
+            self.mods_ids_entry.insert(0, ",".join(order))
             
-            self.show_message(f"✅ {len(mod_ids)} mods aplicados al servidor", "success")
+            self.show_message(f"✅ {len(order)} mods aplicados al servidor", "success")
             
         except Exception as e:
             if self.logger:
@@ -1238,16 +1526,16 @@ class ModsPanel(ctk.CTkFrame):
     def clear_mods(self):
         """Limpiar todos los mods"""
         try:
-            if not self.installed_mods:
+            if not self.catalog.count(INSTALLED):
                 self.show_message("ℹ️ No hay mods instalados para limpiar", "info")
                 return
             
             # Confirmar acción
             if messagebox.askyesno("Confirmar Limpieza", 
-                                  f"¿Estás seguro de que quieres remover todos los {len(self.installed_mods)} mods instalados?"):
+                                  f"¿Estás seguro de que quieres remover todos los {self.catalog.count(INSTALLED)} mods instalados?"):
                 
                 # Limpiar lista de instalados
-                self.installed_mods.clear()
+                self.catalog.clear(INSTALLED)
                 self.save_installed_mods()
                 
                 # Limpiar entrada de IDs
@@ -1309,12 +1597,18 @@ class ModsPanel(ctk.CTkFrame):
     def update_server_map_context(self, server_name, map_name):
         """Actualizar contexto de servidor y mapa"""
         try:
+            previous_key = self.get_mods_key()
             self.current_server = server_name
             self.current_map = map_name
             
             # Guardar contexto actual
             self.save_current_server_map()
             
+            # Cargar la lista del nuevo servidor/mapa desde el manifiesto en memoria
+            if self.get_mods_key() != previous_key:
+                self.load_installed_mods()
+                self.update_mods_ids_entry()
+            
             # Actualizar visualización
             self.refresh_mods_display()
             self.update_stats()
@@ -1336,10 +1630,7 @@ class ModsPanel(ctk.CTkFrame):
                     "timestamp": datetime.now().isoformat()
                 }
                 
-                # Guardar en archivo
-                context_file = os.path.join(self.get_data_directory(), "current_server_map.json")
-                with open(context_file, 'w', encoding='utf-8') as f:
-                    json.dump(context_data, f, indent=2, ensure_ascii=False)
+                self.state_store.mods.set_context(context_data)
                     
                 if self.logger:
                     self.logger.info(f"Contexto guardado: {self.current_server} - {self.current_map}")
@@ -1350,26 +1641,20 @@ class ModsPanel(ctk.CTkFrame):
     
     def get_mods_key(self):
         """Obtener clave para mods del servidor/mapa actual"""
-        if self.current_server and self.current_map:
-            return f"{self.current_server}_{self.current_map}"
-        return "default"
+        return manifest_key(self.current_server, self.current_map)
     
     def load_installed_mods(self):
         """Cargar mods instalados del servidor/mapa actual"""
         try:
             mods_key = self.get_mods_key()
-            mods_file = os.path.join(self.get_data_directory(), f"installed_mods_{mods_key}.json")
+            self.installed_mods = self.manifest.get(mods_key)
             
-            if os.path.exists(mods_file):
-                with open(mods_file, 'r', encoding='utf-8') as f:
-                    self.installed_mods = json.load(f)
-                    
+            if self.installed_mods:
                 if self.logger:
-                    self.logger.info(f"Mods instalados cargados: {len(self.installed_mods)} mods para {mods_key}")
+                    self.logger.info(f"Mods instalados cargados: {self.catalog.count(INSTALLED)} mods para {mods_key}")
             else:
-                self.installed_mods = []
                 if self.logger:
-                    self.logger.info(f"No se encontró archivo de mods instalados para {mods_key}")
+                    self.logger.info(f"No hay mods instalados registrados para {mods_key}")
                     
         except Exception as e:
             if self.logger:
@@ -1380,13 +1665,10 @@ class ModsPanel(ctk.CTkFrame):
         """Guardar mods instalados del servidor/mapa actual"""
         try:
             mods_key = self.get_mods_key()
-            mods_file = os.path.join(self.get_data_directory(), f"installed_mods_{mods_key}.json")
-            
-            with open(mods_file, 'w', encoding='utf-8') as f:
-                json.dump(self.installed_mods, f, indent=2, ensure_ascii=False)
+            changed = self.manifest.set(mods_key, self.installed_mods)
                 
             if self.logger:
-                self.logger.info(f"Mods instalados guardados: {len(self.installed_mods)} mods para {mods_key}")
+                self.logger.info(f"Mods instalados guardados: {self.catalog.count(INSTALLED)} mods para {mods_key} ({changed} filas modificadas)")
                 
         except Exception as e:
             if self.logger:
@@ -1395,18 +1677,14 @@ class ModsPanel(ctk.CTkFrame):
     def load_favorite_mods(self):
         """Cargar mods favoritos (globales)"""
         try:
-            favorites_file = os.path.join(self.get_data_directory(), "favorite_mods.json")
+            self.favorite_mods = self.state_store.mods.get_favorites()
             
-            if os.path.exists(favorites_file):
-                with open(favorites_file, 'r', encoding='utf-8') as f:
-                    self.favorite_mods = json.load(f)
-                    
+            if self.favorite_mods:
                 if self.logger:
-                    self.logger.info(f"Mods favoritos cargados: {len(self.favorite_mods)} mods")
+                    self.logger.info(f"Mods favoritos cargados: {self.catalog.count(FAVORITES)} mods")
             else:
-                self.favorite_mods = []
                 if self.logger:
-                    self.logger.info("No se encontró archivo de mods favoritos")
+                    self.logger.info("No hay mods favoritos registrados")
                     
         except Exception as e:
             if self.logger:
@@ -1416,13 +1694,10 @@ class ModsPanel(ctk.CTkFrame):
     def save_favorite_mods(self):
         """Guardar mods favoritos (globales)"""
         try:
-            favorites_file = os.path.join(self.get_data_directory(), "favorite_mods.json")
-            
-            with open(favorites_file, 'w', encoding='utf-8') as f:
-                json.dump(self.favorite_mods, f, indent=2, ensure_ascii=False)
+            self.state_store.mods.set_favorites(self.favorite_mods)
                 
             if self.logger:
-                self.logger.info(f"Mods favoritos guardados: {len(self.favorite_mods)} mods")
+                self.logger.info(f"Mods favoritos guardados: {self.catalog.count(FAVORITES)} mods")
                 
         except Exception as e:
             if self.logger:
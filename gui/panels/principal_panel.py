@@ -9,7 +9,12 @@ from utils.config_manager import ConfigManager
 from utils.app_settings import AppSettings
 import threading
 import requests
-import configparser
+from utils.ini_document import IniDocument
+from utils.mod_dependencies import parse_mod_ids
+from utils.mod_manifest import get_mod_manifest, manifest_key
+from utils.launch_profile import get_launch_profiles, LaunchProfileError
+from utils.config_versions import get_version_store
+from utils.port_allocator import PortAllocator, profile_ports
 from datetime import datetime
 
 class PrincipalPanel:
@@ -31,6 +36,11 @@ class PrincipalPanel:
         self.selected_server = None
         self.selected_map = None
         
+        # Perfiles de arranque compilados por servidor (los usan el inicio manual y los reinicios)
+        self.launch_profiles = get_launch_profiles(self.logger)
+        # Puertos de todas las instancias: conflictos al arrancar y puertos libres para las nuevas
+        self.port_allocator = PortAllocator(self.launch_profiles, logger=self.logger)
+        
         # Crear widgets
         self.create_widgets()
         
@@ -246,6 +256,13 @@ class PrincipalPanel:
             if hasattr(self.main_window, 'rcon_panel'):
                 self.main_window.rcon_panel.refresh_password_from_config()
             
+            # Validar y compilar el perfil de arranque con los valores guardados
+            compiled = self.compile_launch_profile()
+            for message in compiled["errors"]:
+                self.show_message(f"❌ {message}", "error")
+            for message in compiled["warnings"]:
+                self.show_message(f"⚠️ {message}", "warning")
+            
             # Mostrar mensaje de éxito
             self.show_message("✅ Configuración guardada correctamente", "success")
             
@@ -321,121 +338,28 @@ class PrincipalPanel:
     
     def _update_ini_file_preserving_content(self, file_path, sections_to_update):
         """Actualizar archivo INI preservando capitalización original y contenido existente"""
-        if not os.path.exists(file_path):
-            # Si el archivo no existe, crearlo con la capitalización proporcionada
-            try:
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    for section_name, section_data in sections_to_update.items():
-                        f.write(f"[{section_name}]\n")
-                        for key, value in section_data.items():
-                            if value is not None:
-                                f.write(f"{key}={value}\n")
-                        f.write("\n")
-                if self.logger and self.logger.should_log_debug():
-                    self.logger.info(f"DEBUG: Nuevo archivo creado: {file_path}")
-                return
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"Error creando archivo {file_path}: {e}")
-                return
-        
         try:
-            # Leer archivo línea por línea preservando la estructura
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            updated_lines = []
-            current_section = None
-            processed_keys = {}  # Para evitar duplicados
+            # El documento conserva el resto del archivo; solo cambian las claves indicadas
+            document = IniDocument.load(file_path)
             
-            for line in lines:
-                original_line = line.rstrip('\n\r')
-                
-                # Detectar secciones
-                if original_line.strip().startswith('[') and original_line.strip().endswith(']'):
-                    current_section = original_line.strip()[1:-1]
-                    processed_keys[current_section] = set()
-                    updated_lines.append(line)
-                    continue
-                
-                # Si estamos en una sección que queremos actualizar
-                if current_section and current_section in sections_to_update:
-                    section_data = sections_to_update[current_section]
-                    
-                    # Buscar si esta línea contiene una clave que queremos actualizar
-                    if '=' in original_line:
-                        existing_key = original_line.split('=', 1)[0].strip()
-                        existing_key_lower = existing_key.lower()
-                        
-                        # Buscar si tenemos una actualización para esta clave
-                        update_key = None
-                        for update_k, update_v in section_data.items():
-                            if update_k.lower() == existing_key_lower:
-                                update_key = update_k
-                                break
-                        
-                        if update_key and existing_key_lower not in processed_keys[current_section]:
-                            # Actualizar usando la capitalización ORIGINAL del archivo
-                            new_value = section_data[update_key]
-                            if new_value is not None:
-                                updated_lines.append(f"{existing_key}={new_value}\n")
-                                if self.logger and self.logger.should_log_debug():
-                                    self.logger.info(f"DEBUG: Actualizado preservando capitalización: {existing_key} = {new_value}")
-                            # Marcar como procesado
-                            processed_keys[current_section].add(existing_key_lower)
-                            continue
-                        elif existing_key_lower in processed_keys[current_section]:
-                            # Esta clave ya fue procesada, eliminar duplicado
-                            if self.logger and self.logger.should_log_debug():
-                                self.logger.info(f"DEBUG: Eliminando duplicado: {existing_key}")
-                            continue
-                
-                # Línea normal, mantener tal como está
-                updated_lines.append(line)
-            
-            # Agregar claves nuevas que no existían
             for section_name, section_data in sections_to_update.items():
-                if section_name not in processed_keys:
-                    # Sección nueva
-                    updated_lines.append(f"\n[{section_name}]\n")
-                    for key, value in section_data.items():
-                        if value is not None:
-                            updated_lines.append(f"{key}={value}\n")
-                            if self.logger and self.logger.should_log_debug():
-                                self.logger.info(f"DEBUG: Nueva sección creada: [{section_name}] {key} = {value}")
-                else:
-                    # Agregar claves que no se encontraron en sección existente
-                    section_end = len(updated_lines)
-                    section_start = -1
-                    
-                    # Encontrar dónde está la sección
-                    for i, line in enumerate(updated_lines):
-                        if line.strip() == f"[{section_name}]":
-                            section_start = i
-                            # Encontrar el final de esta sección
-                            for j in range(i + 1, len(updated_lines)):
-                                if updated_lines[j].strip().startswith('['):
-                                    section_end = j
-                                    break
-                            break
-                    
-                    # Insertar claves nuevas
-                    for key, value in section_data.items():
-                        key_lower = key.lower()
-                        if (key_lower not in processed_keys[section_name] and 
-                            value is not None):
-                            updated_lines.insert(section_end, f"{key}={value}\n")
-                            if self.logger and self.logger.should_log_debug():
-                                self.logger.info(f"DEBUG: Nueva clave agregada: {key} = {value}")
-                            section_end += 1
-            
-            # Escribir archivo actualizado
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(updated_lines)
-            
-            if self.logger and self.logger.should_log_debug():
-                self.logger.info(f"DEBUG: Archivo actualizado preservando capitalización: {file_path}")
+                for key, value in section_data.items():
+                    if value is None:
+                        continue
+                    if len(document.get_all(section_name, key)) > 1:
+                        # Clave duplicada: dejar una sola aparición con el nuevo valor
+                        if self.logger and self.logger.should_log_debug():
+                            self.logger.info(f"DEBUG: Eliminando duplicado: {key}")
+                        document.remove_option(section_name, key)
+                    # Si la clave ya existe se conserva su capitalización original
+                    document.set(section_name, key, value)
+            
+            versions = get_version_store(self.logger)
+            versions.track(file_path)  # Estado previo (por si se editó fuera)
+            if document.save():
+                versions.track(file_path)
+                if self.logger and self.logger.should_log_debug():
+                    self.logger.info(f"DEBUG: Archivo actualizado preservando capitalización: {file_path}")
                 
         except Exception as e:
             if self.logger:
@@ -470,15 +394,8 @@ class PrincipalPanel:
             if not os.path.exists(gameusersettings_path):
                 return
             
-            # Leer archivo
-            config = configparser.ConfigParser()
-            config.optionxform = str  # Preservar mayúsculas/minúsculas
-            try:
-                config.read(gameusersettings_path, encoding='utf-8')
-            except configparser.DuplicateOptionError as e:
-                if self.logger:
-                    self.logger.warning(f"Error leyendo GameUserSettings.ini: {e}")
-                return
+            # Leer archivo (tolera claves duplicadas)
+            config = IniDocument.load(gameusersettings_path)
             
             # Cargar valores en los campos
             if config.has_section('ServerSettings'):
@@ -549,8 +466,20 @@ class PrincipalPanel:
             self.logger.error(f"Error al cargar configuración: {e}")
             self.show_message(f"❌ Error al cargar: {str(e)}", "error")
     
-    def start_server_with_config(self, capture_console=False):
-        """Iniciar servidor con la configuración actual"""
+    def start_server_with_config(self, capture_console=False, interactive=True, on_launched=None):
+        """
+        Iniciar servidor con la configuración actual
+        
+        Args:
+            interactive: Si hay problemas con los mods, preguntar antes de iniciar
+                (False en arranques desatendidos: solo se avisa en el log)
+            on_launched: Recibe True/False cuando termina el intento de arranque
+                (la comprobación de mods es asíncrona)
+        """
+        def finish(started):
+            if on_launched:
+                on_launched(started)
+        
         # Obtener servidor y mapa desde main_window
         selected_server = None
         selected_map = None
@@ -568,20 +497,39 @@ class PrincipalPanel:
         # Verificar si hay un servidor seleccionado
         if not selected_server:
             self.show_message("❌ Debe seleccionar un servidor primero", "error")
+            finish(False)
             return
         
         # Verificar si hay un mapa seleccionado
         if not selected_map:
             self.show_message("❌ Debe seleccionar un mapa primero", "error")
+            finish(False)
             return
         
         # Guardar configuración antes de iniciar
         self.save_configuration()
         
-        # Construir argumentos del servidor
-        server_args = self.build_server_arguments()
+        # Argumentos del perfil compilado (no se arranca con un perfil inválido)
+        compiled = self.compile_launch_profile()
+        if compiled["errors"]:
+            self.show_message("❌ El perfil de arranque tiene errores, corrígelos antes de iniciar", "error")
+            finish(False)
+            return
+        server_args = compiled["args"]
         
-        # Iniciar servidor con argumentos personalizados
+        # Puertos y dependencias de mods antes de un arranque de varios minutos
+        self.check_launch_then(selected_server, server_args, lambda: finish(self._launch_server(
+            selected_server, selected_map, server_args, capture_console, compiled["env"])), interactive,
+            on_cancel=lambda: finish(False))
+    
+    def _launch_server(self, selected_server, selected_map, server_args, capture_console, env=None):
+        """
+        Iniciar servidor con argumentos personalizados
+        
+        Returns:
+            bool: True si el proceso del servidor quedó en ejecución
+        """
+        started = False
         try:
             self.show_message(f"🚀 Iniciando servidor {selected_server} con mapa {selected_map}", "info")
             
@@ -590,13 +538,15 @@ class PrincipalPanel:
             
             # Llamar al método de inicio del servidor con argumentos personalizados
             if self.server_manager:
-                self.server_manager.start_server_with_args(
+                started = self.server_manager.start_server_with_args(
                     self.add_status_message, 
                     selected_server, 
                     selected_map, 
                     server_args,
-                    capture_console
+                    capture_console,
+                    env
                 )
+                self._mark_mods_current(selected_server, selected_map)
                 
                 # También notificar al main window si hay uno
                 if hasattr(self, 'main_window') and self.main_window and hasattr(self.main_window, 'server_panel'):
@@ -605,9 +555,17 @@ class PrincipalPanel:
         except Exception as e:
             self.logger.error(f"Error al iniciar servidor: {e}")
             self.show_message(f"❌ Error al iniciar servidor: {str(e)}", "error")
+        return started
     
-    def restart_server_with_config(self, capture_console=False):
-        """Reiniciar servidor con la configuración actual"""
+    def _mark_mods_current(self, selected_server, selected_map):
+        """Al arrancar, el servidor descarga las versiones actuales de sus mods"""
+        mods_panel = getattr(self.main_window, 'mods_panel', None)
+        tracker = getattr(mods_panel, 'update_tracker', None)
+        if tracker:
+            tracker.mark_restarted(selected_server, selected_map)
+    
+    def restart_server_with_config(self, capture_console=False, interactive=True):
+        """Reiniciar servidor con la configuración actual (interactive: ver start_server_with_config)"""
         # Obtener servidor y mapa desde main_window
         selected_server = None
         selected_map = None
@@ -635,10 +593,19 @@ class PrincipalPanel:
         # Guardar configuración antes de reiniciar
         self.save_configuration()
         
-        # Construir argumentos del servidor
-        server_args = self.build_server_arguments()
+        # Argumentos del perfil compilado (no se arranca con un perfil inválido)
+        compiled = self.compile_launch_profile()
+        if compiled["errors"]:
+            self.show_message("❌ El perfil de arranque tiene errores, corrígelos antes de reiniciar", "error")
+            return
+        server_args = compiled["args"]
         
-        # Reiniciar servidor con argumentos personalizados
+        # Puertos y dependencias de mods antes de un arranque de varios minutos
+        self.check_launch_then(selected_server, server_args, lambda: self._relaunch_server(
+            selected_server, selected_map, server_args, capture_console, compiled["env"]), interactive)
+    
+    def _relaunch_server(self, selected_server, selected_map, server_args, capture_console, env=None):
+        """Reiniciar servidor con argumentos personalizados"""
         try:
             self.show_message(f"🔄 Reiniciando servidor {selected_server} con mapa {selected_map}", "info")
             
@@ -649,8 +616,10 @@ class PrincipalPanel:
                     selected_server, 
                     selected_map, 
                     server_args,
-                    capture_console
+                    capture_console,
+                    env
                 )
+                self._mark_mods_current(selected_server, selected_map)
                 
                 # También notificar al main window si hay uno
                 if hasattr(self, 'main_window') and self.main_window and hasattr(self.main_window, 'server_panel'):
@@ -660,138 +629,181 @@ class PrincipalPanel:
             self.logger.error(f"Error al reiniciar servidor: {e}")
             self.show_message(f"❌ Error al reiniciar servidor: {str(e)}", "error")
     
-    def build_server_arguments(self):
-        """Construir argumentos del servidor basados en la configuración"""
-        # 1. Obtener el mapa seleccionado (desde el dropdown de la ventana principal)
-        selected_map = None
-        if hasattr(self.main_window, 'selected_map') and self.main_window.selected_map:
-            selected_map = self.main_window.selected_map
-        elif self.selected_map:
-            selected_map = self.selected_map
+    def check_launch_then(self, server_name, server_args, action, interactive=True, on_cancel=None):
+        """
+        Comprobaciones comunes a todos los arranques: rechazar conflictos de
+        puertos y revisar las dependencias de mods antes de ejecutar `action`
+        """
+        if not self.check_port_conflicts(server_name):
+            if on_cancel:
+                on_cancel()
+            return
+        self.check_mods_then(server_args, action, interactive, on_cancel)
+    
+    def check_mods_then(self, server_args, action, interactive=True, on_cancel=None):
+        """
+        Comprobar en segundo plano las dependencias de los mods de -mods= y
+        ejecutar `action` si no hay problemas o el usuario decide continuar
+        (si no, `on_cancel`)
+        """
+        mods_arg = next((arg for arg in server_args if arg.startswith("-mods=")), "")
+        mod_ids = parse_mod_ids(mods_arg[len("-mods="):])
+        mods_panel = getattr(self.main_window, 'mods_panel', None)
+        resolver = getattr(mods_panel, 'dependency_resolver', None)
+        if not mod_ids or resolver is None:
+            action()
+            return
         
-        # Mapear nombres de mapas a sus identificadores técnicos
-        # NOTA: Incluimos todas las variantes posibles para máxima compatibilidad
-        map_identifiers = {
-            # IDENTIFICADORES CORRECTOS PARA ARK SURVIVAL ASCENDED:
-            "The Island": "TheIsland_WP",        # ✅ SÍ necesita _WP
-            "TheIsland": "TheIsland_WP",
-            "TheIsland_WP": "TheIsland_WP",
-            "The Center": "TheCenter_WP",        # ✅ SÍ necesita _WP (ASA)
-            "TheCenter": "TheCenter_WP",
-            "TheCenter_WP": "TheCenter_WP",
-            "Scorched Earth": "ScorchedEarth_WP", # ✅ SÍ necesita _WP
-            "ScorchedEarth": "ScorchedEarth_WP",
-            "ScorchedEarth_WP": "ScorchedEarth_WP",
-            "Ragnarok": "Ragnarok_WP",           # ✅ SÍ necesita _WP (ASA)
-            "Ragnarok_WP": "Ragnarok_WP",
-            "Aberration": "Aberration_P",        # ✅ Usa _P
-            "Aberration_P": "Aberration_P",
-            "Extinction": "Extinction",          # ✅ NO necesita _WP
-            "Valguero": "Valguero_P",           # ✅ Usa _P
-            "Valguero_P": "Valguero_P",
-            "Genesis: Part 1": "Genesis",        # ✅ NO necesita _WP
-            "Genesis1": "Genesis",
-            "Genesis": "Genesis",
-            "Crystal Isles": "CrystalIsles",     # ✅ NO necesita _WP
-            "CrystalIsles": "CrystalIsles",
-            "Genesis: Part 2": "Gen2",          # ✅ Abreviado a Gen2
-            "Genesis2": "Gen2",
-            "Gen2": "Gen2",
-            "Lost Island": "LostIsland",         # ✅ NO necesita _WP
-            "LostIsland": "LostIsland",
-            "Fjordur": "Fjordur",               # ✅ NO necesita _WP
-            "Modded Map": "ModdedMap",
-            "ModdedMap": "ModdedMap"
-        }
+        self.show_message(f"🔎 Comprobando dependencias de {len(mod_ids)} mods...", "info")
         
-        # Construir el argumento base del mapa siguiendo el formato correcto
-        # Solo mostrar logs de debug en desarrollo
-        if self.logger.should_log_debug():
-            self.logger.info(f"DEBUG: Mapa seleccionado: '{selected_map}' (tipo: {type(selected_map)}, len: {len(selected_map) if selected_map else 'N/A'})")
-            self.logger.info(f"DEBUG: Mapas disponibles: {list(map_identifiers.keys())}")
-            self.logger.info(f"DEBUG: ¿Mapa es None?: {selected_map is None}")
-            self.logger.info(f"DEBUG: ¿Mapa en diccionario?: {selected_map in map_identifiers if selected_map else 'N/A'}")
-            
-            # Debug más específico: comparar caractér por caractér
-            if selected_map:
-                for key in map_identifiers.keys():
-                    if key == selected_map:
-                        self.logger.info(f"DEBUG: ✅ Coincidencia exacta encontrada con '{key}'")
-                    elif key.strip() == selected_map.strip():
-                        self.logger.info(f"DEBUG: ⚠️ Coincidencia con espacios: '{key}' vs '{selected_map}'")
-                
-        if selected_map and selected_map in map_identifiers:
-            map_identifier = map_identifiers[selected_map]
-            if self.logger.should_log_debug():
-                self.logger.info(f"DEBUG: ✅ Mapa encontrado. Usando identificador: {map_identifier}")
-        else:
-            # Mapa por defecto si no hay selección
-            map_identifier = "TheIsland_WP"
-            if self.logger.should_log_debug():
-                self.logger.info(f"DEBUG: ❌ Mapa no encontrado o vacío. Razón: selected_map='{selected_map}', en diccionario={selected_map in map_identifiers if selected_map else False}. Usando por defecto: TheIsland_WP")
+        def worker():
+            try:
+                result = resolver.resolve(mod_ids)
+            except Exception as e:
+                self.logger.error(f"Error al comprobar dependencias de mods: {e}")
+                result = None
+            self.parent.after(0, lambda: self._on_mods_checked(resolver, mod_ids, result, action, interactive, on_cancel))
         
-        # 2. Obtener mods configurados (buscar por servidor/mapa específico primero)
-        # Obtener servidor seleccionado
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _on_mods_checked(self, resolver, mod_ids, result, action, interactive=True, on_cancel=None):
+        """Avisar de los problemas de mods y preguntar antes de arrancar"""
+        if result is not None:
+            if result["order"] != mod_ids:
+                self.show_message(f"💡 Orden de carga recomendado: {','.join(result['order'])} (Mods → Aplicar al Servidor)", "info")
+            if resolver.has_problems(result):
+                problems = resolver.describe(result)
+                for line in problems:
+                    self.show_message(line, "warning")
+                if interactive and not messagebox.askyesno(
+                    "Problemas con los mods",
+                    "\n".join(problems) + "\n\nEl servidor probablemente fallará tras el arranque. ¿Iniciar de todos modos?"
+                ):
+                    self.show_message("⏹️ Inicio cancelado por problemas con los mods", "info")
+                    if on_cancel:
+                        on_cancel()
+                    return
+            elif result["unknown"]:
+                self.logger.warning(f"No se pudieron comprobar {len(result['unknown'])} mods: {', '.join(result['unknown'])}")
+        action()
+    
+    def collect_launch_profile(self):
+        """Datos del perfil de arranque a partir de la interfaz y del manifiesto de mods"""
         selected_server = None
         if hasattr(self.main_window, 'selected_server') and self.main_window.selected_server:
             selected_server = self.main_window.selected_server
         elif self.selected_server:
             selected_server = self.selected_server
-            
-        server_map_key = f"{selected_server}_{selected_map}" if selected_server and selected_map else "default"
-        mod_ids = self.config_manager.get("server", f"mod_ids_{server_map_key}", "").strip()
+        
+        selected_map = None
+        if hasattr(self.main_window, 'selected_map') and self.main_window.selected_map:
+            selected_map = self.main_window.selected_map
+        elif self.selected_map:
+            selected_map = self.selected_map
+        
+        # El manifiesto de mods (lo que muestra el panel de mods) es la fuente de la lista
+        server_map_key = manifest_key(selected_server, selected_map)
+        manifest = get_mod_manifest(self.logger)
+        if manifest.has(server_map_key):
+            mod_ids = ",".join(manifest.ids(server_map_key))
+        else:
+            # Listas guardadas en config.ini por versiones anteriores
+            mod_ids = self.config_manager.get("server", f"mod_ids_{server_map_key}", "").strip()
         
         # Fallback a la configuración general si no hay específica
         if not mod_ids:
             mod_ids = self.config_manager.get("server", "mod_ids", "").strip()
         
-        # 3. Construir la lista final con argumentos separados
-        # El primer argumento debe ser el mapa con todos sus parámetros concatenados
-        map_arg = map_identifier + "?listen"
-        
-        # Agregar los parámetros de configuración al argumento del mapa
-        # Port
-        port = self.port_entry.get() or "7777"
-        map_arg += f"?Port={port}"
-        
-        # QueryPort
-        query_port = self.query_port_entry.get() or "27015"
-        map_arg += f"?QueryPort={query_port}"
-        
-        # MultiHome
-        multihome = self.multihome_entry.get() or "127.0.0.1"
-        map_arg += f"?MultiHome={multihome}"
-        
-        # Argumentos personalizados
-        custom_args = self.custom_args_text.get("1.0", "end-1c").strip()
-        if custom_args:
-            for line in custom_args.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('#'):  # Ignorar líneas vacías y comentarios
-                    # Si la línea ya comienza con ?, la agregamos tal como está
-                    if line.startswith('?'):
-                        map_arg += line
-                    else:
-                        # Si no, agregamos el ? al principio
-                        map_arg += f"?{line}"
-        
-        # RCON
-        if hasattr(self.main_window, 'rcon_panel') and self.main_window.rcon_panel.get_rcon_enabled():
-            rcon_port = self.main_window.rcon_panel.get_rcon_port()
-            map_arg += "?EnableRCON=True"
-            map_arg += f"?RCONPort={rcon_port}"
-        
-        # Construir la lista final
-        args = [map_arg, "-server", "-log"]
-        
-        # 4. Agregar mods si existen
-        if mod_ids:
-            args.append(f"-mods={mod_ids}")
-        
-        if self.logger.should_log_debug():
-            self.logger.info(f"DEBUG: Argumentos finales generados: {args}")
-        
-        return args
+        rcon_panel = getattr(self.main_window, 'rcon_panel', None)
+        rcon_enabled = bool(rcon_panel and rcon_panel.get_rcon_enabled())
+        
+        # El entorno no se edita en esta pestaña: se conserva el del perfil guardado
+        previous = self.launch_profiles.get(selected_server or "default") or {}
+        
+        return {
+            "server": selected_server,
+            "map": selected_map,
+            "port": self.port_entry.get(),
+            "query_port": self.query_port_entry.get(),
+            "multihome": self.multihome_entry.get(),
+            "rcon_enabled": rcon_enabled,
+            "rcon_port": rcon_panel.get_rcon_port() if rcon_enabled else None,
+            "mods": mod_ids,
+            "custom_args": self.custom_args_text.get("1.0", "end-1c"),
+            "env": previous.get("env", {}),
+        }
+    
+    def compile_launch_profile(self):
+        """
+        Actualizar el perfil de arranque del servidor seleccionado
+        
+        Solo se valida y compila de nuevo si algo cambió desde la última vez.
+        
+        Returns:
+            dict: {args, env, errors, warnings, fingerprint}
+        """
+        profile = self.collect_launch_profile()
+        compiled, changes = self.launch_profiles.update(profile["server"] or "default", profile)
+        if changes and self.logger.should_log_debug():
+            self.logger.info(f"DEBUG: Perfil de arranque recompilado ({', '.join(changes)}): {compiled['args']}")
+        return compiled
+    
+    def build_server_arguments(self):
+        """
+        Construir argumentos del servidor basados en la configuración
+        
+        Raises:
+            LaunchProfileError: Si el perfil tiene errores que impedirían el arranque
+        """
+        compiled = self.compile_launch_profile()
+        if compiled["errors"]:
+            raise LaunchProfileError(compiled["errors"])
+        return compiled["args"]
+    
+    def _own_server_pids(self):
+        """Procesos del servidor gestionado (al reiniciar, sus puertos son los propios)"""
+        pid = getattr(self.server_manager, 'server_pid', None) if self.server_manager else None
+        return {pid} if pid else set()
+    
+    def check_port_conflicts(self, server_name):
+        """Comprobar que los puertos del perfil no los usa otro servidor ni otro proceso"""
+        ports = profile_ports(self.launch_profiles.get(server_name) or {})
+        conflicts = self.port_allocator.conflicts(server_name, ports, ignore_pids=self._own_server_pids())
+        for conflict in conflicts:
+            self.show_message(f"❌ Conflicto de puertos: {conflict}", "error")
+        return not conflicts
+    
+    def apply_server_ports(self, server_name):
+        """
+        Mostrar los puertos del servidor seleccionado
+        
+        Se usan los de su perfil; un servidor sin perfil cuyos puertos actuales
+        ya usa otra instancia recibe puertos libres.
+        """
+        rcon_panel = getattr(self.main_window, 'rcon_panel', None)
+        profile = self.launch_profiles.get(server_name)
+        if profile:
+            ports = profile_ports(profile)
+        else:
+            current = {"port": self.port_entry.get(), "query_port": self.query_port_entry.get()}
+            if rcon_panel and rcon_panel.get_rcon_enabled():
+                current["rcon_port"] = rcon_panel.get_rcon_port()
+            roles = list(current)
+            current = {role: int(value) for role, value in current.items() if str(value).strip().isdigit()}
+            if len(current) == len(roles) and not self.port_allocator.conflicts(
+                    server_name, current, ignore_pids=self._own_server_pids()):
+                return
+            ports = self.port_allocator.allocate(server_name, roles=roles)
+            self.show_message(f"🔌 Puertos libres asignados a {server_name}: "
+                              + ", ".join(f"{role}={port}" for role, port in ports.items()), "info")
+        
+        for role, entry in (("port", self.port_entry), ("query_port", self.query_port_entry)):
+            if role in ports:
+                entry.delete(0, "end")
+                entry.insert(0, str(ports[role]))
+        if "rcon_port" in ports and rcon_panel and hasattr(rcon_panel, 'port_entry'):
+            rcon_panel.port_entry.delete(0, "end")
+            rcon_panel.port_entry.insert(0, str(ports["rcon_port"]))
     
     def update_server_info(self, server_name, map_name):
         """Actualizar información del servidor seleccionado"""
@@ -800,6 +812,13 @@ class PrincipalPanel:
         
         # Cargar configuración específica del servidor desde GameUserSettings.ini
         self.load_from_gameusersettings()
+        
+        # Puertos propios de cada instancia
+        if server_name:
+            try:
+                self.apply_server_ports(server_name)
+            except Exception as e:
+                self.logger.error(f"Error al asignar puertos del servidor: {e}")
     
     def get_public_ip(self):
         """Obtener IP pública automáticamente"""
@@ -866,8 +885,9 @@ class PrincipalPanel:
     def preview_arguments(self):
         """Mostrar una vista previa de los argumentos que se generarán"""
         try:
-            # Construir argumentos
-            server_args = self.build_server_arguments()
+            # Construir argumentos (la vista previa se muestra también con errores)
+            compiled = self.compile_launch_profile()
+            server_args = compiled["args"]
             
             # Crear ventana de vista previa
             import customtkinter as ctk
@@ -894,6 +914,11 @@ class PrincipalPanel:
             
             # Formatear argumentos para mejor visualización
             args_formatted = ""
+            if compiled["errors"]:
+                args_formatted += "--- ERRORES (el servidor no se iniciará) ---\n"
+                args_formatted += "".join(f"❌ {error}\n" for error in compiled["errors"]) + "\n"
+            if compiled["warnings"]:
+                args_formatted += "".join(f"⚠️ {warning}\n" for warning in compiled["warnings"]) + "\n"
             for i, arg in enumerate(server_args):
                 args_formatted += f"Argumento {i+1}: {arg}\n"
             
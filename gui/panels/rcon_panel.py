@@ -4,6 +4,7 @@ import threading
 import os
 import json
 from pathlib import Path
+from utils.metrics_exporter import RconTimer
 
 
 class RconPanel(ctk.CTkFrame):
@@ -353,10 +354,10 @@ class RconPanel(ctk.CTkFrame):
         
         threading.Thread(target=_test, daemon=True).start()
     
-    def execute_rcon_command(self, command):
-        """Ejecutar comando RCON usando el ejecutable en la carpeta rcon"""
+    def execute_rcon_command(self, command, quiet=False):
+        """Ejecutar comando RCON usando el ejecutable en la carpeta rcon (quiet=True omite los logs de la UI)"""
         # Log del intento de ejecución
-        if hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
+        if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
             self.main_window.add_log_message(f"🎮 RCON: Ejecutando '{command}'...")
         
         try:
@@ -384,7 +385,7 @@ class RconPanel(ctk.CTkFrame):
                 error_msg = "❌ No se encontró ejecutable RCON"
                 search_info = "Buscado en: " + ", ".join([str(p) for p in search_paths])
                 self.logger.error(f"RCON executable not found. {search_info}")
-                if hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
+                if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
                     self.main_window.add_log_message(f"🔌 RCON Error: No se encontró ejecutable RCON")
                 return error_msg
             
@@ -398,15 +399,16 @@ class RconPanel(ctk.CTkFrame):
             
             self.logger.info(f"Ejecutando comando RCON: {' '.join(cmd[:-1])} [comando oculto]")
             
-            # Ejecutar comando sin mostrar ventana de consola
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=str(rcon_exe.parent),  # Usar el directorio del ejecutable encontrado
-                creationflags=subprocess.CREATE_NO_WINDOW  # Ocultar ventana DOS
-            )
+            # Ejecutar comando sin mostrar ventana de consola (midiendo latencia para métricas)
+            with RconTimer(getattr(self.main_window, 'metrics_exporter', None), command):
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                    cwd=str(rcon_exe.parent),  # Usar el directorio del ejecutable encontrado
+                    creationflags=subprocess.CREATE_NO_WINDOW  # Ocultar ventana DOS
+                )
             
             if result.returncode == 0:
                 # Registrar comando RCON exitoso
@@ -416,11 +418,11 @@ class RconPanel(ctk.CTkFrame):
                     success_msg += f" - Respuesta: {response[:50]}{'...' if len(response) > 50 else ''}"
                 
                 # Log en área principal
-                if hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
+                if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
                     self.main_window.add_log_message(success_msg)
                 
                 # Log en archivo
-                if hasattr(self, 'main_window') and hasattr(self.main_window, 'log_server_event'):
+                if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'log_server_event'):
                     self.main_window.log_server_event("rcon_command", 
                         command=command,
                         success=True,
@@ -434,11 +436,11 @@ class RconPanel(ctk.CTkFrame):
                 fail_msg = f"❌ RCON: '{command}' falló - {error_msg}"
                 
                 # Log en área principal
-                if hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
+                if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
                     self.main_window.add_log_message(fail_msg)
                 
                 # Log en archivo
-                if hasattr(self, 'main_window') and hasattr(self.main_window, 'log_server_event'):
+                if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'log_server_event'):
                     self.main_window.log_server_event("rcon_command", 
                         command=command,
                         success=False,
@@ -448,13 +450,13 @@ class RconPanel(ctk.CTkFrame):
                 
         except subprocess.TimeoutExpired:
             timeout_msg = f"⏱️ RCON Timeout: '{command}' tardó demasiado en ejecutarse"
-            if hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
+            if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
                 self.main_window.add_log_message(timeout_msg)
             return "❌ Timeout: El comando tardó demasiado en ejecutarse"
         except Exception as e:
             self.logger.error(f"Error al ejecutar comando RCON: {e}")
             error_msg = f"🔌 RCON Error: '{command}' - Error de conexión: {str(e)}"
-            if hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
+            if not quiet and hasattr(self, 'main_window') and hasattr(self.main_window, 'add_log_message'):
                 self.main_window.add_log_message(error_msg)
             return f"❌ Error al ejecutar comando: {e}"
     
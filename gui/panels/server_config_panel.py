@@ -1,6 +1,11 @@
 import customtkinter as ctk
-import configparser
+from utils.ini_document import IniDocument
+from utils.ini_search import IniSearchIndex
+from utils.settings_catalog import get_schema
+from utils.config_versions import get_version_store
+from utils.bulk_config import BulkConfigEngine, CONFIG_SUBDIR
 import os
+import threading
 import subprocess
 import platform
 import time
@@ -24,9 +29,25 @@ class ServerConfigPanel(ctk.CTkFrame):
         self.current_server_path = None
         
         # Diccionarios para almacenar datos
-        self.config_data = {}  # {file_type: configparser_object}
+        self.config_data = {}  # {file_type: IniDocument}
         self.config_widgets = {}  # {file_type: {section: {key: widget}}}
+        self.config_lines = {}  # {file_type: {section: {key: IniLine}}}
         self.filtered_widgets = {}  # Para el filtro de búsqueda
+        self.pending_rows = {}  # {file_type: {section: [(key, IniLine), ...]}} aún sin widget
+        self.rows_per_batch = 40  # Filas creadas por sección en cada tanda
+        self.section_frames = {}  # {file_type: [frames de sección en orden]}
+        
+        # Búsqueda indexada; los widgets de resultados se reutilizan entre búsquedas
+        self.search_index = IniSearchIndex()
+        self.schema = get_schema()
+        self.results_frames = {}  # {file_type: frame de resultados}
+        self.result_rows = {}  # {file_type: {(sección, clave): (frame, etiqueta_rango, etiqueta_info)}}
+        # Los widgets de resultados no sustituyen a los de las secciones: sus ediciones se copian
+        self.search_widgets = {}  # {file_type: {(sección, clave): widget}}
+        self.search_edits = {}  # {file_type: {(sección, clave): valor}} de filas aún sin widget
+        self.max_search_results = 150
+        # INI del resto de servidores ya indexados: {(servidor, archivo): mtime}
+        self.indexed_mtimes = {}
         
         # Filtro de búsqueda
         self.search_filter = ""
@@ -120,6 +141,15 @@ class ServerConfigPanel(ctk.CTkFrame):
         )
         clear_button.grid(row=0, column=2, padx=5, pady=5)
         
+        # Ámbito: solo el servidor seleccionado o todos los servidores de la ruta raíz
+        self.search_scope_menu = ctk.CTkOptionMenu(
+            search_frame,
+            values=["Este servidor", "Todos los servidores"],
+            command=lambda _: self.apply_search_filter(self.search_filter) if self.search_filter else None,
+            width=160
+        )
+        self.search_scope_menu.grid(row=0, column=3, padx=5, pady=5)
+        
         # 3. Botones de acción
         buttons_frame = ctk.CTkFrame(self)
         buttons_frame.grid(row=2, column=0, padx=10, pady=5, sticky="ew")
@@ -188,6 +218,62 @@ class ServerConfigPanel(ctk.CTkFrame):
         if self.ini_types:
             self.current_tab_type = list(self.ini_types.keys())[0]
     
+    def index_all_servers(self, root_path):
+        """
+        Indexar en segundo plano los INI de los demás servidores de la ruta raíz
+        
+        Solo se vuelven a leer los archivos cuya fecha de modificación cambió;
+        los del servidor actual los indexa load_ini_file con el documento en edición.
+        """
+        current = self.current_server
+        known = dict(self.indexed_mtimes)
+        
+        def worker():
+            loaded, seen = [], set()
+            try:
+                for server in BulkConfigEngine(root_path, self.logger).discover_servers():
+                    if server == current:
+                        continue
+                    for ini_type, filename in self.ini_types.items():
+                        path = os.path.join(root_path, server, CONFIG_SUBDIR, filename)
+                        try:
+                            mtime = os.path.getmtime(path)
+                        except OSError:
+                            continue
+                        seen.add((server, ini_type))
+                        if known.get((server, ini_type)) == mtime:
+                            continue
+                        try:
+                            loaded.append((server, ini_type, mtime, IniDocument.load(path)))
+                        except Exception as e:
+                            self.logger.warning(f"No se pudo indexar {path}: {e}")
+            except Exception as e:
+                self.logger.error(f"Error al indexar los INI de los servidores: {e}")
+                return
+            # El índice solo se modifica desde el hilo de la interfaz
+            self.after(0, lambda: self._add_indexed_documents(loaded, seen, current))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _add_indexed_documents(self, loaded, seen, skipped_server):
+        """Añadir al índice los documentos leídos en segundo plano"""
+        for server, ini_type, mtime, document in loaded:
+            if server == self.current_server:
+                continue  # Ya indexado con el documento en edición
+            self.search_index.add_document(server, ini_type, document)
+            self.indexed_mtimes[(server, ini_type)] = mtime
+        # Archivos o servidores que ya no existen
+        for key in [key for key in self.indexed_mtimes if key not in seen and key[0] != skipped_server]:
+            self.search_index.remove_document(*key)
+            del self.indexed_mtimes[key]
+        self.indexed_mtimes = {key: mtime for key, mtime in self.indexed_mtimes.items() if key[0] != self.current_server}
+        if loaded and self.search_filter and self.search_all_servers():
+            self.apply_search_filter(self.search_filter)
+    
+    def search_all_servers(self):
+        """Indicar si la búsqueda abarca todos los servidores"""
+        return self.search_scope_menu.get() == "Todos los servidores"
+    
     def on_tab_change(self):
         """Manejar cambio de pestaña"""
         try:
@@ -258,6 +344,9 @@ class ServerConfigPanel(ctk.CTkFrame):
                 self.status_label.configure(text=f"✅ {loaded_files} archivos INI cargados")
             else:
                 self.status_label.configure(text="⚠️ No se encontraron archivos INI")
+            
+            # El resto de servidores se indexa en segundo plano para la búsqueda global
+            self.index_all_servers(root_path)
                 
         except Exception as e:
             self.logger.error(f"Error al cargar configuraciones del servidor: {e}")
@@ -269,23 +358,19 @@ class ServerConfigPanel(ctk.CTkFrame):
             # Limpiar contenido anterior de esta pestaña
             for widget in self.tab_contents[ini_type].winfo_children():
                 widget.destroy()
+            self.results_frames.pop(ini_type, None)
+            self.result_rows[ini_type] = {}
+            self.search_widgets[ini_type] = {}
+            self.search_edits[ini_type] = {}
             
-            # Intentar cargar con configparser estándar
-            try:
-                config = configparser.ConfigParser(
-                    allow_no_value=True,
-                    strict=False,
-                    interpolation=None
-                )
-                config.optionxform = str  # Preservar mayúsculas/minúsculas en las claves
-                config.read(file_path, encoding='utf-8')
-                self.config_data[ini_type] = config
-                
-            except configparser.DuplicateOptionError:
-                # Si hay claves duplicadas, usar método manual
-                self.logger.warning(f"Archivo {file_path} tiene claves duplicadas, usando parser manual")
-                config = self.parse_ini_manually(file_path)
-                self.config_data[ini_type] = config
+            # El documento conserva formato y claves duplicadas sin renombrarlas
+            config = IniDocument.load(file_path)
+            self.config_data[ini_type] = config
+            self.search_index.add_document(self.current_server, ini_type, config)
+            
+            # Avisar de claves repetidas, fuera de sitio o con valores inválidos
+            for issue in self.schema.check_document(ini_type, config):
+                self.logger.warning(f"⚠️ {self.ini_types[ini_type]}: {issue['message']}")
             
             # Crear widgets para las secciones y opciones
             self.create_ini_widgets(ini_type, config)
@@ -299,54 +384,15 @@ class ServerConfigPanel(ctk.CTkFrame):
             )
             error_label.pack(pady=20)
     
-    def parse_ini_manually(self, file_path):
-        """Parser manual para archivos INI con claves duplicadas"""
-        config = configparser.ConfigParser(allow_no_value=True, strict=False)
-        config.optionxform = str  # Preservar mayúsculas/minúsculas en las claves
-        current_section = None
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                
-                # Saltar líneas vacías y comentarios
-                if not line or line.startswith('#') or line.startswith(';'):
-                    continue
-                
-                # Detectar sección
-                if line.startswith('[') and line.endswith(']'):
-                    current_section = line[1:-1]
-                    if not config.has_section(current_section):
-                        config.add_section(current_section)
-                    continue
-                
-                # Detectar clave=valor
-                if '=' in line and current_section:
-                    try:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        
-                        # Si la clave ya existe, agregar sufijo numérico
-                        original_key = key
-                        counter = 1
-                        while config.has_option(current_section, key):
-                            key = f"{original_key}_{counter}"
-                            counter += 1
-                        
-                        config.set(current_section, key, value)
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Error en línea {line_num} de {file_path}: {e}")
-        
-        return config
-    
     def create_ini_widgets(self, ini_type, config):
         """Crear widgets para un archivo INI"""
         self.config_widgets[ini_type] = {}
+        self.config_lines[ini_type] = {}
+        self.pending_rows[ini_type] = {}
+        self.section_frames[ini_type] = []
         
-        row = 0
         for section_name in config.sections():
+            option_lines = config.option_lines(section_name)
             # Crear frame para la sección con mejor diseño
             section_frame = ctk.CTkFrame(
                 self.tab_contents[ini_type], 
@@ -355,6 +401,7 @@ class ServerConfigPanel(ctk.CTkFrame):
             )
             section_frame.pack(fill="x", padx=12, pady=8)
             section_frame.grid_columnconfigure(1, weight=1)
+            self.section_frames[ini_type].append(section_frame)
             
             # Header de la sección con icono y estilo mejorado
             header_frame = ctk.CTkFrame(section_frame, corner_radius=8, height=50)
@@ -372,7 +419,7 @@ class ServerConfigPanel(ctk.CTkFrame):
             section_label.pack(side="left", padx=15, pady=12)
             
             # Contador de parámetros
-            param_count = len(config[section_name].items())
+            param_count = len(option_lines)
             count_label = ctk.CTkLabel(
                 header_frame,
                 text=f"({param_count} parámetros)",
@@ -387,15 +434,53 @@ class ServerConfigPanel(ctk.CTkFrame):
             options_frame.grid_columnconfigure(1, weight=1)
             
             self.config_widgets[ini_type][section_name] = {}
+            self.config_lines[ini_type][section_name] = {}
             
-            # Crear widgets para cada opción
-            option_row = 0
-            for key, value in config[section_name].items():
-                widget = self.create_parameter_widget(
-                    options_frame, key, value, option_row
-                )
-                self.config_widgets[ini_type][section_name][key] = widget
-                option_row += 1
+            # Las claves repetidas se numeran solo en la UI
+            occurrences = {}
+            rows = []
+            for line in option_lines:
+                count = occurrences.get(line.key.lower(), 0) + 1
+                occurrences[line.key.lower()] = count
+                rows.append((line.key if count == 1 else f"{line.key} #{count}", line))
+            
+            # Solo se crea la primera tanda de filas; el resto bajo demanda
+            self.pending_rows[ini_type][section_name] = rows
+            self.render_next_rows(ini_type, section_name, options_frame)
+    
+    def render_next_rows(self, ini_type, section_name, options_frame, more_button=None):
+        """Crear los widgets de la siguiente tanda de filas de una sección"""
+        if more_button is not None:
+            more_button.destroy()
+        
+        pending = self.pending_rows.get(ini_type, {}).get(section_name, [])
+        batch, rest = pending[:self.rows_per_batch], pending[self.rows_per_batch:]
+        self.pending_rows[ini_type][section_name] = rest
+        
+        section_widgets = self.config_widgets[ini_type][section_name]
+        section_lines = self.config_lines[ini_type][section_name]
+        search_edits = self.search_edits.get(ini_type, {})
+        for key, line in batch:
+            widget = self.create_parameter_widget(
+                options_frame, key, line.value, len(section_widgets)
+            )
+            if (section_name, key) in search_edits:
+                self._set_widget_value(widget, search_edits.pop((section_name, key)))
+            section_widgets[key] = widget
+            section_lines[key] = line
+        
+        if rest:
+            button = ctk.CTkButton(
+                options_frame,
+                text=f"⬇️ Mostrar más ({len(rest)} restantes)",
+                height=28,
+                fg_color="transparent",
+                border_width=1,
+            )
+            button.configure(command=lambda: self.render_next_rows(
+                ini_type, section_name, options_frame, button
+            ))
+            button.grid(row=len(section_widgets), column=0, columnspan=2, pady=(6, 2))
     
     def get_section_icon(self, section_name):
         """Obtener icono según la sección"""
@@ -506,6 +591,8 @@ class ServerConfigPanel(ctk.CTkFrame):
                     if val:
                         if not (val.lstrip('-').isdigit() and val.count('-') <= 1 and (not val.startswith('-') or len(val) > 1)):
                             widget.configure(border_color=("red", "red"))
+                        elif self.schema.validate(key.split(" #")[0], val):
+                            widget.configure(border_color=("orange", "orange"))
                         else:
                             widget.configure(border_color=("gray", "gray"))
                     else:
@@ -532,7 +619,10 @@ class ServerConfigPanel(ctk.CTkFrame):
                     val = widget.get().strip()
                     if val:
                         float(val)
-                        widget.configure(border_color=("gray", "gray"))
+                        if self.schema.validate(key.split(" #")[0], val):
+                            widget.configure(border_color=("orange", "orange"))
+                        else:
+                            widget.configure(border_color=("gray", "gray"))
                     else:
                         widget.configure(border_color=("gray", "gray"))
                 except ValueError:
@@ -582,6 +672,11 @@ class ServerConfigPanel(ctk.CTkFrame):
     
     def detect_data_type(self, key, value):
         """Detectar tipo de dato basado en clave y valor"""
+        # Los ajustes conocidos usan el tipo del esquema, sin heurísticas
+        schema_type = self.schema.value_type(key.split(" #")[0])
+        if schema_type is not None:
+            return schema_type
+        
         key_lower = key.lower()
         value_str = str(value).lower().strip()
         
@@ -678,8 +773,8 @@ class ServerConfigPanel(ctk.CTkFrame):
         if current_text != self.last_search_text:
             self.last_search_text = current_text
             
-            # Programar nueva búsqueda después de 500ms para dar tiempo al usuario
-            self.search_timeout_id = self.after(500, self._execute_search)
+            # Programar nueva búsqueda tras una breve pausa (el índice responde en milisegundos)
+            self.search_timeout_id = self.after(150, self._execute_search)
     
     def _execute_search(self):
         """Ejecutar la búsqueda real después del debounce"""
@@ -708,118 +803,66 @@ class ServerConfigPanel(ctk.CTkFrame):
             self.filter_and_reorder_tab(self.current_tab_type, search_text)
     
     def filter_and_reorder_tab(self, ini_type, search_text):
-        """Filtrar y reordenar contenido de una pestaña"""
-        tab_content = self.tab_contents[ini_type]
-        
-        # Limpiar contenido actual
-        for widget in tab_content.winfo_children():
-            widget.destroy()
-        
-        # Obtener datos de configuración para esta pestaña
+        """Mostrar los resultados del índice en lugar de las secciones de la pestaña"""
         if ini_type not in self.config_data:
             return
         
-        config = self.config_data[ini_type]
+        matching_params = self.search_index.search(
+            search_text, server=None if self.search_all_servers() else self.current_server, file_type=ini_type
+        )
         
-        # Recopilar todos los parámetros con información de coincidencia
-        all_params = []
+        # Ocultar las secciones; se conservan para restaurarlas al limpiar la búsqueda
+        for frame in self.section_frames.get(ini_type, []):
+            frame.pack_forget()
         
-        for section_name in config.sections():
-            for key, value in config[section_name].items():
-                param_info = {
-                    'section': section_name,
-                    'key': key,
-                    'value': value,
-                    'match_type': self.get_param_match_type(key, value, search_text),
-                    'match_score': self.get_match_score(key, value, search_text)
-                }
-                all_params.append(param_info)
-        
-        # Filtrar solo parámetros con coincidencias
-        matching_params = [p for p in all_params if p['match_type'] != 'none']
+        results_frame = self.results_frames.get(ini_type)
+        if results_frame is None:
+            results_frame = ctk.CTkFrame(self.tab_contents[ini_type], fg_color="transparent")
+            results_frame.summary_label = ctk.CTkLabel(
+                results_frame,
+                font=ctk.CTkFont(size=12, weight="bold")
+            )
+            self.results_frames[ini_type] = results_frame
+        results_frame.pack(fill="x", padx=5, pady=5)
         
-        # Ordenar por relevancia: exactos primero, luego por puntuación
-        matching_params.sort(key=lambda x: (
-            0 if x['match_type'] == 'exact' else 1,  # Exactos primero
-            -x['match_score']  # Mayor puntuación primero
-        ))
+        rows = self.result_rows.setdefault(ini_type, {})
+        for row in rows.values():
+            row[0].pack_forget()
         
-        # Crear widgets para los parámetros encontrados
         if matching_params:
-            # Crear un frame de resultados
-            results_frame = ctk.CTkFrame(tab_content)
-            results_frame.pack(fill="x", padx=5, pady=5)
-            
-            results_label = ctk.CTkLabel(
-                results_frame,
-                text=f"🔍 {len(matching_params)} coincidencias para '{search_text}'",
-                font=ctk.CTkFont(size=12, weight="bold"),
-                text_color="#4CAF50"
-            )
-            results_label.pack(pady=10)
+            shown = matching_params[:self.max_search_results]
+            summary = f"🔍 {len(matching_params)} coincidencias para '{search_text}'"
+            if len(shown) < len(matching_params):
+                summary += f" (mostrando {len(shown)})"
+            results_frame.summary_label.configure(text=summary, text_color="#4CAF50")
+            results_frame.summary_label.pack(pady=10)
             
-            # Crear widgets para cada parámetro encontrado
-            for i, param in enumerate(matching_params):
-                self.create_search_result_widget(tab_content, param, search_text, i)
+            # Reutilizar las filas ya creadas; solo se crean las de parámetros nuevos
+            for i, param in enumerate(shown):
+                row_key = (param['server'], param['section'], param['key'])
+                if row_key not in rows:
+                    rows[row_key] = self.create_search_result_widget(results_frame, param, search_text, i)
+                result_frame, relevance_label, info_label = rows[row_key]
+                # Mostrar el valor actual si se editó desde la sección
+                real_widget = self.config_widgets.get(ini_type, {}).get(param['section'], {}).get(param['key'])
+                search_widget = self.search_widgets.get(ini_type, {}).get((param['section'], param['key']))
+                if param['server'] == self.current_server and real_widget is not None and search_widget is not None:
+                    self._set_widget_value(search_widget, self._widget_value(real_widget))
+                relevance_label.configure(
+                    text=f"#{i + 1}",
+                    text_color="#FFD700" if param['match_type'] == 'exact' else "#87CEEB"
+                )
+                info_label.configure(text=self._result_info_text(param, search_text))
+                result_frame.pack(fill="x", padx=5, pady=3)
         else:
-            # Sin resultados
-            no_results_frame = ctk.CTkFrame(tab_content)
-            no_results_frame.pack(fill="x", padx=5, pady=20)
-            
-            no_results_label = ctk.CTkLabel(
-                no_results_frame,
+            results_frame.summary_label.configure(
                 text=f"❌ No se encontraron coincidencias para '{search_text}'",
-                font=ctk.CTkFont(size=12),
                 text_color="#FF6B6B"
             )
-            no_results_label.pack(pady=20)
-    
-    def get_param_match_type(self, key, value, search_text):
-        """Determinar tipo de coincidencia para un parámetro específico"""
-        key_lower = key.lower()
-        value_lower = str(value).lower()
-        
-        # Coincidencia exacta en nombre del parámetro
-        if search_text == key_lower:
-            return 'exact'
-        
-        # Coincidencia parcial en nombre del parámetro (prioritaria)
-        if search_text in key_lower:
-            return 'partial_key'
-        
-        # Coincidencia en valor
-        if search_text in value_lower:
-            return 'partial_value'
-        
-        return 'none'
-    
-    def get_match_score(self, key, value, search_text):
-        """Calcular puntuación de coincidencia (mayor = más relevante)"""
-        score = 0
-        key_lower = key.lower()
-        value_lower = str(value).lower()
-        
-        # Puntuación por posición en el nombre del parámetro
-        if search_text in key_lower:
-            pos = key_lower.find(search_text)
-            # Coincidencia al inicio vale más
-            score += 100 - pos
-            
-            # Coincidencia exacta vale mucho más
-            if search_text == key_lower:
-                score += 1000
-        
-        # Puntuación por coincidencia en valor (menor peso)
-        if search_text in value_lower:
-            score += 10
-        
-        # Penalizar parámetros muy largos
-        score -= len(key) * 0.1
-        
-        return score
+            results_frame.summary_label.pack(pady=20)
     
     def create_search_result_widget(self, parent, param_info, search_text, index):
-        """Crear widget para un resultado de búsqueda"""
+        """Crear widget para un resultado de búsqueda (frame, etiqueta de rango, etiqueta de info)"""
         # Frame principal del resultado
         result_frame = ctk.CTkFrame(parent)
         result_frame.pack(fill="x", padx=5, pady=3)
@@ -841,26 +884,102 @@ class ServerConfigPanel(ctk.CTkFrame):
         param_frame.grid(row=0, column=1, sticky="ew", padx=5, pady=2)
         param_frame.grid_columnconfigure(1, weight=1)
         
-        # Sección y parámetro con resaltado
-        section_text = f"[{param_info['section']}]"
-        param_text = self.highlight_text(param_info['key'], search_text)
-        
+        # Sección y parámetro con resaltado (y el valor si es de otro servidor)
         info_label = ctk.CTkLabel(
             param_frame,
-            text=f"{section_text} → {param_text}",
+            text=self._result_info_text(param_info, search_text),
             font=ctk.CTkFont(size=11),
             anchor="w"
         )
         info_label.grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=2)
         
-        # Widget de edición
-        widget = self.create_parameter_widget_simple(param_frame, param_info)
+        # Solo se editan los parámetros del servidor cargado; los de otros servidores se
+        # muestran en la etiqueta (para cambiarlos en varios servidores: configuración multi-servidor)
+        if param_info['server'] == self.current_server:
+            # Widget de edición
+            widget = self.create_parameter_widget_simple(param_frame, param_info)
+            
+            # El widget de la sección sigue siendo el que se guarda; las ediciones se copian a él
+            ini_type = self.current_tab_type
+            section, key = param_info['section'], param_info['key']
+            real_widget = self.config_widgets.get(ini_type, {}).get(section, {}).get(key)
+            if real_widget is not None:
+                self._set_widget_value(widget, self._widget_value(real_widget))
+            self.search_widgets.setdefault(ini_type, {})[(section, key)] = widget
+            
+            def copy_edit(event=None):
+                self._copy_search_edit(ini_type, section, key, self._widget_value(widget))
+            
+            if isinstance(widget, ctk.CTkSwitch):
+                widget.configure(command=copy_edit)
+            else:
+                widget.bind('<KeyRelease>', copy_edit)
+                widget.bind('<FocusOut>', copy_edit)
         
-        # Almacenar referencia del widget para guardado
-        if param_info['section'] not in self.config_widgets.setdefault(self.current_tab_type, {}):
-            self.config_widgets[self.current_tab_type][param_info['section']] = {}
+        # Descripción del catálogo de ajustes conocidos
+        if param_info.get('description'):
+            description_label = ctk.CTkLabel(
+                param_frame,
+                text=param_info['description'],
+                font=ctk.CTkFont(size=10),
+                text_color="gray",
+                anchor="w"
+            )
+            description_label.grid(row=2, column=0, columnspan=2, sticky="w", padx=10, pady=(0, 2))
         
-        self.config_widgets[self.current_tab_type][param_info['section']][param_info['key']] = widget
+        return result_frame, relevance_label, info_label
+    
+    def _result_info_text(self, param, search_text):
+        """Texto de la etiqueta de un resultado de búsqueda"""
+        text = f"[{param['section']}] → {self.highlight_text(param['key'], search_text)}"
+        if param['server'] != self.current_server:
+            text = f"🖥️ {param['server']} · {text} = {param['value']}"
+        return text
+    
+    def _widget_value(self, widget):
+        """Valor de texto de un widget de parámetro"""
+        if isinstance(widget, ctk.CTkSwitch):
+            return "True" if widget.get() else "False"
+        if isinstance(widget, ctk.CTkTextbox):
+            return widget.get("1.0", "end-1c")
+        return widget.get()  # CTkEntry
+    
+    def _set_widget_value(self, widget, value):
+        """Escribir un valor en un widget de parámetro sin recrearlo"""
+        if self._widget_value(widget) == value:
+            return
+        if isinstance(widget, ctk.CTkSwitch):
+            if str(value).lower() in ['true', '1', 'yes', 'on']:
+                widget.select()
+            else:
+                widget.deselect()
+            command = widget.cget("command")
+            if command:
+                command()  # Actualizar la etiqueta de estado del interruptor
+        elif isinstance(widget, ctk.CTkTextbox):
+            widget.delete("1.0", "end")
+            widget.insert("1.0", value)
+        else:
+            widget.delete(0, "end")
+            widget.insert(0, value)
+    
+    def _copy_search_edit(self, ini_type, section, key, value):
+        """Copiar la edición de un resultado de búsqueda al widget de su sección"""
+        # La búsqueda por valor ve la edición antes de guardar
+        self.search_index.update_value(self.current_server, ini_type, section, key, value)
+        real_widget = self.config_widgets.get(ini_type, {}).get(section, {}).get(key)
+        if real_widget is not None:
+            self._set_widget_value(real_widget, value)
+        else:
+            # Fila aún no creada: se aplica al crearla o al guardar
+            self.search_edits.setdefault(ini_type, {})[(section, key)] = value
+    
+    def _pending_line(self, ini_type, section, key):
+        """Línea del documento de una fila que todavía no tiene widget"""
+        for row_key, line in self.pending_rows.get(ini_type, {}).get(section, []):
+            if row_key == key:
+                return line
+        return None
     
     def highlight_text(self, text, search_text):
         """Resaltar texto de búsqueda (para mostrar en labels)"""
@@ -983,26 +1102,12 @@ class ServerConfigPanel(ctk.CTkFrame):
         highlight_widget(frame)
     
     def restore_original_order(self):
-        """Restaurar el orden original y quitar resaltado"""
-        for ini_type in self.config_data.keys():
-            if ini_type in self.tab_contents:
-                tab_content = self.tab_contents[ini_type]
-                
-                # Obtener todos los frames
-                frames = []
-                for widget in tab_content.winfo_children():
-                    if isinstance(widget, ctk.CTkFrame):
-                        frames.append(widget)
-                
-                # Ocultar todos
-                for frame in frames:
-                    frame.pack_forget()
-                
-                # Volver a mostrar en orden original
-                for frame in frames:
-                    frame.pack(fill="x", padx=5, pady=5)
-                    # Quitar resaltado
-                    self.remove_highlight_from_frame(frame)
+        """Ocultar los resultados de búsqueda y volver a mostrar las secciones"""
+        for ini_type, results_frame in self.results_frames.items():
+            results_frame.pack_forget()
+        for ini_type, frames in self.section_frames.items():
+            for frame in frames:
+                frame.pack(fill="x", padx=12, pady=8)
     
     def remove_highlight_from_frame(self, frame):
         """Quitar resaltado de un frame"""
@@ -1189,6 +1294,43 @@ class ServerConfigPanel(ctk.CTkFrame):
             config = self.config_data[ini_type]
             file_path = os.path.join(config_path, self.ini_types[ini_type])
             
+            # Leer y validar todos los valores antes de tocar el archivo
+            values = []
+            errors = []
+            for section_name, section_widgets in self.config_widgets[ini_type].items():
+                for key, widget in section_widgets.items():
+                    try:
+                        value = self._widget_value(widget)
+                    except Exception as e:
+                        self.logger.warning(f"Error al obtener valor de {key}: {e}")
+                        continue
+                    # Solo se validan los valores editados; los del archivo no bloquean el guardado
+                    line = self.config_lines.get(ini_type, {}).get(section_name, {}).get(key)
+                    error = None
+                    if line is None or value != line.value:
+                        error = self.schema.validate(key.split(" #")[0], value)
+                    if error:
+                        errors.append(f"[{section_name}] {error}")
+                    values.append((section_name, key, value))
+            
+            # Ediciones hechas desde la búsqueda en filas todavía sin widget
+            for (section_name, key), value in self.search_edits.get(ini_type, {}).items():
+                line = self._pending_line(ini_type, section_name, key)
+                if line is None or value != line.value:
+                    error = self.schema.validate(key.split(" #")[0], value)
+                    if error:
+                        errors.append(f"[{section_name}] {error}")
+                values.append((section_name, key, value))
+            
+            if errors:
+                self.logger.warning(f"{self.ini_types[ini_type]} no guardado, valores inválidos: {errors}")
+                self.show_ctk_message(
+                    "Valores inválidos",
+                    f"{self.ini_types[ini_type]} no se guardó:\n" + "\n".join(errors[:10]),
+                    "warning"
+                )
+                return False
+            
             # Crear backup
             if os.path.exists(file_path):
                 backup_path = f"{file_path}.backup"
@@ -1196,30 +1338,21 @@ class ServerConfigPanel(ctk.CTkFrame):
                 shutil.copy2(file_path, backup_path)
                 self.logger.info(f"Backup creado: {backup_path}")
             
-            # Actualizar valores del config con los widgets
-            for section_name, section_widgets in self.config_widgets[ini_type].items():
-                for key, widget in section_widgets.items():
-                    try:
-                        if isinstance(widget, ctk.CTkSwitch):
-                            value = "True" if widget.get() else "False"
-                        elif isinstance(widget, ctk.CTkTextbox):
-                            value = widget.get("1.0", "end-1c")
-                        else:  # CTkEntry
-                            value = widget.get()
-                        
-                        config.set(section_name, key, str(value))
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Error al obtener valor de {key}: {e}")
+            # Actualizar solo las líneas editadas; el resto del archivo se conserva
+            for section_name, key, value in values:
+                line = self.config_lines.get(ini_type, {}).get(section_name, {}).get(key) or \
+                    self._pending_line(ini_type, section_name, key)
+                if line is not None:
+                    config.set_line_value(line, value)
+                else:
+                    config.set(section_name, key, str(value))
             
-            # Escribir archivo sin espacios alrededor del =
-            with open(file_path, 'w', encoding='utf-8') as f:
-                # Escribir manualmente para evitar espacios alrededor del =
-                for section_name in config.sections():
-                    f.write(f"[{section_name}]\n")
-                    for key, value in config[section_name].items():
-                        f.write(f"{key}={value}\n")
-                    f.write("\n")  # Línea en blanco entre secciones
+            versions = get_version_store(self.logger)
+            versions.track(file_path)  # Estado previo (por si se editó fuera)
+            config.save(file_path)
+            versions.track(file_path)
+            self.search_edits.pop(ini_type, None)
+            self.search_index.add_document(self.current_server, ini_type, config)
             
             self.logger.info(f"Guardado {file_path}")
             return True
@@ -1384,51 +1517,27 @@ class ServerConfigPanel(ctk.CTkFrame):
                 
                 # Leer archivo y detectar problemas de capitalización
                 try:
-                    with open(ini_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    original_content = content
-                    current_section = None
-                    lines = content.split('\n')
-                    corrected_lines = []
+                    document = IniDocument.load(ini_path)
+                    original_content = document.to_string()
                     corrections_made = 0
                     
-                    for line in lines:
-                        original_line = line
-                        
-                        # Detectar secciones
-                        if line.strip().startswith('[') and line.strip().endswith(']'):
-                            current_section = line.strip()[1:-1]
-                            corrected_lines.append(line)
+                    for current_section in document.sections():
+                        # Coincidencia exacta o, para secciones /script/, sin distinguir mayúsculas
+                        corrections = None
+                        for section_pattern, pattern_corrections in correct_capitalization.items():
+                            if (current_section == section_pattern or 
+                                (section_pattern.startswith('/script/') and 
+                                 current_section.lower() == section_pattern.lower())):
+                                corrections = pattern_corrections
+                                break
+                        if not corrections:
                             continue
                         
-                        # Procesar parámetros
-                        if '=' in line and current_section:
-                            key_part, value_part = line.split('=', 1)
-                            key = key_part.strip()
-                            key_lower = key.lower()
-                            
-                            # Buscar si este parámetro necesita corrección
-                            correct_key = None
-                            for section_pattern, corrections in correct_capitalization.items():
-                                # Coincidencia exacta o pattern matching para secciones script
-                                if (current_section == section_pattern or 
-                                    (section_pattern.startswith('/script/') and 
-                                     current_section.lower() == section_pattern.lower())):
-                                    if key_lower in corrections:
-                                        correct_key = corrections[key_lower]
-                                        break
-                            
+                        for key in document.options(current_section):
+                            correct_key = corrections.get(key.lower())
                             if correct_key and correct_key != key:
-                                # Corregir capitalización
-                                corrected_line = f"{correct_key}={value_part}"
-                                corrected_lines.append(corrected_line)
-                                corrections_made += 1
+                                corrections_made += document.rename_option(current_section, key, correct_key)
                                 self.logger.info(f"  ✅ Corregido: {key} → {correct_key}")
-                            else:
-                                corrected_lines.append(line)
-                        else:
-                            corrected_lines.append(line)
                     
                     if corrections_made > 0:
                         # Crear backup
@@ -1436,10 +1545,8 @@ class ServerConfigPanel(ctk.CTkFrame):
                         with open(backup_path, 'w', encoding='utf-8') as f:
                             f.write(original_content)
                         
-                        # Guardar archivo corregido
-                        corrected_content = '\n'.join(corrected_lines)
-                        with open(ini_path, 'w', encoding='utf-8') as f:
-                            f.write(corrected_content)
+                        # Guardar archivo corregido (solo cambian las líneas renombradas)
+                        document.save()
                         
                         corrected_files.append(f"{display_name} ({corrections_made} correcciones)")
                         self.logger.info(f"✅ {display_name} corregido con {corrections_made} cambios")
@@ -7,6 +7,8 @@ import threading
 import logging
 from utils.server_manager import ServerManager
 from utils.config_manager import ConfigManager
+from utils.metrics_collector import MetricsCollector
+from utils.shared_install import MASTER_DIR_NAME
 from datetime import datetime
 
 
@@ -18,6 +20,13 @@ class ServerPanel:
         self.main_window = main_window
         self.server_manager = ServerManager(config_manager)
         
+        # Recolector de métricas históricas (CPU, memoria, jugadores, etc.)
+        self.metrics_collector = MetricsCollector(
+            self.server_manager,
+            config_manager.get_data_file_path("metrics"),
+            logger
+        )
+        
         # Inicializar variables de selección
         self.selected_server = None
         self.selected_map = None
@@ -220,7 +229,9 @@ class ServerPanel:
             servers = []
             for item in os.listdir(root_path):
                 item_path = os.path.join(root_path, item)
-                if os.path.isdir(item_path) and item != "SteamCMD":
+                # La maestra y los staging contienen ejecutable pero no son servidores
+                if os.path.isdir(item_path) and item not in ("SteamCMD", MASTER_DIR_NAME) \
+                        and not item.endswith("_staging"):
                     # Verificar si es un servidor válido buscando el ejecutable
                     if self.server_manager.find_server_executable(item_path):
                         servers.append(item)
@@ -247,6 +258,10 @@ class ServerPanel:
         if server_name and server_name != "Seleccionar servidor...":
             self.selected_server = server_name
             self.add_status_message(f"Servidor seleccionado: {server_name}", "info")
+            # Asociar las métricas al servidor seleccionado
+            root_path = self.config_manager.get("server", "root_path", "").strip()
+            server_path = os.path.join(root_path, server_name) if root_path else None
+            self.metrics_collector.set_server(server_name, server_path)
             # Cargar mapas disponibles para este servidor
             self.load_maps_for_server(server_name)
             # Actualizar información del servidor
@@ -408,6 +423,14 @@ class ServerPanel:
     
     def start_monitoring(self):
         """Inicia el monitoreo del servidor en un hilo separado"""
+        # Jugadores vía RCON sin registrar cada consulta en los logs
+        if self.main_window and hasattr(self.main_window, 'rcon_panel') and self.main_window.rcon_panel:
+            rcon_panel = self.main_window.rcon_panel
+            self.metrics_collector.set_player_count_provider(
+                lambda: rcon_panel.execute_rcon_command("ListPlayers", quiet=True)
+            )
+        self.metrics_collector.start()
+        
         def monitor():
             while True:
                 try:
@@ -425,7 +448,12 @@ class ServerPanel:
             # Obtener información del servidor usando ServerManager
             status = self.server_manager.get_server_status()
             uptime = self.server_manager.get_uptime()
-            stats = self.server_manager.get_server_stats()
+            # Reutilizar la última muestra del recolector si está disponible
+            latest = self.metrics_collector.latest() if self.metrics_collector.running else None
+            if latest:
+                stats = {"cpu_percent": latest["cpu_percent"], "memory_mb": latest["memory_mb"]}
+            else:
+                stats = self.server_manager.get_server_stats()
             
             # Actualizar etiquetas
             if status == "Ejecutándose":
@@ -433,6 +461,15 @@ class ServerPanel:
             else:
                 status_color = "red"
             
+            # Detectar caídas: el proceso desapareció sin una parada solicitada
+            previous_status = getattr(self, '_last_status', None)
+            self._last_status = status
+            if (previous_status == "Ejecutándose" and status == "Detenido"
+                    and not self.server_manager.stop_requested
+                    and hasattr(self.main_window, 'log_server_event')):
+                self.main_window.log_server_event("server_crash",
+                    error_details="El proceso del servidor terminó inesperadamente")
+            
             # Programar actualizaciones de UI en el hilo principal
             def update_ui():
                 try:
@@ -543,8 +580,14 @@ class ServerPanel:
         except Exception as e:
             self.logger.error(f"Error al actualizar uso de memoria: {e}")
     
-    def start_server(self):
-        """Inicia el servidor usando la configuración de la pestaña Principal"""
+    def start_server(self, interactive=True):
+        """
+        Inicia el servidor usando la configuración de la pestaña Principal
+        
+        Args:
+            interactive: False en arranques desatendidos (reinicios programados,
+                watchdog): los problemas de mods se registran sin preguntar
+        """
         if not hasattr(self, 'selected_server') or not self.selected_server:
             error_msg = "❌ ERROR: Debe seleccionar un servidor primero"
             self.add_status_message(error_msg, "error")
@@ -582,7 +625,7 @@ class ServerPanel:
             
             # Iniciar servidor con configuración del panel principal
             self.update_server_status("Iniciando...", "orange")
-            self.main_window.principal_panel.start_server_with_config()
+            self.main_window.principal_panel.start_server_with_config(interactive=interactive)
         else:
             # Fallback al método antiguo si no hay panel principal
             self.update_server_status("Iniciando...", "orange")
@@ -857,7 +900,7 @@ class ServerPanel:
         # Crear ventana de confirmación
         confirm_window = ctk.CTkToplevel()
         confirm_window.title("Confirmar Actualización")
-        confirm_window.geometry("400x200")
+        confirm_window.geometry("440x280")
         confirm_window.resizable(False, False)
         
         # Centrar la ventana
@@ -875,21 +918,56 @@ class ServerPanel:
             confirm_window, 
             text="Esto puede tomar varios minutos.",
             font=("Arial", 12)
-        ).pack(pady=(0, 20))
+        ).pack(pady=(0, 5))
+        
+        # Build instalado frente al disponible (se consulta en segundo plano)
+        build_label = ctk.CTkLabel(confirm_window, text="🔍 Comprobando build disponible...", font=("Arial", 11))
+        build_label.pack(pady=(0, 5))
+        
+        def show_build_info(text):
+            if build_label.winfo_exists():
+                build_label.configure(text=text)
+        
+        def check_build():
+            try:
+                info = self.server_manager.check_server_update(server_name)
+                if not info:
+                    text = "⚠️ No se pudo comprobar el build disponible"
+                elif info["update_needed"]:
+                    text = f"⬆️ Build {info['installed']} → {info['available']} disponible"
+                else:
+                    text = f"✅ Ya está en el último build ({info['installed']})"
+            except Exception as e:
+                self.logger.error(f"Error comprobando build: {e}")
+                text = "⚠️ No se pudo comprobar el build disponible"
+            confirm_window.after(0, lambda: show_build_info(text))
+        
+        threading.Thread(target=check_build, daemon=True).start()
+        
+        validate_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            confirm_window,
+            text="Validar todos los archivos (más lento)",
+            variable=validate_var
+        ).pack(pady=(5, 0))
         
         # Frame para botones
         buttons_frame = ctk.CTkFrame(confirm_window, fg_color="transparent")
-        buttons_frame.pack(pady=20)
+        buttons_frame.pack(pady=15)
         
-        # Variable para almacenar la respuesta
-        response = [False]
+        # Variable para almacenar la respuesta: None, "update" o "prestage"
+        response = [None]
         
         def on_confirm():
-            response[0] = True
+            response[0] = "update"
+            confirm_window.destroy()
+        
+        def on_prestage():
+            response[0] = "prestage"
             confirm_window.destroy()
         
         def on_cancel():
-            response[0] = False
+            response[0] = None
             confirm_window.destroy()
         
         # Botones
@@ -902,6 +980,14 @@ class ServerPanel:
             width=100
         ).pack(side="left", padx=10)
         
+        # Descargar en staging sin detener el servidor; se aplica en el próximo reinicio
+        ctk.CTkButton(
+            buttons_frame,
+            text="Pre-descargar",
+            command=on_prestage,
+            width=110
+        ).pack(side="left", padx=10)
+        
         ctk.CTkButton(
             buttons_frame,
             text="Cancelar",
@@ -918,6 +1004,12 @@ class ServerPanel:
             self.add_status_message("Actualización cancelada por el usuario", "info")
             return
         
+        if response[0] == "prestage":
+            self.add_status_message(f"⬇️ Pre-descargando actualización de {server_name} sin detener el servidor", "info")
+            self.server_manager.prestage_update(self.install_callback, server_name)
+            return
+        force_validate = validate_var.get()
+        
         # Deshabilitar el botón durante la actualización (usar el botón de la ventana principal)
         if hasattr(self.main_window, 'update_button'):
             self.main_window.update_button.configure(state="disabled", text="Actualizando...")
@@ -936,7 +1028,9 @@ class ServerPanel:
                     self.main_window.log_server_event("update_start", method="SteamCMD")
                 
                 # Llamar al método de actualización del server_manager
-                result = self.server_manager.update_server(self.install_callback, server_name)
+                result = self.server_manager.update_server(
+                    self.install_callback, server_name, force_validate=force_validate
+                )
                 
                 # Registrar resultado de actualización
                 if hasattr(self.main_window, 'log_server_event'):
@@ -965,6 +1059,69 @@ class ServerPanel:
         
         threading.Thread(target=update_thread, daemon=True).start()
     
+    def repair_shared_install(self):
+        """Verificar y reparar la capa compartida del servidor seleccionado"""
+        if not getattr(self, 'selected_server', None):
+            self.add_status_message("Error: Debe seleccionar un servidor primero", "error")
+            return
+        root_path = self.config_manager.get("server", "root_path", "").strip()
+        server_name = self.selected_server
+        shared_install = self.server_manager.get_shared_install(root_path, server_name) if root_path else None
+        if not shared_install:
+            self.add_status_message(f"ℹ️ El servidor '{server_name}' no usa la instalación compartida", "info")
+            return
+        
+        def check_thread():
+            try:
+                report = shared_install.check_consistency(server_name)
+                self.parent.after(0, lambda: self._confirm_shared_repair(shared_install, server_name, report))
+            except Exception as e:
+                self.logger.error(f"Error verificando la capa compartida: {e}")
+                self.add_status_message(f"❌ Error verificando la capa de {server_name}: {str(e)}", "error")
+        
+        self.add_status_message(f"🔍 Verificando archivos de {server_name}...", "info")
+        threading.Thread(target=check_thread, daemon=True).start()
+    
+    def _confirm_shared_repair(self, shared_install, server_name, report):
+        """Pedir confirmación antes de borrar archivos sobrantes y reparar la capa"""
+        from gui.dialogs.custom_dialogs import ask_yes_no
+        
+        remove_extra = False
+        if report["extra"]:
+            sample = "\n".join(report["extra"][:10])
+            if len(report["extra"]) > 10:
+                sample += f"\n... y {len(report['extra']) - 10} más"
+            remove_extra = ask_yes_no(
+                self.parent,
+                "Archivos sobrantes",
+                f"{len(report['extra'])} archivos de '{server_name}' no están en la instalación maestra "
+                f"(por ejemplo plugins propios del servidor):\n\n{sample}\n\n"
+                "¿Eliminarlos? Elige No para conservarlos y reparar solo los archivos del juego."
+            )
+        elif not report["missing"] and not report["stale"]:
+            self.add_status_message(f"✅ La capa de {server_name} está completa", "success")
+            return
+        
+        def repair_thread():
+            try:
+                result = shared_install.repair(server_name, remove_extra=remove_extra)
+                repaired = len(result["missing"]) + len(result["stale"])
+                removed = len(result["extra"]) if remove_extra else 0
+                if result["failed"]:
+                    self.add_status_message(
+                        f"⚠️ {len(result['failed'])} archivos de {server_name} no se pudieron reparar (¿servidor en ejecución?)",
+                        "warning"
+                    )
+                self.add_status_message(
+                    f"🔧 Capa de {server_name} reparada: {repaired} archivos reenlazados, {removed} eliminados",
+                    "success"
+                )
+            except Exception as e:
+                self.logger.error(f"Error reparando la capa compartida: {e}")
+                self.add_status_message(f"❌ Error reparando la capa de {server_name}: {str(e)}", "error")
+        
+        threading.Thread(target=repair_thread, daemon=True).start()
+    
     def install_callback(self, message_type, message):
         """Callback mejorado para la instalación con barra de progreso"""
         try:
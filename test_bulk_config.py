@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para la configuración masiva de servidores
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.bulk_config import BulkConfigEngine, CONFIG_SUBDIR
+from utils.ini_document import IniDocument
+
+
+def make_server(root, name, gus_text, game_text=None):
+    config_dir = os.path.join(root, name, CONFIG_SUBDIR)
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, "GameUserSettings.ini"), "w", encoding="utf-8") as f:
+        f.write(gus_text)
+    if game_text is not None:
+        with open(os.path.join(config_dir, "Game.ini"), "w", encoding="utf-8") as f:
+            f.write(game_text)
+
+
+def read(engine, server, file_type="GameUserSettings"):
+    with open(engine.ini_path(server, file_type), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_diff_matrix():
+    """Probar la carga paralela y la matriz clave × servidor"""
+    print("🧪 PRUEBA DE MATRIZ DE DIFERENCIAS")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "servers")
+        make_server(root, "Isla", "[ServerSettings]\nXPMultiplier=2\nServerPVE=True\n")
+        make_server(root, "Centro", "[ServerSettings]\nxpmultiplier=3\nServerPVE=True\n",
+                    "[/Script/ShooterGame.ShooterGameMode]\nbDisableLootCrates=True\n")
+        os.makedirs(os.path.join(root, "SteamCMD"))
+
+        engine = BulkConfigEngine(root, snapshot_dir=os.path.join(tmp, "snapshots"))
+        assert engine.discover_servers() == ["Centro", "Isla"]
+        documents = engine.load_all()
+        assert set(documents["Centro"]) == {"GameUserSettings", "Game"}
+
+        matrix = engine.diff_matrix(file_type="GameUserSettings")
+        assert list(matrix) == [("GameUserSettings", "ServerSettings", "xpmultiplier")]
+        assert matrix[("GameUserSettings", "ServerSettings", "xpmultiplier")] == {"Centro": "3", "Isla": "2"}
+        assert len(engine.diff_matrix(only_different=False)) == 3
+        game = engine.diff_matrix(file_type="Game")
+        assert game[("Game", "/Script/ShooterGame.ShooterGameMode", "bDisableLootCrates")]["Isla"] is None
+    print("✅ Matriz de diferencias correcta")
+
+
+def test_apply_and_rollback():
+    """Probar la aplicación en lote con instantánea y deshacer"""
+    print("🧪 PRUEBA DE APLICACIÓN EN LOTE")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "servers")
+        originals = {
+            "Isla": "; comentario\n[ServerSettings]\nXPMultiplier=2\nServerPVE=True\n",
+            "Centro": "[ServerSettings]\nXPMultiplier=3\n",
+            "Ragnarok": "[ServerSettings]\nXPMultiplier=5\n",
+        }
+        for name, text in originals.items():
+            make_server(root, name, text)
+
+        engine = BulkConfigEngine(root, snapshot_dir=os.path.join(tmp, "snapshots"))
+        engine.load_all()
+        changes = [
+            ("GameUserSettings", "ServerSettings", "XPMultiplier", "3"),
+            ("GameUserSettings", "ServerSettings", "ServerPVE", None),
+        ]
+        planned = engine.plan(changes, ["Isla", "Centro"])
+        assert list(planned) == [("Isla", "GameUserSettings")]  # Centro ya tiene esos valores
+
+        result = engine.apply(changes, ["Isla", "Centro", "Ragnarok"], description="XP común")
+        assert sorted(result['applied']) == [("Isla", "GameUserSettings"), ("Ragnarok", "GameUserSettings")]
+        assert read(engine, "Isla") == "; comentario\n[ServerSettings]\nXPMultiplier=3\n"
+        assert read(engine, "Centro") == originals["Centro"]
+        assert engine.diff_matrix() == {}
+
+        snapshots = engine.list_snapshots()
+        assert len(snapshots) == 1 and snapshots[0]['description'] == "XP común"
+        assert engine.rollback(snapshots[0]['id']) == 2
+        for name, text in originals.items():
+            assert read(engine, name) == text
+        assert IniDocument.load(engine.ini_path("Isla", "GameUserSettings")).get("ServerSettings", "ServerPVE") == "True"
+    print("✅ Aplicación en lote y deshacer correctos")
+
+
+if __name__ == "__main__":
+    test_diff_matrix()
+    test_apply_and_rollback()
@@ -1 +1,139 @@
- 
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el guardado diferido de ConfigManager
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.config_manager import ConfigManager
+from utils.config_versions import ConfigVersionStore
+from utils.state_store import StateStore
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_coalesced_saves():
+    """Probar que varios save() seguidos producen una sola escritura"""
+    print("🧪 PRUEBA DE GUARDADO DIFERIDO")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("; Configuración\n[mods]\n")
+
+        manager = ConfigManager(path, save_delay=0.3)
+        writes = []
+        original_save = manager.document.save
+        manager.document.save = lambda *args, **kwargs: writes.append(1) or original_save(*args, **kwargs)
+
+        for i in range(200):
+            manager.set("mods", f"server_{i}_map", str(i))
+            manager.save()
+
+        # Las lecturas se sirven desde memoria aunque el archivo aún no se haya escrito
+        assert manager.get("mods", "server_199_map") == "199"
+        assert "server_0_map" not in read(path)
+
+        time.sleep(0.6)
+        assert len(writes) == 1
+        content = read(path)
+        assert content.startswith("; Configuración\n[mods]\nserver_0_map=0\n")
+        assert content.count("\n") == 202
+    print("✅ Guardados agrupados en una sola escritura")
+
+
+def test_flush_and_reload():
+    """Probar escritura inmediata y recarga"""
+    print("🧪 PRUEBA DE FLUSH Y RECARGA")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.ini")
+        manager = ConfigManager(path, save_delay=30)
+        assert manager.get("server", "port") == "7777"
+
+        manager.set("server", "port", "7778")
+        manager.save()
+        manager.flush()
+        assert "port=7778" in read(path)
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("[extra]\nvalor=1\n")
+        assert manager.reload_config()
+        assert manager.get("extra", "valor") == "1"
+        assert manager.get_section("extra") == {"valor": "1"}
+    print("✅ Flush y recarga correctos")
+
+
+def test_flush_records_external_edits():
+    """Probar que una edición externa queda en el historial antes de sobrescribirla"""
+    print("🧪 PRUEBA DE HISTORIAL AL GUARDAR")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[server]\nport=7777\n")
+        store = StateStore(data_dir=os.path.join(tmp, "data"), migrate=False)
+        manager = ConfigManager(path, save_delay=0)
+        manager.version_store = ConfigVersionStore(store=store)
+
+        # Edición hecha fuera de la aplicación mientras el documento está en memoria
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("externo=1\n")
+        manager.flush()  # Sin cambios propios no se registra ni se escribe nada
+        assert manager.version_store.count("app", "config") == 0
+
+        manager.set("server", "port", "7778")
+        manager.save()
+        revisions = manager.version_store.timeline("app", "config")
+        assert len(revisions) == 2
+        assert "externo=1" in manager.version_store.get_text(revisions[1]["id"])
+        assert "port=7778" in manager.version_store.get_text(revisions[0]["id"])
+        manager.version_store = None  # El flush de salida no debe usar la base ya cerrada
+        store.close()
+    print("✅ Historial previo al guardado correcto")
+
+
+def test_restore_is_not_overwritten():
+    """Probar que restaurar una revisión no la pisa el documento en memoria"""
+    print("🧪 PRUEBA DE RESTAURAR REVISIÓN")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[server]\nport=7777\n")
+        store = StateStore(data_dir=os.path.join(tmp, "data"), migrate=False)
+        manager = ConfigManager(path, save_delay=30)
+        manager.version_store = ConfigVersionStore(store=store)
+        manager.version_store.track(path)
+        first = manager.version_store.timeline("app", "config")[0]["id"]
+
+        # Cambio pendiente (guardado diferido) al abrir el historial
+        manager.set("server", "port", "7778")
+        manager.save()
+
+        # Como el diálogo: escribir lo pendiente, restaurar y releer sin escribir
+        manager.flush()
+        manager.version_store.rollback(first, path)
+        assert manager.reload_config(flush=False)
+        assert manager.get("server", "port") == "7777"
+        manager.flush()
+        assert "port=7777" in read(path)
+        # El cambio pendiente quedó registrado antes de la restauración
+        texts = [manager.version_store.get_text(r["id"]) for r in manager.version_store.timeline("app", "config")]
+        assert any("port=7778" in text for text in texts)
+        manager.version_store = None
+        store.close()
+    print("✅ Restauración conservada")
+
+
+if __name__ == "__main__":
+    test_coalesced_saves()
+    test_flush_and_reload()
+    test_flush_records_external_edits()
+    test_restore_is_not_overwritten()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el historial de versiones de configuración
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.config_versions import ConfigVersionStore, target_for_path, line_delta, apply_delta
+from utils.ini_document import IniDocument
+from utils.state_store import StateStore
+
+
+def test_delta_roundtrip():
+    """Probar que los deltas de líneas reconstruyen el texto exacto"""
+    print("🧪 PRUEBA DE DELTAS DE LÍNEAS")
+    old = "; c\r\n[ServerSettings]\r\nA=1\r\nB=2\r\n"
+    new = "; c\r\n[ServerSettings]\r\nA=5\r\nB=2\r\nC=3"
+    assert apply_delta(old, line_delta(old, new)) == new
+    assert apply_delta(old, line_delta(old, "")) == ""
+    assert target_for_path(os.path.join("D:", "ASA", "Isla", "ShooterGame", "Saved", "Config",
+                                        "WindowsServer", "Game.ini")) == ("Isla", "Game")
+    assert target_for_path("config.ini") == ("app", "config")
+    print("✅ Deltas correctos")
+
+
+def test_revisions_and_rollback():
+    """Probar revisiones compactas, línea de tiempo y restauración"""
+    print("🧪 PRUEBA DE HISTORIAL DE REVISIONES")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=os.path.join(tmp, "data"))
+        versions = ConfigVersionStore(store=store, full_every=10)
+        config_dir = os.path.join(tmp, "Isla", "ShooterGame", "Saved", "Config", "WindowsServer")
+        os.makedirs(config_dir)
+        path = os.path.join(config_dir, "GameUserSettings.ini")
+
+        base = "[ServerSettings]\n" + "".join(f"Setting{i}=valor_{i}\n" for i in range(300))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(base)
+        first = versions.record_file(path)
+        assert versions.record_file(path) is None  # Sin cambios no hay revisión
+
+        texts = {first: base}
+        document = IniDocument.load(path)
+        for i in range(25):
+            document.set("ServerSettings", "XPMultiplier", str(i))
+            document.save(path)
+            revision = versions.record_file(path)
+            with open(path, encoding="utf-8") as f:
+                texts[revision] = f.read()
+
+        assert versions.count("Isla", "GameUserSettings") == 26
+        for revision, text in texts.items():
+            assert versions.get_text(revision) == text
+
+        rows = store.query("SELECT kind, size FROM config_revisions ORDER BY id")
+        assert [row["kind"] for row in rows].count("full") == 3  # 1 inicial + cada 10
+        delta_size = max(row["size"] for row in rows if row["kind"] == "delta")
+        assert delta_size < rows[0]["size"] // 4
+
+        timeline = versions.timeline("Isla", "GameUserSettings", limit=3)
+        assert [entry["changes"] for entry in timeline][0] == [["ServerSettings", "XPMultiplier", "23", "24"]]
+
+        # Restaurar a la primera revisión y poder deshacerlo
+        versions.rollback(first, path)
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == base
+        latest = versions.timeline("Isla", "GameUserSettings", limit=1)[0]
+        assert latest["note"] == f"Restaurado a la revisión #{first}"
+        assert latest["changes"] == [["ServerSettings", "XPMultiplier", "24", None]]
+        assert versions.targets() == [("Isla", "GameUserSettings", 27)]
+        store.close()
+    print("✅ Historial y restauración correctos")
+
+
+if __name__ == "__main__":
+    test_delta_roundtrip()
+    test_revisions_and_rollback()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el cliente de CurseForge contra un servidor local
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.curseforge_client import CurseForgeClient, CurseForgeError
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """API mínima: /v1/mods/search con ETag, /v1/mods/lento y /v1/mods/limitado"""
+
+    hits = {}
+    delay = 0.0
+    fail_first = 0
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, data, status=200, headers=None):
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        StubHandler.hits[path] = StubHandler.hits.get(path, 0) + 1
+        assert self.headers.get("x-api-key") == "clave"
+        if path == "/v1/mods/search":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_json({"data": [{"id": 1, "name": "Mod"}], "pagination": {"totalCount": 1}},
+                           headers={"ETag": '"v1"'})
+        elif path == "/v1/mods/lento":
+            time.sleep(StubHandler.delay)
+            self.send_json({"data": {"id": 2}})
+        elif path == "/v1/mods/limitado":
+            if StubHandler.hits[path] <= StubHandler.fail_first:
+                self.send_json({"error": "rate"}, status=429, headers={"Retry-After": "0"})
+            else:
+                self.send_json({"data": {"id": 3}})
+        else:
+            self.send_json({"error": "no encontrado"}, status=404)
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubHandler.hits = {}
+    return server
+
+
+def make_client(server, cache_dir, **kwargs):
+    return CurseForgeClient("clave", base_url=f"http://127.0.0.1:{server.server_port}/v1",
+                            cache_dir=cache_dir, backoff=0.01, **kwargs)
+
+
+def test_cache_and_revalidation():
+    """Probar caché dentro del TTL, caché en disco y revalidación con ETag"""
+    print("🧪 PRUEBA DE CACHÉ Y REVALIDACIÓN")
+    server = start_stub()
+    with tempfile.TemporaryDirectory() as tmp:
+        client = make_client(server, tmp)
+        first = client.search_mods("dino")
+        assert first["data"][0]["name"] == "Mod"
+        assert client.search_mods("dino") == first
+        assert StubHandler.hits["/v1/mods/search"] == 1
+        assert client.stats["cache_hits"] == 1
+
+        # Otro cliente (reinicio de la app) reutiliza la caché en disco
+        other = make_client(server, tmp)
+        assert other.search_mods("dino") == first
+        assert StubHandler.hits["/v1/mods/search"] == 1
+
+        # Pasado el TTL se revalida: 304 sin cuerpo devuelve la copia
+        assert other.search_mods("dino", ttl=0) == first
+        assert StubHandler.hits["/v1/mods/search"] == 2
+        assert other.stats["revalidated"] == 1
+
+        # Parámetros distintos son otra entrada
+        other.search_mods("dino", index=20)
+        assert StubHandler.hits["/v1/mods/search"] == 3
+        assert other.clear_cache() == 2
+    server.shutdown()
+    print("✅ Caché correcta")
+
+
+def test_coalescing_and_retry():
+    """Probar agrupación de peticiones simultáneas y reintentos ante 429"""
+    print("🧪 PRUEBA DE AGRUPACIÓN Y REINTENTOS")
+    server = start_stub()
+    with tempfile.TemporaryDirectory() as tmp:
+        client = make_client(server, tmp)
+        StubHandler.delay = 0.3
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get_mod("lento"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [{"id": 2}] * 5
+        assert StubHandler.hits["/v1/mods/lento"] == 1
+
+        StubHandler.fail_first = 2
+        assert client.get_mod("limitado") == {"id": 3}
+        assert StubHandler.hits["/v1/mods/limitado"] == 3
+        assert client.stats["retries"] == 2
+
+        try:
+            client.get("/inexistente")
+            assert False, "Debería fallar"
+        except CurseForgeError as e:
+            assert e.status_code == 404
+        assert StubHandler.hits["/v1/inexistente"] == 1  # Sin reintentos en 404
+    server.shutdown()
+    print("✅ Agrupación y reintentos correctos")
+
+
+def test_prune_cache():
+    """Probar que la caché en disco se limita por antigüedad y tamaño"""
+    print("🧪 PRUEBA DE LÍMITES DE CACHÉ")
+    with tempfile.TemporaryDirectory() as tmp:
+        client = CurseForgeClient("clave", cache_dir=tmp, max_cache_age=3600, max_cache_bytes=250)
+        now = time.time()
+        for index, age in enumerate([7200, 300, 200, 100]):  # La primera supera la antigüedad
+            path = client._cache_path(f"{index:02d}" + "a" * 38)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("x" * 100)
+            os.utime(path, (now - age, now - age))
+
+        # Se borra la caducada y después la más antigua hasta quedar bajo 250 bytes
+        assert client.prune_cache() == 2
+        remaining = sorted(name[:2] for _dir, _dirs, files in os.walk(tmp) for name in files)
+        assert remaining == ["02", "03"]
+        assert client.prune_cache() == 0
+    print("✅ Límites de caché correctos")
+
+
+if __name__ == "__main__":
+    test_cache_and_revalidation()
+    test_coalescing_and_retry()
+    test_prune_cache()
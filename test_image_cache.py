@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para la caché de miniaturas de mods
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.image_cache import ThumbnailCache
+
+
+class LogoHandler(BaseHTTPRequestHandler):
+    """Sirve un PNG de 256x128 distinto por ruta"""
+
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        LogoHandler.hits += 1
+        color = (len(self.path) * 20 % 256, 100, 200, 255)
+        buffer = io.BytesIO()
+        Image.new("RGBA", (256, 128), color).save(buffer, format="PNG")
+        payload = buffer.getvalue()
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def wait_for(cache, url, size):
+    """Pedir una miniatura y esperar a que llegue"""
+    done = threading.Event()
+    result = []
+    image = cache.request(url, size, lambda loaded: (result.append(loaded), done.set()))
+    if image is not None:
+        return image
+    assert done.wait(5), "La miniatura no llegó"
+    return result[0]
+
+
+def test_thumbnail_cache():
+    """Probar descarga, reducción, caché en memoria/disco y agrupación"""
+    print("🧪 PRUEBA DE CACHÉ DE MINIATURAS")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LogoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ThumbnailCache(cache_dir=tmp, max_workers=2)
+        image = wait_for(cache, f"{base}/a.png", (64, 64))
+        assert image.size == (64, 32)  # Conserva la proporción
+        assert cache.get(f"{base}/a.png", (64, 64)) is image
+        assert LogoHandler.hits == 1
+
+        # Varias tarjetas pidiendo el mismo logo comparten una descarga
+        events = [threading.Event() for _ in range(5)]
+        for event in events:
+            cache.request(f"{base}/b.png", (40, 40), lambda loaded, e=event: e.set())
+        assert all(event.wait(5) for event in events)
+        assert LogoHandler.hits == 2
+
+        # Otra instancia (reinicio) lee del disco sin descargar
+        other = ThumbnailCache(cache_dir=tmp, image_factory=lambda img: ("convertida", img.size))
+        assert wait_for(other, f"{base}/a.png", (64, 64)) == ("convertida", (64, 32))
+        assert LogoHandler.hits == 2 and other.stats["disk_hits"] == 1
+
+        # El límite de disco elimina las menos usadas
+        count, used = other.disk_usage()
+        assert count == 2
+        small = ThumbnailCache(cache_dir=tmp, max_disk_bytes=used)
+        wait_for(small, f"{base}/c.png", (64, 64))
+        count, total = small.disk_usage()
+        assert total <= used and count < 3
+        cache.shutdown()
+        other.shutdown()
+        small.shutdown()
+    server.shutdown()
+    print("✅ Caché de miniaturas correcta")
+
+
+if __name__ == "__main__":
+    test_thumbnail_cache()
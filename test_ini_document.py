@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el modelo de documento INI sin pérdidas
+"""
+
+import os
+import sys
+import codecs
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ini_document import IniDocument
+from utils.ini_cleaner import clean_duplicate_options
+from utils.config_manager import ConfigManager
+
+
+SAMPLE = (
+    "; Comentario inicial\r\n"
+    "[ServerSettings]\r\n"
+    "ServerPassword = secreto\r\n"
+    "maxplayers=10\r\n"
+    "\r\n"
+    "[/script/shootergame.shootergamemode]\r\n"
+    "ConfigOverrideItemMaxQuantity=(ItemClassString=\"A\")\r\n"
+    "ConfigOverrideItemMaxQuantity=(ItemClassString=\"B\")\r\n"
+)
+
+
+def test_round_trip_and_lookup():
+    """Probar que el documento se serializa idéntico y las búsquedas ignoran mayúsculas"""
+    print("🧪 PRUEBA DE IDA Y VUELTA")
+    document = IniDocument(SAMPLE)
+    assert document.to_string() == SAMPLE
+    assert document.get("serversettings", "MaxPlayers") == "10"
+    assert document["ServerSettings"]["ServerPassword"] == "secreto"
+    assert document.get_all("/Script/ShooterGame.ShooterGameMode", "ConfigOverrideItemMaxQuantity") == [
+        '(ItemClassString="A")', '(ItemClassString="B")'
+    ]
+    assert document.duplicates() == [("/script/shootergame.shootergamemode", "ConfigOverrideItemMaxQuantity", 2)]
+    print("✅ Documento conservado sin cambios")
+
+
+def test_in_place_edits():
+    """Probar que las ediciones solo tocan las líneas afectadas"""
+    print("🧪 PRUEBA DE EDICIÓN EN SITIO")
+    document = IniDocument(SAMPLE)
+    document.set("ServerSettings", "MaxPlayers", "70")
+    document.set("ServerSettings", "RCONEnabled", "True")
+    document.set("SessionSettings", "SessionName", "Mi Servidor")
+    text = document.to_string()
+
+    assert "maxplayers=70\r\n" in text  # Capitalización original conservada
+    assert "ServerPassword = secreto\r\n" in text
+    assert text.index("RCONEnabled=True") < text.index("[/script/shootergame")
+    assert text.endswith("[SessionSettings]\r\nSessionName=Mi Servidor\r\n")
+    assert document.dirty
+
+    reparsed = IniDocument(text)
+    assert reparsed.get("SessionSettings", "SessionName") == "Mi Servidor"
+    assert len(reparsed.get_all("/script/shootergame.shootergamemode", "ConfigOverrideItemMaxQuantity")) == 2
+    print("✅ Ediciones en sitio correctas")
+
+
+def test_save_and_clean_duplicates():
+    """Probar guardado atómico con BOM y limpieza de duplicados"""
+    print("🧪 PRUEBA DE GUARDADO Y LIMPIEZA")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "GameUserSettings.ini")
+        with open(path, "wb") as f:
+            f.write(codecs.BOM_UTF8 + "[ServerSettings]\nA=1\nA=2\nB=3\n".encode("utf-8"))
+
+        document = IniDocument.load(path)
+        assert not document.save()  # Sin cambios no se reescribe
+        document.set("ServerSettings", "B", "4")
+        assert document.save()
+        with open(path, "rb") as f:
+            assert f.read() == codecs.BOM_UTF8 + b"[ServerSettings]\nA=1\nA=2\nB=4\n"
+
+        assert clean_duplicate_options(path, backup=False)
+        assert IniDocument.load(path).to_string() == "[ServerSettings]\nA=1\nB=4\n"
+        assert not clean_duplicate_options(path, backup=False)
+
+        # Los bytes que no son UTF-8 (p. ej. un nombre en Latin-1) sobreviven a una edición
+        with open(path, "wb") as f:
+            f.write(b"[ServerSettings]\nSessionName=Caf\xe9\nB=1\n")
+        document = IniDocument.load(path)
+        document.set("ServerSettings", "B", "2")
+        assert document.save()
+        with open(path, "rb") as f:
+            assert f.read() == b"[ServerSettings]\nSessionName=Caf\xe9\nB=2\n"
+    print("✅ Guardado y limpieza correctos")
+
+
+def test_insertion_anchors():
+    """Probar que las claves nuevas siguen a la última opción tras inserciones y borrados"""
+    print("🧪 PRUEBA DE PUNTOS DE INSERCIÓN")
+    document = IniDocument("[A]\na=1\n\n[B]\nb=1\n; fin de B\n[A]\nc=1\n")
+    for index in range(200):
+        document.set("A", f"KeyA{index}", index)
+        document.set("B", f"KeyB{index}", index)
+    document.remove_option("B", "b")
+    document.set("B", "Nueva", "x")
+    document.remove_option("A", "KeyA199")
+    document.set("A", "Ultima", "y")
+    document.set("C", "c", "z")
+    document.set("C", "d", "w")
+
+    text = document.to_string()
+    assert document.to_string() == "".join(line.text for line in document.lines)
+    # Las claves nuevas de A van tras el segundo bloque [A]; las de B, antes de su comentario
+    assert text.index("KeyB199=199\nNueva=x\n; fin de B\n") < text.index("\n[A]\nc=1\nKeyA0=0\n")
+    assert text.endswith("KeyA198=198\nUltima=y\n\n[C]\nc=z\nd=w\n")
+    for entry in document.sections_index.values():
+        if entry.anchor is not None:
+            assert document.lines[entry.anchor] is entry.lines[entry.anchor_slot]
+    reparsed = IniDocument(text)
+    assert len(reparsed.options("A")) == 202 and len(reparsed.options("B")) == 201
+    print("✅ Puntos de inserción correctos")
+
+
+def test_config_manager_keeps_format():
+    """Probar que ConfigManager conserva comentarios y guarda claves nuevas"""
+    print("🧪 PRUEBA DE CONFIGMANAGER")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# Configuración\n[server]\nroot_path=C:/ASA\n")
+        manager = ConfigManager(path)
+        manager.set("server", "root_path", "D:/ASA")
+        manager.set("app", "theme", "dark")
+        manager.save(immediate=True)
+
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        assert content.startswith("# Configuración\n[server]\nroot_path=D:/ASA\n")
+        assert ConfigManager(path).get("app", "theme") == "dark"
+    print("✅ ConfigManager conserva el formato")
+
+
+if __name__ == "__main__":
+    test_round_trip_and_lookup()
+    test_in_place_edits()
+    test_save_and_clean_duplicates()
+    test_insertion_anchors()
+    test_config_manager_keeps_format()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el índice de búsqueda de parámetros INI
+"""
+
+import os
+import sys
+import time
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ini_document import IniDocument
+from utils.ini_search import IniSearchIndex
+
+
+def test_ranked_search():
+    """Probar el orden de relevancia y la búsqueda por descripción"""
+    print("🧪 PRUEBA DE BÚSQUEDA ORDENADA")
+    document = IniDocument(
+        "[ServerSettings]\nXPMultiplier=2.0\nKillXPMultiplier=1.5\nServerPVE=True\n"
+        "[/Script/ShooterGame.ShooterGameMode]\nConfigOverrideItemMaxQuantity=(ItemClassString=\"PrimalItemResource_Stone_C\")\n"
+        "ConfigOverrideItemMaxQuantity=(ItemClassString=\"PrimalItemResource_Wood_C\")\n"
+    )
+    index = IniSearchIndex()
+    index.add_document("Isla", "GameUserSettings", document)
+
+    results = index.search("XPMultiplier")
+    assert [r['key'] for r in results] == ["XPMultiplier", "KillXPMultiplier"]
+    assert results[0]['match_type'] == 'exact'
+    assert results[0]['description'] == "Multiplicador de XP"
+
+    # Coincidencia en valor y claves duplicadas numeradas como en la UI
+    results = index.search("wood")
+    assert [r['key'] for r in results] == ["ConfigOverrideItemMaxQuantity #2"]
+    assert results[0]['match_type'] == 'partial_value'
+
+    # Coincidencia solo en la descripción del catálogo
+    results = index.search("servidor pve")
+    assert [(r['key'], r['match_type']) for r in results] == [("ServerPVE", 'description')]
+    assert [r['key'] for r in index.search("multiplicador de xp")] == ["XPMultiplier", "KillXPMultiplier"]
+
+    # Consultas cortas (sin trigramas) y ampliación incremental
+    assert len(index.search("x")) == 4  # También ConfigOverrideItemMaxQuantity
+    assert len(index.search("xp")) == 2
+    assert len(index.search("xpm")) == 2
+    assert len(index.search("xpmultiplier")) == 2
+    print("✅ Búsqueda ordenada correcta")
+
+
+def test_reindex_and_filters():
+    """Probar el reindexado tras guardar y el filtrado por servidor/archivo"""
+    print("🧪 PRUEBA DE REINDEXADO")
+    index = IniSearchIndex()
+    index.add_document("Isla", "GameUserSettings", IniDocument("[ServerSettings]\nMaxPlayers=10\n"))
+    index.add_document("Centro", "GameUserSettings", IniDocument("[ServerSettings]\nMaxPlayers=20\n"))
+    assert len(index.search("maxplayers")) == 2
+    assert [r['value'] for r in index.search("maxplayers", server="Centro")] == ["20"]
+
+    index.add_document("Isla", "GameUserSettings", IniDocument("[ServerSettings]\nMaxPlayers=70\n"))
+    assert sorted(r['value'] for r in index.search("maxplayers")) == ["20", "70"]
+    assert index.search("10") == []
+
+    assert index.update_value("Centro", "GameUserSettings", "ServerSettings", "MaxPlayers", "45")
+    assert [r['server'] for r in index.search("45")] == ["Centro"]
+
+    index.remove_document("Isla", "GameUserSettings")
+    assert len(index) == 1
+    print("✅ Reindexado correcto")
+
+
+def test_search_speed():
+    """Probar que buscar en muchos servidores tarda menos de 10 ms"""
+    print("🧪 PRUEBA DE VELOCIDAD DE BÚSQUEDA")
+    lines = ["[ServerSettings]"] + [f"Setting{i}Multiplier={i}.5" for i in range(400)]
+    lines += ["[/Script/ShooterGame.ShooterGameMode]"] + [f"PerLevelStatsMultiplier_Player[{i % 12}]={i}" for i in range(400)]
+    text = "\n".join(lines) + "\n"
+    index = IniSearchIndex()
+    for server in range(20):
+        for file_type in ("GameUserSettings", "Game"):
+            index.add_document(f"Servidor{server}", file_type, IniDocument(text))
+
+    start = time.perf_counter()
+    results = index.search("setting37")
+    elapsed = time.perf_counter() - start
+    assert len(results) == 20 * 2 * 11  # Setting37 y Setting370-379 en cada documento
+    assert elapsed < 0.01, f"{elapsed * 1000:.1f} ms"
+    print(f"✅ {len(index)} parámetros buscados en {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    test_ranked_search()
+    test_reindex_and_filters()
+    test_search_speed()
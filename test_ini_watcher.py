@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el vigilante de archivos INI
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ini_document import IniDocument
+from utils.ini_watcher import IniFileWatcher, diff_documents
+
+
+def test_diff_documents():
+    """Probar la diferencia clave a clave entre documentos"""
+    print("🧪 PRUEBA DE DIFERENCIA ENTRE DOCUMENTOS")
+    old = IniDocument("[ServerSettings]\nMaxPlayers=10\nServerPVE=False\nA=1\nA=2\n")
+    new = IniDocument("[ServerSettings]\nmaxplayers=20\nServerPVE=False\nA=1\nA=2\n[SessionSettings]\nSessionName=X\n")
+    changes = diff_documents(old, new)
+    assert ("ServerSettings", "maxplayers", "10", "20") in changes
+    assert ("SessionSettings", "SessionName", None, "X") in changes
+    assert len(changes) == 2
+    assert diff_documents(new, old)[-1] == ("SessionSettings", "SessionName", "X", None)
+    assert diff_documents(None, old)[0] == ("ServerSettings", "MaxPlayers", None, "10")
+    print("✅ Diferencia correcta")
+
+
+def test_watcher_detects_external_edits():
+    """Probar que solo las ediciones externas con contenido nuevo generan aviso"""
+    print("🧪 PRUEBA DE VIGILANTE DE ARCHIVOS")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "GameUserSettings.ini")
+        with open(path, "w") as f:
+            f.write("[ServerSettings]\nMaxPlayers=10\n")
+
+        events = []
+        watcher = IniFileWatcher(interval=3600)
+        watcher.watch(path, lambda changed_path, document: events.append(document))
+        watcher.check_now()
+        assert events == []
+
+        # Edición externa
+        with open(path, "w") as f:
+            f.write("[ServerSettings]\nMaxPlayers=25\n")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        watcher.check_now()
+        assert len(events) == 1
+        assert events[0].get("ServerSettings", "MaxPlayers") == "25"
+
+        # Solo cambia la fecha: sin aviso
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 2_000_000))
+        watcher.check_now()
+        assert len(events) == 1
+
+        # Escritura propia confirmada: sin aviso
+        document = events[0]
+        document.set("ServerSettings", "MaxPlayers", "30")
+        document.save(path)
+        watcher.acknowledge(path)
+        watcher.check_now()
+        assert len(events) == 1
+
+        watcher.unwatch(path)
+        with open(path, "w") as f:
+            f.write("[ServerSettings]\nMaxPlayers=1\n")
+        watcher.check_now()
+        assert len(events) == 1
+        watcher.stop()
+    print("✅ Vigilante correcto")
+
+
+def test_watcher_backs_off():
+    """Probar que el intervalo se alarga sin cambios y vuelve al mínimo al detectar uno"""
+    print("🧪 PRUEBA DE ESPERA PROGRESIVA")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "Game.ini")
+        with open(path, "w") as f:
+            f.write("[ServerSettings]\nA=1\n")
+
+        watcher = IniFileWatcher(interval=0.02, max_interval=0.16)
+        checks = []
+        check_now = watcher.check_now
+        watcher.check_now = lambda: checks.append(time.monotonic()) or check_now()
+        events = []
+        watcher.watch(path, lambda changed_path, document: events.append(document))
+        time.sleep(0.8)
+        idle_checks = len(checks)
+        # Con un intervalo fijo de 0.02 s serían unas 40 comprobaciones
+        assert 2 <= idle_checks <= 12, idle_checks
+        assert checks[-1] - checks[-2] >= 0.1
+
+        with open(path, "w") as f:
+            f.write("[ServerSettings]\nA=2\n")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        deadline = time.monotonic() + 2
+        while not events and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(events) == 1 and events[0].get("ServerSettings", "A") == "2"
+        watcher.stop()
+    print("✅ Espera progresiva correcta")
+
+
+if __name__ == "__main__":
+    test_diff_documents()
+    test_watcher_detects_external_edits()
+    test_watcher_backs_off()
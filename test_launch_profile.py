@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para los perfiles de arranque
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.state_store import StateStore
+from utils.launch_profile import (
+    LaunchProfileStore, LaunchProfileError, normalize_profile, compile_profile, map_identifier
+)
+
+
+def test_compile_and_validate():
+    """Probar los argumentos generados y la validación"""
+    print("🧪 PRUEBA DE COMPILACIÓN DE PERFILES")
+    profile = normalize_profile({
+        "server": "Alpha", "map": "Ragnarok", "port": "7779", "query_port": "",
+        "multihome": "10.0.0.5", "rcon_enabled": True, "rcon_port": "27020",
+        "mods": "100, 200,100", "custom_args": "# comentario\nMaxPlayers=50\n\n?ServerPVE=True",
+    })
+    compiled = compile_profile(profile)
+    assert compiled["args"] == [
+        "Ragnarok_WP?listen?Port=7779?QueryPort=27015?MultiHome=10.0.0.5"
+        "?MaxPlayers=50?ServerPVE=True?EnableRCON=True?RCONPort=27020",
+        "-server", "-log", "-mods=100,200",
+    ]
+    assert compiled["errors"] == [] and compiled["warnings"] == []
+    assert map_identifier(" The Island ") == "TheIsland_WP"
+
+    bad = compile_profile(normalize_profile({
+        "map": "Mapa Raro", "port": "7777", "query_port": "7777", "multihome": "localhost",
+        "rcon_enabled": True, "rcon_port": "abc", "mods": ["12", "x1"], "custom_args": "Port=1",
+    }))
+    assert len(bad["errors"]) == 4  # Puerto repetido, RCON inválido, IP y mod
+    assert len(bad["warnings"]) == 2  # Mapa desconocido y opción repetida
+    assert bad["args"][0].startswith("TheIsland_WP?listen")
+    print("✅ Compilación correcta")
+
+
+def test_store_caches_and_diffs():
+    """Probar caché por servidor, diferencias y arranque sin interfaz"""
+    print("🧪 PRUEBA DE ALMACÉN DE PERFILES")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=tmp, migrate=False)
+        profiles = LaunchProfileStore(store)
+        data = {"map": "The Center", "port": 7777, "mods": ["5"], "env": {"SteamAppId": "2430930"}}
+        compiled, changes = profiles.update("Alpha", data)
+        assert changes["map"] == (None, "The Center")
+
+        # Los mismos datos de la interfaz no vuelven a compilar
+        again, changes = profiles.update("Alpha", {**data, "port": "7777"})
+        assert changes == {} and again["fingerprint"] == compiled["fingerprint"]
+        assert profiles.stats == {"compilations": 1, "cache_hits": 1}
+
+        _compiled, changes = profiles.update("Alpha", {**data, "mods": ["5", "6"]})
+        assert changes == {"mods": (["5"], ["5", "6"])}
+
+        # Otra instancia (otro proceso o arranque sin interfaz) lee lo compilado
+        headless = LaunchProfileStore(store)
+        assert headless.launch_args("Alpha")[-1] == "-mods=5,6"
+        assert headless.compiled("Alpha")["env"] == {"SteamAppId": "2430930"}
+        assert headless.launch_env("Alpha") == {"SteamAppId": "2430930"}
+        assert headless.launch_env("Gamma") == {}
+
+        profiles.update("Beta", {"port": "0"})
+        for server in ("Beta", "Gamma"):
+            try:
+                profiles.launch_args(server)
+                assert False, "Debía fallar"
+            except LaunchProfileError as e:
+                assert e.errors
+        store.close()
+    print("✅ Almacén de perfiles correcto")
+
+
+if __name__ == "__main__":
+    test_compile_and_validate()
+    test_store_caches_and_diffs()
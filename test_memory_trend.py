@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el análisis de tendencia de memoria
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.memory_trend import MemoryTrendAnalyzer, MemoryWatchdog, fit_linear_trend
+
+
+def make_series(start_mb, mb_per_hour, hours, now, step=60):
+    """Generar una serie lineal de memoria terminando en 'now'"""
+    count = int(hours * 3600 / step)
+    return [(now - (count - i) * step, start_mb + mb_per_hour * (i * step) / 3600) for i in range(count + 1)]
+
+
+def test_fit_linear_trend():
+    """Probar el ajuste por mínimos cuadrados"""
+    slope, intercept, r_squared, _ = fit_linear_trend([(0, 10), (10, 20), (20, 30)])
+    assert abs(slope - 1.0) < 1e-9
+    assert abs(intercept - 10) < 1e-9
+    assert abs(r_squared - 1.0) < 1e-9
+    assert fit_linear_trend([(0, 1)]) is None
+    print("✅ Ajuste lineal correcto")
+
+
+def test_decisions():
+    """Probar reinicio, aplazamiento con jugadores y ausencia de tendencia"""
+    now = 1_000_000
+    analyzer = MemoryTrendAnalyzer(memory_limit_mb=20000, window_hours=6, horizon_hours=2, player_defer_hours=0.5)
+
+    # Crece 1000 MB/h y está a 1.5 h del límite: reiniciar
+    analysis = analyzer.analyze(make_series(13500, 1000, 5, now), now)
+    assert analysis["slope_mb_per_hour"] == 1000.0
+    assert 1.4 < analysis["hours_to_limit"] < 1.6
+    assert analyzer.decide(analysis, players=0)[0]
+
+    # Con jugadores y margen mayor a 0.5 h: aplazar
+    should_restart, reason = analyzer.decide(analysis, players=5)
+    assert not should_restart and "Aplazado" in reason
+
+    # Memoria estable: no reiniciar
+    flat = analyzer.analyze(make_series(12000, 0, 5, now), now)
+    assert not analyzer.decide(flat, players=0)[0]
+
+    # Límite superado: reiniciar aunque haya jugadores
+    over = analyzer.analyze(make_series(21000, 10, 5, now), now)
+    assert analyzer.decide(over, players=10)[0]
+    print("✅ Decisiones correctas")
+
+
+def test_watchdog_cooldown():
+    """Probar que el watchdog reinicia una sola vez dentro del enfriamiento"""
+    now = 1_000_000
+    series = make_series(19000, 1000, 3, now)
+
+    class FakeCollector:
+        def query(self, metric, since=None, until=None):
+            return [(ts, v) for ts, v in series if since <= ts <= until]
+
+        def latest(self):
+            return {"players": 0}
+
+    restarts = []
+    analyzer = MemoryTrendAnalyzer(memory_limit_mb=20000)
+    watchdog = MemoryWatchdog(FakeCollector(), analyzer, lambda reason, analysis: restarts.append(reason))
+    assert watchdog.check_once(now)
+    assert not watchdog.check_once(now + 60)
+    assert len(restarts) == 1
+    print("✅ Enfriamiento correcto")
+
+
+if __name__ == "__main__":
+    test_fit_linear_trend()
+    test_decisions()
+    test_watchdog_cooldown()
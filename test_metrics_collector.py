@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el recolector de métricas históricas
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.metrics_collector import MetricsCollector, count_players
+
+
+class FakeServerManager:
+    """Simula el ServerManager apuntando al proceso actual"""
+    def __init__(self):
+        self.server_pid = os.getpid()
+
+
+def test_count_players():
+    """Probar el conteo de jugadores de ListPlayers"""
+    print("🧪 PRUEBA DE CONTEO DE JUGADORES")
+    assert count_players("No Players Connected") == 0
+    assert count_players("0. Jugador1, 0002abc\n1. Jugador2, 0002def\n") == 2
+    assert count_players("❌ Error: Timeout") is None
+    assert count_players("") is None
+    print("✅ Conteo de jugadores correcto")
+
+
+def test_sampling_and_query():
+    """Probar muestreo, consulta y agregados por minuto"""
+    print("🧪 PRUEBA DE MUESTREO Y CONSULTA")
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = MetricsCollector(FakeServerManager(), tmp, sample_interval=1.0, rollup_interval=1)
+        collector.set_server("Prueba", tmp)
+        collector.set_player_count_provider(lambda: "0. A, 1\n1. B, 2", interval=0)
+
+        for _ in range(3):
+            collector.sample_once()
+            time.sleep(1.05)
+        collector.stop()
+
+        latest = collector.latest()
+        assert latest["memory_mb"] > 0
+        assert latest["threads"] >= 1
+        assert latest["players"] == 2
+
+        points = collector.query("memory_mb", since=time.time() - 60)
+        assert len(points) >= 3
+
+        # Los agregados se persisten y se recargan al volver a seleccionar el servidor
+        assert os.path.exists(os.path.join(tmp, "metrics_Prueba.jsonl"))
+        reloaded = MetricsCollector(FakeServerManager(), tmp, rollup_interval=1)
+        reloaded.set_server("Prueba", tmp)
+        assert len(reloaded.rollup_samples) >= 2
+        assert reloaded.summary("players")["max"] == 2
+    print("✅ Muestreo y consulta correctos")
+
+
+if __name__ == "__main__":
+    test_count_players()
+    test_sampling_and_query()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el exportador OpenMetrics
+"""
+
+import os
+import sys
+import urllib.request
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.metrics_exporter import MetricsExporter, MetricsRegistry
+
+
+def test_registry_render():
+    """Probar el formato de contadores, gauges e histogramas"""
+    print("🧪 PRUEBA DE FORMATO OPENMETRICS")
+    registry = MetricsRegistry()
+    registry.inc("ark_restarts", labels={"server": "Prueba"})
+    registry.inc("ark_restarts", labels={"server": "Prueba"})
+    registry.set("ark_server_memory_bytes", 1024, {"server": "Prueba"})
+    registry.observe("ark_rcon_latency_seconds", 0.2, {"command": "listplayers"}, buckets=(0.1, 0.5))
+    text = registry.render()
+    print(text)
+    assert 'ark_restarts_total{server="Prueba"} 2' in text
+    assert 'ark_server_memory_bytes{server="Prueba"} 1024' in text
+    assert 'ark_rcon_latency_seconds_bucket{command="listplayers",le="0.1"} 0' in text
+    assert 'ark_rcon_latency_seconds_bucket{command="listplayers",le="0.5"} 1' in text
+    assert 'ark_rcon_latency_seconds_count{command="listplayers"} 1' in text
+    assert text.endswith("# EOF\n")
+    print("✅ Formato correcto")
+
+
+def test_http_endpoint():
+    """Probar que el endpoint /metrics responde con los hooks aplicados"""
+    print("🧪 PRUEBA DE ENDPOINT HTTP")
+    exporter = MetricsExporter(host="127.0.0.1", port=0)
+    exporter.add_scrape_hook(lambda registry: registry.set("ark_server_up", 1, {"server": "Prueba"}))
+    assert exporter.start()
+    try:
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            assert "openmetrics-text" in response.headers["Content-Type"]
+        assert 'ark_server_up{server="Prueba"} 1' in body
+    finally:
+        exporter.stop()
+    print("✅ Endpoint correcto")
+
+
+if __name__ == "__main__":
+    test_registry_render()
+    test_http_endpoint()
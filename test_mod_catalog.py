@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el catálogo de mods en memoria
+"""
+
+import os
+import sys
+import time
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.mod_catalog import ModCatalog, FAVORITES, INSTALLED, SEARCH
+
+
+def make_mod(mod_id, name, summary="", category="QoL", author="Autor"):
+    return {
+        "id": mod_id, "name": name, "summary": summary,
+        "categories": [{"name": category}], "authors": [{"name": author}],
+    }
+
+
+def test_membership_and_filters():
+    """Probar pertenencia por id, filtros por palabras, categoría y autor"""
+    print("🧪 PRUEBA DE CATÁLOGO DE MODS")
+    catalog = ModCatalog()
+    events = []
+    catalog.add_listener(lambda event, group, ids: events.append((event, group, ids)))
+
+    catalog.set_group(FAVORITES, [{"id": "10", "name": "Super Spyglass"}])
+    catalog.set_group(SEARCH, [
+        make_mod(10, "Super Spyglass", "Ver estadísticas de dinos"),
+        make_mod(20, "Dino Storage", "Guardar dinos en bolas", category="Storage", author="Otro"),
+    ])
+    # La API devuelve enteros y el almacén textos: son el mismo mod
+    assert catalog.is_favorite(10) and catalog.is_favorite("10")
+    assert not catalog.is_installed(20)
+    assert catalog.add(INSTALLED, catalog.get(20))  # Instalar desde la tarjeta de búsqueda
+    assert not catalog.add(INSTALLED, {"id": "20"})
+
+    assert [m["name"] for m in catalog.filter(None)] == ["Super Spyglass", "Dino Storage"]
+    ids = lambda mods: [str(mod["id"]) for mod in mods]
+    assert ids(catalog.filter(SEARCH, text="dino")) == ["10", "20"]  # Resumen de 10
+    assert ids(catalog.filter(SEARCH, text="stor")) == ["20"]
+    assert catalog.filter(SEARCH, text="spy stor") == []
+    assert ids(catalog.filter(SEARCH, category="qol")) == ["10"]
+    assert ids(catalog.filter(None, author="Otro")) == ["20"]
+    assert catalog.get(20)["summary"] == "Guardar dinos en bolas"  # Datos combinados
+    assert catalog.stats() == {FAVORITES: 1, INSTALLED: 1, SEARCH: 2}
+
+    # Quitar de resultados conserva el mod si sigue en otro grupo
+    catalog.set_group(SEARCH, [])
+    assert catalog.get(10) is not None and catalog.get(20) is not None
+    assert catalog.remove(INSTALLED, 20)
+    assert catalog.get(20) is None and "storage" not in catalog.categories()
+    assert ("added", INSTALLED, ["20"]) in events and ("removed", INSTALLED, ["20"]) in events
+    print("✅ Catálogo correcto")
+
+
+def test_large_collection_speed():
+    """Probar que filtrar miles de mods es inmediato"""
+    print("🧪 PRUEBA DE RENDIMIENTO DEL CATÁLOGO")
+    catalog = ModCatalog()
+    catalog.set_group(SEARCH, [make_mod(i, f"Mod {i} estructura{i % 50}") for i in range(5000)])
+    catalog.set_group(FAVORITES, [{"id": str(i)} for i in range(0, 5000, 10)])
+    start = time.perf_counter()
+    for i in range(5000):
+        catalog.is_favorite(i)
+    matches = catalog.filter(None, text="estructura7")
+    elapsed = time.perf_counter() - start
+    assert len(matches) == 100
+    print(f"   5000 comprobaciones y un filtro en {elapsed * 1000:.1f} ms")
+    assert elapsed < 0.5
+    print("✅ Rendimiento correcto")
+
+
+if __name__ == "__main__":
+    test_membership_and_filters()
+    test_large_collection_speed()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para la resolución de dependencias de mods
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.mod_dependencies import (
+    ModDependencyResolver, plan_load_order, parse_mod_ids,
+    RELATION_REQUIRED, RELATION_INCOMPATIBLE, RELATION_OPTIONAL
+)
+
+
+def api_mod(mod_id, name, requires=(), incompatible=(), optional=()):
+    """Mod con el formato de la API: dependencias en el archivo principal"""
+    dependencies = [{"modId": d, "relationType": RELATION_REQUIRED} for d in requires]
+    dependencies += [{"modId": d, "relationType": RELATION_INCOMPATIBLE} for d in incompatible]
+    dependencies += [{"modId": d, "relationType": RELATION_OPTIONAL} for d in optional]
+    return {
+        "id": mod_id, "name": name, "mainFileId": 1,
+        "latestFiles": [{"id": 0, "dependencies": []}, {"id": 1, "dependencies": dependencies}],
+    }
+
+
+class FakeClient:
+    def __init__(self, mods):
+        self.mods = {str(mod["id"]): mod for mod in mods}
+        self.batches = []
+
+    def get_mods(self, mod_ids):
+        self.batches.append(list(mod_ids))
+        return [self.mods[mod_id] for mod_id in mod_ids if mod_id in self.mods]
+
+
+def test_load_order():
+    """Probar orden estable, ciclos e incompatibilidades"""
+    print("🧪 PRUEBA DE ORDEN DE CARGA")
+    relations = {
+        "1": {"requires": ["3"], "incompatible": []},
+        "2": {"requires": [], "incompatible": ["4"]},
+        "3": {"requires": [], "incompatible": []},
+        "4": {"requires": [], "incompatible": []},
+        "5": {"requires": ["6"], "incompatible": []},
+        "6": {"requires": ["5"], "incompatible": []},
+    }
+    result = plan_load_order(["1", "2", "3", "4", "5", "6", "7"], relations)
+    assert result["order"] == ["2", "3", "1", "4", "7", "5", "6"]
+    assert result["cycles"] == [["5", "6"]]
+    assert result["conflicts"] == [("2", "4")]
+    assert result["unknown"] == ["7"]
+    assert result["missing"] == {}
+    assert parse_mod_ids(" 10, 20,,10 ,30") == ["10", "20", "30"]
+    print("✅ Orden de carga correcto")
+
+
+def test_resolver_missing_dependencies():
+    """Probar dependencias que faltan, incluidas las de segundo nivel"""
+    print("🧪 PRUEBA DE DEPENDENCIAS QUE FALTAN")
+    client = FakeClient([
+        api_mod(100, "Estructuras+", requires=[200], optional=[400]),
+        api_mod(200, "Librería", requires=[300]),
+        api_mod(300, "Núcleo"),
+        api_mod(500, "Otro", incompatible=[100]),
+    ])
+    resolver = ModDependencyResolver(client)
+    result = resolver.resolve([100, 500])
+    assert result["missing"] == {"200": ["100"], "300": ["200"]}
+    assert result["conflicts"] == [("100", "500")]
+    assert resolver.has_problems(result)
+    assert client.batches == [["100", "500"], ["200"], ["300"]]
+    lines = resolver.describe(result)
+    assert lines[0] == "❌ Falta Librería (200), requerido por Estructuras+ (100)"
+    assert "incompatible" in lines[-1]
+
+    ok = resolver.resolve(["300", "200", "100"])
+    assert ok["order"] == ["300", "200", "100"] and not resolver.has_problems(ok)
+    print("✅ Dependencias correctas")
+
+
+if __name__ == "__main__":
+    test_load_order()
+    test_resolver_missing_dependencies()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el manifiesto de mods por servidor/mapa
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.state_store import StateStore
+from utils.mod_manifest import ModManifestStore, manifest_key
+
+
+def test_diff_saves_and_reload():
+    """Probar guardado por diferencias, listas vacías y recarga"""
+    print("🧪 PRUEBA DE MANIFIESTO DE MODS")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=tmp, migrate=False)
+        store.mods.set_installed("Alpha_The Island", [{"id": 1, "name": "Uno"}])  # Lista previa al manifiesto
+        manifest = ModManifestStore(store)
+        assert manifest.has("Alpha_The Island") and manifest.ids("Alpha_The Island") == ["1"]
+
+        key = manifest_key("Beta", "Ragnarok")
+        mods = [{"id": str(i), "name": f"Mod {i}"} for i in range(1, 6)]
+        assert manifest.set(key, mods) == 5
+        assert manifest.set(key, mods) == 0  # Sin cambios no se escribe nada
+        assert manifest.set(key, mods + [{"id": "6", "name": "Mod 6"}]) == 1  # Añadir al final
+        assert manifest.remove(key, 3)
+        assert manifest.stats["rows_written"] == 6 and manifest.stats["rows_deleted"] == 1
+        assert manifest.add(key, {"id": 6}) is False
+
+        # Mover un mod al principio reordena en la base sin perder el orden
+        assert manifest.set(key, [{"id": "5", "name": "Mod 5"}] + manifest.get(key)) > 0
+        assert manifest.ids(key) == ["5", "1", "2", "4", "6"]
+
+        # Una lista vaciada sigue existiendo (no se recurre a la configuración antigua)
+        manifest.set(manifest_key("Gamma", "The Center"), [])
+
+        reloaded = ModManifestStore(store)
+        assert reloaded.ids(key) == ["5", "1", "2", "4", "6"]
+        assert reloaded.get(key)[0]["name"] == "Mod 5"
+        assert reloaded.has("Gamma_The Center") and reloaded.ids("Gamma_The Center") == []
+        assert not reloaded.has(manifest_key(None, None))
+        store.close()
+    print("✅ Manifiesto correcto")
+
+
+def test_switching_is_in_memory():
+    """Probar que cambiar entre 20 servidores/mapas no consulta la base"""
+    print("🧪 PRUEBA DE CAMBIO DE SERVIDOR/MAPA")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=tmp, migrate=False)
+        manifest = ModManifestStore(store)
+        keys = [manifest_key(f"Servidor{i}", "The Island") for i in range(20)]
+        for index, key in enumerate(keys):
+            manifest.set(key, [{"id": str(index * 100 + j), "name": f"Mod {j}"} for j in range(40)])
+
+        store.query = None  # Cualquier consulta fallaría
+        start = time.perf_counter()
+        for _ in range(50):
+            for index, key in enumerate(keys):
+                assert manifest.ids(key)[0] == str(index * 100)
+        elapsed = time.perf_counter() - start
+        print(f"   1000 cambios de contexto en {elapsed * 1000:.1f} ms")
+        assert elapsed < 1.0
+        store.close()
+    print("✅ Cambio de contexto correcto")
+
+
+if __name__ == "__main__":
+    test_diff_saves_and_reload()
+    test_switching_is_in_memory()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para la búsqueda paginada de mods
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.mod_search import PagedModSearch
+
+
+class FakeClient:
+    """Catálogo de 120 mods servido por páginas"""
+
+    def __init__(self, total=120):
+        self.total = total
+        self.calls = []
+        self.gate = None
+
+    def search_mods(self, query="", index=0, page_size=20, sort_field=6):
+        self.calls.append((query, index, page_size))
+        if self.gate is not None:
+            self.gate.wait()
+        data = [{"id": i, "name": f"{query} {i}"} for i in range(index, min(index + page_size, self.total))]
+        return {"data": data, "pagination": {"index": index, "pageSize": page_size, "totalCount": self.total}}
+
+
+def test_pagination_and_prefetch():
+    """Probar cursores index/pageSize, precarga y final de resultados"""
+    print("🧪 PRUEBA DE PAGINACIÓN")
+    client = FakeClient()
+    search = PagedModSearch(client)
+    generation = search.start("dino")
+    first = search.fetch_next(generation)
+    assert [mod["id"] for mod in first] == list(range(50))
+    time.sleep(0.1)
+    assert ("dino", 50, 50) in client.calls  # Precarga de la página siguiente
+
+    second = search.fetch_next(generation)
+    third = search.fetch_next(generation)
+    assert len(second) == 50 and len(third) == 20
+    assert not search.has_more
+    assert search.fetch_next(generation) is None
+    print("✅ Paginación correcta")
+
+
+def test_stale_query_is_discarded():
+    """Probar que una búsqueda obsoleta no entrega resultados"""
+    print("🧪 PRUEBA DE CANCELACIÓN")
+    client = FakeClient()
+    client.gate = threading.Event()
+    search = PagedModSearch(client, prefetch=False)
+    old = search.start("viejo")
+    results = []
+    worker = threading.Thread(target=lambda: results.append(search.fetch_next(old)))
+    worker.start()
+    time.sleep(0.05)
+
+    new = search.start("nuevo")
+    client.gate.set()
+    worker.join()
+    assert results == [None]
+    assert not search.is_current(old)
+    assert search.fetch_next(new)[0]["name"] == "nuevo 0"
+
+    search.cancel()
+    assert not search.has_more
+    print("✅ Cancelación correcta")
+
+
+if __name__ == "__main__":
+    test_pagination_and_prefetch()
+    test_stale_query_is_discarded()
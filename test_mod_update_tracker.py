@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el seguimiento de actualizaciones de mods
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.state_store import StateStore
+from utils.mod_update_tracker import ModUpdateTracker
+from utils.mod_manifest import manifest_key
+
+
+class FakeClient:
+    """Devuelve la versión actual de cada mod y registra las peticiones"""
+
+    def __init__(self, files):
+        self.files = files  # {id: file_id}
+        self.batches = []
+
+    def get_mods(self, mod_ids, ttl=None):
+        self.batches.append(sorted(mod_ids))
+        return [
+            {"id": int(mod_id), "name": f"Mod {mod_id}", "mainFileId": self.files[mod_id],
+             "latestFiles": [{"id": self.files[mod_id], "fileDate": f"2024-01-0{self.files[mod_id] % 9 + 1}"}]}
+            for mod_id in mod_ids if mod_id in self.files
+        ]
+
+
+def test_batched_update_tracking():
+    """Probar una sola petición para todos los servidores y el aviso de reinicio"""
+    print("🧪 PRUEBA DE SEGUIMIENTO DE ACTUALIZACIONES DE MODS")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=tmp, migrate=False)
+        store.mods.set_installed("Alpha_The Island", [{"id": "1"}, {"id": "2"}])
+        store.mods.set_installed("Alpha_Scorched Earth", [{"id": "2"}])
+        store.mods.set_installed("Beta_The Island", [{"id": "2"}, {"id": "3"}])
+        store.mods.set_installed("Alpha_2_The Island", [{"id": "2"}])  # Servidor "Alpha_2"
+
+        client = FakeClient({"1": 10, "2": 20, "3": 30})
+        tracker = ModUpdateTracker(client, store)
+        notified = []
+        tracker.add_listener(notified.append)
+
+        # Primera comprobación: solo se guardan las versiones
+        assert tracker.check_now() == {}
+        assert client.batches == [["1", "2", "3"]]
+        assert store.mod_versions.get_all()["2"]["file_id"] == 20
+
+        # El mod 2 cambia de archivo: afecta a tres listas en una sola petición
+        client.files["2"] = 21
+        updates = tracker.check_now()
+        assert len(client.batches) == 2
+        assert sorted(updates) == ["Alpha_2_The Island", "Alpha_Scorched Earth", "Alpha_The Island", "Beta_The Island"]
+        assert updates["Beta_The Island"][0]["previous_file_id"] == 20
+        assert notified == [updates]
+        assert sorted(tracker.servers_needing_restart()) == sorted(updates)
+
+        # Las claves se comparan completas: "Alpha" con The Island no incluye "Alpha_2"
+        alpha_island = manifest_key("Alpha", "The Island")
+        assert list(tracker.pending_updates([alpha_island])) == [alpha_island]
+        assert tracker.pending_updates([alpha_island])[alpha_island][0]["name"] == "Mod 2"
+        assert tracker.pending_updates([]) == {}
+
+        # Arrancar un servidor/mapa solo limpia esa lista
+        assert tracker.mark_restarted("Alpha", "The Island") == 1
+        assert sorted(tracker.pending_updates()) == ["Alpha_2_The Island", "Alpha_Scorched Earth", "Beta_The Island"]
+        assert tracker.mark_restarted("Alpha", "Scorched Earth") == 1
+        assert tracker.mark_restarted("Alpha", "The Island") == 0
+        assert sorted(tracker.pending_updates()) == ["Alpha_2_The Island", "Beta_The Island"]
+
+        # Sin cambios no se vuelve a avisar
+        assert tracker.check_now() == {} and len(notified) == 1
+        store.close()
+    print("✅ Seguimiento de actualizaciones correcto")
+
+
+if __name__ == "__main__":
+    test_batched_update_tracking()
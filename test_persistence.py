@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para la capa de persistencia (escrituras atómicas y diario)
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.persistence import CoalescingWriter, HistoryJournal, atomic_write_json, load_json
+
+
+def test_atomic_write():
+    """Probar que la escritura atómica no deja temporales"""
+    print("🧪 PRUEBA DE ESCRITURA ATÓMICA")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data", "estado.json")
+        atomic_write_json(path, {"mapa": "Isla", "jugadores": 10})
+        atomic_write_json(path, {"mapa": "Centro"})
+        assert load_json(path) == {"mapa": "Centro"}
+        assert os.listdir(os.path.dirname(path)) == ["estado.json"]
+        assert load_json(os.path.join(tmp, "no_existe.json"), []) == []
+    print("✅ Escritura atómica correcta")
+
+
+def test_coalescing_writer():
+    """Probar que las escrituras dentro del intervalo se agrupan"""
+    print("🧪 PRUEBA DE ESCRITURAS AGRUPADAS")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "app_settings.json")
+        writer = CoalescingWriter(interval=0.3)
+
+        assert writer.write_json(path, {"n": 0})  # Primera escritura directa
+        data = {"n": 1}
+        assert not writer.write_json(path, data)
+        data["n"] = 2  # Cambios posteriores no afectan a la versión programada
+        assert not writer.write_json(path, {"n": 3})
+        assert load_json(path) == {"n": 0}
+        assert writer.has_pending(path)
+
+        time.sleep(0.5)
+        assert load_json(path) == {"n": 3}
+        assert not writer.has_pending()
+
+        writer.write_json(path, {"n": 4})
+        writer.flush()
+        assert load_json(path) == {"n": 4}
+    print("✅ Escrituras agrupadas correctamente")
+
+
+def test_history_journal():
+    """Probar el diario de solo-añadir y la compactación"""
+    print("🧪 PRUEBA DE DIARIO DE HISTORIAL")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "backup_history.json")
+        atomic_write_json(path, [{"name": "b0"}])
+
+        journal = HistoryJournal(path, compact_every=3)
+        history = journal.load([])
+        assert history == [{"name": "b0"}]
+        assert not journal.append({"name": "b1"})
+        assert not journal.append({"name": "b2"})
+        # El archivo principal no se reescribe al añadir
+        assert load_json(path) == [{"name": "b0"}]
+
+        # Una línea cortada por un cierre inesperado se ignora
+        with open(journal.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"key": null, "rec')
+        history = HistoryJournal(path).load([])
+        assert [item["name"] for item in history] == ["b0", "b1", "b2"]
+
+        journal = HistoryJournal(path, compact_every=3)
+        history = journal.load([])
+        history.append({"name": "b3"})
+        assert journal.append({"name": "b3"})  # Alcanzado compact_every
+        assert [item["name"] for item in HistoryJournal(path).load([])] == ["b0", "b1", "b2", "b3"]
+        journal.compact(history)
+        assert len(load_json(path)) == 4
+        assert HistoryJournal(path).load([]) == history
+    print("✅ Diario de historial correcto")
+
+
+def test_journal_interrupted_compaction():
+    """Probar que un diario ya compactado no duplica registros"""
+    print("🧪 PRUEBA DE COMPACTACIÓN INTERRUMPIDA")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "restart_history.json")
+        journal = HistoryJournal(path, limit=2)
+        history = journal.load({})
+        for i in range(3):
+            history.setdefault("Isla", []).append({"n": i})
+            journal.append({"n": i}, key="Isla")
+        assert HistoryJournal(path, limit=2).load({}) == {"Isla": [{"n": 1}, {"n": 2}]}
+
+        # Simular corte tras reescribir el principal pero antes de vaciar el diario
+        with open(journal.journal_path, encoding="utf-8") as f:
+            old_journal = f.read()
+        journal.compact(history)
+        with open(journal.journal_path, "w", encoding="utf-8") as f:
+            f.write(old_journal)
+        assert json.loads(old_journal.splitlines()[0])["base"] is None
+        journal = HistoryJournal(path, limit=2)
+        assert journal.load({}) == {"Isla": [{"n": 1}, {"n": 2}]}
+        journal.append({"n": 3}, key="Isla")
+        assert HistoryJournal(path, limit=2).load({}) == {"Isla": [{"n": 2}, {"n": 3}]}
+    print("✅ Compactación interrumpida sin duplicados")
+
+
+if __name__ == "__main__":
+    test_atomic_write()
+    test_coalescing_writer()
+    test_history_journal()
+    test_journal_interrupted_compaction()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para la asignación de puertos entre instancias
+"""
+
+import os
+import sys
+import socket
+import tempfile
+from collections import namedtuple
+
+import psutil
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.state_store import StateStore
+from utils.launch_profile import LaunchProfileStore
+from utils.port_allocator import PortAllocator, profile_ports
+
+Addr = namedtuple("Addr", "ip port")
+Conn = namedtuple("Conn", "laddr type status pid")
+
+
+def test_conflicts_and_allocation():
+    """Probar conflictos entre perfiles, puertos ocupados y asignación"""
+    print("🧪 PRUEBA DE ASIGNACIÓN DE PUERTOS")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=tmp, migrate=False)
+        profiles = LaunchProfileStore(store)
+        profiles.update("Alpha", {"port": 7777, "query_port": 27015, "rcon_enabled": True, "rcon_port": 27020})
+        profiles.update("Beta", {"port": 7779, "query_port": 27016})
+        profiles.update("default", {"port": 7781, "query_port": 27017})  # Sin servidor: no reserva
+
+        calls = []
+        live = [
+            Conn(Addr("0.0.0.0", 7781), socket.SOCK_DGRAM, psutil.CONN_NONE, 500),
+            Conn(Addr("0.0.0.0", 27021), socket.SOCK_STREAM, psutil.CONN_LISTEN, 600),
+            Conn(Addr("0.0.0.0", 27017), socket.SOCK_STREAM, psutil.CONN_ESTABLISHED, 700),  # Cliente, no ocupa
+        ]
+        allocator = PortAllocator(profiles, connections=lambda: calls.append(1) or live)
+
+        problems = allocator.conflicts("Gamma", {"port": 7779, "query_port": 27017, "rcon_port": 27021})
+        assert problems == [
+            "Port 7779 ya lo usa Beta (Port)",
+            "RCONPort 27021/TCP está ocupado en el sistema (PID 600)",
+        ]
+        assert allocator.conflicts("Gamma", {"port": 7781}, ignore_pids={500}) == []
+        assert allocator.conflicts("Alpha", profile_ports(profiles.get("Alpha"))) == []
+
+        ports = allocator.allocate("Gamma")
+        assert ports == {"port": 7783, "query_port": 27017, "rcon_port": 27022}
+        assert len(calls) == 1  # Una sola revisión del sistema para todo lo anterior
+
+        # Con el perfil guardado, la siguiente instancia recibe otro bloque
+        profiles.update("Gamma", {**ports, "rcon_enabled": True})
+        assert allocator.allocate("Delta") == {"port": 7785, "query_port": 27018, "rcon_port": 27023}
+        store.close()
+    print("✅ Asignación de puertos correcta")
+
+
+def test_live_scan():
+    """Probar la revisión real del sistema con un socket UDP enlazado"""
+    print("🧪 PRUEBA DE PUERTOS OCUPADOS EN EL SISTEMA")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    try:
+        allocator = PortAllocator(profiles=None)
+        try:
+            bound = allocator.scan(force=True)
+        except Exception as e:
+            print(f"   Revisión no disponible en este sistema: {e}")
+            return
+        if bound:
+            assert ("udp", port) in bound
+    finally:
+        sock.close()
+    print("✅ Revisión del sistema correcta")
+
+
+if __name__ == "__main__":
+    test_conflicts_and_allocation()
+    test_live_scan()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el esquema de ajustes de ARK
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ini_document import IniDocument
+from utils.ini_cleaner import find_config_issues
+from utils.settings_catalog import get_schema
+
+
+def test_types_and_validation():
+    """Probar tipos del catálogo y validación de rangos"""
+    print("🧪 PRUEBA DE VALIDACIÓN DEL ESQUEMA")
+    schema = get_schema()
+    assert schema is get_schema()
+    assert schema.value_type("xpmultiplier") is float
+    assert schema.value_type("ServerPVE") is bool
+    assert schema.value_type("MaxPlayers") is int
+    assert schema.value_type("ClaveInventada") is None
+    assert schema.get("XPMultiplier").default == 1.0
+
+    assert schema.validate("XPMultiplier", "2.5") is None
+    assert schema.validate("XPMultiplier", "-1") is not None
+    assert schema.validate("XPMultiplier", "rápido") is not None
+    assert schema.validate("ServerPVE", "True") is None
+    assert schema.validate("ServerPVE", "quizás") is not None
+    assert schema.validate("Port", "80") is not None
+    assert schema.validate("MaxTamedDinos", "5000.000000") is None  # Formato del servidor
+    assert schema.validate("MaxTamedDinos", "10.5") is not None
+    assert schema.validate("ClaveInventada", "lo-que-sea") is None
+    print("✅ Validación correcta")
+
+
+def test_document_issues():
+    """Probar la detección de claves repetidas, fuera de sitio e inválidas"""
+    print("🧪 PRUEBA DE REVISIÓN DE DOCUMENTOS")
+    text = (
+        "[ServerSettings]\nXPMultiplier=2\nxpmultiplier=3\nServerPVE=talvez\n"
+        "[SessionSettings]\nSessionName=Isla\nServerPassword=secreto\n"
+        "[/Script/ShooterGame.ShooterGameMode]\n"
+        "ConfigOverrideItemMaxQuantity=(A)\nConfigOverrideItemMaxQuantity=(B)\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "GameUserSettings.ini")
+        IniDocument(text).save(path)
+        issues = find_config_issues(path)
+
+    kinds = sorted((issue['kind'], issue['key']) for issue in issues)
+    assert kinds == [
+        ('duplicate', 'xpmultiplier'),
+        ('invalid', 'ServerPVE'),
+        ('misplaced', 'ServerPassword'),
+    ], kinds
+    assert find_config_issues(os.path.join(tmp, "no_existe.ini")) == []
+    print("✅ Revisión de documentos correcta")
+
+
+if __name__ == "__main__":
+    test_types_and_validation()
+    test_document_issues()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para la instalación compartida con capas por servidor
+"""
+
+import os
+import sys
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.shared_install import SharedInstallManager
+
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def make_master(manager):
+    """Crear una instalación maestra mínima"""
+    master = manager.master_path
+    write_file(os.path.join(master, "ShooterGame", "Binaries", "Win64", "ArkAscendedServer.exe"), "exe-v1")
+    write_file(os.path.join(master, "ShooterGame", "Content", "Paks", "pak0.pak"), "pak-v1")
+    write_file(os.path.join(master, "steamapps", "appmanifest_2430930.acf"), '"AppState" { "buildid" "1" }')
+    write_file(os.path.join(master, "ShooterGame", "Saved", "master_only.txt"), "no compartir")
+
+
+def test_build_overlay():
+    """Probar la creación de capas y que Saved sea privado"""
+    print("🧪 PRUEBA DE CREACIÓN DE CAPAS")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SharedInstallManager(tmp)
+        make_master(manager)
+
+        report = manager.build_overlay("Isla")
+        assert report["failed"] == []
+        server = manager.get_server_path("Isla")
+        exe = os.path.join(server, "ShooterGame", "Binaries", "Win64", "ArkAscendedServer.exe")
+        with open(exe) as f:
+            assert f.read() == "exe-v1"
+        assert os.path.isdir(os.path.join(server, "ShooterGame", "Saved"))
+        assert not os.path.exists(os.path.join(server, "ShooterGame", "Saved", "master_only.txt"))
+        assert manager.list_overlays() == ["Isla"]
+
+        consistency = manager.check_consistency("Isla")
+        assert consistency["missing"] == consistency["stale"] == consistency["extra"] == []
+    print("✅ Capas creadas correctamente")
+
+
+def test_consistency_after_update():
+    """Probar que el verificador detecta y repara archivos desactualizados"""
+    print("🧪 PRUEBA DE VERIFICADOR DE CONSISTENCIA")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SharedInstallManager(tmp)
+        make_master(manager)
+        manager.build_overlay("Isla")
+        manager.build_overlay("Centro")
+        server = manager.get_server_path("Isla")
+
+        # Simular una actualización que reemplaza archivos en la maestra
+        pak = os.path.join(manager.master_path, "ShooterGame", "Content", "Paks", "pak0.pak")
+        os.remove(pak)
+        write_file(pak, "pak-v2-mas-largo")
+        write_file(os.path.join(manager.master_path, "ShooterGame", "Content", "Paks", "pak1.pak"), "nuevo")
+        write_file(os.path.join(server, "ShooterGame", "Content", "sobrante.txt"), "x")
+        write_file(os.path.join(server, "ShooterGame", "Saved", "world.ark"), "mundo")
+
+        consistency = manager.check_consistency("Isla")
+        assert len(consistency["stale"]) == 1
+        assert len(consistency["missing"]) == 1
+        assert len(consistency["extra"]) == 1
+
+        reports = manager.sync_all()
+        assert set(reports) == {"Isla", "Centro"}
+        with open(os.path.join(server, "ShooterGame", "Content", "Paks", "pak0.pak")) as f:
+            assert f.read() == "pak-v2-mas-largo"
+        # Los archivos propios de la capa (p. ej. plugins) se conservan al sincronizar
+        extra = os.path.join(server, "ShooterGame", "Content", "sobrante.txt")
+        assert os.path.exists(extra)
+        assert reports["Isla"]["extra"] == [os.path.join("ShooterGame", "Content", "sobrante.txt")]
+        # Los datos del servidor nunca se tocan
+        assert os.path.exists(os.path.join(server, "ShooterGame", "Saved", "world.ark"))
+        consistency = manager.check_consistency("Isla")
+        assert consistency["missing"] == consistency["stale"] == []
+
+        # Solo la reparación explícita elimina los sobrantes
+        manager.repair("Isla", remove_extra=True)
+        assert not os.path.exists(extra)
+        consistency = manager.check_consistency("Isla")
+        assert consistency["missing"] == consistency["stale"] == consistency["extra"] == []
+    print("✅ Verificador de consistencia correcto")
+
+
+def test_running_overlays():
+    """Probar la detección de capas con un servidor en ejecución"""
+    print("🧪 PRUEBA DE CAPAS EN EJECUCIÓN")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SharedInstallManager(tmp)
+        make_master(manager)
+        manager.build_overlay("Isla")
+        manager.build_overlay("Isla_2")
+        exe = os.path.join("ShooterGame", "Binaries", "Win64", "ArkAscendedServer.exe")
+
+        assert manager.running_overlays([]) == []
+        # Un servidor que no es capa no bloquea la maestra
+        assert manager.running_overlays([os.path.join(tmp, "Independiente", exe)]) == []
+        # "Isla" no coincide con "Isla_2" por prefijo
+        assert manager.running_overlays([os.path.join(manager.get_server_path("Isla_2"), exe)]) == ["Isla_2"]
+        assert manager.running_overlays([
+            os.path.join(manager.get_server_path("Isla"), exe),
+            os.path.join(manager.master_path, exe),
+        ]) == ["Isla", "_master"]
+    print("✅ Capas en ejecución detectadas")
+
+
+if __name__ == "__main__":
+    test_build_overlay()
+    test_consistency_after_update()
+    test_running_overlays()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el almacén de estado SQLite
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.state_store import StateStore
+from utils.persistence import HistoryJournal
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_migration_from_json():
+    """Probar la importación única de los JSON de data/"""
+    print("🧪 PRUEBA DE MIGRACIÓN DESDE JSON")
+    with tempfile.TemporaryDirectory() as tmp:
+        write_json(os.path.join(tmp, "app_settings.json"), {"theme_mode": "dark", "window_width": 1200})
+        backups = os.path.join(tmp, "backup_history.json")
+        write_json(backups, [{"name": "b1", "server": "Isla", "path": "b1.zip", "date": "2025-01-01T00:00:00"}])
+        # Registro pendiente en el diario de solo-añadir
+        HistoryJournal(backups).append({"name": "b2", "server": "Isla", "path": "b2.zip", "date": "2025-01-02T00:00:00"})
+        write_json(os.path.join(tmp, "restart_history.json"),
+                   {"Isla": [{"datetime": "2025-01-01T00:00:00", "success": True, "type": "manual"}]})
+        write_json(os.path.join(tmp, "installed_mods_by_server.json"),
+                   {"Isla_The Island": [{"id": "1"}], "Centro_The Center": [{"id": "9"}]})
+        write_json(os.path.join(tmp, "installed_mods_Isla_The Island.json"), [{"id": "1"}, {"id": "2"}])
+        write_json(os.path.join(tmp, "favorite_mods.json"), [{"id": "5", "name": "Fav"}])
+        write_json(os.path.join(tmp, "current_server_map.json"), {"server": "Isla", "map": "The Island"})
+
+        store = StateStore(data_dir=tmp)
+        assert store.settings.load() == {"theme_mode": "dark", "window_width": 1200}
+        assert [b["name"] for b in store.backups.list()] == ["b2", "b1"]
+        assert store.restarts.count("Isla") == 1
+        assert [m["id"] for m in store.mods.get_installed("Isla_The Island")] == ["1", "2"]
+        assert [m["id"] for m in store.mods.get_installed("Centro_The Center")] == ["9"]
+        assert store.mods.get_favorites() == [{"id": "5", "name": "Fav"}]
+        assert store.mods.get_context()["map"] == "The Island"
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.close()
+
+        # Reabrir no vuelve a importar
+        store = StateStore(data_dir=tmp)
+        assert store.migrate_json() == 0
+        assert store.backups.count() == 2
+        store.close()
+    print("✅ Migración correcta")
+
+
+def test_history_paging():
+    """Probar historiales sin límite con consultas paginadas"""
+    print("🧪 PRUEBA DE HISTORIAL PAGINADO")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=tmp)
+        for i in range(250):
+            store.backups.add({"name": f"b{i:03d}", "server": "Isla" if i % 2 else "Centro",
+                               "path": f"b{i}.zip", "date": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}"})
+            store.restarts.add("Isla", {"datetime": str(i), "success": True, "n": i})
+
+        assert store.backups.count() == 250
+        assert store.backups.count("Isla") == 125
+        page = store.backups.list(limit=10, offset=10)
+        assert [b["name"] for b in page] == [f"b{i:03d}" for i in range(239, 229, -1)]
+        oldest = store.backups.oldest(3)
+        assert [b["name"] for b in oldest] == ["b000", "b001", "b002"]
+        for backup in oldest:
+            store.backups.remove(backup)
+        assert store.backups.count() == 247
+
+        assert [r["n"] for r in store.restarts.list("Isla", limit=3)] == [249, 248, 247]
+        store.restarts.clear("Isla")
+        assert store.restarts.list("Isla") == []
+        store.close()
+    print("✅ Historial paginado correcto")
+
+
+def test_settings_and_mods_dao():
+    """Probar guardado incremental de configuración y operaciones de mods"""
+    print("🧪 PRUEBA DE DAO DE CONFIGURACIÓN Y MODS")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(data_dir=tmp)
+        settings = {"a": 1, "b": [1, 2]}
+        assert store.settings.save(settings) == 2
+        assert store.settings.save(settings) == 0
+        settings["b"].append(3)
+        del settings["a"]
+        assert store.settings.save(settings) == 2
+        assert store.settings.load() == {"b": [1, 2, 3]}
+
+        store.mods.add_installed("Isla", {"id": "10"})
+        store.mods.add_installed("Isla", {"id": "11"})
+        store.mods.remove_installed("Isla", "10")
+        store.mods.add_installed("Isla", {"id": "12"})
+        assert [m["id"] for m in store.mods.get_installed("Isla")] == ["11", "12"]
+        store.close()
+    print("✅ DAO de configuración y mods correctos")
+
+
+if __name__ == "__main__":
+    test_migration_from_json()
+    test_history_paging()
+    test_settings_and_mods_dao()
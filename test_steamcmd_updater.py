@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para el gestor de actualizaciones de SteamCMD
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.steamcmd_updater import (
+    SteamCMDProcess, SteamCMDUpdateManager, break_hardlinks, parse_available_buildid,
+    read_installed_buildid
+)
+
+
+MANIFEST_TEMPLATE = '''"AppState"
+{
+	"appid"		"2430930"
+	"StateFlags"		"4"
+	"buildid"		"%s"
+	"InstalledDepots"
+	{
+		"2430931"
+		{
+			"manifest"		"123"
+		}
+	}
+}
+'''
+
+APP_INFO_OUTPUT = '''Steam Console Client (c) Valve Corporation
+AppID : 2430930, change number : 1/0, last change : Mon Jan  1 00:00:00 2024
+"2430930"
+{
+	"common"
+	{
+		"name"		"ARK Survival Ascended Dedicated Server"
+	}
+	"depots"
+	{
+		"branches"
+		{
+			"public"
+			{
+				"buildid"		"15000002"
+				"timeupdated"		"1700000000"
+			}
+		}
+	}
+}
+'''
+
+
+def write_install(path, buildid, saved_marker=None):
+    """Crear una instalación falsa con appmanifest y carpeta Saved"""
+    os.makedirs(os.path.join(path, "steamapps"), exist_ok=True)
+    with open(os.path.join(path, "steamapps", "appmanifest_2430930.acf"), "w") as f:
+        f.write(MANIFEST_TEMPLATE % buildid)
+    if saved_marker:
+        saved = os.path.join(path, "ShooterGame", "Saved")
+        os.makedirs(saved, exist_ok=True)
+        with open(os.path.join(saved, "marker.txt"), "w") as f:
+            f.write(saved_marker)
+
+
+def test_buildid_parsing():
+    """Probar lectura del buildid instalado y disponible"""
+    print("🧪 PRUEBA DE LECTURA DE BUILDID")
+    with tempfile.TemporaryDirectory() as tmp:
+        assert read_installed_buildid(tmp) is None
+        write_install(tmp, "15000001")
+        assert read_installed_buildid(tmp) == "15000001"
+    assert parse_available_buildid(APP_INFO_OUTPUT) == "15000002"
+    assert parse_available_buildid("sin datos") is None
+    print("✅ Buildid leído correctamente")
+
+
+def test_validate_schedule():
+    """Probar que validate solo se usa bajo demanda o al vencer el intervalo"""
+    print("🧪 PRUEBA DE VALIDACIÓN PERIÓDICA")
+    with tempfile.TemporaryDirectory() as tmp:
+        install = os.path.join(tmp, "Server1")
+        state_file = os.path.join(tmp, "data", "steamcmd_state.json")
+        manager = SteamCMDUpdateManager("steamcmd", state_file, validate_interval_days=7)
+
+        # Instalación inexistente: siempre validar
+        assert manager.should_validate(install)
+
+        write_install(install, "15000001")
+        manager.mark_validated(install)
+        assert not manager.should_validate(install)
+        assert manager.should_validate(install, force=True)
+        assert "validate" not in manager.build_update_command(install)
+        assert "validate" in manager.build_update_command(install, validate=True)
+
+        # Forzar una validación antigua y recargar estado desde disco
+        with open(state_file) as f:
+            state = json.load(f)
+        for entry in state.values():
+            entry["last_validate"] = (datetime.now() - timedelta(days=8)).isoformat()
+        with open(state_file, "w") as f:
+            json.dump(state, f)
+        reloaded = SteamCMDUpdateManager("steamcmd", state_file, validate_interval_days=7)
+        assert reloaded.should_validate(install)
+    print("✅ Validación periódica correcta")
+
+
+def test_apply_staged():
+    """Probar el intercambio de staging conservando los datos del servidor"""
+    print("🧪 PRUEBA DE APLICAR STAGING")
+    with tempfile.TemporaryDirectory() as tmp:
+        install = os.path.join(tmp, "Server1")
+        manager = SteamCMDUpdateManager("steamcmd", os.path.join(tmp, "state.json"))
+        write_install(install, "15000001", saved_marker="mundo")
+        assert not manager.has_staged_update(install)
+
+        write_install(manager.get_staging_path(install), "15000002")
+        assert manager.has_staged_update(install)
+
+        assert manager.apply_staged(install) == "15000002"
+        with open(os.path.join(install, "ShooterGame", "Saved", "marker.txt")) as f:
+            assert f.read() == "mundo"
+        # La instalación anterior queda como staging para el próximo delta
+        assert read_installed_buildid(manager.get_staging_path(install)) == "15000001"
+        assert not manager.has_staged_update(install)
+    print("✅ Staging aplicado correctamente")
+
+
+def test_staging_never_shares_files():
+    """Probar que el staging no comparte archivos con la instalación en ejecución"""
+    print("🧪 PRUEBA DE STAGING INDEPENDIENTE")
+    with tempfile.TemporaryDirectory() as tmp:
+        install = os.path.join(tmp, "Server1")
+        manager = SteamCMDUpdateManager("steamcmd", os.path.join(tmp, "state.json"))
+        write_install(install, "15000001", saved_marker="mundo")
+        binaries = os.path.join(install, "ShooterGame", "Binaries", "Win64")
+        os.makedirs(binaries)
+        exe = os.path.join(binaries, "ArkAscendedServer.exe")
+        with open(exe, "w") as f:
+            f.write("exe")
+
+        # El sembrado copia los archivos y omite las rutas propias del servidor
+        staging = manager.seed_staging(install)
+        assert read_installed_buildid(staging) == "15000001"
+        assert not os.path.exists(os.path.join(staging, "ShooterGame", "Saved"))
+        staged_exe = os.path.join(staging, "ShooterGame", "Binaries", "Win64", "ArkAscendedServer.exe")
+        assert not os.path.samefile(exe, staged_exe)
+
+        # Un staging enlazado con la instalación (p. ej. la anterior tras un intercambio) se separa
+        os.remove(staged_exe)
+        try:
+            os.link(exe, staged_exe)
+        except OSError:
+            print("⚠️ El volumen no admite hardlinks, se omite la comprobación")
+            return
+        assert break_hardlinks(staging) == 1
+        assert not os.path.samefile(exe, staged_exe)
+        with open(staged_exe, "w") as f:
+            f.write("exe nuevo")
+        with open(exe) as f:
+            assert f.read() == "exe"
+        assert break_hardlinks(staging) == 0
+    print("✅ Staging independiente")
+
+
+def test_single_reader_process():
+    """Probar que la salida se entrega línea a línea con un solo lector"""
+    print("🧪 PRUEBA DE LECTOR DE SALIDA")
+    lines = []
+    cmd = [sys.executable, "-c", "import time\nfor i in range(3):\n    print('linea', i, flush=True)\n    time.sleep(0.05)"]
+    return_code = SteamCMDProcess(cmd).run(lines.append, idle_timeout=0.01)
+    assert return_code == 0
+    assert lines == ["linea 0", "linea 1", "linea 2"]
+    print("✅ Lector de salida correcto")
+
+
+if __name__ == "__main__":
+    test_buildid_parsing()
+    test_validate_schedule()
+    test_apply_staged()
+    test_staging_never_shares_files()
+    test_single_reader_process()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de prueba para los cálculos de la vista virtualizada de mods
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.virtual_grid import row_count, visible_range, cell_position
+
+
+def test_visible_range():
+    """Probar las posiciones visibles al desplazar en cuadrícula y lista"""
+    print("🧪 PRUEBA DE RANGO VISIBLE")
+    # Cuadrícula de 4 columnas y filas de 150 px, 1000 mods
+    assert visible_range(0, 600, 150, 4, 1000) == (0, 20)
+    assert visible_range(0, 600, 150, 4, 1000, overscan=2) == (0, 28)
+    # Tras desplazar 10 filas la ventana avanza y el margen cubre dos filas por encima
+    assert visible_range(1500, 600, 150, 4, 1000, overscan=2) == (32, 68)
+    # El final de la lista no se pasa del total
+    assert visible_range(150 * 249, 600, 150, 4, 1000, overscan=2) == (988, 1000)
+    # El contenido aún no ha llegado a la parte visible: solo la primera fila
+    assert visible_range(-900, 600, 150, 4, 1000) == (0, 4)
+    # Vista de lista: una columna
+    assert visible_range(260, 390, 130, 1, 50, overscan=1) == (1, 7)
+    assert visible_range(0, 600, 150, 4, 0) == (0, 0)
+    print("✅ Rango visible correcto")
+
+
+def test_cells_and_rows():
+    """Probar la celda de cada posición y el número de filas"""
+    print("🧪 PRUEBA DE CELDAS")
+    assert cell_position(0, 4, 150) == (0, 0, 0)
+    assert cell_position(7, 4, 150) == (1, 3, 150)
+    assert cell_position(5, 1, 130) == (5, 0, 650)
+    assert row_count(0, 4) == 0
+    assert row_count(9, 4) == 3
+    assert row_count(8, 4) == 2
+    print("✅ Celdas correctas")
+
+
+if __name__ == "__main__":
+    test_visible_range()
+    test_cells_and_rows()
@@ -9,6 +9,8 @@ import sys
 import winreg
 from pathlib import Path
 
+from .state_store import get_state_store
+
 
 class AppSettings:
     """Gestor de configuraciones avanzadas de la aplicación"""
@@ -26,6 +28,8 @@ class AppSettings:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         
         self.settings_file = os.path.join(base_dir, "data", "app_settings.json")
+        # Las configuraciones viven en el almacén SQLite (app_settings.json se migra al abrirlo)
+        self.store = get_state_store(logger)
         self.app_name = "ArkServerManager"
         self.app_path = sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__)
         
@@ -68,11 +72,10 @@ class AppSettings:
         self.settings = self.load_settings()
         
     def load_settings(self):
-        """Cargar configuraciones desde archivo"""
+        """Cargar configuraciones desde el almacén de estado"""
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
+            loaded_settings = self.store.settings.load()
+            if loaded_settings:
                 # Combinar con defaults para nuevas opciones
                 settings = self.default_settings.copy()
                 settings.update(loaded_settings)
@@ -87,14 +90,11 @@ class AppSettings:
             return self.settings
     
     def save_settings(self):
-        """Guardar configuraciones a archivo con logging robusto"""
+        """Guardar configuraciones en el almacén de estado con logging robusto"""
         try:
-            # Crear directorio si no existe
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            
             # Log antes de guardar
             self.logger.info("💾 Iniciando guardado de configuraciones...")
-            self.logger.debug(f"Archivo destino: {self.settings_file}")
+            self.logger.debug(f"Almacén destino: {self.store.db_path}")
             self.logger.debug(f"Configuraciones a guardar: {len(self.settings)} items")
             
             # Verificar configuraciones críticas antes de guardar
@@ -108,30 +108,9 @@ class AppSettings:
                 value = self.settings.get(setting, "NO_ENCONTRADO")
                 self.logger.info(f"🔍 {setting}: {value}")
             
-            # Escribir al archivo
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
-            
-            # Verificar que se escribió correctamente
-            if os.path.exists(self.settings_file):
-                file_size = os.path.getsize(self.settings_file)
-                self.logger.info(f"✅ Archivo guardado exitosamente ({file_size} bytes)")
-                
-                # Verificar contenido leyendo de vuelta
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    saved_data = json.load(f)
-                
-                # Verificar configuraciones críticas en el archivo
-                for setting in critical_settings:
-                    file_value = saved_data.get(setting, "NO_ENCONTRADO")
-                    memory_value = self.settings.get(setting, "NO_ENCONTRADO")
-                    if file_value == memory_value:
-                        self.logger.info(f"✅ {setting} verificado: {file_value}")
-                    else:
-                        self.logger.error(f"❌ {setting} desincronizado: memoria={memory_value}, archivo={file_value}")
-                        
-            else:
-                self.logger.error("❌ El archivo no se creó después del guardado")
+            # Solo se escriben las claves que cambiaron, en una transacción
+            changed = self.store.settings.save(self.settings)
+            self.logger.info(f"✅ Configuraciones guardadas ({changed} claves modificadas)")
                 
             self.logger.info("Configuraciones guardadas correctamente")
             return True
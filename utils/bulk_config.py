@@ -0,0 +1,256 @@
+"""
+Configuración masiva de varios servidores
+Carga en paralelo los GameUserSettings.ini / Game.ini de todos los servidores
+bajo la ruta raíz, construye una matriz de diferencias (clave × servidor) y
+aplica un conjunto de cambios a muchos servidores a la vez. Cada archivo se
+escribe de forma atómica y antes de tocar nada se guarda una instantánea de
+los archivos afectados para poder deshacer la operación completa.
+"""
+import os
+import shutil
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from .ini_document import IniDocument
+from .persistence import atomic_write_bytes, atomic_write_json, load_json
+from .shared_install import MASTER_DIR_NAME
+from .state_store import default_data_directory
+
+
+CONFIG_SUBDIR = os.path.join("ShooterGame", "Saved", "Config", "WindowsServer")
+INI_FILES = {
+    "GameUserSettings": "GameUserSettings.ini",
+    "Game": "Game.ini",
+}
+IGNORED_DIRS = ("SteamCMD", MASTER_DIR_NAME)
+
+
+class BulkConfigEngine:
+    """Diferencias y cambios de configuración sobre varios servidores"""
+
+    def __init__(self, root_path, logger=None, snapshot_dir=None, max_workers=8, versions=None):
+        self.root_path = root_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.versions = versions  # Historial de revisiones opcional (ConfigVersionStore)
+        self.snapshot_dir = snapshot_dir or os.path.join(default_data_directory(), "bulk_config_snapshots")
+        self.max_workers = max_workers
+        self.documents = {}  # {servidor: {archivo: IniDocument}}
+
+    def ini_path(self, server, file_type):
+        return os.path.join(self.root_path, server, CONFIG_SUBDIR, INI_FILES[file_type])
+
+    def discover_servers(self):
+        """Servidores bajo la ruta raíz que tienen carpeta de configuración"""
+        if not self.root_path or not os.path.isdir(self.root_path):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root_path)
+            if name not in IGNORED_DIRS
+            and os.path.isdir(os.path.join(self.root_path, name, CONFIG_SUBDIR))
+        )
+
+    def load_all(self, servers=None):
+        """
+        Cargar en paralelo los INI de los servidores indicados (o de todos)
+
+        Returns:
+            dict: {servidor: {archivo: IniDocument}} solo con los archivos existentes
+        """
+        servers = self.discover_servers() if servers is None else list(servers)
+        targets = [
+            (server, file_type) for server in servers for file_type in INI_FILES
+            if os.path.exists(self.ini_path(server, file_type))
+        ]
+
+        def load(target):
+            server, file_type = target
+            try:
+                return target, IniDocument.load(self.ini_path(server, file_type))
+            except Exception as e:
+                self.logger.error(f"Error al cargar {file_type}.ini de {server}: {e}")
+                return target, None
+
+        documents = {server: {} for server in servers}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for (server, file_type), document in executor.map(load, targets):
+                if document is not None:
+                    documents[server][file_type] = document
+        self.documents = documents
+        return documents
+
+    def diff_matrix(self, file_type=None, only_different=True, keys=None):
+        """
+        Matriz de valores clave × servidor de los documentos cargados
+
+        Args:
+            file_type: Limitar a "GameUserSettings" o "Game"
+            only_different: Omitir filas con el mismo valor en todos los servidores
+            keys: Limitar a estas claves (sin distinguir mayúsculas)
+
+        Returns:
+            dict: {(archivo, sección, clave): {servidor: valor o None}}
+        """
+        wanted = {key.lower() for key in keys} if keys else None
+        servers = sorted(self.documents)
+        rows = {}
+        names = {}  # (archivo, sección.lower(), clave.lower()) -> (sección, clave) visibles
+        for server in servers:
+            for doc_type, document in self.documents[server].items():
+                if file_type and doc_type != file_type:
+                    continue
+                for section in document.sections():
+                    for key, value in document.items(section):
+                        if wanted is not None and key.lower() not in wanted:
+                            continue
+                        row_id = (doc_type, section.lower(), key.lower())
+                        names.setdefault(row_id, (section, key))
+                        rows.setdefault(row_id, {})[server] = value
+
+        matrix = {}
+        for row_id in sorted(rows):
+            values = {server: rows[row_id].get(server) for server in servers}
+            if only_different and len(set(values.values())) <= 1:
+                continue
+            section, key = names[row_id]
+            matrix[(row_id[0], section, key)] = values
+        return matrix
+
+    def plan(self, changes, servers):
+        """
+        Calcular qué archivos cambiarían
+
+        Args:
+            changes: Lista de (archivo, sección, clave, valor); valor None elimina la clave
+            servers: Servidores destino
+
+        Returns:
+            dict: {(servidor, archivo): [(sección, clave, valor_actual, valor_nuevo)]}
+        """
+        planned = {}
+        for server in servers:
+            for file_type, section, key, value in changes:
+                document = self.documents.get(server, {}).get(file_type)
+                if document is None:
+                    document = IniDocument.load(self.ini_path(server, file_type))
+                current = document.get(section, key)
+                new = None if value is None else str(value)
+                if current != new:
+                    planned.setdefault((server, file_type), []).append((section, key, current, new))
+        return planned
+
+    def apply(self, changes, servers, description=""):
+        """
+        Aplicar cambios a varios servidores con instantánea previa
+
+        Si algún archivo falla se restauran los ya escritos.
+
+        Returns:
+            dict: {snapshot, applied: [(servidor, archivo)], failed: {(servidor, archivo): error}}
+        """
+        planned = self.plan(changes, servers)
+        result = {'snapshot': None, 'applied': [], 'failed': {}}
+        if not planned:
+            return result
+
+        snapshot_id = self.create_snapshot(list(planned), description or f"{len(changes)} cambios")
+        result['snapshot'] = snapshot_id
+
+        def write(target):
+            server, file_type = target
+            path = self.ini_path(server, file_type)
+            if self.versions is not None:
+                self.versions.track(path)
+            document = IniDocument.load(path)  # Releer: el archivo pudo cambiar desde load_all
+            for section, key, _current, new in planned[target]:
+                if new is None:
+                    document.remove_option(section, key)
+                else:
+                    document.set(section, key, new)
+            document.save(path, force=True)
+            if self.versions is not None:
+                self.versions.track(path, note=description or None)
+            return document
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {target: executor.submit(write, target) for target in planned}
+            for target, future in futures.items():
+                try:
+                    document = future.result()
+                    self.documents.setdefault(target[0], {})[target[1]] = document
+                    result['applied'].append(target)
+                except Exception as e:
+                    self.logger.error(f"Error al aplicar cambios en {target[1]}.ini de {target[0]}: {e}")
+                    result['failed'][target] = str(e)
+
+        if result['failed'] and result['applied']:
+            self.logger.warning("Restaurando archivos ya modificados por errores en la operación")
+            self.rollback(snapshot_id, targets=result['applied'])
+            result['applied'] = []
+        else:
+            self.logger.info(f"✅ Cambios aplicados en {len(result['applied'])} archivos (instantánea {snapshot_id})")
+        return result
+
+    # ------------------------------------------------------------------
+    # Instantáneas
+    # ------------------------------------------------------------------
+    def create_snapshot(self, targets, description=""):
+        """Copiar los archivos indicados antes de modificarlos"""
+        snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        directory = os.path.join(self.snapshot_dir, snapshot_id)
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for server, file_type in targets:
+            path = self.ini_path(server, file_type)
+            copy_name = f"{server}__{INI_FILES[file_type]}"
+            existed = os.path.exists(path)
+            if existed:
+                shutil.copy2(path, os.path.join(directory, copy_name))
+            files.append({'server': server, 'file': file_type, 'copy': copy_name, 'existed': existed})
+        atomic_write_json(os.path.join(directory, "manifest.json"), {
+            'created': datetime.now().isoformat(),
+            'description': description,
+            'files': files,
+        })
+        return snapshot_id
+
+    def list_snapshots(self):
+        """Instantáneas disponibles, de la más reciente a la más antigua"""
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        snapshots = []
+        for snapshot_id in sorted(os.listdir(self.snapshot_dir), reverse=True):
+            manifest = load_json(os.path.join(self.snapshot_dir, snapshot_id, "manifest.json"))
+            if manifest:
+                manifest['id'] = snapshot_id
+                snapshots.append(manifest)
+        return snapshots
+
+    def rollback(self, snapshot_id, targets=None):
+        """
+        Restaurar los archivos de una instantánea
+
+        Returns:
+            int: Número de archivos restaurados
+        """
+        directory = os.path.join(self.snapshot_dir, snapshot_id)
+        manifest = load_json(os.path.join(directory, "manifest.json"))
+        if not manifest:
+            raise FileNotFoundError(f"Instantánea no encontrada: {snapshot_id}")
+        restored = 0
+        for entry in manifest['files']:
+            target = (entry['server'], entry['file'])
+            if targets is not None and target not in targets:
+                continue
+            path = self.ini_path(*target)
+            if entry['existed']:
+                with open(os.path.join(directory, entry['copy']), "rb") as f:
+                    atomic_write_bytes(path, f.read())
+            elif os.path.exists(path):
+                os.remove(path)
+            if self.versions is not None and os.path.exists(path):
+                self.versions.track(path, note=f"Instantánea multi-servidor {snapshot_id} restaurada")
+            self.documents.get(entry['server'], {}).pop(entry['file'], None)
+            restored += 1
+        self.logger.info(f"↩️ Instantánea {snapshot_id} restaurada ({restored} archivos)")
+        return restored
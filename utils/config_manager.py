@@ -1,11 +1,13 @@
-import configparser
 import os
 import sys
 import json
+import atexit
+import threading
 from pathlib import Path
+from .ini_document import IniDocument
 
 class ConfigManager:
-    def __init__(self, config_file="config.ini"):
+    def __init__(self, config_file="config.ini", save_delay=0.5):
         # Asegurar que el config esté en el directorio del ejecutable
         if not os.path.isabs(config_file):
             # Si es un path relativo, ponerlo relativo al directorio del script/ejecutable
@@ -19,11 +21,17 @@ class ConfigManager:
         else:
             self.config_file = config_file
             
-        self.config = configparser.RawConfigParser()
-        # Preservar el caso original de las claves
-        self.config.optionxform = str
-        self.original_file_content = []
+        # Documento INI sin pérdidas: índice sección/clave → línea, fuente única de lecturas
+        self.document = None
         self.base_dir = self._get_base_dir()
+        
+        # Guardado diferido: varias llamadas a save() seguidas producen una sola escritura
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self.version_store = None  # Historial de revisiones (lo asigna la aplicación)
+        atexit.register(self.flush)
+        
         self.load_config()
     
     def _get_base_dir(self):
@@ -45,14 +53,9 @@ class ConfigManager:
         """Cargar configuración desde archivo preservando formato original"""
         try:
             if os.path.exists(self.config_file):
-                # Leer el contenido original del archivo
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.original_file_content = f.readlines()
-                
-                # Parsear con configparser preservando caso
-                # IMPORTANTE: Limpiar config antes de leer para evitar conflictos
-                self.config.clear()
-                self.config.read(self.config_file, encoding='utf-8')
+                # Leer el documento original (líneas, comentarios y formato)
+                with self._lock:
+                    self.document = IniDocument.load(self.config_file)
             else:
                 self.create_default_config()
         except Exception as e:
@@ -61,8 +64,10 @@ class ConfigManager:
     
     def create_default_config(self):
         """Crear configuración por defecto"""
+        defaults = {}
+        
         # Configuración del servidor
-        self.config['server'] = {
+        defaults['server'] = {
             'root_path': '',
             'executable_path': '',
             'install_path': '',
@@ -70,11 +75,13 @@ class ConfigManager:
             'port': '7777',
             'max_players': '70',
             'server_name': 'Mi Servidor Ark',
-            'additional_params': ''
+            'additional_params': '',
+            'validate_interval_days': '7',
+            'shared_install': 'false'
         }
         
         # Configuración de juego
-        self.config['game'] = {
+        defaults['game'] = {
             'xp_multiplier': '1.0',
             'harvest_multiplier': '1.0',
             'taming_multiplier': '1.0',
@@ -82,14 +89,14 @@ class ConfigManager:
         }
         
         # Configuración avanzada
-        self.config['advanced'] = {
+        defaults['advanced'] = {
             'data_path': '',
             'logs_path': '',
             'additional_params': ''
         }
         
         # Configuración de backups
-        self.config['backup'] = {
+        defaults['backup'] = {
             'source_path': '',
             'destination_path': '',
             'frequency_hours': '24',
@@ -97,243 +104,136 @@ class ConfigManager:
         }
         
         # Configuración de logs
-        self.config['logs'] = {
+        defaults['logs'] = {
             'logs_path': '',
             'max_log_size_mb': '100',
             'retain_logs_days': '30'
         }
         
         # Configuración de la aplicación
-        self.config['app'] = {
+        defaults['app'] = {
             'theme': 'dark',
             'language': 'es',
             'auto_start_monitoring': 'false',
             'auto_start_backup': 'false'
         }
         
-        # Crear contenido original para preservar formato
-        self.original_file_content = []
-        for section_name in self.config.sections():
-            self.original_file_content.append(f"[{section_name}]\n")
-            for key, value in self.config[section_name].items():
-                self.original_file_content.append(f"{key}={value}\n")
-            self.original_file_content.append("\n")  # Línea en blanco entre secciones
+        # Exportador de métricas OpenMetrics (Prometheus)
+        defaults['metrics'] = {
+            'exporter_enabled': 'false',
+            'exporter_host': '0.0.0.0',
+            'exporter_port': '9464'
+        }
+        
+        # Crear el documento para preservar formato en guardados posteriores
+        with self._lock:
+            self.document = IniDocument(path=self.config_file)
+            for section_name, values in defaults.items():
+                for key, value in values.items():
+                    self.document.set(section_name, key, value)
         
         # NO llamar a save() aquí para evitar recursión
         # Solo escribir directamente el archivo
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                f.writelines(self.original_file_content)
+            self.document.save(force=True)
         except Exception as e:
             print(f"Error creando configuración por defecto: {e}")
     
-    def save(self):
-        """Guardar configuración preservando formato original del archivo"""
-        try:
-            if self.original_file_content:
-                # Guardar preservando formato original
-                self._save_preserving_format()
-            else:
-                # Fallback: guardar con formato estándar
-                self._save_standard_format()
-        except Exception as e:
-            print(f"Error al guardar configuración: {e}")
-            # Intentar guardar estándar como fallback
-            self._save_standard_format()
+    def save(self, immediate=False):
+        """
+        Guardar configuración preservando formato original del archivo
+        
+        La escritura se difiere save_delay segundos para agrupar guardados
+        consecutivos; immediate=True escribe en el acto.
+        """
+        if immediate or not self.save_delay:
+            self.flush()
+            return
+        with self._lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
     
-    def _save_preserving_format(self):
-        """Guardar preservando el formato original del archivo"""
-        try:
-            print(f"🔍 DEBUG: Iniciando preservación de formato para {self.config_file}")
-            print(f"🔍 DEBUG: Contenido original tiene {len(self.original_file_content)} líneas")
-            
-            modified_lines = []
-            current_section = None
-            
-            for i, line in enumerate(self.original_file_content):
-                original_line = line
-                stripped_line = line.strip()
-                
-                # Líneas de sección
-                if stripped_line.startswith('[') and stripped_line.endswith(']'):
-                    current_section = stripped_line[1:-1]
-                    modified_lines.append(original_line)
-                    print(f"🔍 DEBUG: Línea {i+1}: Sección [{current_section}]")
-                    continue
-                
-                # Líneas vacías o comentarios
-                if not stripped_line or stripped_line.startswith(';') or stripped_line.startswith('#'):
-                    modified_lines.append(original_line)
-                    continue
-                
-                # Líneas key=value
-                if '=' in stripped_line and current_section:
-                    key_part, value_part = stripped_line.split('=', 1)
-                    original_key = key_part.strip()
-                    
-                    print(f"🔍 DEBUG: Línea {i+1}: Clave '{original_key}' en sección '{current_section}'")
-                    
-                    # Buscar si este valor ha sido modificado
-                    # Usar búsqueda case-insensitive para encontrar la clave
-                    found_key = None
-                    found_value = None
-                    
-                    if self.config.has_section(current_section):
-                        # Buscar la clave exacta primero
-                        if self.config.has_option(current_section, original_key):
-                            found_key = original_key
-                            found_value = self.config.get(current_section, original_key)
-                        else:
-                            # Buscar case-insensitive
-                            for config_key in self.config.options(current_section):
-                                if config_key.lower() == original_key.lower():
-                                    found_key = config_key
-                                    found_value = self.config.get(current_section, config_key)
-                                    break
-                    
-                    if found_key and found_value is not None:
-                        # Preservar el formato original (espacios, etc.)
-                        prefix = line[:line.find('=') + 1]
-                        suffix = '\n' if line.endswith('\n') else ''
-                        modified_line = f"{prefix}{found_value}{suffix}"
-                        modified_lines.append(modified_line)
-                        print(f"🔍 DEBUG: Línea {i+1}: Modificada '{original_key}={found_value}'")
-                    else:
-                        modified_lines.append(original_line)
-                else:
-                    modified_lines.append(original_line)
-            
-            # Escribir el archivo modificado
-            print(f"🔍 DEBUG: Escribiendo archivo con {len(modified_lines)} líneas")
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                f.writelines(modified_lines)
-                
-            print("✅ DEBUG: Archivo guardado preservando formato exitosamente")
-                
-        except Exception as e:
-            print(f"❌ Error preservando formato: {e}")
-            # Fallback a formato estándar
-            self._save_standard_format()
+    def flush(self):
+        """Escribir ahora los cambios pendientes (archivo temporal + rename)"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self.document is None:
+                return
+            try:
+                # Estado previo del archivo (por si se editó fuera) antes de sobrescribirlo
+                if self.document.dirty and self.version_store is not None:
+                    self.version_store.track(self.config_file)
+                # Solo se reescriben las líneas modificadas; sin cambios no se toca el disco
+                if self.document.save(self.config_file) and self.version_store is not None:
+                    self.version_store.track(self.config_file)
+            except Exception as e:
+                print(f"Error al guardar configuración: {e}")
     
-    def _save_standard_format(self):
-        """Guardar con formato estándar (fallback)"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                # Escribir manualmente para evitar espacios alrededor del =
-                for section_name in self.config.sections():
-                    f.write(f"[{section_name}]\n")
-                    for key, value in self.config[section_name].items():
-                        f.write(f"{key}={value}\n")
-                    f.write("\n")  # Línea en blanco entre secciones
-        except Exception as e:
-            print(f"Error al guardar configuración estándar: {e}")
+    def discard_pending(self):
+        """Cancelar un guardado diferido sin escribirlo"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
     
     def get(self, section, key, default=None):
-        """Obtener valor de configuración"""
-        try:
-            return self.config.get(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError):
+        """Obtener valor de configuración (desde memoria, sin acceder al disco)"""
+        if self.document is None:
             return default
+        return self.document.get(section, key, default)
     
     def set(self, section, key, value):
-        """Establecer valor de configuración"""
+        """Establecer valor de configuración (actualiza solo la línea afectada)"""
         try:
-            if not self.config.has_section(section):
-                self.config.add_section(section)
-            
-            # Verificar si el valor realmente cambió
-            old_value = self.config.get(section, key) if self.config.has_option(section, key) else None
-            new_value = str(value)
-            
-            if old_value != new_value:
-                self.config.set(section, key, new_value)
-                
-                # Actualizar el contenido original si existe
-                if self.original_file_content:
-                    self._update_original_content(section, key, new_value)
-                    
+            with self._lock:
+                self.document.set(section, key, str(value))
         except Exception as e:
             print(f"Error al establecer configuración: {e}")
     
-    def _update_original_content(self, section, key, new_value):
-        """Actualizar el contenido original con el nuevo valor"""
-        try:
-            modified_lines = []
-            current_section = None
-            
-            for i, line in enumerate(self.original_file_content):
-                original_line = line
-                stripped_line = line.strip()
-                
-                # Líneas de sección
-                if stripped_line.startswith('[') and stripped_line.endswith(']'):
-                    current_section = stripped_line[1:-1]
-                    modified_lines.append(original_line)
-                    continue
-                
-                # Líneas key=value en la sección correcta
-                if ('=' in stripped_line and current_section == section and 
-                    stripped_line.split('=')[0].strip() == key):
-                    # Reemplazar solo el valor, preservando el formato
-                    prefix = line[:line.find('=') + 1]
-                    suffix = '\n' if line.endswith('\n') else ''
-                    modified_line = f"{prefix}{new_value}{suffix}"
-                    modified_lines.append(modified_line)
-                else:
-                    modified_lines.append(original_line)
-            
-            # Actualizar el contenido original
-            self.original_file_content = modified_lines
-            
-        except Exception as e:
-            print(f"❌ Error actualizando contenido original: {e}")
-    
     def get_section(self, section):
         """Obtener toda una sección de configuración"""
-        try:
-            return dict(self.config[section])
-        except configparser.NoSectionError:
+        if self.document is None:
             return {}
+        return dict(self.document.items(section))
     
     def set_section(self, section, data):
         """Establecer toda una sección de configuración"""
         try:
-            if not self.config.has_section(section):
-                self.config.add_section(section)
-            
-            for key, value in data.items():
-                self.config.set(section, key, str(value))
-                
-            # Actualizar el contenido original si existe
-            if self.original_file_content:
+            with self._lock:
+                self.document.add_section(section)
                 for key, value in data.items():
-                    self._update_original_content(section, key, str(value))
+                    self.document.set(section, key, str(value))
                     
         except Exception as e:
             print(f"Error al establecer sección de configuración: {e}")
     
     def has_section(self, section):
         """Verificar si existe una sección"""
-        return self.config.has_section(section)
+        return self.document is not None and self.document.has_section(section)
     
     def remove_section(self, section):
         """Eliminar una sección de configuración"""
         try:
-            return self.config.remove_section(section)
+            with self._lock:
+                return self.document.remove_section(section)
         except Exception as e:
             print(f"Error al eliminar sección: {e}")
             return False
     
     def get_all_sections(self):
         """Obtener todas las secciones"""
-        return self.config.sections()
+        return self.document.sections() if self.document is not None else []
     
     def export_config(self, file_path):
         """Exportar configuración a archivo JSON"""
         try:
             config_dict = {}
-            for section in self.config.sections():
-                config_dict[section] = dict(self.config[section])
+            for section in self.get_all_sections():
+                config_dict[section] = self.get_section(section)
             
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(config_dict, f, indent=4, ensure_ascii=False)
@@ -360,7 +260,6 @@ class ConfigManager:
     
     def reset_to_defaults(self):
         """Restablecer configuración por defecto"""
-        self.config.clear()
         self.create_default_config()
     
     def validate_config(self):
@@ -398,17 +297,23 @@ class ConfigManager:
         
         return errors
 
-    def reload_config(self):
-        """Recargar configuración desde archivo y actualizar contenido original"""
+    def reload_config(self, flush=True):
+        """
+        Recargar configuración desde archivo y actualizar contenido original
+        
+        Args:
+            flush: Escribir antes los cambios pendientes; False cuando el archivo
+                se acaba de reemplazar (p. ej. al restaurar una revisión) y el
+                documento en memoria ya no debe sobrescribirlo
+        """
         try:
             if os.path.exists(self.config_file):
-                # Leer el contenido original del archivo
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.original_file_content = f.readlines()
-                
-                # Limpiar y recargar config
-                self.config.clear()
-                self.config.read(self.config_file, encoding='utf-8')
+                if flush:
+                    self.flush()
+                else:
+                    self.discard_pending()
+                with self._lock:
+                    self.document = IniDocument.load(self.config_file)
                 return True
             else:
                 return False
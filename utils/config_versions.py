@@ -0,0 +1,251 @@
+"""
+Historial de versiones de archivos de configuración
+Cada guardado de GameUserSettings.ini, Game.ini o config.ini se registra en
+el almacén de estado como una revisión. La mayoría son deltas de líneas
+(comprimidos) respecto a la revisión anterior, y cada `full_every` revisiones
+se guarda una copia completa. Así se pueden conservar miles de revisiones por
+servidor y reconstruir cualquiera aplicando como mucho `full_every` deltas.
+Cada revisión guarda además un resumen clave a clave para la línea de tiempo.
+"""
+import os
+import json
+import zlib
+import difflib
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+from .ini_document import IniDocument
+from .ini_watcher import diff_documents
+from .persistence import atomic_write_bytes
+from .state_store import get_state_store
+
+
+CONFIG_SUBDIR = os.path.join("ShooterGame", "Saved", "Config", "WindowsServer")
+APP_SCOPE = "app"
+MAX_SUMMARY_CHANGES = 200
+
+
+def _decode(raw):
+    # surrogateescape conserva bytes no UTF-8 para reconstruir el archivo exacto
+    return raw.decode("utf-8", errors="surrogateescape")
+
+
+def _encode(text):
+    return text.encode("utf-8", errors="surrogateescape")
+
+
+def target_for_path(path):
+    """(ámbito, archivo) de una ruta: el servidor para los INI de ARK o 'app'"""
+    path = os.path.abspath(path)
+    file_type = os.path.splitext(os.path.basename(path))[0]
+    directory = os.path.dirname(path)
+    if os.path.normcase(directory).endswith(os.path.normcase(CONFIG_SUBDIR)):
+        server_dir = directory[:-len(CONFIG_SUBDIR)].rstrip("\\/")
+        return os.path.basename(server_dir), file_type
+    return APP_SCOPE, file_type
+
+
+def line_delta(old_text, new_text):
+    """Operaciones para pasar de old_text a new_text: [[i1, i2, líneas_nuevas], ...]"""
+    old_lines = old_text.splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [
+        [i1, i2, new_lines[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"
+    ]
+
+
+def apply_delta(old_text, ops):
+    """Aplicar las operaciones de `line_delta`"""
+    old_lines = old_text.splitlines(keepends=True)
+    result = []
+    position = 0
+    for i1, i2, lines in ops:
+        result.extend(old_lines[position:i1])
+        result.extend(lines)
+        position = i2
+    result.extend(old_lines[position:])
+    return "".join(result)
+
+
+def summarize_changes(old_text, new_text):
+    """Cambios clave a clave [[sección, clave, antes, después], ...]"""
+    try:
+        old = IniDocument(old_text) if old_text is not None else None
+        changes = diff_documents(old, IniDocument(new_text))
+    except Exception:
+        return []
+    return [list(change) for change in changes[:MAX_SUMMARY_CHANGES]]
+
+
+class ConfigVersionStore:
+    """Revisiones de archivos de configuración sobre el almacén SQLite"""
+
+    def __init__(self, store=None, logger=None, full_every=50):
+        self.logger = logger or logging.getLogger(__name__)
+        self.store = store or get_state_store(self.logger)
+        self.full_every = full_every
+        self._lock = threading.Lock()  # Leer la última revisión e insertar la nueva es una sola operación
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    def record_file(self, path, scope=None, file_type=None, note=None):
+        """
+        Registrar el contenido actual de un archivo si cambió desde la última revisión
+
+        Returns:
+            int: Id de la nueva revisión, o None si no hubo cambios o no existe
+        """
+        if not os.path.exists(path):
+            return None
+        default_scope, default_file = target_for_path(path)
+        with open(path, "rb") as f:
+            text = _decode(f.read())
+        return self.record_text(scope or default_scope, file_type or default_file, text, note)
+
+    def track(self, path, note=None):
+        """Como `record_file`, pero un fallo del historial nunca interrumpe un guardado"""
+        try:
+            return self.record_file(path, note=note)
+        except Exception as e:
+            self.logger.warning(f"No se pudo registrar la revisión de {path}: {e}")
+            return None
+
+    def record_text(self, scope, file_type, text, note=None):
+        """Registrar un contenido como nueva revisión (None si es igual al último)"""
+        with self._lock:
+            return self._record_text(scope, file_type, text, note)
+
+    def _record_text(self, scope, file_type, text, note):
+        sha1 = hashlib.sha1(_encode(text)).hexdigest()
+        last = self._last_row(scope, file_type)
+        if last is not None and last["sha1"] == sha1:
+            return None
+
+        previous_text = self.get_text(last["id"]) if last is not None else None
+        full_data = zlib.compress(_encode(text))
+        kind, base_id, data = "full", None, full_data
+        if last is not None:
+            base_id = last["id"] if last["kind"] == "full" else last["base_id"]
+            since_full = self.store.query(
+                "SELECT COUNT(*) FROM config_revisions WHERE scope = ? AND file = ? AND id > ?",
+                (scope, file_type, base_id)
+            )[0][0]
+            delta = zlib.compress(json.dumps(line_delta(previous_text, text), ensure_ascii=True).encode("ascii"))
+            # Copia completa periódica, o si el delta no compensa: uno que ocupa más de la
+            # mitad de la copia completa apenas ahorra espacio y alarga la cadena de deltas a
+            # aplicar para reconstruir, así que se guarda completa y la cadena vuelve a empezar
+            if since_full + 1 < self.full_every and len(delta) < len(full_data) // 2:
+                kind, data = "delta", delta
+        if kind == "full":
+            base_id = None
+
+        summary = {"changes": summarize_changes(previous_text, text)}
+        if note:
+            summary["note"] = note
+        cursor = self.store.execute(
+            "INSERT INTO config_revisions (scope, file, created, kind, base_id, sha1, size, data, summary) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (scope, file_type, datetime.now().isoformat(), kind, base_id, sha1, len(data),
+             data, json.dumps(summary, ensure_ascii=False))
+        )
+        return cursor.lastrowid
+
+    def _last_row(self, scope, file_type):
+        rows = self.store.query(
+            "SELECT id, kind, base_id, sha1 FROM config_revisions WHERE scope = ? AND file = ? "
+            "ORDER BY id DESC LIMIT 1",
+            (scope, file_type)
+        )
+        return rows[0] if rows else None
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def targets(self):
+        """Archivos con historial: [(ámbito, archivo, número de revisiones)]"""
+        rows = self.store.query(
+            "SELECT scope, file, COUNT(*) AS revisions FROM config_revisions GROUP BY scope, file ORDER BY scope, file"
+        )
+        return [(row["scope"], row["file"], row["revisions"]) for row in rows]
+
+    def count(self, scope, file_type):
+        return self.store.query(
+            "SELECT COUNT(*) FROM config_revisions WHERE scope = ? AND file = ?", (scope, file_type)
+        )[0][0]
+
+    def timeline(self, scope, file_type, limit=50, offset=0):
+        """Revisiones de un archivo, de la más reciente a la más antigua"""
+        rows = self.store.query(
+            "SELECT id, created, kind, size, summary FROM config_revisions WHERE scope = ? AND file = ? "
+            "ORDER BY id DESC LIMIT ? OFFSET ?",
+            (scope, file_type, limit, offset)
+        )
+        timeline = []
+        for row in rows:
+            summary = json.loads(row["summary"]) if row["summary"] else {}
+            timeline.append({
+                "id": row["id"],
+                "created": row["created"],
+                "kind": row["kind"],
+                "size": row["size"],
+                "changes": summary.get("changes", []),
+                "note": summary.get("note"),
+            })
+        return timeline
+
+    def get_text(self, revision_id):
+        """Reconstruir el contenido completo de una revisión"""
+        rows = self.store.query(
+            "SELECT scope, file, kind, base_id, data FROM config_revisions WHERE id = ?", (revision_id,)
+        )
+        if not rows:
+            raise KeyError(f"Revisión no encontrada: {revision_id}")
+        row = rows[0]
+        if row["kind"] == "full":
+            return _decode(zlib.decompress(row["data"]))
+
+        base = self.store.query("SELECT data FROM config_revisions WHERE id = ?", (row["base_id"],))[0]
+        text = _decode(zlib.decompress(base["data"]))
+        deltas = self.store.query(
+            "SELECT data FROM config_revisions WHERE scope = ? AND file = ? AND id > ? AND id <= ? ORDER BY id",
+            (row["scope"], row["file"], row["base_id"], revision_id)
+        )
+        for delta in deltas:
+            text = apply_delta(text, json.loads(zlib.decompress(delta["data"]).decode("ascii")))
+        return text
+
+    # ------------------------------------------------------------------
+    # Restauración
+    # ------------------------------------------------------------------
+    def rollback(self, revision_id, path):
+        """
+        Restaurar un archivo al contenido de una revisión
+
+        El estado actual se registra antes (si no estaba ya) y la restauración
+        queda como una revisión nueva, de modo que también se puede deshacer.
+        """
+        text = self.get_text(revision_id)
+        scope, file_type = self.store.query(
+            "SELECT scope, file FROM config_revisions WHERE id = ?", (revision_id,)
+        )[0]
+        self.record_file(path, scope, file_type)
+        atomic_write_bytes(path, _encode(text))
+        self.record_text(scope, file_type, text, note=f"Restaurado a la revisión #{revision_id}")
+        self.logger.info(f"↩️ {os.path.basename(path)} restaurado a la revisión #{revision_id}")
+        return text
+
+
+_default_versions = None
+
+
+def get_version_store(logger=None):
+    """Historial de versiones compartido (usa el almacén de estado por defecto)"""
+    global _default_versions
+    if _default_versions is None:
+        _default_versions = ConfigVersionStore(logger=logger)
+    return _default_versions
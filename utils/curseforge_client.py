@@ -0,0 +1,334 @@
+"""
+Cliente de la API de CurseForge
+- Sesión HTTP con conexiones reutilizables (pool) y tiempo de espera.
+- Caché de respuestas en disco indexada por endpoint + parámetros: dentro del
+  TTL se responde sin red; pasado el TTL se revalida con If-None-Match /
+  If-Modified-Since y un 304 solo renueva la entrada.
+- Las peticiones idénticas simultáneas se agrupan en una sola llamada.
+- Reintentos con espera exponencial ante 429/5xx respetando Retry-After; si
+  se agotan y hay una copia en caché, se devuelve la copia antigua.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .persistence import get_writer, load_json
+from .state_store import default_data_directory
+
+
+BASE_URL = "https://api.curseforge.com/v1"
+ARK_SA_GAME_ID = 83374
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+SORT_POPULARITY = 6
+
+
+class CurseForgeError(Exception):
+    """Error de la API de CurseForge (status_code es None si no hubo respuesta)"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CurseForgeClient:
+    """Acceso a la API de CurseForge con caché, agrupación y reintentos"""
+
+    def __init__(self, api_key, base_url=BASE_URL, game_id=ARK_SA_GAME_ID, cache_dir=None,
+                 ttl=600, timeout=(5, 20), max_retries=3, backoff=1.0, max_backoff=30.0,
+                 memory_entries=256, max_cache_age=7 * 24 * 3600, max_cache_bytes=64 * 1024 * 1024,
+                 logger=None, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.game_id = game_id
+        self.cache_dir = cache_dir or os.path.join(default_data_directory(), "curseforge_cache")
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.memory_entries = memory_entries
+        self.max_cache_age = max_cache_age
+        self.max_cache_bytes = max_cache_bytes
+        self.logger = logger or logging.getLogger(__name__)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.update({"x-api-key": api_key, "Accept": "application/json"})
+        self.session = session
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # {clave: entrada} de las respuestas más recientes
+        self._inflight = {}  # {clave: Future} de las peticiones en curso
+        self._not_before = 0.0  # Pausa global tras un 429
+        self._sleep = time.sleep
+        self.stats = {"network": 0, "cache_hits": 0, "revalidated": 0, "coalesced": 0, "retries": 0}
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    def search_mods(self, query="", index=0, page_size=20, sort_field=SORT_POPULARITY,
+                    sort_order="desc", ttl=None, **filters):
+        """
+        Buscar mods del juego
+
+        Returns:
+            dict: Respuesta completa {data: [...], pagination: {index, pageSize, resultCount, totalCount}}
+        """
+        params = {
+            "gameId": self.game_id,
+            "sortField": sort_field,
+            "sortOrder": sort_order,
+            "index": index,
+            "pageSize": page_size,
+        }
+        if query:
+            params["searchFilter"] = query
+        params.update({key: value for key, value in filters.items() if value is not None})
+        return self.get("/mods/search", params, ttl=ttl)
+
+    def get_mod(self, mod_id, ttl=None):
+        return self.get(f"/mods/{mod_id}", ttl=ttl).get("data")
+
+    def get_mods(self, mod_ids, ttl=None):
+        """Varios mods en una sola petición (POST /mods)"""
+        mod_ids = sorted({int(mod_id) for mod_id in mod_ids})
+        if not mod_ids:
+            return []
+        return self.post("/mods", {"modIds": mod_ids}, ttl=ttl).get("data", [])
+
+    def get_mod_files(self, mod_id, index=0, page_size=50, ttl=None):
+        return self.get(f"/mods/{mod_id}/files", {"index": index, "pageSize": page_size}, ttl=ttl)
+
+    # ------------------------------------------------------------------
+    # Peticiones
+    # ------------------------------------------------------------------
+    def get(self, path, params=None, ttl=None):
+        return self.request("GET", path, params=params, ttl=ttl)
+
+    def post(self, path, body, ttl=None):
+        return self.request("POST", path, body=body, ttl=ttl)
+
+    def request(self, method, path, params=None, body=None, ttl=None):
+        """
+        Petición con caché y agrupación de peticiones idénticas en curso
+
+        Args:
+            ttl: Segundos que la respuesta se usa sin revalidar (None = el del cliente, 0 = revalidar siempre)
+
+        Returns:
+            dict: JSON de la respuesta
+        """
+        ttl = self.ttl if ttl is None else ttl
+        key = self.cache_key(method, path, params, body)
+        entry = self._cached(key)
+        if entry is not None and time.time() - entry["stored_at"] < ttl:
+            self.stats["cache_hits"] += 1
+            return entry["body"]
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._fetch(key, method, path, params, body, entry)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _fetch(self, key, method, path, params, body, entry):
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        url = f"{self.base_url}{path}"
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            wait = self._not_before - time.time()
+            if wait > 0:
+                self._sleep(wait)
+            try:
+                self.stats["network"] += 1
+                response = self.session.request(method, url, params=params, json=body,
+                                                headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = CurseForgeError(f"Error de conexión con CurseForge: {e}")
+                delay = self._retry_delay(attempt)
+            else:
+                if response.status_code == 304 and entry is not None:
+                    self.stats["revalidated"] += 1
+                    entry["stored_at"] = time.time()
+                    self._store(key, entry)
+                    return entry["body"]
+                if response.status_code == 200:
+                    entry = {
+                        "url": url,
+                        "stored_at": time.time(),
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "body": response.json(),
+                    }
+                    self._store(key, entry)
+                    return entry["body"]
+                last_error = CurseForgeError(
+                    f"CurseForge respondió {response.status_code} en {path}", response.status_code
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    self._not_before = max(self._not_before, time.time() + delay)
+                    delay = 0  # La pausa global ya cubre la espera
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                self.logger.warning(f"🔁 Reintentando {path} ({attempt + 1}/{self.max_retries}): {last_error}")
+                if delay > 0:
+                    self._sleep(delay)
+
+        if entry is not None:
+            self.logger.warning(f"⚠️ Usando copia en caché de {path}: {last_error}")
+            return entry["body"]
+        raise last_error
+
+    def _retry_delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return min(self.backoff * (2 ** attempt), self.max_backoff)
+
+    # ------------------------------------------------------------------
+    # Caché
+    # ------------------------------------------------------------------
+    @staticmethod
+    def cache_key(method, path, params=None, body=None):
+        raw = json.dumps([method.upper(), path, params or {}, body], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _cached(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        path = self._cache_path(key)
+        # Una escritura aún pendiente en el escritor es más reciente que el disco
+        get_writer().flush(path)
+        try:
+            entry = load_json(path)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Entrada de caché de CurseForge ilegible: {e}")
+            entry = None
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, key, entry):
+        self._remember(key, entry)
+        try:
+            get_writer().write_json(self._cache_path(key), entry, indent=None)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar la caché de CurseForge: {e}")
+
+    def clear_cache(self, older_than=None):
+        """
+        Borrar entradas de la caché en disco
+
+        Args:
+            older_than: Solo las guardadas hace más de estos segundos (None = todas)
+
+        Returns:
+            int: Entradas borradas
+        """
+        with self._lock:
+            self._memory.clear()
+        get_writer().flush()
+        removed = 0
+        if not os.path.isdir(self.cache_dir):
+            return removed
+        limit = time.time() - older_than if older_than is not None else None
+        for directory, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                if limit is None or os.path.getmtime(path) < limit:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    def prune_cache(self):
+        """
+        Mantener la caché en disco acotada (se llama al arrancar)
+
+        Se borran las entradas no guardadas ni revalidadas en `max_cache_age` segundos y,
+        si aun así se supera `max_cache_bytes`, las más antiguas primero. Cada
+        revalidación reescribe la entrada, así que las consultas habituales
+        se conservan.
+
+        Returns:
+            int: Entradas borradas
+        """
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        entries = []
+        for directory, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        limit = time.time() - self.max_cache_age if self.max_cache_age is not None else None
+        total = sum(size for _mtime, size, _path in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            too_old = limit is not None and mtime < limit
+            too_big = self.max_cache_bytes is not None and total > self.max_cache_bytes
+            if not too_old and not too_big:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            self.logger.info(f"🧹 Caché de CurseForge: {removed} entradas antiguas borradas")
+        return removed
@@ -0,0 +1,187 @@
+"""
+Caché de miniaturas de mods
+Los logos se descargan en un grupo acotado de hilos, se reducen al tamaño de
+la tarjeta y se guardan como PNG en una caché en disco con límite de tamaño
+(se eliminan primero los menos usados). La imagen ya decodificada se guarda
+en una caché LRU en memoria compartida por todas las vistas, de modo que
+la cuadrícula y la lista reutilizan el mismo objeto. Todo el trabajo de red
+y de decodificación ocurre fuera del hilo de la interfaz.
+"""
+import io
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+from .persistence import atomic_write_bytes
+from .state_store import default_data_directory
+
+
+class ThumbnailCache:
+    """Miniaturas por URL y tamaño con caché en memoria y en disco"""
+
+    def __init__(self, cache_dir=None, max_disk_bytes=64 * 1024 * 1024, memory_items=400,
+                 max_workers=4, timeout=10, image_factory=None, session=None, logger=None):
+        """
+        Args:
+            image_factory: Conversión opcional de la imagen PIL (p. ej. a CTkImage),
+                ejecutada en el hilo de trabajo; su resultado es lo que se guarda en memoria
+        """
+        self.cache_dir = cache_dir or os.path.join(default_data_directory(), "thumbnail_cache")
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_items = memory_items
+        self.timeout = timeout
+        self.image_factory = image_factory
+        self.logger = logger or logging.getLogger(__name__)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=max_workers))
+        self.session = session
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnails")
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # {clave: imagen}
+        self._pending = {}  # {clave: [callbacks]} de las descargas en curso
+        self._disk = None  # {clave: bytes} en orden de uso, se carga al primer acceso
+        self._disk_bytes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "downloads": 0, "errors": 0}
+
+    @staticmethod
+    def cache_key(url, size):
+        return hashlib.sha1(f"{url}|{size[0]}x{size[1]}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def get(self, url, size):
+        """Imagen ya en memoria, o None (sin bloquear)"""
+        key = self.cache_key(url, size)
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            return image
+
+    def request(self, url, size, callback):
+        """
+        Pedir una miniatura
+
+        Si ya está en memoria se devuelve al momento y no se llama a `callback`.
+        Si no, se carga en segundo plano y `callback(imagen)` se llama desde el
+        hilo de trabajo (la interfaz debe pasarlo a su hilo con `after`). Las
+        peticiones repetidas de la misma imagen en curso comparten la descarga.
+        """
+        if not url:
+            return None
+        image = self.get(url, size)
+        if image is not None:
+            return image
+        key = self.cache_key(url, size)
+        with self._lock:
+            if key in self._pending:
+                self._pending[key].append(callback)
+                return None
+            self._pending[key] = [callback]
+        self._executor.submit(self._load, key, url, tuple(size))
+        return None
+
+    def _load(self, key, url, size):
+        image = None
+        try:
+            thumbnail = self._load_from_disk(key)
+            if thumbnail is None:
+                thumbnail = self._download(key, url, size)
+            image = self.image_factory(thumbnail) if self.image_factory else thumbnail
+            with self._lock:
+                self._memory[key] = image
+                while len(self._memory) > self.memory_items:
+                    self._memory.popitem(last=False)
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.debug(f"No se pudo cargar la miniatura {url}: {e}")
+        finally:
+            with self._lock:
+                callbacks = self._pending.pop(key, [])
+        if image is not None:
+            for callback in callbacks:
+                try:
+                    callback(image)
+                except Exception as e:
+                    self.logger.error(f"Error al entregar miniatura: {e}")
+
+    # ------------------------------------------------------------------
+    # Disco
+    # ------------------------------------------------------------------
+    def _disk_index(self):
+        """Índice de la caché en disco (se construye una vez, del más antiguo al más reciente)"""
+        if self._disk is None:
+            entries = []
+            if os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".png"):
+                        stat = os.stat(os.path.join(self.cache_dir, name))
+                        entries.append((stat.st_mtime, name[:-4], stat.st_size))
+            self._disk = OrderedDict((key, size) for _mtime, key, size in sorted(entries))
+            self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def _load_from_disk(self, key):
+        with self._lock:
+            if key not in self._disk_index():
+                return None
+            self._disk.move_to_end(key)
+        path = self._path(key)
+        try:
+            with Image.open(path) as image:
+                image.load()
+                thumbnail = image.copy()
+            os.utime(path)  # La fecha de modificación marca el último uso
+            self.stats["disk_hits"] += 1
+            return thumbnail
+        except (OSError, ValueError):
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(key, 0)
+            return None
+
+    def _download(self, key, url, size):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        self.stats["downloads"] += 1
+        with Image.open(io.BytesIO(response.content)) as image:
+            thumbnail = image.convert("RGBA")
+        thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, format="PNG", optimize=True)
+        data = buffer.getvalue()
+        atomic_write_bytes(self._path(key), data)
+        with self._lock:
+            index = self._disk_index()
+            self._disk_bytes += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            self._evict_disk()
+        return thumbnail
+
+    def _evict_disk(self):
+        """Borrar las miniaturas menos usadas hasta quedar bajo el límite"""
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def disk_usage(self):
+        with self._lock:
+            self._disk_index()
+            return len(self._disk), self._disk_bytes
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
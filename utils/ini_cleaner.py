@@ -2,17 +2,18 @@
 Utilidad para limpiar archivos INI con opciones duplicadas
 """
 import os
-import configparser
-from collections import OrderedDict
+from .ini_document import IniDocument
+from .settings_catalog import get_schema
 
 
-def clean_duplicate_options(ini_file_path, backup=True):
+def clean_duplicate_options(ini_file_path, backup=True, versions=None):
     """
     Limpia opciones duplicadas de un archivo INI
     
     Args:
         ini_file_path (str): Ruta al archivo INI
         backup (bool): Si crear un backup antes de limpiar
+        versions (ConfigVersionStore): Historial donde registrar el antes y el después
     
     Returns:
         bool: True si se limpiaron duplicados, False si no había duplicados o error
@@ -28,45 +29,19 @@ def clean_duplicate_options(ini_file_path, backup=True):
                 with open(backup_path, 'w', encoding='utf-8') as dst:
                     dst.write(src.read())
         
-        # Leer archivo línea por línea y eliminar duplicados
-        with open(ini_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        cleaned_lines = []
-        current_section = None
-        seen_options = {}
-        duplicates_found = False
-        
-        for line in lines:
-            stripped_line = line.strip()
-            
-            # Detectar nueva sección
-            if stripped_line.startswith('[') and stripped_line.endswith(']'):
-                current_section = stripped_line
-                seen_options[current_section] = set()
-                cleaned_lines.append(line)
-                continue
-            
-            # Procesar opciones
-            if '=' in stripped_line and not stripped_line.startswith(';') and not stripped_line.startswith('#'):
-                option_name = stripped_line.split('=')[0].strip().lower()
-                
-                if current_section and option_name in seen_options[current_section]:
-                    # Opción duplicada encontrada - omitir
-                    duplicates_found = True
-                    print(f"Eliminando duplicado: {option_name} en {current_section}")
-                    continue
-                else:
-                    # Primera vez que vemos esta opción en esta sección
-                    if current_section:
-                        seen_options[current_section].add(option_name)
-            
-            cleaned_lines.append(line)
+        # Cargar el documento y eliminar duplicados conservando la primera aparición
+        document = IniDocument.load(ini_file_path)
+        removed = document.remove_duplicates(keep="first")
+        for section, option_name in removed:
+            print(f"Eliminando duplicado: {option_name} en [{section}]")
         
         # Escribir archivo limpio solo si encontramos duplicados
-        if duplicates_found:
-            with open(ini_file_path, 'w', encoding='utf-8') as f:
-                f.writelines(cleaned_lines)
+        if removed:
+            if versions is not None:
+                versions.track(ini_file_path)
+            document.save()
+            if versions is not None:
+                versions.track(ini_file_path)
             return True
         
         return False
@@ -76,6 +51,30 @@ def clean_duplicate_options(ini_file_path, backup=True):
         return False
 
 
+def find_config_issues(ini_file_path, file_type=None):
+    """
+    Detectar claves repetidas, fuera de su sección o con valores inválidos
+    
+    Args:
+        ini_file_path (str): Ruta al archivo INI
+        file_type (str): "GameUserSettings" o "Game"; por defecto se deduce del nombre
+    
+    Returns:
+        list: Problemas encontrados ({kind, section, key, message}); vacía si no hay archivo
+    """
+    if not os.path.exists(ini_file_path):
+        return []
+    
+    if file_type is None:
+        file_type = os.path.splitext(os.path.basename(ini_file_path))[0]
+    
+    try:
+        return get_schema().check_document(file_type, IniDocument.load(ini_file_path))
+    except Exception as e:
+        print(f"Error al revisar archivo INI: {e}")
+        return []
+
+
 def clean_gameusersettings_for_server(server_path, server_name):
     """
     Limpia el archivo GameUserSettings.ini específico de un servidor
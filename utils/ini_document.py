@@ -0,0 +1,428 @@
+"""
+Modelo de documento INI sin pérdidas compartido por todos los editores
+Conserva cada línea original (comentarios, espacios, claves duplicadas, finales
+de línea y BOM) y mantiene un índice sección/clave → líneas para búsquedas en
+O(1). Las ediciones solo reescriben las líneas afectadas; el resto del archivo
+se serializa tal cual se leyó.
+
+Ofrece además un subconjunto de la API de configparser (sections, items, get,
+set, acceso con corchetes) para que los paneles puedan usarlo directamente.
+"""
+import os
+import codecs
+
+from .persistence import atomic_write_bytes
+
+
+class IniLine:
+    """Una línea física del archivo"""
+
+    __slots__ = ("text", "kind", "section", "key")
+
+    def __init__(self, text, kind, section=None, key=None):
+        self.text = text        # Texto original incluyendo el salto de línea
+        self.kind = kind        # "section", "option", "comment", "blank" u "other"
+        self.section = section  # Nombre de la sección a la que pertenece
+        self.key = key          # Clave original (solo en opciones)
+
+    @property
+    def value(self):
+        """Valor de una línea clave=valor sin espacios alrededor"""
+        if self.kind != "option":
+            return None
+        return self.text.split("=", 1)[1].strip()
+
+    def set_value(self, value, newline):
+        """Reemplazar solo el valor conservando el prefijo original"""
+        body = self.text.rstrip("\r\n")
+        ending = self.text[len(body):] or newline
+        separator = body.find("=") + 1
+        rest = body[separator:]
+        # Conservar también los espacios que seguían al "="
+        prefix = body[:separator] + rest[:len(rest) - len(rest.lstrip())]
+        self.text = f"{prefix}{value}{ending}"
+
+
+class IniSection:
+    """Índice de una sección: cabecera, líneas y opciones por clave"""
+
+    __slots__ = ("name", "lines", "options", "anchor", "anchor_slot")
+
+    def __init__(self, name):
+        self.name = name
+        self.lines = []    # Cabecera(s) y líneas pertenecientes, en orden
+        self.options = {}  # clave en minúsculas -> [IniLine, ...] (duplicados incluidos)
+        # Punto de inserción de claves nuevas: última opción (o cabecera) de la sección,
+        # como posición en el documento y en `lines`; None si hay que recalcularlo
+        self.anchor = None
+        self.anchor_slot = None
+
+
+class SectionProxy:
+    """Vista tipo diccionario de una sección (compatible con configparser)"""
+
+    def __init__(self, document, name):
+        self._document = document
+        self._name = name
+
+    def __getitem__(self, key):
+        value = self._document.get(self._name, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._document.set(self._name, key, value)
+
+    def __contains__(self, key):
+        return self._document.has_option(self._name, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._document.options(self._name))
+
+    def get(self, key, default=None):
+        return self._document.get(self._name, key, default)
+
+    def keys(self):
+        return self._document.options(self._name)
+
+    def items(self):
+        return self._document.items(self._name)
+
+
+class IniDocument:
+    """Documento INI editable que preserva el formato original"""
+
+    def __init__(self, text="", path=None, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.bom = False
+        self.newline = "\n"
+        self.lines = []
+        self.sections_index = {}  # nombre en minúsculas -> IniSection
+        self.dirty = False
+        self._parse(text)
+
+    @classmethod
+    def load(cls, path, encoding="utf-8"):
+        """Leer un archivo INI (vacío si no existe)"""
+        if not os.path.exists(path):
+            return cls("", path=path, encoding=encoding)
+        with open(path, "rb") as f:
+            raw = f.read()
+        bom = raw.startswith(codecs.BOM_UTF8)
+        if bom:
+            raw = raw[len(codecs.BOM_UTF8):]
+        # surrogateescape conserva los bytes no válidos para volver a escribirlos tal cual
+        document = cls(raw.decode(encoding, errors="surrogateescape"), path=path, encoding=encoding)
+        document.bom = bom
+        return document
+
+    # ------------------------------------------------------------------
+    # Parseo e índice
+    # ------------------------------------------------------------------
+    def _parse(self, text):
+        self.lines = []
+        self.sections_index = {}
+        raw_lines = text.splitlines(keepends=True)
+        if raw_lines and raw_lines[0].endswith("\r\n"):
+            self.newline = "\r\n"
+
+        current = None
+        for raw in raw_lines:
+            line = self._classify(raw, current.name if current else None)
+            if line.kind == "section":
+                current = self._get_or_create_section(line.section)
+            if current is not None and line.kind in ("option", "section"):
+                current.anchor = len(self.lines)
+                current.anchor_slot = len(current.lines)
+            self.lines.append(line)
+            if current is not None:
+                current.lines.append(line)
+                if line.kind == "option":
+                    current.options.setdefault(line.key.lower(), []).append(line)
+
+    @staticmethod
+    def _classify(raw, section_name):
+        stripped = raw.strip()
+        if not stripped:
+            return IniLine(raw, "blank", section_name)
+        if stripped[0] in ";#":
+            return IniLine(raw, "comment", section_name)
+        if stripped.startswith("[") and stripped.endswith("]"):
+            return IniLine(raw, "section", stripped[1:-1])
+        if "=" in stripped and section_name is not None:
+            return IniLine(raw, "option", section_name, stripped.split("=", 1)[0].strip())
+        return IniLine(raw, "other", section_name)
+
+    def _get_or_create_section(self, name):
+        section = self.sections_index.get(name.lower())
+        if section is None:
+            section = IniSection(name)
+            self.sections_index[name.lower()] = section
+        return section
+
+    def _ensure_trailing_newline(self):
+        if self.lines and not self.lines[-1].text.endswith(("\n", "\r")):
+            self.lines[-1].text += self.newline
+
+    def _append_line(self, new_line):
+        """Agregar una línea al final del documento"""
+        self._ensure_trailing_newline()
+        self.lines.append(new_line)
+
+    def _insert_option(self, entry, new_line):
+        """Insertar una opción tras el punto de inserción de su sección"""
+        if entry.anchor is None:
+            self._locate_anchor(entry)
+        position = entry.anchor + 1
+        self._ensure_trailing_newline()
+        self.lines.insert(position, new_line)
+        self._shift_anchors(position, 1, skip=entry)
+        entry.lines.insert(entry.anchor_slot + 1, new_line)
+        entry.anchor = position
+        entry.anchor_slot += 1
+
+    def _shift_anchors(self, position, delta, skip=None):
+        """Desplazar los puntos de inserción situados desde `position` (O(secciones))"""
+        for entry in self.sections_index.values():
+            if entry is not skip and entry.anchor is not None and entry.anchor >= position:
+                entry.anchor += delta
+
+    def _locate_anchor(self, entry):
+        """Recalcular el punto de inserción de una sección tras eliminar líneas"""
+        for slot in range(len(entry.lines) - 1, -1, -1):
+            if entry.lines[slot].kind in ("option", "section"):
+                entry.anchor_slot = slot
+                entry.anchor = self._position(entry.lines[slot])
+                return
+        raise ValueError(f"La sección {entry.name} no tiene cabecera")
+
+    def _position(self, line):
+        # Búsqueda desde el final: las inserciones suelen ocurrir cerca del final de la sección
+        for index in range(len(self.lines) - 1, -1, -1):
+            if self.lines[index] is line:
+                return index
+        raise ValueError("La línea no pertenece al documento")
+
+    # ------------------------------------------------------------------
+    # API de consulta
+    # ------------------------------------------------------------------
+    def sections(self):
+        """Nombres de las secciones en orden de aparición"""
+        return [section.name for section in self.sections_index.values()]
+
+    def has_section(self, section):
+        return section.lower() in self.sections_index
+
+    def has_option(self, section, key):
+        entry = self.sections_index.get(section.lower())
+        return bool(entry and entry.options.get(key.lower()))
+
+    def options(self, section):
+        """Claves únicas de una sección con su capitalización original"""
+        entry = self.sections_index.get(section.lower())
+        if entry is None:
+            return []
+        return [lines[0].key for lines in entry.options.values() if lines]
+
+    def items(self, section):
+        """Pares (clave, valor) únicos; para duplicados se usa la última aparición"""
+        entry = self.sections_index.get(section.lower())
+        if entry is None:
+            return []
+        return [(lines[0].key, lines[-1].value) for lines in entry.options.values() if lines]
+
+    def get(self, section, key, default=None):
+        """Valor de una clave (última aparición, como hace el motor con claves repetidas)"""
+        entry = self.sections_index.get(section.lower())
+        if entry is None:
+            return default
+        lines = entry.options.get(key.lower())
+        return lines[-1].value if lines else default
+
+    def get_all(self, section, key):
+        """Todos los valores de una clave repetida (arrays de Game.ini)"""
+        entry = self.sections_index.get(section.lower())
+        if entry is None:
+            return []
+        return [line.value for line in entry.options.get(key.lower(), [])]
+
+    def option_lines(self, section):
+        """Líneas de opción de una sección, incluidas las duplicadas"""
+        entry = self.sections_index.get(section.lower())
+        if entry is None:
+            return []
+        return [line for line in entry.lines if line.kind == "option"]
+
+    def duplicates(self):
+        """Lista de (sección, clave, apariciones) para claves repetidas"""
+        result = []
+        for section in self.sections_index.values():
+            for lines in section.options.values():
+                if len(lines) > 1:
+                    result.append((section.name, lines[0].key, len(lines)))
+        return result
+
+    # ------------------------------------------------------------------
+    # API de edición
+    # ------------------------------------------------------------------
+    def add_section(self, section):
+        """Agregar una sección al final del documento"""
+        if self.has_section(section):
+            return self.sections_index[section.lower()]
+        if self.lines and self.lines[-1].kind != "blank":
+            self._append_line(IniLine(self.newline, "blank"))
+        header = IniLine(f"[{section}]{self.newline}", "section", section)
+        self._append_line(header)
+        entry = self._get_or_create_section(section)
+        entry.lines.append(header)
+        entry.anchor = len(self.lines) - 1
+        entry.anchor_slot = 0
+        self.dirty = True
+        return entry
+
+    def set(self, section, key, value):
+        """
+        Establecer un valor editando solo la línea afectada
+
+        Si la clave no existe se agrega tras la última opción de la sección.
+        """
+        value = str(value)
+        entry = self.sections_index.get(section.lower()) or self.add_section(section)
+        lines = entry.options.get(key.lower())
+        if lines:
+            line = lines[-1]
+            if line.value != value:
+                line.set_value(value, self.newline)
+                self.dirty = True
+            return
+
+        new_line = IniLine(f"{key}={value}{self.newline}", "option", entry.name, key)
+        self._insert_option(entry, new_line)
+        entry.options.setdefault(key.lower(), []).append(new_line)
+        self.dirty = True
+
+    def set_line_value(self, line, value):
+        """Editar una aparición concreta (p. ej. una entrada duplicada)"""
+        value = str(value)
+        if line.kind == "option" and line.value != value:
+            line.set_value(value, self.newline)
+            self.dirty = True
+
+    def remove_option(self, section, key):
+        """Eliminar todas las apariciones de una clave"""
+        entry = self.sections_index.get(section.lower())
+        if entry is None:
+            return False
+        lines = entry.options.pop(key.lower(), [])
+        for line in lines:
+            self._remove_line(entry, line)
+        if lines:
+            self.dirty = True
+        return bool(lines)
+
+    def remove_section(self, section):
+        """Eliminar una sección completa (cabeceras, opciones y comentarios internos)"""
+        entry = self.sections_index.pop(section.lower(), None)
+        if entry is None:
+            return False
+        removed = set(map(id, entry.lines))
+        self.lines = [line for line in self.lines if id(line) not in removed]
+        for other in self.sections_index.values():
+            other.anchor = other.anchor_slot = None
+        self.dirty = True
+        return True
+
+    def _remove_line(self, entry, line):
+        position = self._position(line)
+        self.lines.pop(position)
+        entry.lines.remove(line)
+        self._shift_anchors(position + 1, -1, skip=entry)
+        # El punto de inserción de la propia sección se recalcula en la próxima inserción
+        entry.anchor = entry.anchor_slot = None
+
+    def rename_option(self, section, key, new_key):
+        """Cambiar la capitalización/nombre de una clave conservando su valor"""
+        entry = self.sections_index.get(section.lower())
+        lines = entry.options.get(key.lower()) if entry else None
+        if not lines:
+            return 0
+        changed = 0
+        for line in lines:
+            if line.key == new_key:
+                continue
+            body = line.text.rstrip("\r\n")
+            ending = line.text[len(body):]
+            key_start = body.find(line.key)
+            line.text = f"{body[:key_start]}{new_key}{body[key_start + len(line.key):]}{ending}"
+            line.key = new_key
+            changed += 1
+        if new_key.lower() != key.lower():
+            entry.options.setdefault(new_key.lower(), []).extend(entry.options.pop(key.lower()))
+        if changed:
+            self.dirty = True
+        return changed
+
+    def remove_duplicates(self, keep="first"):
+        """
+        Eliminar claves repetidas dejando una sola aparición
+
+        Returns:
+            list: (sección, clave) de cada línea eliminada
+        """
+        removed = []
+        for entry in self.sections_index.values():
+            for key_lower, lines in entry.options.items():
+                if len(lines) < 2:
+                    continue
+                kept = lines[0] if keep == "first" else lines[-1]
+                for line in lines:
+                    if line is not kept:
+                        self._remove_line(entry, line)
+                        removed.append((entry.name, line.key))
+                entry.options[key_lower] = [kept]
+        if removed:
+            self.dirty = True
+        return removed
+
+    # ------------------------------------------------------------------
+    # Compatibilidad con configparser
+    # ------------------------------------------------------------------
+    def __contains__(self, section):
+        return self.has_section(section)
+
+    def __getitem__(self, section):
+        if not self.has_section(section):
+            raise KeyError(section)
+        return SectionProxy(self, section)
+
+    # ------------------------------------------------------------------
+    # Serialización
+    # ------------------------------------------------------------------
+    def to_string(self):
+        """Serializar el documento; las líneas no editadas salen idénticas"""
+        return "".join(line.text for line in self.lines)
+
+    def save(self, path=None, force=False):
+        """
+        Guardar de forma atómica (archivo temporal + rename)
+
+        Returns:
+            bool: True si se escribió el archivo
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No se indicó ruta para guardar el documento INI")
+        if not self.dirty and not force and path == self.path and os.path.exists(path):
+            return False
+        data = self.to_string().encode(self.encoding, errors="surrogateescape")
+        if self.bom:
+            data = codecs.BOM_UTF8 + data
+        atomic_write_bytes(path, data)
+        self.path = path
+        self.dirty = False
+        return True
@@ -0,0 +1,191 @@
+"""
+Índice de búsqueda de parámetros INI
+Mantiene en memoria las claves, valores y descripciones (del catálogo de
+ajustes) ya en minúsculas de todos los archivos INI cargados, con un índice
+de trigramas para localizar candidatos sin recorrer todos los parámetros.
+Las búsquedas que amplían la anterior (el usuario sigue escribiendo) solo
+filtran los resultados previos.
+"""
+from .settings_catalog import describe
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class IniSearchIndex:
+    """Índice de texto completo sobre los parámetros de varios documentos INI"""
+
+    def __init__(self):
+        self._entries = {}  # {id: dict de la entrada}
+        self._documents = {}  # {(servidor, archivo): [ids]}
+        self._postings = {}  # {trigrama: set(ids)}
+        self._next_id = 0
+        self._version = 0
+        self._last = None  # (versión, servidor, archivo, consulta, ids coincidentes)
+
+    def add_document(self, server, file_type, document):
+        """Indexar (o reindexar) un documento; las claves repetidas se numeran como en la UI"""
+        self.remove_document(server, file_type)
+        ids = []
+        for section in document.sections():
+            occurrences = {}
+            for line in document.option_lines(section):
+                key_lower = line.key.lower()
+                count = occurrences.get(key_lower, 0) + 1
+                occurrences[key_lower] = count
+                key = line.key if count == 1 else f"{line.key} #{count}"
+                ids.append(self._add_entry(server, file_type, section, key, line.value))
+        self._documents[(server, file_type)] = ids
+        self._version += 1
+
+    def _add_entry(self, server, file_type, section, key, value):
+        entry_id = self._next_id
+        self._next_id += 1
+        value = "" if value is None else str(value)
+        description = describe(key.split(" #")[0])
+        entry = {
+            'server': server,
+            'file': file_type,
+            'section': section,
+            'key': key,
+            'value': value,
+            'description': description,
+            'key_lower': key.lower(),
+            'value_lower': value.lower(),
+            'description_lower': description.lower(),
+        }
+        self._entries[entry_id] = entry
+        for gram in self._entry_grams(entry):
+            self._postings.setdefault(gram, set()).add(entry_id)
+        return entry_id
+
+    def _entry_grams(self, entry):
+        return (_trigrams(entry['key_lower'])
+                | _trigrams(entry['value_lower'])
+                | _trigrams(entry['description_lower']))
+
+    def remove_document(self, server, file_type):
+        """Quitar del índice un documento"""
+        ids = self._documents.pop((server, file_type), None)
+        if not ids:
+            return
+        for entry_id in ids:
+            entry = self._entries.pop(entry_id)
+            for gram in self._entry_grams(entry):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(entry_id)
+                    if not postings:
+                        del self._postings[gram]
+        self._version += 1
+
+    def update_value(self, server, file_type, section, key, value):
+        """Actualizar el valor indexado de un parámetro tras editarlo"""
+        for entry_id in self._documents.get((server, file_type), ()):
+            entry = self._entries[entry_id]
+            if entry['section'] == section and entry['key'] == key:
+                for gram in self._entry_grams(entry):
+                    self._postings[gram].discard(entry_id)
+                entry['value'] = "" if value is None else str(value)
+                entry['value_lower'] = entry['value'].lower()
+                for gram in self._entry_grams(entry):
+                    self._postings.setdefault(gram, set()).add(entry_id)
+                self._version += 1
+                return True
+        return False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _candidates(self, server, file_type, query):
+        # Una consulta que amplía la anterior solo necesita filtrar sus resultados
+        if self._last is not None:
+            version, last_server, last_file, last_query, last_ids = self._last
+            if (version == self._version and last_server == server and last_file == file_type
+                    and query.startswith(last_query)):
+                return last_ids
+
+        if len(query) >= 3:
+            postings = sorted((self._postings.get(gram, set()) for gram in _trigrams(query)), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+        elif server is not None or file_type is not None:
+            candidates = []
+            for (doc_server, doc_file), ids in self._documents.items():
+                if server in (None, doc_server) and file_type in (None, doc_file):
+                    candidates.extend(ids)
+        else:
+            candidates = self._entries.keys()
+        return candidates
+
+    @staticmethod
+    def match_type(entry, query):
+        """Tipo de coincidencia: exact, partial_key, partial_value, description o none"""
+        if query == entry['key_lower']:
+            return 'exact'
+        if query in entry['key_lower']:
+            return 'partial_key'
+        if query in entry['value_lower']:
+            return 'partial_value'
+        if query in entry['description_lower']:
+            return 'description'
+        return 'none'
+
+    @staticmethod
+    def match_score(entry, query):
+        """Puntuación de relevancia (mayor = más relevante)"""
+        score = 0
+        pos = entry['key_lower'].find(query)
+        if pos != -1:
+            # Coincidencia al inicio vale más; la exacta mucho más
+            score += 100 - pos
+            if query == entry['key_lower']:
+                score += 1000
+        if query in entry['value_lower']:
+            score += 10
+        if query in entry['description_lower']:
+            score += 5
+        # Penalizar parámetros muy largos
+        score -= len(entry['key']) * 0.1
+        return score
+
+    def search(self, query, server=None, file_type=None, limit=None):
+        """
+        Buscar parámetros por clave, valor o descripción
+
+        Returns:
+            list: Diccionarios con server, file, section, key, value, description,
+            match_type y match_score, ordenados por relevancia (exactos primero)
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+
+        matched_ids = []
+        results = []
+        for entry_id in self._candidates(server, file_type, query):
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                continue
+            if server is not None and entry['server'] != server:
+                continue
+            if file_type is not None and entry['file'] != file_type:
+                continue
+            match_type = self.match_type(entry, query)
+            if match_type == 'none':
+                continue
+            matched_ids.append(entry_id)
+            results.append({
+                'server': entry['server'],
+                'file': entry['file'],
+                'section': entry['section'],
+                'key': entry['key'],
+                'value': entry['value'],
+                'description': entry['description'],
+                'match_type': match_type,
+                'match_score': self.match_score(entry, query),
+            })
+        self._last = (self._version, server, file_type, query, matched_ids)
+
+        results.sort(key=lambda r: (0 if r['match_type'] == 'exact' else 1, -r['match_score']))
+        return results[:limit] if limit else results
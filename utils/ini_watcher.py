@@ -0,0 +1,260 @@
+"""
+Vigilancia de archivos INI (GameUserSettings.ini / Game.ini)
+Un único hilo en segundo plano compara la huella de cada archivo vigilado
+(mtime + tamaño, y hash del contenido solo cuando estos cambian) y entrega el
+documento recién cargado cuando hay una edición externa; `diff_documents`
+calcula la diferencia clave a clave respecto al documento en memoria. Las
+escrituras propias se confirman con `acknowledge` para no generar avisos.
+
+En Windows el hilo duerme hasta que el sistema notifica un cambio en la
+carpeta de algún archivo vigilado (FindFirstChangeNotification). La
+comprobación periódica queda como red de seguridad, y en otros sistemas como
+único mecanismo; su intervalo se duplica mientras no cambia nada hasta
+`max_interval`.
+"""
+import os
+import ctypes
+import hashlib
+import logging
+import threading
+from ctypes import wintypes
+
+from .ini_document import IniDocument
+
+
+def file_fingerprint(path, previous=None):
+    """
+    Huella (mtime_ns, tamaño, sha1) de un archivo
+
+    Si mtime y tamaño coinciden con `previous` se reutiliza su hash sin leer
+    el archivo. Devuelve None si el archivo no existe.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+        return previous
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return (stat.st_mtime_ns, stat.st_size, digest)
+
+
+def diff_documents(old, new):
+    """
+    Diferencia clave a clave entre dos documentos INI
+
+    Returns:
+        list: Tuplas (sección, clave, valor_anterior, valor_nuevo); None indica
+        que la clave no existe en ese lado. Para claves duplicadas se compara
+        la última aparición, igual que `IniDocument.get`.
+    """
+    changes = []
+    old_sections = {section.lower(): section for section in old.sections()} if old else {}
+    new_sections = {section.lower(): section for section in new.sections()}
+    for lower in list(old_sections) + [s for s in new_sections if s not in old_sections]:
+        section = new_sections.get(lower, old_sections.get(lower))
+        old_items = {}
+        if lower in old_sections:
+            old_items = {key.lower(): (key, value) for key, value in old.items(old_sections[lower])}
+        new_items = {}
+        if lower in new_sections:
+            new_items = {key.lower(): (key, value) for key, value in new.items(new_sections[lower])}
+        for key_lower in list(old_items) + [k for k in new_items if k not in old_items]:
+            old_key, old_value = old_items.get(key_lower, (None, None))
+            new_key, new_value = new_items.get(key_lower, (None, None))
+            if old_value != new_value:
+                changes.append((section, new_key or old_key, old_value, new_value))
+    return changes
+
+
+class DirectoryNotifier:
+    """Notificaciones de cambios en carpetas de Windows para el hilo del vigilante"""
+
+    # Escrituras, renombrados (guardado atómico) y cambios de tamaño
+    NOTIFY_FILTER = 0x00000001 | 0x00000008 | 0x00000010
+    WAIT_OBJECT_0 = 0x00000000
+    WAIT_TIMEOUT = 0x00000102
+    MAX_HANDLES = 63  # Límite de WaitForMultipleObjects sin contar el evento de despertar
+
+    def __init__(self):
+        self.kernel32 = ctypes.windll.kernel32
+        self.kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self.kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.CreateEventW.restype = wintypes.HANDLE
+        self.kernel32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD
+        ]
+        self.kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        self._invalid_handle = wintypes.HANDLE(-1).value
+        self._wake_handle = self.kernel32.CreateEventW(None, False, False, None)
+        if not self._wake_handle:
+            raise OSError("No se pudo crear el evento del vigilante")
+        self._handles = {}  # {carpeta: handle de notificación}
+
+    def set_directories(self, directories):
+        """Vigilar exactamente estas carpetas (solo desde el hilo que espera)"""
+        directories = set(list(directories)[:self.MAX_HANDLES])
+        for directory in [d for d in self._handles if d not in directories]:
+            self.kernel32.FindCloseChangeNotification(wintypes.HANDLE(self._handles.pop(directory)))
+        for directory in directories:
+            if directory in self._handles or not os.path.isdir(directory):
+                continue
+            handle = self.kernel32.FindFirstChangeNotificationW(directory, False, self.NOTIFY_FILTER)
+            if handle and handle != self._invalid_handle:
+                self._handles[directory] = handle
+
+    def wait(self, timeout):
+        """
+        Esperar un cambio, `wake()` o el tiempo indicado
+
+        Returns:
+            bool: True si hubo notificación o despertar, False si venció el tiempo
+        """
+        handles = [self._wake_handle] + list(self._handles.values())
+        array = (wintypes.HANDLE * len(handles))(*handles)
+        result = self.kernel32.WaitForMultipleObjects(len(handles), array, False, int(timeout * 1000))
+        if result == self.WAIT_TIMEOUT:
+            return False
+        index = result - self.WAIT_OBJECT_0
+        if 1 <= index < len(handles):
+            # Volver a armar la notificación para el siguiente cambio
+            self.kernel32.FindNextChangeNotification(wintypes.HANDLE(handles[index]))
+        return True
+
+    def wake(self):
+        self.kernel32.SetEvent(wintypes.HANDLE(self._wake_handle))
+
+    def close(self):
+        self.set_directories([])
+        self.kernel32.CloseHandle(wintypes.HANDLE(self._wake_handle))
+        self._wake_handle = None
+
+
+class IniFileWatcher:
+    """Vigila archivos INI e informa de cambios externos"""
+
+    def __init__(self, logger=None, interval=1.0, max_interval=30.0):
+        self.logger = logger or logging.getLogger(__name__)
+        self.interval = interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._watches = {}  # {ruta: {"fingerprint": ..., "callback": ...}}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._notifier = None
+        try:
+            self._notifier = DirectoryNotifier()
+        except (AttributeError, OSError):
+            # Fuera de Windows (o si falla la API) solo queda la comprobación periódica
+            self._notifier = None
+
+    def watch(self, path, callback):
+        """
+        Empezar a vigilar un archivo
+
+        `callback(path, document)` se invoca desde el hilo del vigilante con el
+        documento recién cargado; la interfaz debe reenviarlo a su hilo.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            self._watches[path] = {"fingerprint": file_fingerprint(path), "callback": callback}
+        self._ensure_thread()
+        # Registrar la carpeta nueva y volver al intervalo corto
+        self._wake_thread()
+
+    def unwatch(self, path):
+        with self._lock:
+            self._watches.pop(os.path.abspath(path), None)
+
+    def unwatch_all(self):
+        with self._lock:
+            self._watches.clear()
+
+    def watched_paths(self):
+        with self._lock:
+            return list(self._watches)
+
+    def acknowledge(self, path):
+        """Registrar la huella actual tras una escritura propia (no genera aviso)"""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self._watches:
+                self._watches[path]["fingerprint"] = file_fingerprint(path)
+
+    def check_now(self):
+        """
+        Comprobar todos los archivos inmediatamente (también lo usa el hilo)
+
+        Returns:
+            bool: True si cambió la huella de algún archivo
+        """
+        with self._lock:
+            watches = list(self._watches.items())
+        changed = False
+        for path, watch in watches:
+            previous = watch["fingerprint"]
+            try:
+                fingerprint = file_fingerprint(path, previous)
+            except OSError as e:
+                self.logger.warning(f"No se pudo leer {path}: {e}")
+                continue
+            if fingerprint is None or fingerprint == previous:
+                continue
+            with self._lock:
+                if self._watches.get(path) is not watch:
+                    continue
+                watch["fingerprint"] = fingerprint
+            changed = True
+            # Un cambio solo de mtime (mismo contenido) actualiza la huella sin avisar
+            if previous and previous[2] == fingerprint[2]:
+                continue
+            try:
+                watch["callback"](path, IniDocument.load(path))
+            except Exception as e:
+                self.logger.error(f"Error procesando cambio externo en {path}: {e}")
+        return changed
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="IniFileWatcher")
+        self._thread.start()
+
+    def _wake_thread(self):
+        self._wake.set()
+        if self._notifier:
+            self._notifier.wake()
+
+    def _wait(self, timeout):
+        """Dormir hasta un cambio notificado, un despertar o `timeout` segundos"""
+        if self._notifier:
+            directories = {os.path.dirname(path) for path in self.watched_paths()}
+            self._notifier.set_directories(directories)
+            notified = self._notifier.wait(timeout)
+        else:
+            notified = self._wake.wait(timeout)
+        self._wake.clear()
+        return notified
+
+    def _run(self):
+        delay = self.interval
+        while not self._stop.is_set():
+            notified = self._wait(delay)
+            if self._stop.is_set():
+                break
+            changed = self.check_now()
+            # Sin cambios el intervalo se duplica; cualquier actividad lo reinicia
+            delay = self.interval if changed or notified else min(delay * 2, self.max_interval)
+
+    def stop(self):
+        self._stop.set()
+        self._wake_thread()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._notifier:
+            self._notifier.close()
+            self._notifier = None
@@ -0,0 +1,277 @@
+"""
+Perfiles de arranque de servidores
+Un perfil reúne todo lo que define un arranque (mapa, puertos, MultiHome,
+RCON, mods, argumentos personalizados y variables de entorno). Se valida y
+se compila a la lista de argumentos una sola vez cuando cambia, y el
+resultado se guarda por servidor en el almacén de estado: el arranque manual,
+el reinicio programado y cualquier arranque sin interfaz usan los mismos
+argumentos ya calculados.
+"""
+import json
+import hashlib
+import logging
+import ipaddress
+import threading
+from datetime import datetime
+
+from .state_store import get_state_store
+
+
+# Nombres de mapa (y sus variantes) → identificador técnico de ARK: Survival Ascended
+MAP_IDENTIFIERS = {
+    "The Island": "TheIsland_WP",
+    "TheIsland": "TheIsland_WP",
+    "TheIsland_WP": "TheIsland_WP",
+    "The Center": "TheCenter_WP",
+    "TheCenter": "TheCenter_WP",
+    "TheCenter_WP": "TheCenter_WP",
+    "Scorched Earth": "ScorchedEarth_WP",
+    "ScorchedEarth": "ScorchedEarth_WP",
+    "ScorchedEarth_WP": "ScorchedEarth_WP",
+    "Ragnarok": "Ragnarok_WP",
+    "Ragnarok_WP": "Ragnarok_WP",
+    "Aberration": "Aberration_P",
+    "Aberration_P": "Aberration_P",
+    "Extinction": "Extinction",
+    "Valguero": "Valguero_P",
+    "Valguero_P": "Valguero_P",
+    "Genesis: Part 1": "Genesis",
+    "Genesis1": "Genesis",
+    "Genesis": "Genesis",
+    "Crystal Isles": "CrystalIsles",
+    "CrystalIsles": "CrystalIsles",
+    "Genesis: Part 2": "Gen2",
+    "Genesis2": "Gen2",
+    "Gen2": "Gen2",
+    "Lost Island": "LostIsland",
+    "LostIsland": "LostIsland",
+    "Fjordur": "Fjordur",
+    "Modded Map": "ModdedMap",
+    "ModdedMap": "ModdedMap",
+}
+DEFAULT_MAP_IDENTIFIER = "TheIsland_WP"
+
+DEFAULT_PORT = 7777
+DEFAULT_QUERY_PORT = 27015
+DEFAULT_MULTIHOME = "127.0.0.1"
+
+# Opciones del argumento del mapa que el perfil ya define
+_RESERVED_OPTIONS = {"port", "queryport", "multihome", "enablercon", "rconport"}
+
+
+class LaunchProfileError(ValueError):
+    """Perfil con errores que impedirían el arranque"""
+
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def map_identifier(map_name):
+    """Identificador técnico de un mapa (el de The Island si no se conoce)"""
+    return MAP_IDENTIFIERS.get((map_name or "").strip(), DEFAULT_MAP_IDENTIFIER)
+
+
+def _port(value, default):
+    """Puerto como entero; el texto no numérico se conserva para informar del error"""
+    text = str(value).strip() if value is not None else ""
+    if not text:
+        return default
+    return int(text) if text.isdigit() else text
+
+
+def normalize_profile(data):
+    """Perfil completo y comparable a partir de datos parciales (valores de la interfaz, JSON...)"""
+    custom_args = data.get("custom_args") or []
+    if isinstance(custom_args, str):
+        custom_args = custom_args.split("\n")
+    mods = data.get("mods") or []
+    if isinstance(mods, str):
+        mods = mods.split(",")
+    return {
+        "server": (data.get("server") or "").strip(),
+        "map": (data.get("map") or "").strip(),
+        "port": _port(data.get("port"), DEFAULT_PORT),
+        "query_port": _port(data.get("query_port"), DEFAULT_QUERY_PORT),
+        "multihome": (data.get("multihome") or "").strip() or DEFAULT_MULTIHOME,
+        "rcon_enabled": bool(data.get("rcon_enabled")),
+        "rcon_port": _port(data.get("rcon_port"), None) if data.get("rcon_enabled") else None,
+        "mods": list(dict.fromkeys(str(mod_id).strip() for mod_id in mods if str(mod_id).strip())),
+        # Líneas vacías y comentarios no forman parte del arranque
+        "custom_args": [line.strip() for line in custom_args if line.strip() and not line.strip().startswith("#")],
+        "env": {str(key): str(value) for key, value in (data.get("env") or {}).items()},
+    }
+
+
+def validate_profile(profile):
+    """
+    Comprobar un perfil normalizado
+
+    Returns:
+        tuple: (errores, avisos) como listas de textos
+    """
+    errors, warnings = [], []
+    ports = {"Port": profile["port"], "QueryPort": profile["query_port"]}
+    if profile["rcon_enabled"]:
+        ports["RCONPort"] = profile["rcon_port"]
+    for name, port in ports.items():
+        if not isinstance(port, int) or not 1 <= port <= 65535:
+            errors.append(f"{name} inválido: {port}")
+    used = {}
+    for name, port in ports.items():
+        if isinstance(port, int) and port in used:
+            errors.append(f"{name} y {used[port]} usan el mismo puerto {port}")
+        used.setdefault(port, name)
+
+    try:
+        ipaddress.IPv4Address(profile["multihome"])
+    except ValueError:
+        errors.append(f"MultiHome no es una IP válida: {profile['multihome']}")
+
+    invalid_mods = [mod_id for mod_id in profile["mods"] if not mod_id.isdigit()]
+    if invalid_mods:
+        errors.append(f"Ids de mods inválidos: {', '.join(invalid_mods)}")
+
+    for key in profile["env"]:
+        if not key or "=" in key:
+            errors.append(f"Variable de entorno inválida: '{key}'")
+
+    if profile["map"] and profile["map"] not in MAP_IDENTIFIERS:
+        warnings.append(f"Mapa desconocido '{profile['map']}', se usará {DEFAULT_MAP_IDENTIFIER}")
+    for line in profile["custom_args"]:
+        option = line.lstrip("?").split("=", 1)[0].strip().lower()
+        if option in _RESERVED_OPTIONS:
+            warnings.append(f"El argumento personalizado '{line}' repite una opción del perfil")
+    return errors, warnings
+
+
+def compile_profile(profile):
+    """
+    Compilar un perfil normalizado
+
+    Returns:
+        dict: {args, env, errors, warnings, fingerprint}
+    """
+    errors, warnings = validate_profile(profile)
+    map_arg = (
+        f"{map_identifier(profile['map'])}?listen"
+        f"?Port={profile['port']}?QueryPort={profile['query_port']}?MultiHome={profile['multihome']}"
+    )
+    for line in profile["custom_args"]:
+        map_arg += line if line.startswith("?") else f"?{line}"
+    if profile["rcon_enabled"]:
+        map_arg += f"?EnableRCON=True?RCONPort={profile['rcon_port']}"
+
+    args = [map_arg, "-server", "-log"]
+    if profile["mods"]:
+        args.append(f"-mods={','.join(profile['mods'])}")
+    return {
+        "args": args,
+        "env": dict(profile["env"]),
+        "errors": errors,
+        "warnings": warnings,
+        "fingerprint": hashlib.sha1(json.dumps(profile, sort_keys=True).encode("utf-8")).hexdigest(),
+    }
+
+
+def diff_profiles(old, new):
+    """{campo: (antes, después)} de los campos que cambian entre dos perfiles"""
+    old = old or {}
+    return {key: (old.get(key), value) for key, value in new.items() if old.get(key) != value}
+
+
+class LaunchProfileStore:
+    """Perfiles y argumentos compilados por servidor, en memoria y en el almacén de estado"""
+
+    def __init__(self, store, logger=None):
+        self.store = store
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._profiles = {}  # {servidor: perfil normalizado}
+        self._compiled = {}  # {servidor: perfil compilado}
+        self.stats = {"compilations": 0, "cache_hits": 0}
+        for row in self.store.query("SELECT server, data, compiled FROM launch_profiles"):
+            self._profiles[row["server"]] = json.loads(row["data"])
+            self._compiled[row["server"]] = json.loads(row["compiled"])
+
+    def servers(self):
+        with self._lock:
+            return list(self._profiles)
+
+    def get(self, server):
+        """Copia del perfil guardado de un servidor, o None"""
+        with self._lock:
+            profile = self._profiles.get(server)
+            return json.loads(json.dumps(profile)) if profile is not None else None
+
+    def compiled(self, server):
+        """Resultado compilado del perfil de un servidor, o None"""
+        with self._lock:
+            compiled = self._compiled.get(server)
+            return dict(compiled) if compiled is not None else None
+
+    def launch_args(self, server):
+        """
+        Argumentos listos para arrancar un servidor sin la interfaz
+
+        Raises:
+            LaunchProfileError: Si no hay perfil o tiene errores
+        """
+        compiled = self.compiled(server)
+        if compiled is None:
+            raise LaunchProfileError([f"No hay perfil de arranque para {server}"])
+        if compiled["errors"]:
+            raise LaunchProfileError(compiled["errors"])
+        return list(compiled["args"])
+
+    def launch_env(self, server):
+        """Variables de entorno del perfil de un servidor ({} si no tiene perfil)"""
+        compiled = self.compiled(server)
+        return dict(compiled["env"]) if compiled is not None else {}
+
+    def update(self, server, data):
+        """
+        Guardar el perfil de un servidor; solo se valida y compila si cambió
+
+        Returns:
+            tuple: (compilado, cambios {campo: (antes, después)})
+        """
+        profile = normalize_profile({**data, "server": data.get("server") or server})
+        with self._lock:
+            previous = self._profiles.get(server)
+            if previous == profile and server in self._compiled:
+                self.stats["cache_hits"] += 1
+                return dict(self._compiled[server]), {}
+
+            compiled = compile_profile(profile)
+            self.stats["compilations"] += 1
+            self.store.execute(
+                "INSERT OR REPLACE INTO launch_profiles (server, data, compiled, updated_at) VALUES (?, ?, ?, ?)",
+                (server, json.dumps(profile, ensure_ascii=False), json.dumps(compiled, ensure_ascii=False),
+                 datetime.now().isoformat())
+            )
+            self._profiles[server] = profile
+            self._compiled[server] = compiled
+            changes = diff_profiles(previous, profile)
+        if previous is not None:
+            self.logger.info(f"Perfil de arranque de {server} actualizado: {', '.join(changes)}")
+        return dict(compiled), changes
+
+    def remove(self, server):
+        with self._lock:
+            self._profiles.pop(server, None)
+            self._compiled.pop(server, None)
+            self.store.execute("DELETE FROM launch_profiles WHERE server = ?", (server,))
+
+
+_default_profiles = None
+_default_profiles_lock = threading.Lock()
+
+
+def get_launch_profiles(logger=None):
+    """Perfiles de arranque compartidos por toda la aplicación"""
+    global _default_profiles
+    with _default_profiles_lock:
+        if _default_profiles is None:
+            _default_profiles = LaunchProfileStore(get_state_store(logger), logger)
+        return _default_profiles
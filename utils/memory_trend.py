@@ -0,0 +1,183 @@
+"""
+Análisis de tendencia de memoria del servidor ARK
+Ajusta una recta al crecimiento de RSS en una ventana deslizante, estima el
+tiempo hasta alcanzar el límite configurado y decide si conviene reiniciar.
+"""
+import time
+import logging
+import threading
+
+
+def fit_linear_trend(points):
+    """
+    Ajustar una recta por mínimos cuadrados
+
+    Args:
+        points (list): Pares (timestamp, valor)
+
+    Returns:
+        tuple: (pendiente por segundo, ordenada en t0, r², t0) o None si no hay datos suficientes
+    """
+    if len(points) < 2:
+        return None
+    t0 = points[0][0]
+    n = len(points)
+    sum_x = sum_y = sum_xx = sum_xy = 0.0
+    for ts, value in points:
+        x = ts - t0
+        sum_x += x
+        sum_y += value
+        sum_xx += x * x
+        sum_xy += x * value
+    denominator = n * sum_xx - sum_x * sum_x
+    if denominator == 0:
+        return None
+    slope = (n * sum_xy - sum_x * sum_y) / denominator
+    intercept = (sum_y - slope * sum_x) / n
+
+    mean_y = sum_y / n
+    ss_tot = sum((value - mean_y) ** 2 for _, value in points)
+    ss_res = sum((value - (intercept + slope * (ts - t0))) ** 2 for ts, value in points)
+    r_squared = 1 - ss_res / ss_tot if ss_tot else 0.0
+    return slope, intercept, r_squared, t0
+
+
+class MemoryTrendAnalyzer:
+    """Evalúa el crecimiento de memoria y decide reinicios por necesidad"""
+
+    def __init__(self, memory_limit_mb, window_hours=6, horizon_hours=2,
+                 min_r_squared=0.5, min_samples=30, player_defer_hours=1.0):
+        self.memory_limit_mb = memory_limit_mb
+        self.window_seconds = window_hours * 3600
+        self.horizon_seconds = horizon_hours * 3600
+        self.min_r_squared = min_r_squared
+        self.min_samples = min_samples
+        # Con jugadores conectados solo se reinicia si el límite está más cerca que esto
+        self.player_defer_seconds = player_defer_hours * 3600
+
+    def analyze(self, points, now=None):
+        """
+        Analizar una serie de memoria
+
+        Returns:
+            dict: Pendiente (MB/h), memoria actual, proyección y horas hasta el límite
+        """
+        now = now if now is not None else time.time()
+        window = [(ts, value) for ts, value in points if ts >= now - self.window_seconds]
+        result = {
+            "samples": len(window),
+            "current_mb": window[-1][1] if window else None,
+            "slope_mb_per_hour": None,
+            "r_squared": None,
+            "projected_mb": None,
+            "hours_to_limit": None,
+        }
+        if len(window) < self.min_samples:
+            return result
+
+        fit = fit_linear_trend(window)
+        if fit is None:
+            return result
+        slope, intercept, r_squared, t0 = fit
+        current_fit = intercept + slope * (now - t0)
+        result["slope_mb_per_hour"] = round(slope * 3600, 2)
+        result["r_squared"] = round(r_squared, 3)
+        result["projected_mb"] = round(current_fit + slope * self.horizon_seconds, 1)
+        if slope > 0:
+            remaining = self.memory_limit_mb - max(current_fit, result["current_mb"])
+            result["hours_to_limit"] = round(max(0.0, remaining / slope) / 3600, 2)
+        return result
+
+    def decide(self, analysis, players=None):
+        """
+        Decidir si se debe reiniciar
+
+        Returns:
+            tuple: (reiniciar, motivo)
+        """
+        current = analysis.get("current_mb")
+        if current is None:
+            return False, "Sin datos de memoria"
+
+        # Límite ya superado: reiniciar aunque haya jugadores
+        if current >= self.memory_limit_mb:
+            return True, f"Memoria actual {current:.0f} MB supera el límite de {self.memory_limit_mb} MB"
+
+        hours_to_limit = analysis.get("hours_to_limit")
+        if analysis.get("slope_mb_per_hour") is None or hours_to_limit is None:
+            return False, "Sin tendencia de crecimiento"
+        if (analysis.get("r_squared") or 0) < self.min_r_squared:
+            return False, f"Tendencia poco fiable (r²={analysis.get('r_squared')})"
+        if hours_to_limit * 3600 > self.horizon_seconds:
+            return False, f"Límite proyectado en {hours_to_limit:.1f} h"
+
+        # Con jugadores conectados se aplaza mientras quede margen
+        if players and hours_to_limit * 3600 > self.player_defer_seconds:
+            return False, f"Aplazado: {players} jugador(es) conectados, límite en {hours_to_limit:.1f} h"
+
+        return True, (f"Crecimiento de {analysis['slope_mb_per_hour']} MB/h, "
+                      f"límite de {self.memory_limit_mb} MB en {hours_to_limit:.1f} h")
+
+
+class MemoryWatchdog:
+    """Hilo que revisa periódicamente la tendencia y dispara el reinicio"""
+
+    def __init__(self, metrics_collector, analyzer, restart_callback, logger=None,
+                 check_interval=300, cooldown_seconds=3600):
+        self.metrics_collector = metrics_collector
+        self.analyzer = analyzer
+        self.restart_callback = restart_callback
+        self.logger = logger or logging.getLogger(__name__)
+        self.check_interval = check_interval
+        self.cooldown_seconds = cooldown_seconds
+        self.last_restart_time = 0
+        self.last_analysis = None
+        self.last_reason = ""
+        self.running = False
+        self.stop_event = threading.Event()
+        self.worker_thread = None
+
+    def check_once(self, now=None):
+        """Evaluar la tendencia una vez y reiniciar si corresponde"""
+        now = now if now is not None else time.time()
+        points = self.metrics_collector.query(
+            "memory_mb", since=now - self.analyzer.window_seconds, until=now
+        )
+        latest = self.metrics_collector.latest() or {}
+        # Ignorar muestras sin proceso (memoria 0) para no sesgar la recta
+        points = [(ts, value) for ts, value in points if value > 0]
+        analysis = self.analyzer.analyze(points, now)
+        should_restart, reason = self.analyzer.decide(analysis, latest.get("players"))
+        self.last_analysis = analysis
+        self.last_reason = reason
+
+        if should_restart and now - self.last_restart_time < self.cooldown_seconds:
+            self.logger.info(f"Reinicio por memoria en enfriamiento: {reason}")
+            return False
+        if should_restart:
+            self.last_restart_time = now
+            self.logger.warning(f"Reinicio por memoria solicitado: {reason}")
+            self.restart_callback(reason, analysis)
+        return should_restart
+
+    def start(self):
+        """Iniciar la revisión periódica"""
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+
+        def worker():
+            while not self.stop_event.wait(self.check_interval):
+                try:
+                    self.check_once()
+                except Exception as e:
+                    self.logger.error(f"Error analizando tendencia de memoria: {e}")
+
+        self.worker_thread = threading.Thread(target=worker, daemon=True)
+        self.worker_thread.start()
+
+    def stop(self):
+        """Detener la revisión periódica"""
+        self.running = False
+        self.stop_event.set()
@@ -0,0 +1,379 @@
+"""
+Recolector de métricas históricas del servidor ARK
+Muestrea CPU, memoria, hilos, handles, E/S de disco, jugadores y ritmo de logs
+en un buffer circular en memoria y conserva agregados por minuto en disco.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+
+import psutil
+
+
+# Métricas registradas en cada muestra
+METRIC_NAMES = (
+    "cpu_percent",
+    "memory_mb",
+    "threads",
+    "handles",
+    "disk_read_kbps",
+    "disk_write_kbps",
+    "players",
+    "log_lines_per_min",
+)
+
+# Nombres amigables para la interfaz
+METRIC_LABELS = {
+    "cpu_percent": "CPU (%)",
+    "memory_mb": "Memoria (MB)",
+    "threads": "Hilos",
+    "handles": "Handles",
+    "disk_read_kbps": "Lectura disco (KB/s)",
+    "disk_write_kbps": "Escritura disco (KB/s)",
+    "players": "Jugadores",
+    "log_lines_per_min": "Líneas de log/min",
+}
+
+
+def count_players(listplayers_output):
+    """Contar jugadores a partir de la respuesta de ListPlayers"""
+    if not listplayers_output:
+        return None
+    text = str(listplayers_output).strip()
+    if text.startswith("❌"):
+        return None
+    if "no players connected" in text.lower():
+        return 0
+    count = 0
+    for line in text.splitlines():
+        # Formato ARK: "0. NombreJugador, EOS_ID"
+        head = line.strip().split(".", 1)[0]
+        if head.isdigit() and "," in line:
+            count += 1
+    return count
+
+
+class MetricsCollector:
+    """Recolector de series temporales del proceso del servidor"""
+
+    def __init__(self, server_manager, data_dir, logger=None, sample_interval=1.0,
+                 raw_retention_seconds=3600, rollup_interval=60, rollup_retention_days=30):
+        self.server_manager = server_manager
+        self.data_dir = data_dir
+        self.logger = logger or logging.getLogger(__name__)
+        self.sample_interval = sample_interval
+        self.rollup_interval = rollup_interval
+        self.rollup_retention_seconds = rollup_retention_days * 86400
+
+        # Buffer circular de muestras crudas (1 s durante 1 h por defecto)
+        raw_capacity = max(1, int(raw_retention_seconds / sample_interval))
+        self.raw_samples = deque(maxlen=raw_capacity)
+        # Agregados por minuto (30 días por defecto)
+        rollup_capacity = max(1, int(self.rollup_retention_seconds / rollup_interval))
+        self.rollup_samples = deque(maxlen=rollup_capacity)
+
+        self.server_name = None
+        self.server_path = None
+        self.lock = threading.Lock()
+        self.running = False
+        self.sampler_thread = None
+        self.listeners = []
+
+        # Estado del muestreo
+        self._process = None
+        self._last_io = None
+        self._last_io_time = None
+        self._pending_rollup = []
+        self._current_bucket = None
+
+        # Jugadores vía RCON (consulta costosa, se hace con menor frecuencia)
+        self.player_count_provider = None
+        self.player_poll_interval = 60
+        self._last_player_poll = 0
+        self._last_player_count = None
+
+        # Ritmo de líneas en el log del servidor
+        self._log_path = None
+        self._log_offset = None
+        self._log_line_times = deque()
+
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def set_server(self, server_name, server_path=None):
+        """Cambiar el servidor al que se asocian las métricas"""
+        with self.lock:
+            if server_name == self.server_name:
+                return
+            self._flush_rollup()
+            self.server_name = server_name
+            self.server_path = server_path
+            self.raw_samples.clear()
+            self.rollup_samples.clear()
+            self._pending_rollup = []
+            self._current_bucket = None
+            self._log_path = None
+            self._log_offset = None
+            self._log_line_times.clear()
+            self._load_rollups()
+
+    def set_player_count_provider(self, provider, interval=60):
+        """Registrar función que devuelve la salida de ListPlayers"""
+        self.player_count_provider = provider
+        self.player_poll_interval = interval
+
+    def add_listener(self, callback):
+        """Registrar callback llamado con cada nueva muestra"""
+        self.listeners.append(callback)
+
+    def start(self):
+        """Iniciar el muestreo en un hilo separado"""
+        if self.running:
+            return
+        self.running = True
+
+        def sampler():
+            while self.running:
+                started = time.time()
+                try:
+                    self.sample_once()
+                except Exception as e:
+                    self.logger.error(f"Error muestreando métricas: {e}")
+                elapsed = time.time() - started
+                time.sleep(max(0.05, self.sample_interval - elapsed))
+
+        self.sampler_thread = threading.Thread(target=sampler, daemon=True)
+        self.sampler_thread.start()
+
+    def stop(self):
+        """Detener el muestreo y guardar el minuto en curso"""
+        self.running = False
+        with self.lock:
+            self._flush_rollup()
+
+    def _get_process(self):
+        """Obtener el proceso del servidor reutilizando el objeto psutil"""
+        pid = getattr(self.server_manager, "server_pid", None)
+        if not pid:
+            self._process = None
+            return None
+        if self._process is None or self._process.pid != pid:
+            try:
+                self._process = psutil.Process(pid)
+                # Primera llamada de cpu_percent inicializa la medición
+                self._process.cpu_percent()
+                self._last_io = None
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self._process = None
+        return self._process
+
+    def _sample_process(self, now):
+        """Leer estadísticas del proceso del servidor"""
+        sample = {
+            "cpu_percent": 0.0,
+            "memory_mb": 0.0,
+            "threads": 0,
+            "handles": 0,
+            "disk_read_kbps": 0.0,
+            "disk_write_kbps": 0.0,
+        }
+        process = self._get_process()
+        if process is None:
+            return sample
+        try:
+            with process.oneshot():
+                sample["cpu_percent"] = round(process.cpu_percent(), 1)
+                sample["memory_mb"] = round(process.memory_info().rss / 1024 / 1024, 1)
+                sample["threads"] = process.num_threads()
+                if hasattr(process, "num_handles"):
+                    sample["handles"] = process.num_handles()
+                elif hasattr(process, "num_fds"):
+                    sample["handles"] = process.num_fds()
+                io = process.io_counters() if hasattr(process, "io_counters") else None
+            if io is not None:
+                if self._last_io is not None and now > self._last_io_time:
+                    dt = now - self._last_io_time
+                    sample["disk_read_kbps"] = round(max(0, io.read_bytes - self._last_io.read_bytes) / 1024 / dt, 1)
+                    sample["disk_write_kbps"] = round(max(0, io.write_bytes - self._last_io.write_bytes) / 1024 / dt, 1)
+                self._last_io = io
+                self._last_io_time = now
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self._process = None
+        return sample
+
+    def _sample_players(self, now):
+        """Consultar jugadores vía RCON respetando el intervalo configurado"""
+        if self.player_count_provider is None or self._process is None:
+            return self._last_player_count if self._process is not None else None
+        if now - self._last_player_poll >= self.player_poll_interval:
+            self._last_player_poll = now
+            try:
+                self._last_player_count = count_players(self.player_count_provider())
+            except Exception as e:
+                self.logger.debug(f"No se pudo obtener jugadores: {e}")
+                self._last_player_count = None
+        return self._last_player_count
+
+    def _find_log_path(self):
+        """Ubicar ShooterGame.log del servidor actual"""
+        if not self.server_path:
+            return None
+        path = os.path.join(self.server_path, "ShooterGame", "Saved", "Logs", "ShooterGame.log")
+        return path if os.path.exists(path) else None
+
+    def _sample_log_rate(self, now):
+        """Contar líneas nuevas del log desde la última muestra (ventana de 60 s)"""
+        if self._log_path is None:
+            self._log_path = self._find_log_path()
+            self._log_offset = None
+        if self._log_path:
+            try:
+                size = os.path.getsize(self._log_path)
+                if self._log_offset is None or size < self._log_offset:
+                    # Primer muestreo o log rotado: empezar desde el final
+                    self._log_offset = size
+                elif size > self._log_offset:
+                    with open(self._log_path, "rb") as f:
+                        f.seek(self._log_offset)
+                        new_data = f.read(size - self._log_offset)
+                    self._log_offset = size
+                    new_lines = new_data.count(b"\n")
+                    if new_lines:
+                        self._log_line_times.append((now, new_lines))
+            except OSError:
+                self._log_path = None
+        while self._log_line_times and now - self._log_line_times[0][0] > 60:
+            self._log_line_times.popleft()
+        return sum(count for _, count in self._log_line_times)
+
+    def sample_once(self):
+        """Tomar una muestra y agregarla a los buffers"""
+        now = time.time()
+        sample = {"ts": round(now, 3)}
+        sample.update(self._sample_process(now))
+        sample["players"] = self._sample_players(now)
+        sample["log_lines_per_min"] = self._sample_log_rate(now)
+
+        with self.lock:
+            self.raw_samples.append(sample)
+            self._add_to_rollup(sample)
+
+        for callback in list(self.listeners):
+            try:
+                callback(sample)
+            except Exception as e:
+                self.logger.debug(f"Error en listener de métricas: {e}")
+        return sample
+
+    def _add_to_rollup(self, sample):
+        """Acumular la muestra en el agregado del minuto actual"""
+        bucket = int(sample["ts"] // self.rollup_interval) * self.rollup_interval
+        if self._current_bucket is not None and bucket != self._current_bucket:
+            self._flush_rollup()
+        self._current_bucket = bucket
+        self._pending_rollup.append(sample)
+
+    def _flush_rollup(self):
+        """Cerrar el agregado pendiente y persistirlo (requiere self.lock)"""
+        if not self._pending_rollup or self._current_bucket is None:
+            return
+        rollup = {"ts": self._current_bucket}
+        for name in METRIC_NAMES:
+            values = [s[name] for s in self._pending_rollup if s.get(name) is not None]
+            if values:
+                rollup[name] = round(sum(values) / len(values), 2)
+                rollup[f"{name}_max"] = max(values)
+            else:
+                rollup[name] = None
+        self._pending_rollup = []
+        self.rollup_samples.append(rollup)
+        self._append_rollup_to_disk(rollup)
+
+    def _get_rollup_file(self):
+        """Ruta del archivo de agregados del servidor actual"""
+        name = self.server_name or "default"
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+        return os.path.join(self.data_dir, f"metrics_{safe_name}.jsonl")
+
+    def _append_rollup_to_disk(self, rollup):
+        """Añadir un agregado al archivo JSONL (O(1) por minuto)"""
+        try:
+            with open(self._get_rollup_file(), "a", encoding="utf-8") as f:
+                f.write(json.dumps(rollup) + "\n")
+        except Exception as e:
+            self.logger.error(f"Error guardando métricas: {e}")
+
+    def _load_rollups(self):
+        """Cargar agregados desde disco y descartar los vencidos"""
+        path = self._get_rollup_file()
+        if not os.path.exists(path):
+            return
+        cutoff = time.time() - self.rollup_retention_seconds
+        kept = []
+        expired = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rollup = json.loads(line)
+                    except ValueError:
+                        expired = True  # Línea truncada: reescribir archivo
+                        continue
+                    if rollup.get("ts", 0) >= cutoff:
+                        kept.append(rollup)
+                    else:
+                        expired = True
+            self.rollup_samples.extend(kept)
+            if expired:
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for rollup in kept:
+                        f.write(json.dumps(rollup) + "\n")
+                os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.error(f"Error cargando métricas históricas: {e}")
+
+    def latest(self):
+        """Obtener la última muestra tomada"""
+        with self.lock:
+            return dict(self.raw_samples[-1]) if self.raw_samples else None
+
+    def query(self, metric, since=None, until=None):
+        """
+        Consultar una serie temporal
+
+        Usa las muestras crudas si el rango cabe en el buffer en memoria y los
+        agregados por minuto en caso contrario.
+
+        Returns:
+            list: Pares (timestamp, valor) ordenados por tiempo
+        """
+        if metric not in METRIC_NAMES:
+            raise ValueError(f"Métrica desconocida: {metric}")
+        until = until if until is not None else time.time()
+        since = since if since is not None else until - 3600
+        with self.lock:
+            raw = list(self.raw_samples)
+            if raw and raw[0]["ts"] <= since:
+                source = raw
+            else:
+                source = list(self.rollup_samples)
+                # Completar con las muestras crudas del minuto aún no agregado
+                if self._pending_rollup:
+                    source = source + list(self._pending_rollup)
+        return [(s["ts"], s.get(metric)) for s in source
+                if since <= s["ts"] <= until and s.get(metric) is not None]
+
+    def summary(self, metric, since=None, until=None):
+        """Obtener mínimo, máximo y promedio de una métrica en un rango"""
+        values = [value for _, value in self.query(metric, since, until)]
+        if not values:
+            return {"min": None, "max": None, "avg": None, "count": 0}
+        return {
+            "min": min(values),
+            "max": max(values),
+            "avg": round(sum(values) / len(values), 2),
+            "count": len(values),
+        }
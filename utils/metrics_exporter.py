@@ -0,0 +1,240 @@
+"""
+Exportador OpenMetrics/Prometheus opcional para las métricas del servidor
+Los valores se pre-agregan en memoria a medida que ocurren los eventos, de
+modo que cada scrape solo serializa el estado actual sin consultar procesos.
+"""
+import time
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Buckets por defecto para latencias RCON (segundos)
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape_label_value(value):
+    """Escapar un valor de etiqueta según el formato de texto"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    """Convertir una tupla de pares (clave, valor) en texto de etiquetas"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value):
+    """Formatear un valor numérico"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Registro thread-safe de contadores, gauges e histogramas"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.families = {}  # {nombre: {"type", "help", "buckets", "samples"}}
+
+    def _family(self, name, metric_type, help_text, buckets=None):
+        family = self.families.get(name)
+        if family is None:
+            family = {"type": metric_type, "help": help_text, "buckets": buckets, "samples": {}}
+            self.families[name] = family
+        elif family["type"] != metric_type:
+            raise ValueError(f"La métrica {name} ya está registrada como {family['type']}")
+        return family
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted((labels or {}).items()))
+
+    def describe(self, name, metric_type, help_text, buckets=None):
+        """Declarar una familia de métricas para que aparezca aunque no tenga muestras"""
+        with self.lock:
+            self._family(name, metric_type, help_text, buckets)
+
+    def inc(self, name, amount=1, labels=None, help_text=""):
+        """Incrementar un contador"""
+        with self.lock:
+            samples = self._family(name, "counter", help_text)["samples"]
+            key = self._key(labels)
+            samples[key] = samples.get(key, 0) + amount
+
+    def set(self, name, value, labels=None, help_text=""):
+        """Establecer el valor de un gauge"""
+        with self.lock:
+            self._family(name, "gauge", help_text)["samples"][self._key(labels)] = value
+
+    def observe(self, name, value, labels=None, help_text="", buckets=DEFAULT_LATENCY_BUCKETS):
+        """Registrar una observación en un histograma"""
+        with self.lock:
+            family = self._family(name, "histogram", help_text, tuple(buckets))
+            key = self._key(labels)
+            state = family["samples"].get(key)
+            if state is None:
+                state = {"counts": [0] * len(family["buckets"]), "sum": 0.0, "count": 0}
+                family["samples"][key] = state
+            for i, bound in enumerate(family["buckets"]):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def get(self, name, labels=None):
+        """Obtener el valor actual de un contador o gauge"""
+        with self.lock:
+            family = self.families.get(name)
+            if family is None:
+                return None
+            return family["samples"].get(self._key(labels))
+
+    def render(self):
+        """Serializar todas las métricas en formato de texto OpenMetrics"""
+        lines = []
+        with self.lock:
+            for name in sorted(self.families):
+                family = self.families[name]
+                metric_type = family["type"]
+                lines.append(f"# TYPE {name} {metric_type}")
+                if family["help"]:
+                    lines.append(f"# HELP {name} {family['help']}")
+                for key, value in family["samples"].items():
+                    if metric_type == "counter":
+                        lines.append(f"{name}_total{_format_labels(key)} {_format_value(value)}")
+                    elif metric_type == "gauge":
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                    else:
+                        for bound, count in zip(family["buckets"], value["counts"]):
+                            bucket_labels = key + (("le", _format_value(float(bound))),)
+                            lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+                        inf_labels = key + (("le", "+Inf"),)
+                        lines.append(f"{name}_bucket{_format_labels(inf_labels)} {value['count']}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {_format_value(value['sum'])}")
+                        lines.append(f"{name}_count{_format_labels(key)} {value['count']}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Servidor HTTP mínimo que publica el registro en /metrics"""
+
+    def __init__(self, registry=None, host="0.0.0.0", port=9464, logger=None):
+        self.registry = registry or MetricsRegistry()
+        self.host = host
+        self.port = port
+        self.logger = logger or logging.getLogger(__name__)
+        self.httpd = None
+        self.server_thread = None
+        # Funciones ligeras evaluadas en cada scrape (p. ej. uptime)
+        self.scrape_hooks = []
+        self._describe_defaults()
+
+    def _describe_defaults(self):
+        """Declarar las familias conocidas para que existan desde el inicio"""
+        registry = self.registry
+        registry.describe("ark_server_up", "gauge", "1 si el proceso del servidor está en ejecución")
+        registry.describe("ark_server_uptime_seconds", "gauge", "Tiempo activo del servidor")
+        registry.describe("ark_server_cpu_percent", "gauge", "Uso de CPU del proceso del servidor")
+        registry.describe("ark_server_memory_bytes", "gauge", "Memoria residente del proceso del servidor")
+        registry.describe("ark_server_threads", "gauge", "Hilos del proceso del servidor")
+        registry.describe("ark_server_players", "gauge", "Jugadores conectados según RCON")
+        registry.describe("ark_backup_duration_seconds", "gauge", "Duración del último backup")
+        registry.describe("ark_backup_size_bytes", "gauge", "Tamaño del último backup")
+        registry.describe("ark_backups", "counter", "Backups realizados")
+        registry.describe("ark_restarts", "counter", "Reinicios ejecutados")
+        registry.describe("ark_crashes", "counter", "Caídas detectadas del servidor")
+        registry.describe("ark_rcon_latency_seconds", "histogram", "Latencia de comandos RCON",
+                          DEFAULT_LATENCY_BUCKETS)
+
+    def add_scrape_hook(self, hook):
+        """Registrar función barata que actualiza gauges antes de cada scrape"""
+        self.scrape_hooks.append(hook)
+
+    def update_from_sample(self, server_name, sample):
+        """Actualizar gauges de proceso con una muestra del MetricsCollector"""
+        labels = {"server": server_name or "default"}
+        registry = self.registry
+        registry.set("ark_server_cpu_percent", sample.get("cpu_percent", 0), labels)
+        registry.set("ark_server_memory_bytes", int(sample.get("memory_mb", 0) * 1024 * 1024), labels)
+        registry.set("ark_server_threads", sample.get("threads", 0), labels)
+        if sample.get("players") is not None:
+            registry.set("ark_server_players", sample["players"], labels)
+
+    def render(self):
+        """Ejecutar los hooks y devolver el texto OpenMetrics"""
+        for hook in list(self.scrape_hooks):
+            try:
+                hook(self.registry)
+            except Exception as e:
+                self.logger.debug(f"Error en hook de métricas: {e}")
+        return self.registry.render()
+
+    def start(self):
+        """Iniciar el endpoint HTTP en un hilo separado"""
+        if self.httpd:
+            return True
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # No registrar cada scrape
+                pass
+
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.httpd.daemon_threads = True
+            self.port = self.httpd.server_address[1]
+            self.server_thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+            self.server_thread.start()
+            self.logger.info(f"Exportador de métricas escuchando en http://{self.host}:{self.port}/metrics")
+            return True
+        except OSError as e:
+            self.logger.error(f"No se pudo iniciar el exportador de métricas en el puerto {self.port}: {e}")
+            self.httpd = None
+            return False
+
+    def stop(self):
+        """Detener el endpoint HTTP"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+class RconTimer:
+    """Context manager que mide la latencia de un comando RCON"""
+
+    def __init__(self, exporter, command):
+        self.exporter = exporter
+        self.command = command.split(" ", 1)[0].lower() if command else "unknown"
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.exporter is not None:
+            self.exporter.registry.observe(
+                "ark_rcon_latency_seconds",
+                time.perf_counter() - self.started,
+                {"command": self.command}
+            )
+        return False
@@ -0,0 +1,245 @@
+"""
+Catálogo de mods en memoria
+Guarda una sola copia de cada mod (favoritos, instalados y resultados de
+búsqueda) indexada por id, con la pertenencia a cada grupo en diccionarios
+ordenados: comprobar si un mod es favorito o está instalado es O(1) y no
+hace falta recorrer listas en cada tarjeta. Los índices secundarios por
+palabras del nombre/resumen, categoría y autor permiten filtrar sin recorrer
+todos los mods, y los oyentes reciben cada cambio para actualizar solo lo
+que cambió.
+"""
+import re
+import logging
+from collections import defaultdict
+
+
+FAVORITES = "favorites"
+INSTALLED = "installed"
+SEARCH = "search"
+GROUPS = (FAVORITES, INSTALLED, SEARCH)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def mod_key(mod_or_id):
+    """Id normalizado como texto (la API devuelve enteros, el almacén textos)"""
+    if isinstance(mod_or_id, dict):
+        mod_or_id = mod_or_id.get("id", "")
+    return str(mod_or_id).strip()
+
+
+def tokenize(text):
+    return {token for token in _TOKEN_RE.findall((text or "").lower()) if token}
+
+
+class ModCatalog:
+    """Mods conocidos indexados por id, grupo, palabras, categoría y autor"""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.mods = {}  # {id: mod}
+        self.groups = {group: {} for group in GROUPS}  # {grupo: {id: None}} en orden de inserción
+        self._tokens = defaultdict(set)  # {palabra: {ids}}
+        self._categories = defaultdict(set)  # {categoría: {ids}}
+        self._authors = defaultdict(set)  # {autor: {ids}}
+        self._indexed = {}  # {id: (palabras, categorías, autores)} para desindexar
+        self._listeners = []
+
+    # ------------------------------------------------------------------
+    # Notificaciones
+    # ------------------------------------------------------------------
+    def add_listener(self, callback):
+        """callback(evento, grupo, ids) con evento 'added', 'removed', 'reset' o 'updated'"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, group, mod_ids):
+        for callback in list(self._listeners):
+            try:
+                callback(event, group, mod_ids)
+            except Exception as e:
+                self.logger.error(f"Error en oyente del catálogo de mods: {e}")
+
+    # ------------------------------------------------------------------
+    # Índices
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _mod_terms(mod):
+        tokens = tokenize(mod.get("name", "")) | tokenize(mod.get("summary", ""))
+        categories = {c.get("name", "").lower() for c in mod.get("categories") or [] if c.get("name")}
+        section = (mod.get("categorySection") or {}).get("name")
+        if section:
+            categories.add(section.lower())
+        authors = {a.get("name", "").lower() for a in mod.get("authors") or [] if a.get("name")}
+        return tokens, categories, authors
+
+    def _index(self, mod_id, mod):
+        self._unindex(mod_id)
+        terms = self._mod_terms(mod)
+        for index, values in zip((self._tokens, self._categories, self._authors), terms):
+            for value in values:
+                index[value].add(mod_id)
+        self._indexed[mod_id] = terms
+
+    def _unindex(self, mod_id):
+        terms = self._indexed.pop(mod_id, None)
+        if terms is None:
+            return
+        for index, values in zip((self._tokens, self._categories, self._authors), terms):
+            for value in values:
+                ids = index.get(value)
+                if ids is not None:
+                    ids.discard(mod_id)
+                    if not ids:
+                        del index[value]
+
+    def _forget_if_unused(self, mod_id):
+        """Soltar un mod que ya no pertenece a ningún grupo"""
+        if not any(mod_id in members for members in self.groups.values()):
+            self.mods.pop(mod_id, None)
+            self._unindex(mod_id)
+
+    # ------------------------------------------------------------------
+    # Modificación
+    # ------------------------------------------------------------------
+    def upsert(self, mod):
+        """
+        Guardar (o actualizar) los datos de un mod; devuelve su id
+
+        Los campos nuevos se combinan con los ya conocidos, así un favorito
+        guardado con pocos datos no pierde los que trae la búsqueda.
+        """
+        mod_id = mod_key(mod)
+        if not mod_id:
+            return None
+        current = self.mods.get(mod_id)
+        if current is None:
+            self.mods[mod_id] = mod
+            self._index(mod_id, mod)
+        elif current is not mod:
+            merged = {**current, **mod}
+            if merged != current:
+                self.mods[mod_id] = merged
+                self._index(mod_id, merged)
+                self._notify("updated", None, [mod_id])
+        return mod_id
+
+    def set_group(self, group, mods):
+        """Reemplazar el contenido de un grupo conservando el orden"""
+        previous = self.groups[group]
+        self.groups[group] = {}
+        for mod in mods:
+            mod_id = self.upsert(mod)
+            if mod_id:
+                self.groups[group][mod_id] = None
+        for mod_id in previous:
+            if mod_id not in self.groups[group]:
+                self._forget_if_unused(mod_id)
+        self._notify("reset", group, list(self.groups[group]))
+
+    def extend_group(self, group, mods):
+        """Añadir varios mods al final de un grupo (p. ej. otra página de resultados)"""
+        added = []
+        for mod in mods:
+            mod_id = self.upsert(mod)
+            if mod_id and mod_id not in self.groups[group]:
+                self.groups[group][mod_id] = None
+                added.append(mod_id)
+        if added:
+            self._notify("added", group, added)
+        return added
+
+    def add(self, group, mod):
+        """Añadir un mod a un grupo; False si ya estaba"""
+        return bool(self.extend_group(group, [mod]))
+
+    def remove(self, group, mod_or_id):
+        """Quitar un mod de un grupo; False si no estaba"""
+        mod_id = mod_key(mod_or_id)
+        if mod_id not in self.groups[group]:
+            return False
+        del self.groups[group][mod_id]
+        self._forget_if_unused(mod_id)
+        self._notify("removed", group, [mod_id])
+        return True
+
+    def clear(self, group):
+        self.set_group(group, [])
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def get(self, mod_or_id):
+        return self.mods.get(mod_key(mod_or_id))
+
+    def contains(self, group, mod_or_id):
+        return mod_key(mod_or_id) in self.groups[group]
+
+    def is_favorite(self, mod_or_id):
+        return self.contains(FAVORITES, mod_or_id)
+
+    def is_installed(self, mod_or_id):
+        return self.contains(INSTALLED, mod_or_id)
+
+    def count(self, group):
+        return len(self.groups[group])
+
+    def ids(self, group):
+        return list(self.groups[group])
+
+    def members(self, group):
+        """Mods de un grupo, en orden"""
+        return [self.mods[mod_id] for mod_id in self.groups[group]]
+
+    def ordered_ids(self, group=None):
+        """Ids de un grupo, o de todos (favoritos, instalados, búsqueda) sin repetir"""
+        if group in self.groups:
+            return list(self.groups[group])
+        ordered = {}
+        for name in GROUPS:
+            ordered.update(self.groups[name])
+        return list(ordered)
+
+    def matching_ids(self, text="", category=None, author=None):
+        """
+        Ids que cumplen todos los criterios (None = sin restricción)
+
+        Cada palabra de `text` debe ser el comienzo de alguna palabra del
+        nombre o el resumen del mod.
+        """
+        result = None
+        for token in tokenize(text):
+            ids = set(self._tokens.get(token, ()))
+            for indexed, indexed_ids in self._tokens.items():
+                if indexed != token and indexed.startswith(token):
+                    ids |= indexed_ids
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        for index, value in ((self._categories, category), (self._authors, author)):
+            if value:
+                ids = index.get(value.lower(), set())
+                result = set(ids) if result is None else result & ids
+        return result
+
+    def filter(self, group=None, text="", category=None, author=None):
+        """Mods de un grupo (o de todos) que cumplen los criterios, en orden"""
+        ordered = self.ordered_ids(group)
+        wanted = self.matching_ids(text, category, author)
+        if wanted is not None:
+            ordered = [mod_id for mod_id in ordered if mod_id in wanted]
+        return [self.mods[mod_id] for mod_id in ordered]
+
+    def categories(self):
+        """{categoría: número de mods}"""
+        return {name: len(ids) for name, ids in sorted(self._categories.items())}
+
+    def authors(self):
+        """{autor: número de mods}"""
+        return {name: len(ids) for name, ids in sorted(self._authors.items())}
+
+    def stats(self):
+        return {group: len(members) for group, members in self.groups.items()}
@@ -0,0 +1,246 @@
+"""
+Dependencias y orden de carga de mods
+Lee las relaciones de cada mod desde CurseForge (el archivo principal de cada
+mod declara sus dependencias), construye el grafo y detecta antes de
+arrancar el servidor lo que haría fallar un arranque de varios minutos:
+dependencias obligatorias que faltan, ciclos y mods incompatibles entre sí.
+Calcula además un orden de carga en el que cada mod va después de lo que
+necesita, respetando en lo posible el orden elegido por el usuario.
+"""
+import heapq
+import logging
+
+from .curseforge_client import CurseForgeError
+from .mod_catalog import mod_key
+
+
+# relationType de la API de CurseForge
+RELATION_EMBEDDED = 1
+RELATION_OPTIONAL = 2
+RELATION_REQUIRED = 3
+RELATION_TOOL = 4
+RELATION_INCOMPATIBLE = 5
+RELATION_INCLUDE = 6
+
+
+def parse_mod_ids(text):
+    """Ids de una lista separada por comas (como en -mods=), sin repetidos"""
+    ids = []
+    for part in (text or "").split(","):
+        part = part.strip()
+        if part and part not in ids:
+            ids.append(part)
+    return ids
+
+
+def main_file(mod):
+    """Archivo principal del mod (o el más reciente de latestFiles)"""
+    files = mod.get("latestFiles") or []
+    main_id = mod.get("mainFileId")
+    for file in files:
+        if file.get("id") == main_id:
+            return file
+    return max(files, key=lambda file: file.get("fileDate", ""), default=None)
+
+
+def mod_relations(mod):
+    """{name, requires, optional, incompatible} a partir de los datos de la API"""
+    relations = {"name": mod.get("name", ""), "requires": [], "optional": [], "incompatible": []}
+    file = main_file(mod) or {}
+    for dependency in file.get("dependencies") or []:
+        dep_id = mod_key(dependency.get("modId", ""))
+        relation = dependency.get("relationType")
+        if not dep_id:
+            continue
+        if relation == RELATION_REQUIRED:
+            relations["requires"].append(dep_id)
+        elif relation == RELATION_OPTIONAL:
+            relations["optional"].append(dep_id)
+        elif relation == RELATION_INCOMPATIBLE:
+            relations["incompatible"].append(dep_id)
+    return relations
+
+
+def plan_load_order(mod_ids, relations):
+    """
+    Analizar una lista de mods con sus relaciones
+
+    Args:
+        mod_ids: Ids en el orden elegido por el usuario
+        relations: {id: {requires, incompatible, ...}} (los ids sin datos se consideran desconocidos)
+
+    Returns:
+        dict: {order, missing: {dependencia: [mods que la necesitan]},
+               cycles: [[ids]], conflicts: [(a, b)], unknown: [ids]}
+    """
+    mod_ids = [mod_key(mod_id) for mod_id in mod_ids]
+    selected = set(mod_ids)
+    position = {mod_id: index for index, mod_id in enumerate(mod_ids)}
+
+    missing = {}
+    conflicts = []
+    requires = {mod_id: [] for mod_id in mod_ids}
+    for mod_id in mod_ids:
+        info = relations.get(mod_id)
+        if info is None:
+            continue
+        for dep_id in info.get("requires", []):
+            if dep_id == mod_id:
+                continue
+            if dep_id in selected:
+                requires[mod_id].append(dep_id)
+            else:
+                missing.setdefault(dep_id, []).append(mod_id)
+        for other in info.get("incompatible", []):
+            if other in selected and other != mod_id:
+                pair = tuple(sorted((mod_id, other), key=position.get))
+                if pair not in conflicts:
+                    conflicts.append(pair)
+
+    # Orden topológico estable: entre los mods listos, primero el que el usuario puso antes
+    dependents = {mod_id: [] for mod_id in mod_ids}
+    pending = {mod_id: len(set(deps)) for mod_id, deps in requires.items()}
+    for mod_id, deps in requires.items():
+        for dep_id in set(deps):
+            dependents[dep_id].append(mod_id)
+    ready = [(position[mod_id], mod_id) for mod_id in mod_ids if pending[mod_id] == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _position, mod_id = heapq.heappop(ready)
+        order.append(mod_id)
+        for dependent in dependents[mod_id]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, (position[dependent], dependent))
+
+    cycles = []
+    if len(order) < len(mod_ids):
+        remaining = [mod_id for mod_id in mod_ids if pending[mod_id] > 0]
+        cycles = _find_cycles(remaining, requires)
+        order.extend(remaining)  # Se mantienen al final, en el orden del usuario
+
+    return {
+        "order": order,
+        "missing": missing,
+        "cycles": cycles,
+        "conflicts": conflicts,
+        "unknown": [mod_id for mod_id in mod_ids if mod_id not in relations],
+    }
+
+
+def _find_cycles(nodes, requires):
+    """Componentes fuertemente conexas con más de un mod (Tarjan iterativo)"""
+    nodes = list(nodes)
+    node_set = set(nodes)
+    index_of, low, on_stack = {}, {}, set()
+    stack, cycles, counter = [], [], 0
+    for root in nodes:
+        if root in index_of:
+            continue
+        work = [(root, iter([d for d in requires[root] if d in node_set]))]
+        index_of[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index_of:
+                    index_of[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter([d for d in requires[child] if d in node_set])))
+                elif child in on_stack:
+                    low[node] = min(low[node], index_of[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    cycles.append(sorted(component, key=nodes.index))
+    return cycles
+
+
+class ModDependencyResolver:
+    """Relaciones de mods (con la caché del cliente) y análisis de listas de mods"""
+
+    def __init__(self, client, logger=None):
+        self.client = client
+        self.logger = logger or logging.getLogger(__name__)
+
+    def fetch_relations(self, mod_ids, follow_required=True):
+        """
+        Relaciones de los mods indicados en lotes (POST /mods)
+
+        Con `follow_required` también se consultan las dependencias obligatorias,
+        para poder nombrarlas y detectar lo que ellas necesitan.
+        """
+        relations = {}
+        queue = [mod_key(mod_id) for mod_id in mod_ids]
+        while queue:
+            batch = [mod_id for mod_id in dict.fromkeys(queue) if mod_id not in relations and mod_id.isdigit()]
+            queue = []
+            if not batch:
+                break
+            try:
+                mods = self.client.get_mods(batch)
+            except CurseForgeError as e:
+                self.logger.warning(f"No se pudieron consultar las dependencias de {len(batch)} mods: {e}")
+                break
+            for mod in mods:
+                mod_id = mod_key(mod)
+                relations[mod_id] = mod_relations(mod)
+                if follow_required:
+                    queue.extend(relations[mod_id]["requires"])
+        return relations
+
+    def resolve(self, mod_ids):
+        """Analizar una lista de mods; añade `names` {id: nombre} al resultado"""
+        mod_ids = [mod_key(mod_id) for mod_id in mod_ids]
+        relations = self.fetch_relations(mod_ids)
+        result = plan_load_order(mod_ids, relations)
+        result["names"] = {mod_id: info["name"] for mod_id, info in relations.items()}
+        # Dependencias de las dependencias que faltan (para poder añadirlas todas de una vez)
+        closure = list(result["missing"])
+        for dep_id in closure:
+            for sub_id in relations.get(dep_id, {}).get("requires", []):
+                if sub_id not in mod_ids and sub_id not in result["missing"]:
+                    result["missing"][sub_id] = [dep_id]
+                    closure.append(sub_id)
+        return result
+
+    @staticmethod
+    def has_problems(result):
+        return bool(result["missing"] or result["cycles"] or result["conflicts"])
+
+    @staticmethod
+    def describe(result):
+        """Líneas de aviso legibles para mostrar al usuario"""
+        names = result.get("names", {})
+
+        def label(mod_id):
+            name = names.get(mod_id)
+            return f"{name} ({mod_id})" if name else mod_id
+
+        lines = []
+        for dep_id, needed_by in result["missing"].items():
+            lines.append(f"❌ Falta {label(dep_id)}, requerido por {', '.join(label(m) for m in needed_by)}")
+        for cycle in result["cycles"]:
+            lines.append(f"🔁 Dependencia circular: {' → '.join(label(m) for m in cycle)}")
+        for first, second in result["conflicts"]:
+            lines.append(f"⚠️ {label(first)} es incompatible con {label(second)}")
+        if result["unknown"]:
+            lines.append(f"❔ Sin datos de {len(result['unknown'])} mods: {', '.join(result['unknown'][:10])}")
+        return lines
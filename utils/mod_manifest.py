@@ -0,0 +1,160 @@
+"""
+Manifiesto de mods por servidor/mapa
+Fuente única de las listas de mods instalados: la tabla `installed_mods` del
+almacén de estado, con un registro por lista en `mod_manifests` (también para
+las listas vacías). Todas las listas se cargan en memoria con una sola
+consulta, de modo que cambiar de servidor/mapa no toca el disco, y al guardar
+solo se escriben las filas que cambiaron. El panel de mods y los argumentos de
+arranque leen de aquí, así que lo que se ve es lo que se lanza.
+"""
+import json
+import logging
+import threading
+from datetime import datetime
+
+from .mod_catalog import mod_key
+from .state_store import get_state_store
+
+
+def manifest_key(server, map_name):
+    """Clave de la lista de un servidor/mapa ("default" sin selección)"""
+    if server and map_name:
+        return f"{server}_{map_name}"
+    return "default"
+
+
+def _dumps(mod):
+    return json.dumps(mod, ensure_ascii=False)
+
+
+class ModManifestStore:
+    """Listas de mods de todos los servidores/mapas en memoria con guardado por diferencias"""
+
+    def __init__(self, store, logger=None):
+        self.store = store
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._lists = {}  # {mods_key: [mod]} en orden de carga
+        self._rows = {}  # {mods_key: {mod_id: (posición, json)}} tal como están en la base
+        self.stats = {"saves": 0, "rows_written": 0, "rows_deleted": 0}
+        self._load()
+
+    def _load(self):
+        """Cargar todas las listas con una consulta"""
+        with self.store.transaction() as conn:
+            # Listas anteriores al registro de manifiestos (migradas desde JSON)
+            conn.execute(
+                "INSERT OR IGNORE INTO mod_manifests (mods_key, updated_at) "
+                "SELECT DISTINCT mods_key, ? FROM installed_mods", (datetime.now().isoformat(),)
+            )
+        with self._lock:
+            for row in self.store.query("SELECT mods_key FROM mod_manifests"):
+                self._lists[row["mods_key"]] = []
+                self._rows[row["mods_key"]] = {}
+            rows = self.store.query("SELECT mods_key, mod_id, position, data FROM installed_mods ORDER BY mods_key, position")
+            for row in rows:
+                self._lists[row["mods_key"]].append(json.loads(row["data"]))
+                self._rows[row["mods_key"]][row["mod_id"]] = (row["position"], row["data"])
+        self.logger.debug(f"Manifiesto de mods cargado: {len(self._lists)} listas, {len(rows)} mods")
+
+    def keys(self):
+        with self._lock:
+            return list(self._lists)
+
+    def has(self, mods_key):
+        """La lista existe (aunque esté vacía)"""
+        with self._lock:
+            return mods_key in self._lists
+
+    def get(self, mods_key):
+        """Copia de la lista de un servidor/mapa (vacía si no existe)"""
+        with self._lock:
+            return [dict(mod) for mod in self._lists.get(mods_key, [])]
+
+    def ids(self, mods_key):
+        """Ids en orden de carga, tal como se pasan en -mods="""
+        with self._lock:
+            return [mod_key(mod) for mod in self._lists.get(mods_key, [])]
+
+    def ids_by_key(self):
+        with self._lock:
+            return {key: [mod_key(mod) for mod in mods] for key, mods in self._lists.items()}
+
+    def set(self, mods_key, mods):
+        """
+        Guardar la lista de un servidor/mapa escribiendo solo lo que cambió
+
+        Las posiciones existentes se conservan mientras sigan en orden, así que
+        quitar un mod o añadirlo al final no reescribe el resto de la lista.
+
+        Returns:
+            int: Filas escritas o borradas
+        """
+        unique = {}
+        for mod in mods:
+            unique.setdefault(mod_key(mod), dict(mod))  # Sin repetidos, se queda la primera aparición
+        with self._lock:
+            known = mods_key in self._lists
+            old_rows = self._rows.get(mods_key, {})
+            new_rows, upserts = {}, []
+            previous = -1
+            for mod_id, mod in unique.items():
+                data = _dumps(mod)
+                old = old_rows.get(mod_id)
+                position = old[0] if old and old[0] > previous else previous + 1
+                previous = position
+                new_rows[mod_id] = (position, data)
+                if old != (position, data):
+                    upserts.append((mods_key, mod_id, position, data))
+            deletes = [(mods_key, mod_id) for mod_id in old_rows if mod_id not in new_rows]
+
+            if upserts or deletes or not known:
+                with self.store.transaction() as conn:
+                    conn.executemany("DELETE FROM installed_mods WHERE mods_key = ? AND mod_id = ?", deletes)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO installed_mods (mods_key, mod_id, position, data) VALUES (?, ?, ?, ?)",
+                        upserts
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO mod_manifests (mods_key, updated_at) VALUES (?, ?)",
+                        (mods_key, datetime.now().isoformat())
+                    )
+                self.stats["saves"] += 1
+                self.stats["rows_written"] += len(upserts)
+                self.stats["rows_deleted"] += len(deletes)
+            self._lists[mods_key] = list(unique.values())
+            self._rows[mods_key] = new_rows
+            return len(upserts) + len(deletes)
+
+    def add(self, mods_key, mod):
+        """Añadir un mod al final; False si ya estaba"""
+        with self._lock:
+            current = self._lists.get(mods_key, [])
+            if any(mod_key(existing) == mod_key(mod) for existing in current):
+                return False
+            self.set(mods_key, current + [mod])
+            return True
+
+    def remove(self, mods_key, mod_id):
+        """Quitar un mod de una lista; False si no estaba"""
+        mod_id = mod_key(mod_id)
+        with self._lock:
+            current = self._lists.get(mods_key, [])
+            remaining = [mod for mod in current if mod_key(mod) != mod_id]
+            if len(remaining) == len(current):
+                return False
+            self.set(mods_key, remaining)
+            return True
+
+
+_default_manifest = None
+_default_manifest_lock = threading.Lock()
+
+
+def get_mod_manifest(logger=None):
+    """Manifiesto compartido por el panel de mods y el arranque del servidor"""
+    global _default_manifest
+    with _default_manifest_lock:
+        if _default_manifest is None:
+            _default_manifest = ModManifestStore(get_state_store(logger), logger)
+        return _default_manifest
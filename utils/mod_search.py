@@ -0,0 +1,129 @@
+"""
+Búsqueda paginada de mods en CurseForge
+Recorre los resultados con los cursores `index`/`pageSize` de la API. Al
+recibir una página se pide la siguiente en segundo plano: queda en la caché
+del cliente y, cuando el usuario llega al final de la lista, se sirve al
+instante (si sigue en curso, la petición se une a la de precarga). Cada
+búsqueda nueva invalida la anterior: las páginas que lleguen tarde de una
+búsqueda obsoleta se descartan.
+"""
+import logging
+import threading
+
+from .curseforge_client import SORT_POPULARITY
+
+
+MAX_PAGE_SIZE = 50  # Límite de la API
+MAX_RESULTS = 10000  # La API no admite index + pageSize por encima de este valor
+
+
+class PagedModSearch:
+    """Estado de una búsqueda paginada con precarga y cancelación"""
+
+    def __init__(self, client, page_size=MAX_PAGE_SIZE, prefetch=True, logger=None):
+        self.client = client
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.prefetch_enabled = prefetch
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.query = None
+        self.sort_field = SORT_POPULARITY
+        self.next_index = 0
+        self.total = None
+        self.loading = False
+        self.seen_ids = set()
+
+    def start(self, query="", sort_field=SORT_POPULARITY):
+        """
+        Empezar una búsqueda nueva (la anterior queda obsoleta)
+
+        Returns:
+            int: Generación de la búsqueda, para comprobar luego si sigue vigente
+        """
+        with self._lock:
+            self.generation += 1
+            self.query = query
+            self.sort_field = sort_field
+            self.next_index = 0
+            self.total = None
+            self.loading = False
+            self.seen_ids = set()
+            return self.generation
+
+    def cancel(self):
+        """Invalidar la búsqueda actual sin empezar otra"""
+        with self._lock:
+            self.generation += 1
+            self.query = None
+            self.loading = False
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    @property
+    def has_more(self):
+        if self.query is None:
+            return False
+        if self.total is None:
+            return True
+        return self.next_index < min(self.total, MAX_RESULTS)
+
+    def fetch_next(self, generation):
+        """
+        Descargar la siguiente página de la búsqueda `generation`
+
+        Pensado para un hilo en segundo plano.
+
+        Returns:
+            list: Mods nuevos de la página (sin repetidos), o None si la
+            búsqueda quedó obsoleta, ya se estaba cargando o no hay más
+        """
+        with self._lock:
+            if not self.is_current(generation) or self.loading or not self.has_more:
+                return None
+            self.loading = True
+            query, sort_field, index = self.query, self.sort_field, self.next_index
+
+        try:
+            data = self._request(query, sort_field, index)
+        finally:
+            with self._lock:
+                if self.is_current(generation):
+                    self.loading = False
+
+        with self._lock:
+            if not self.is_current(generation):
+                return None
+            mods = data.get("data", [])
+            pagination = data.get("pagination", {})
+            self.total = pagination.get("totalCount", index + len(mods))
+            self.next_index = index + self.page_size
+            if len(mods) < self.page_size:
+                self.total = min(self.total, index + len(mods))
+            new_mods = []
+            for mod in mods:
+                mod_id = str(mod.get("id", ""))
+                if mod_id not in self.seen_ids:
+                    self.seen_ids.add(mod_id)
+                    new_mods.append(mod)
+            prefetch = self.prefetch_enabled and self.has_more
+            next_index = self.next_index
+
+        if prefetch:
+            threading.Thread(
+                target=self._prefetch, args=(generation, query, sort_field, next_index), daemon=True
+            ).start()
+        return new_mods
+
+    def _request(self, query, sort_field, index):
+        page_size = min(self.page_size, MAX_RESULTS - index)
+        return self.client.search_mods(query, index=index, page_size=page_size, sort_field=sort_field)
+
+    def _prefetch(self, generation, query, sort_field, index):
+        if not self.is_current(generation):
+            return
+        try:
+            self._request(query, sort_field, index)
+        except Exception as e:
+            self.logger.debug(f"Precarga de la página {index} fallida: {e}")
@@ -0,0 +1,180 @@
+"""
+Seguimiento de actualizaciones de mods
+Reúne los ids de todas las listas de mods instaladas (todos los servidores y
+mapas), consulta CurseForge en una sola petición por lotes (POST /mods) cada
+cierto tiempo y compara el archivo principal de cada mod con la última
+versión conocida. Cuando un mod cambia, cada servidor/mapa que lo usa queda
+marcado como pendiente de reinicio hasta que se vuelve a arrancar, para que
+el programador de reinicios pueda actuar antes de que los jugadores no
+puedan entrar por tener una versión distinta.
+"""
+import logging
+import threading
+from datetime import datetime
+
+from .curseforge_client import CurseForgeError
+from .mod_catalog import mod_key
+from .mod_dependencies import main_file
+from .mod_manifest import manifest_key
+
+
+class ModUpdateTracker:
+    """Comprobación periódica y por lotes de versiones de los mods instalados"""
+
+    # Límite prudente de ids por petición; con listas normales es una sola petición
+    BATCH_SIZE = 1000
+
+    def __init__(self, client, store, check_interval=1800, initial_delay=60, logger=None):
+        """
+        Args:
+            client: CurseForgeClient (se usa `get_mods`)
+            store: StateStore con las listas de mods instalados y las versiones conocidas
+        """
+        self.client = client
+        self.store = store
+        self.check_interval = check_interval
+        self.initial_delay = initial_delay
+        self.logger = logger or logging.getLogger(__name__)
+        self.listeners = []
+        self.last_check = None
+        self.last_error = None
+        self.stats = {"checks": 0, "requests": 0, "mods_checked": 0, "updates": 0}
+        self._check_lock = threading.Lock()
+        self.running = False
+        self.stop_event = threading.Event()
+        self.worker_thread = None
+
+    def add_listener(self, callback):
+        """`callback({mods_key: [actualizaciones]})` al detectar actualizaciones (desde el hilo de trabajo)"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def check_now(self):
+        """
+        Comprobar ahora todas las listas instaladas
+
+        La primera vez que se ve un mod solo se guarda su versión; a partir de
+        ahí, un archivo principal distinto cuenta como actualización.
+
+        Returns:
+            dict: {mods_key: [{mod_id, name, file_id, file_date, previous_file_id}]} con lo nuevo
+        """
+        with self._check_lock:
+            ids_by_key = self.store.mods.installed_ids_by_key()
+            all_ids = list(dict.fromkeys(
+                mod_id for ids in ids_by_key.values() for mod_id in ids if mod_id.isdigit()
+            ))
+            self.last_check = datetime.now().isoformat()
+            self.stats["checks"] += 1
+            if not all_ids:
+                return {}
+
+            mods = []
+            try:
+                for start in range(0, len(all_ids), self.BATCH_SIZE):
+                    # ttl=0: revalidar siempre, la caché del cliente solo ahorra la descarga (304)
+                    mods.extend(self.client.get_mods(all_ids[start:start + self.BATCH_SIZE], ttl=0))
+                    self.stats["requests"] += 1
+                self.last_error = None
+            except CurseForgeError as e:
+                self.last_error = str(e)
+                self.logger.warning(f"No se pudieron comprobar las versiones de {len(all_ids)} mods: {e}")
+                return {}
+
+            known = self.store.mod_versions.get_all()
+            versions, updated = [], {}
+            for mod in mods:
+                mod_id = mod_key(mod)
+                file = main_file(mod) or {}
+                file_id = file.get("id", mod.get("mainFileId"))
+                previous = known.get(mod_id)
+                changed = (previous is not None and file_id is not None
+                           and previous["file_id"] is not None and previous["file_id"] != file_id)
+                versions.append({
+                    "mod_id": mod_id,
+                    "name": mod.get("name", ""),
+                    "file_id": file_id,
+                    "file_date": file.get("fileDate", ""),
+                    "checked_at": self.last_check,
+                    "updated_at": self.last_check if changed else (previous or {}).get("updated_at"),
+                })
+                if changed:
+                    updated[mod_id] = {
+                        "mod_id": mod_id,
+                        "name": mod.get("name", ""),
+                        "file_id": file_id,
+                        "file_date": file.get("fileDate", ""),
+                        "previous_file_id": previous["file_id"],
+                    }
+
+            updates_by_key = {}
+            pending = []
+            for key, ids in ids_by_key.items():
+                for mod_id in ids:
+                    if mod_id in updated:
+                        updates_by_key.setdefault(key, []).append(updated[mod_id])
+                        pending.append((key, mod_id, updated[mod_id]["file_id"], self.last_check))
+            self.store.mod_versions.record(versions, pending)
+            self.stats["mods_checked"] += len(mods)
+            self.stats["updates"] += len(updated)
+
+        if updated:
+            names = ", ".join(update["name"] or update["mod_id"] for update in updated.values())
+            self.logger.info(f"🧩 Mods actualizados: {names} (afecta a {len(updates_by_key)} servidor/mapa)")
+            for callback in list(self.listeners):
+                try:
+                    callback(updates_by_key)
+                except Exception as e:
+                    self.logger.error(f"Error notificando actualizaciones de mods: {e}")
+        return updates_by_key
+
+    def pending_updates(self, keys=None):
+        """{mods_key: [actualizaciones]} pendientes de reinicio (de las claves indicadas o de todas)"""
+        pending = {}
+        for row in self.store.mod_versions.pending(keys):
+            pending.setdefault(row["mods_key"], []).append(row)
+        return pending
+
+    def servers_needing_restart(self):
+        """mods_key de los servidores/mapas con mods actualizados desde su último arranque"""
+        return list(self.pending_updates())
+
+    def mark_restarted(self, server, map_name):
+        """El servidor arrancó con ese mapa y las versiones actuales de su lista de mods"""
+        key = manifest_key(server, map_name)
+        cleared = self.store.mod_versions.clear_pending([key])
+        if cleared:
+            self.logger.info(f"🧩 {cleared} actualizaciones de mods aplicadas en {key}")
+        return cleared
+
+    @staticmethod
+    def describe(updates):
+        """Texto corto con los mods de una lista de actualizaciones"""
+        return ", ".join(f"{update.get('name') or update['mod_id']} ({update['mod_id']})" for update in updates)
+
+    def start(self):
+        """Iniciar la comprobación periódica"""
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+
+        def worker():
+            delay = self.initial_delay
+            while not self.stop_event.wait(delay):
+                delay = self.check_interval
+                try:
+                    self.check_now()
+                except Exception as e:
+                    self.logger.error(f"Error comprobando actualizaciones de mods: {e}")
+
+        self.worker_thread = threading.Thread(target=worker, daemon=True)
+        self.worker_thread.start()
+
+    def stop(self):
+        """Detener la comprobación periódica"""
+        self.running = False
+        self.stop_event.set()
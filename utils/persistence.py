@@ -0,0 +1,254 @@
+"""
+Capa de persistencia compartida para los archivos de estado
+- Escrituras atómicas (archivo temporal + fsync + rename): un corte de luz
+  nunca deja un JSON truncado, queda la versión anterior o la nueva.
+- Escritor con agrupación: como máximo una escritura por intervalo y archivo;
+  las llamadas intermedias solo reemplazan el contenido pendiente.
+- Diario de historial en modo "append": añadir un registro escribe una línea
+  en lugar de reserializar todo el historial.
+"""
+import os
+import json
+import atexit
+import hashlib
+import logging
+import tempfile
+import threading
+import time
+
+
+def atomic_write_bytes(path, data):
+    """Escribir bytes de forma atómica en el mismo directorio del destino"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=os.path.splitext(path)[1], dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def dump_json(data, indent=2, ensure_ascii=False):
+    """Serializar a bytes UTF-8 con el formato habitual de los archivos de data/"""
+    return json.dumps(data, indent=indent, ensure_ascii=ensure_ascii).encode("utf-8")
+
+
+def atomic_write_json(path, data, indent=2, ensure_ascii=False):
+    """Guardar un objeto como JSON de forma atómica"""
+    atomic_write_bytes(path, dump_json(data, indent, ensure_ascii))
+
+
+def load_json(path, default=None):
+    """Leer un JSON devolviendo `default` si no existe"""
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class CoalescingWriter:
+    """
+    Agrupa escrituras frecuentes del mismo archivo
+
+    La primera escritura tras un periodo de calma va directa a disco; las que
+    llegan dentro del intervalo se acumulan y solo se escribe el último
+    contenido cuando vence el intervalo.
+    """
+
+    def __init__(self, interval=1.0, logger=None):
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_write = {}
+        self._timers = {}
+        atexit.register(self.flush)
+
+    def write_json(self, path, data, indent=2, ensure_ascii=False):
+        """
+        Programar la escritura de un JSON
+
+        El contenido se serializa en el momento de la llamada, así los cambios
+        posteriores del objeto no se mezclan con esta versión.
+
+        Returns:
+            bool: True si se escribió inmediatamente, False si quedó pendiente
+        """
+        return self.write_bytes(path, dump_json(data, indent, ensure_ascii))
+
+    def write_bytes(self, path, data):
+        """Programar la escritura de bytes (ver write_json)"""
+        path = os.path.abspath(path)
+        with self._lock:
+            wait = self._last_write.get(path, 0) + self.interval - time.monotonic()
+            if wait > 0 or path in self._timers:
+                self._pending[path] = data
+                if path not in self._timers:
+                    timer = threading.Timer(wait, self.flush, args=(path,))
+                    timer.daemon = True
+                    self._timers[path] = timer
+                    timer.start()
+                return False
+            self._write(path, data)
+            return True
+
+    def _write(self, path, data):
+        atomic_write_bytes(path, data)
+        self._last_write[path] = time.monotonic()
+
+    def flush(self, path=None):
+        """Escribir ya el contenido pendiente (de un archivo o de todos)"""
+        with self._lock:
+            paths = [os.path.abspath(path)] if path else list(self._pending)
+            for pending_path in paths:
+                timer = self._timers.pop(pending_path, None)
+                if timer:
+                    timer.cancel()
+                data = self._pending.pop(pending_path, None)
+                if data is None:
+                    continue
+                try:
+                    self._write(pending_path, data)
+                except Exception as e:
+                    self.logger.error(f"Error escribiendo {pending_path}: {e}")
+
+    def has_pending(self, path=None):
+        with self._lock:
+            return os.path.abspath(path) in self._pending if path else bool(self._pending)
+
+
+_default_writer = None
+_default_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Escritor agrupado compartido por toda la aplicación"""
+    global _default_writer
+    with _default_writer_lock:
+        if _default_writer is None:
+            _default_writer = CoalescingWriter()
+        return _default_writer
+
+
+class HistoryJournal:
+    """
+    Historial JSON con diario de solo-añadir
+
+    El archivo principal (p. ej. data/backup_history.json) conserva el formato
+    de siempre; los registros nuevos se añaden como líneas JSON en
+    `<archivo>.journal`. La primera línea del diario guarda el hash del archivo
+    principal sobre el que se apoya: si la compactación se interrumpe después
+    de reescribir el principal, el diario antiguo ya no coincide y se ignora,
+    por lo que nunca se duplican registros.
+
+    Los historiales pueden ser una lista de registros o un diccionario de
+    listas (clave → registros), como el historial de reinicios por servidor.
+    """
+
+    def __init__(self, path, limit=None, compact_every=200, logger=None):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.limit = limit
+        self.compact_every = compact_every
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._base = None
+        self._entries = 0
+
+    @staticmethod
+    def _hash_file(path):
+        try:
+            with open(path, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def _trim(self, data):
+        if not self.limit:
+            return data
+        if isinstance(data, dict):
+            for key, records in data.items():
+                if isinstance(records, list) and len(records) > self.limit:
+                    data[key] = records[-self.limit:]
+            return data
+        return data[-self.limit:] if len(data) > self.limit else data
+
+    def load(self, default=None):
+        """Cargar el historial: archivo principal + registros del diario"""
+        with self._lock:
+            data = load_json(self.path, default)
+            if data is None:
+                data = []
+            self._base = self._hash_file(self.path)
+            self._entries = 0
+            if not os.path.exists(self.journal_path):
+                return self._trim(data)
+
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            try:
+                header = json.loads(lines[0]) if lines else {}
+            except ValueError:
+                header = {}
+            if header.get("base") != self._base:
+                # El diario ya está incluido en el archivo principal: descartarlo
+                # para que los próximos registros empiecen un diario nuevo
+                os.remove(self.journal_path)
+                return self._trim(data)
+
+            for line in lines[1:]:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Última línea cortada por un cierre inesperado
+                    self.logger.warning(f"Registro incompleto ignorado en {self.journal_path}")
+                    continue
+                key, record = entry.get("key"), entry.get("record")
+                if key is None:
+                    data.append(record)
+                else:
+                    data.setdefault(key, []).append(record)
+                self._entries += 1
+            return self._trim(data)
+
+    def append(self, record, key=None):
+        """
+        Añadir un registro al diario (O(1))
+
+        Returns:
+            bool: True si conviene compactar (llamar a compact con el historial)
+        """
+        with self._lock:
+            new_journal = not os.path.exists(self.journal_path)
+            if new_journal:
+                self._base = self._hash_file(self.path)
+            lines = []
+            if new_journal:
+                lines.append(json.dumps({"base": self._base}))
+            lines.append(json.dumps({"key": key, "record": record}, ensure_ascii=False))
+            with open(self.journal_path, "a+b") as f:
+                # Cerrar una línea cortada por un cierre inesperado anterior
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        lines.insert(0, "")
+                f.write(("\n".join(lines) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries += 1
+            return self._entries >= self.compact_every
+
+    def compact(self, data):
+        """Reescribir el archivo principal con el historial completo y vaciar el diario"""
+        with self._lock:
+            payload = dump_json(self._trim(data))
+            atomic_write_bytes(self.path, payload)
+            self._base = hashlib.sha1(payload).hexdigest()
+            atomic_write_bytes(self.journal_path, (json.dumps({"base": self._base}) + "\n").encode("utf-8"))
+            self._entries = 0
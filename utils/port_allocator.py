@@ -0,0 +1,144 @@
+"""
+Asignación de puertos entre instancias
+Con varios servidores en la misma máquina, dos perfiles con el mismo puerto
+de juego, de consulta o RCON solo fallan tras varios minutos de arranque. El
+asignador reúne los puertos de todos los perfiles de arranque, comprueba los
+puertos realmente ocupados con una sola llamada a `psutil.net_connections`
+por revisión, rechaza los conflictos antes de arrancar y propone puertos
+libres para las instancias nuevas.
+"""
+import time
+import socket
+import logging
+import threading
+
+import psutil
+
+
+# Rol del perfil → (nombre en los argumentos, protocolo)
+PORT_ROLES = {
+    "port": ("Port", "udp"),
+    "query_port": ("QueryPort", "udp"),
+    "rcon_port": ("RCONPort", "tcp"),
+}
+
+
+def profile_ports(profile):
+    """{rol: puerto} de un perfil normalizado (RCON solo si está activado)"""
+    ports = {}
+    for role in PORT_ROLES:
+        if role == "rcon_port" and not profile.get("rcon_enabled"):
+            continue
+        if isinstance(profile.get(role), int):
+            ports[role] = profile[role]
+    return ports
+
+
+class PortAllocator:
+    """Puertos reservados por los perfiles y ocupados en el sistema"""
+
+    FIRST_PORTS = {"port": 7777, "query_port": 27015, "rcon_port": 27020}
+    # El puerto de juego avanza de dos en dos, como es habitual entre instancias de ARK
+    PORT_STEPS = {"port": 2, "query_port": 1, "rcon_port": 1}
+
+    def __init__(self, profiles, max_candidates=200, scan_max_age=2.0, connections=None, logger=None):
+        """
+        Args:
+            profiles: LaunchProfileStore con los perfiles de todos los servidores
+            scan_max_age: Segundos durante los que se reutiliza la última revisión del sistema
+            connections: Alternativa a `psutil.net_connections` (para pruebas)
+        """
+        self.profiles = profiles
+        self.max_candidates = max_candidates
+        self.scan_max_age = scan_max_age
+        self.connections = connections or (lambda: psutil.net_connections(kind="inet"))
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._bound = {}
+        self._scanned_at = 0
+        self.stats = {"scans": 0}
+
+    def reservations(self, exclude_server=None):
+        """{puerto: [(servidor, rol)]} de los perfiles guardados"""
+        reserved = {}
+        for server in self.profiles.servers():
+            # "default" es el perfil sin servidor seleccionado, no una instancia
+            if server in (exclude_server, "default"):
+                continue
+            for role, port in profile_ports(self.profiles.get(server) or {}).items():
+                reserved.setdefault(port, []).append((server, role))
+        return reserved
+
+    def scan(self, force=False):
+        """{(protocolo, puerto): pid} en uso en el sistema (una llamada por revisión)"""
+        with self._lock:
+            if not force and time.time() - self._scanned_at < self.scan_max_age:
+                return self._bound
+            bound = {}
+            try:
+                for conn in self.connections():
+                    if not conn.laddr:
+                        continue
+                    if conn.type == socket.SOCK_DGRAM:  # Un socket UDP enlazado ya ocupa el puerto
+                        bound[("udp", conn.laddr.port)] = conn.pid
+                    elif conn.status == psutil.CONN_LISTEN:
+                        bound[("tcp", conn.laddr.port)] = conn.pid
+            except (psutil.AccessDenied, OSError) as e:
+                self.logger.debug(f"No se pudieron revisar los puertos en uso: {e}")
+            self._bound = bound
+            self._scanned_at = time.time()
+            self.stats["scans"] += 1
+            return bound
+
+    def conflicts(self, server, ports, ignore_pids=()):
+        """
+        Conflictos de los puertos de un servidor
+
+        Args:
+            ports: {rol: puerto}
+            ignore_pids: Procesos propios del servidor (p. ej. al reiniciarlo)
+
+        Returns:
+            list: Textos describiendo cada conflicto (vacía si no hay)
+        """
+        problems = []
+        reserved = self.reservations(exclude_server=server)
+        bound = self.scan()
+        seen = {}
+        for role, port in ports.items():
+            name, protocol = PORT_ROLES[role]
+            if port in seen:
+                problems.append(f"{name} {port} coincide con {seen[port]} del mismo servidor")
+            seen.setdefault(port, name)
+            for other_server, other_role in reserved.get(port, []):
+                problems.append(f"{name} {port} ya lo usa {other_server} ({PORT_ROLES[other_role][0]})")
+            pid = bound.get((protocol, port))
+            if (protocol, port) in bound and pid not in ignore_pids:
+                problems.append(f"{name} {port}/{protocol.upper()} está ocupado en el sistema (PID {pid})")
+        return problems
+
+    def allocate(self, server, roles=None):
+        """
+        Puertos libres para una instancia nueva
+
+        Para cada rol se elige el primer candidato que no reserve otro perfil,
+        no esté ocupado en el sistema y no repita otro puerto de la instancia.
+
+        Returns:
+            dict: {rol: puerto}
+        """
+        reserved = self.reservations(exclude_server=server)
+        bound = self.scan()
+        chosen = {}
+        for role in roles or PORT_ROLES:
+            protocol = PORT_ROLES[role][1]
+            for index in range(self.max_candidates):
+                port = self.FIRST_PORTS[role] + index * self.PORT_STEPS[role]
+                if port in reserved or (protocol, port) in bound or port in chosen.values():
+                    continue
+                chosen[role] = port
+                break
+            else:
+                raise RuntimeError(f"No hay puertos libres para {PORT_ROLES[role][0]}")
+        self.logger.info(f"Puertos asignados a {server}: {chosen}")
+        return chosen
@@ -7,35 +7,32 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 import logging
+import re
 from .config_manager import ConfigManager
+from .steamcmd_updater import SteamCMDUpdateManager, read_installed_buildid
+from .shared_install import SharedInstallManager
 import ctypes
 from ctypes import wintypes
 
 
+# Progreso de descarga en la salida de SteamCMD (p. ej. "Update state (0x61) downloading, progress: 42.10 (...)")
+STEAMCMD_PROGRESS_PATTERN = re.compile(
+    r"progress:\s*(\d+(?:\.\d+)?)|(\d+(?:\.\d+)?)% complete", re.IGNORECASE
+)
+
+
 class ServerManager:
     def __init__(self, config_manager):
         self.config_manager = config_manager
-<<<<<<< HEAD
-        self.logger = logger
-        
-        # Referencia a la consola del servidor
-        self.server_console = None
-=======
->>>>>>> Prod
         self.server_process = None
         self.server_console_hwnd = None
         self.server_pid = None
         self.uptime_start = None
         self.server_running = False
+        # Indica si la última parada fue solicitada (para distinguir caídas)
+        self.stop_requested = False
         self.logger = logging.getLogger(__name__)
         
-<<<<<<< HEAD
-    def register_console(self, console_panel):
-        """Registrar el panel de consola del servidor"""
-        self.server_console = console_panel
-        self.logger.info("Consola del servidor registrada")
-        
-=======
         # Cargar APIs de Windows para controlar ventanas
         self.user32 = ctypes.windll.user32
         self.kernel32 = ctypes.windll.kernel32
@@ -275,7 +272,6 @@ class ServerManager:
             self.logger.error(f"Error al restaurar consola: {e}")
             return False
 
->>>>>>> Prod
     def get_server_status(self):
         """Obtiene el estado actual del servidor"""
         # Verificar proceso guardado
@@ -310,6 +306,12 @@ class ServerManager:
         minutes, seconds = divmod(remainder, 60)
         return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
     
+    def get_uptime_seconds(self):
+        """Obtiene el tiempo de actividad del servidor en segundos"""
+        if not self.uptime_start or not self.server_running:
+            return 0
+        return int((datetime.now() - self.uptime_start).total_seconds())
+    
     def get_server_stats(self):
         """Obtener estadísticas del servidor (CPU, memoria)"""
         try:
@@ -487,6 +489,7 @@ class ServerManager:
                 self.server_pid = self.server_process.pid
                 self.server_running = True
                 self.uptime_start = datetime.now()
+                self.stop_requested = False
                 
                 self.logger.info(f"Servidor iniciado con PID: {self.server_pid}")
                 if callback:
@@ -499,8 +502,16 @@ class ServerManager:
         
         threading.Thread(target=_start, daemon=True).start()
     
-    def start_server_with_args(self, callback=None, server_name=None, map_name=None, custom_args=None, capture_console=False):
-        """Inicia el servidor de Ark con argumentos personalizados"""
+    def start_server_with_args(self, callback=None, server_name=None, map_name=None, custom_args=None, capture_console=False, env=None):
+        """
+        Inicia el servidor de Ark con argumentos personalizados
+        
+        Args:
+            env: Variables de entorno del perfil de arranque, añadidas a las del gestor
+        """
+        # Entorno del proceso: el del gestor más el del perfil (None hereda el del gestor)
+        process_env = {**os.environ, **env} if env else None
+        
         def _start_with_args():
             try:
                 # Obtener la ruta del ejecutable del servidor
@@ -578,24 +589,6 @@ class ServerManager:
                 if callback:
                     callback("info", f"Comando del servidor: {' '.join(cmd)}")
                 
-<<<<<<< HEAD
-                # Iniciar el proceso del servidor (OCULTO)
-                startupinfo = None
-                if os.name == 'nt':  # Windows
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                    startupinfo.wShowWindow = subprocess.SW_HIDE
-                
-                self.server_process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                    startupinfo=startupinfo  # Ocultar ventana DOS
-                )
-=======
                 # Iniciar el proceso del servidor
                 # Si se quiere capturar la consola, usar pipes para stdout/stdin
                 self.logger.info(f"DEBUG: start_server_with_args - capture_console = {capture_console}")
@@ -634,7 +627,8 @@ class ServerManager:
                         stderr=subprocess.STDOUT,
                         stdin=subprocess.PIPE,
                         creationflags=creation_flags,
-                        cwd=server_dir
+                        cwd=server_dir,
+                        env=process_env
                     )
                     
                     # Logging adicional para debug
@@ -659,54 +653,20 @@ class ServerManager:
                     self.server_process = subprocess.Popen(
                         cmd,
                         creationflags=creation_flags,
-                        cwd=server_dir
+                        cwd=server_dir,
+                        env=process_env
                     )
                     
                     self.logger.info(f"DEBUG: Proceso del servidor iniciado con PID: {self.server_process.pid}")
->>>>>>> Prod
                 
                 self.server_pid = self.server_process.pid
                 self.server_running = True
                 self.uptime_start = datetime.now()
+                self.stop_requested = False
                 
                 if callback:
                     callback("success", f"Servidor iniciado con PID: {self.server_pid}")
                 
-<<<<<<< HEAD
-                # Monitorear la salida del servidor en tiempo real
-                def monitor_output():
-                    try:
-                        for line in iter(self.server_process.stdout.readline, ''):
-                            if line:
-                                line = line.strip()
-                                if callback:
-                                    callback("info", line)
-                                self.logger.info(f"Servidor: {line}")
-                    except Exception as e:
-                        self.logger.error(f"Error en monitoreo de salida: {e}")
-                
-                # Iniciar monitoreo en hilo separado
-                self.monitor_thread = threading.Thread(target=monitor_output, daemon=True)
-                self.monitor_thread.start()
-                
-                # Esperar un poco para que el proceso se estabilice
-                import time
-                time.sleep(1)
-                
-                # Verificar que el proceso esté ejecutándose
-                if self.server_process.poll() is not None:
-                    # El proceso terminó inmediatamente
-                    self.server_running = False
-                    self.server_pid = None
-                    self.uptime_start = None
-                    
-                    if callback:
-                        callback("error", "Servidor terminó inmediatamente después del inicio")
-                    self.logger.error("Servidor terminado inmediatamente después del inicio")
-                else:
-                    if callback:
-                        callback("info", "Monitoreo de consola iniciado - Servidor ejecutándose en segundo plano")
-=======
                 # Cuando se está capturando la consola, NO leer stdout aquí
                 # El ConsolePanel se encargará de leer la salida del servidor
                 if capture_console:
@@ -733,7 +693,6 @@ class ServerManager:
                         if callback:
                             callback("info", "Servidor detenido")
                         self.logger.info("Proceso del servidor terminado")
->>>>>>> Prod
                 
             except Exception as e:
                 self.logger.error(f"Error al iniciar servidor con argumentos personalizados: {e}")
@@ -751,6 +710,7 @@ class ServerManager:
     
     def stop_server(self, callback=None):
         """Detiene el servidor de Ark"""
+        self.stop_requested = True
         def _stop():
             try:
                 stopped = False
@@ -841,7 +801,7 @@ class ServerManager:
         
         threading.Thread(target=_stop, daemon=True).start()
     
-    def restart_server(self, callback=None, server_name=None, map_name=None, custom_args=None, capture_console=False):
+    def restart_server(self, callback=None, server_name=None, map_name=None, custom_args=None, capture_console=False, env=None):
         """Reinicia el servidor de Ark con argumentos personalizados"""
         def _restart():
             try:
@@ -857,7 +817,7 @@ class ServerManager:
                 
                 # Usar start_server_with_args para conservar argumentos personalizados y mods
                 if custom_args:
-                    self.start_server_with_args(callback, server_name, map_name, custom_args, capture_console)
+                    self.start_server_with_args(callback, server_name, map_name, custom_args, capture_console, env)
                 else:
                     self.start_server(callback, server_name, map_name, capture_console)
                 
@@ -868,6 +828,104 @@ class ServerManager:
         
         threading.Thread(target=_restart, daemon=True).start()
     
+    def get_update_manager(self, steamcmd_path):
+        """Crear el gestor de actualizaciones de SteamCMD"""
+        try:
+            validate_interval_days = int(self.config_manager.get("server", "validate_interval_days", "7"))
+        except ValueError:
+            validate_interval_days = 7
+        return SteamCMDUpdateManager(
+            steamcmd_path,
+            self.config_manager.get_data_file_path("steamcmd_state.json"),
+            self.logger,
+            validate_interval_days=validate_interval_days
+        )
+
+    def get_shared_install(self, root_path, server_name=None):
+        """
+        Obtener el gestor de instalación compartida si está habilitado
+        
+        Si se indica server_name, solo se devuelve cuando ese servidor ya es una capa.
+        """
+        if self.config_manager.get("server", "shared_install", "false").lower() != "true":
+            return None
+        shared_install = SharedInstallManager(root_path, self.logger)
+        if server_name and not shared_install.is_overlay(server_name):
+            return None
+        return shared_install
+
+    def _sync_shared_install(self, shared_install, callback=None, server_name=None):
+        """Crear la capa del servidor indicado y reenlazar todas las capas existentes"""
+        if server_name and not shared_install.is_overlay(server_name):
+            if callback:
+                callback("progress", f"Creando capa compartida para {server_name}...")
+            shared_install.build_overlay(server_name)
+        for overlay_name, report in shared_install.sync_all().items():
+            if report["failed"] and callback:
+                callback("warning", f"{overlay_name}: {len(report['failed'])} archivos no se pudieron enlazar (¿servidor en ejecución?)")
+        if callback:
+            callback("info", "Capas de instalación compartida sincronizadas")
+
+    def _steamcmd_keepalive(self, callback, message, interval=30):
+        """Crear función on_idle que muestra un mensaje si SteamCMD lleva tiempo sin salida"""
+        state = {"last": time.time()}
+
+        def on_idle():
+            if time.time() - state["last"] > interval:
+                if callback:
+                    callback("info", message)
+                state["last"] = time.time()
+        return on_idle
+
+    def _handle_steamcmd_output(self, output, callback):
+        """Clasificar una línea de salida de SteamCMD y notificarla al callback"""
+        self.logger.debug(f"SteamCMD Output: {output}")
+        if not callback:
+            return
+
+        match = STEAMCMD_PROGRESS_PATTERN.search(output)
+        if match:
+            progress = float(match.group(1) or match.group(2))
+            if progress <= 100:  # Asegurar que el progreso esté en rango válido
+                callback("progress", f"Progreso de descarga: {progress:.1f}%")
+                return
+
+        lower = output.lower()
+        if any(keyword in lower for keyword in ["downloading", "installing", "validating"]):
+            callback("progress", output)
+        elif "success!" in lower or "update complete" in lower or "app state" in lower:
+            callback("success", output)
+        elif "error" in lower or "failed" in lower:
+            callback("error", output)
+        elif any(skip in lower for skip in [
+            "steam console client", "-- type 'quit' to exit --",
+            "loading steam api", "waiting for client config", "logging directory"
+        ]):
+            # Filtrar mensajes de ruido de SteamCMD
+            return
+        elif "update state" in lower and "idle" not in lower:
+            # Estados de actualización importantes
+            callback("info", output)
+        elif len(output) > 5:  # Solo mensajes significativos
+            callback("info", output)
+
+    def check_server_update(self, server_name):
+        """
+        Comparar el build instalado de un servidor con el disponible en Steam
+
+        Returns:
+            dict: installed, available y update_needed, o None si no se puede comprobar
+        """
+        root_path = self.config_manager.get("server", "root_path")
+        if not root_path or not server_name:
+            return None
+        steamcmd_path = self.install_steamcmd_if_needed(root_path)
+        if not steamcmd_path:
+            return None
+        shared_install = self.get_shared_install(root_path, server_name)
+        steam_path = shared_install.master_path if shared_install else os.path.join(root_path, server_name)
+        return self.get_update_manager(steamcmd_path).check_for_update(steam_path)
+
     def install_server(self, callback=None, server_name=None):
         """Instala/actualiza el servidor de Ark"""
         def _install():
@@ -947,167 +1005,49 @@ class ServerManager:
                 if callback:
                     callback("info", f"Iniciando {operation_type} del servidor de Ark Survival Ascended...")
                 
-                # Comando para instalar/actualizar el servidor de Ark Survival Ascended
-                # App ID: 2430930 (Ark Survival Ascended Dedicated Server)
-                cmd = [
-                    steamcmd_path,
-                    "+login", "anonymous",
-                    "+force_install_dir", install_path,
-                    "+app_update", "2430930", "validate",
-                    "+quit"
-                ]
-                
-                if callback:
-                    callback("info", f"Ejecutando SteamCMD para {operation_type}...")
-                
-                # Ejecutar el proceso de instalación con buffering deshabilitado
-                try:
-                    env = os.environ.copy()
-                    env['PYTHONUNBUFFERED'] = '1'  # Deshabilitar buffering de Python
-                    
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,  # Combinar stderr con stdout
-                        text=True,
-                        bufsize=0,  # Sin buffering
-                        universal_newlines=True,
-                        env=env,
-                        cwd=os.path.dirname(steamcmd_path) if steamcmd_path != "steamcmd" else None
-                    )
-                except Exception as e:
+                # Instalar/actualizar el servidor de Ark Survival Ascended (App ID 2430930)
+                # En instalaciones nuevas se valida; en existentes solo periódicamente
+                update_manager = self.get_update_manager(steamcmd_path)
+                # En modo de instalación compartida SteamCMD solo actualiza la maestra
+                shared_install = self.get_shared_install(root_path) if server_name else None
+                steam_path = shared_install.master_path if shared_install else install_path
+                # Las capas en ejecución comparten archivos con la maestra: no se toca en el sitio
+                running = shared_install.running_overlays() if shared_install else []
+                if running and read_installed_buildid(steam_path) is None:
                     if callback:
-                        callback("error", f"Error al ejecutar SteamCMD: {str(e)}")
+                        callback("error", f"La instalación maestra está incompleta y hay servidores en ejecución sobre ella: {', '.join(running)}")
                     return
                 
-                # Leer salida en tiempo real con polling más frecuente
-                if callback:
-                    callback("progress", f"Iniciando {operation_type}...")
-                
-                import select
-                import sys
-                import time
-                import re  # Mover import fuera del loop
-                
-                last_progress_time = time.time()
-                
-                while True:
-                    # Verificar si el proceso terminó
-                    if process.poll() is not None:
-                        # Leer cualquier salida restante
-                        remaining_output = process.stdout.read()
-                        if remaining_output:
-                            for line in remaining_output.split('\n'):
-                                if line.strip():
-                                    self.logger.debug(f"SteamCMD Final Output: {line.strip()}")
-                        break
+                if running:
+                    if callback:
+                        callback("warning", f"Servidores en ejecución sobre la instalación maestra ({', '.join(running)}): "
+                                            "se crea la capa con el build actual sin actualizar la maestra")
+                    return_code = 0
+                else:
+                    validate = update_manager.should_validate(steam_path)
                     
-                    # Leer con timeout corto para ser más responsivo
-                    try:
-                        if sys.platform == "win32":
-                            # En Windows, usar readline con timeout
-                            import threading
-                            import queue
-                            
-                            def read_line(q):
-                                try:
-                                    line = process.stdout.readline()
-                                    if line:
-                                        q.put(line)
-                                except:
-                                    pass
-                            
-                            q = queue.Queue()
-                            t = threading.Thread(target=read_line, args=(q,))
-                            t.daemon = True
-                            t.start()
-                            
-                            try:
-                                output = q.get(timeout=0.5)  # Timeout de 0.5 segundos
-                            except queue.Empty:
-                                # Mostrar progreso de "keep-alive" cada 30 segundos
-                                current_time = time.time()
-                                if current_time - last_progress_time > 30:
-                                    if callback:
-                                        callback("info", "🔄 Instalación en progreso... (puede tomar varios minutos)")
-                                    last_progress_time = current_time
-                                continue
-                        else:
-                            # En Linux/Mac, usar select
-                            ready, _, _ = select.select([process.stdout], [], [], 0.5)
-                            if not ready:
-                                # Mostrar progreso de "keep-alive" cada 30 segundos
-                                current_time = time.time()
-                                if current_time - last_progress_time > 30:
-                                    if callback:
-                                        callback("info", "🔄 Instalación en progreso... (puede tomar varios minutos)")
-                                    last_progress_time = current_time
-                                continue
-                            output = process.stdout.readline()
-                        
-                        if output:
-                            output = output.strip()
-                            if output:
-                                self.logger.debug(f"SteamCMD Output: {output}")  # Debug log
-                                last_progress_time = time.time()  # Reset timer cuando hay salida
-                                
-                                # Patrones específicos de progreso de SteamCMD
-                                # Buscar patrones de progreso específicos
-                                progress_patterns = [
-                                r"Update state \(0x\d+\) downloading, progress: (\d+(?:\.\d+)?) \((\d+) / (\d+)\)",  # Progress con bytes
-                                r"Update state \(0x\d+\) downloading, progress: (\d+(?:\.\d+)?)",  # Progress simple
-                                r"downloading, progress: (\d+(?:\.\d+)?)",  # Progreso de descarga
-                                r"Progress: (\d+(?:\.\d+)?)%",  # Progress con %
-                                r"(\d+(?:\.\d+)?)% complete",  # X% complete
-                            ]
-                            
-                            progress_found = False
-                            for pattern in progress_patterns:
-                                match = re.search(pattern, output, re.IGNORECASE)
-                                if match:
-                                    progress = float(match.group(1))
-                                    if progress <= 100:  # Asegurar que el progreso esté en rango válido
-                                        if callback:
-                                            callback("progress", f"Progreso de descarga: {progress:.1f}%")
-                                        progress_found = True
-                                        break
-                            
-                            if not progress_found:
-                                # Mensajes específicos de estado
-                                if any(keyword in output.lower() for keyword in ["downloading", "installing", "validating"]):
-                                    if callback:
-                                        callback("progress", output)
-                                elif "success!" in output.lower() or "update complete" in output.lower() or "app state" in output.lower():
-                                    if callback:
-                                        callback("success", output)
-                                elif "error" in output.lower() or "failed" in output.lower():
-                                    if callback:
-                                        callback("error", output)
-                                elif any(skip in output.lower() for skip in [
-                                    "steam console client", "-- type 'quit' to exit --", 
-                                    "loading steam api", "waiting for client config", "logging directory"
-                                ]):
-                                    # Filtrar mensajes de ruido de SteamCMD
-                                    continue
-                                elif "update state" in output.lower() and "idle" not in output.lower():
-                                    # Estados de actualización importantes
-                                    if callback:
-                                        callback("info", output)
-                                elif output.strip() and len(output.strip()) > 5:  # Solo mensajes significativos
-                                    if callback:
-                                        callback("info", output)
+                    if callback:
+                        callback("info", f"Ejecutando SteamCMD para {operation_type}{' (con validación)' if validate else ''}...")
+                        callback("progress", f"Iniciando {operation_type}...")
                     
+                    try:
+                        return_code = update_manager.run_update(
+                            steam_path,
+                            lambda output: self._handle_steamcmd_output(output, callback),
+                            self._steamcmd_keepalive(callback, "🔄 Instalación en progreso... (puede tomar varios minutos)"),
+                            validate=validate
+                        )
                     except Exception as e:
-                        self.logger.error(f"Error leyendo salida de SteamCMD: {e}")
-                        time.sleep(0.1)  # Pequeña pausa antes de reintentar
-                        continue
-                
-                # Obtener código de salida
-                return_code = process.poll()
+                        if callback:
+                            callback("error", f"Error al ejecutar SteamCMD: {str(e)}")
+                        return
                 
                 # SteamCMD puede devolver códigos de salida diferentes a 0 incluso cuando la operación es exitosa
                 # Código 7 es común cuando la instalación se completa correctamente
                 if return_code == 0 or return_code == 7:
+                    if shared_install:
+                        self._sync_shared_install(shared_install, callback, server_name)
+                    
                     if callback:
                         callback("info", "Buscando ejecutable del servidor...")
                     
@@ -1151,12 +1091,9 @@ class ServerManager:
                         except Exception as e:
                             self.logger.error(f"Error al listar contenido del directorio: {e}")
                 else:
-                    stderr_output = process.stderr.read()
-                    self.logger.error(f"Error en la {operation_type}: {stderr_output}")
+                    self.logger.error(f"Error en la {operation_type}. Código de salida: {return_code}")
                     if callback:
                         callback("error", f"Error en la {operation_type}. Código de salida: {return_code}")
-                        if stderr_output:
-                            callback("error", f"Detalles: {stderr_output}")
                         
             except Exception as e:
                 self.logger.error(f"Error durante la instalación: {e}")
@@ -1548,8 +1485,14 @@ class ServerManager:
         
         threading.Thread(target=_ban, daemon=True).start()
 
-    def update_server(self, callback=None, server_name=None):
-        """Actualiza un servidor existente de Ark"""
+    def update_server(self, callback=None, server_name=None, force_validate=False, force_update=False, wait=False):
+        """
+        Actualiza un servidor existente de Ark
+        
+        Solo descarga si el buildid instalado difiere del disponible; la
+        validación completa se hace bajo demanda (force_validate) o periódicamente.
+        Con wait=True se ejecuta en el hilo actual (secuencias de reinicio).
+        """
         def _update():
             try:
                 # Obtener rutas de configuración
@@ -1586,83 +1529,66 @@ class ServerManager:
                         callback("error", "No se pudo instalar SteamCMD. Verifique su conexión a internet.")
                     return
                 
-                self.logger.info(f"Iniciando actualización del servidor: {server_name}")
-                if callback:
-                    callback("info", f"Iniciando actualización del servidor: {server_name}")
+                update_manager = self.get_update_manager(steamcmd_path)
+                shared_install = self.get_shared_install(root_path, server_name)
+                steam_path = shared_install.master_path if shared_install else install_path
+                
+                # Las capas en ejecución comparten archivos con la maestra: solo se pre-descarga
+                running = shared_install.running_overlays() if shared_install else []
+                if running:
+                    self._prestage_for_running_overlays(update_manager, steam_path, running, callback)
+                    return
+                
+                # Si hay una actualización pre-descargada y el servidor está detenido, solo intercambiar
+                if update_manager.has_staged_update(steam_path) and not self.is_server_running():
+                    if callback:
+                        callback("progress", "Aplicando actualización pre-descargada...")
+                    buildid = update_manager.apply_staged(steam_path)
+                    if shared_install:
+                        self._sync_shared_install(shared_install, callback)
+                    self.logger.info(f"Actualización pre-descargada aplicada (build {buildid})")
+                    if callback:
+                        callback("success", f"Actualización aplicada desde staging (build {buildid})")
+                    return
                 
-                # Comando para actualizar el servidor de Ark Survival Ascended
-                # App ID: 2430930 (Ark Survival Ascended Dedicated Server)
-                cmd = [
-                    steamcmd_path,
-                    "+login", "anonymous",
-                    "+force_install_dir", install_path,
-                    "+app_update", "2430930", "validate",
-                    "+quit"
-                ]
+                # Validar solo bajo demanda o cuando venza el intervalo periódico
+                validate = update_manager.should_validate(steam_path, force_validate)
+                if not validate and not force_update:
+                    if callback:
+                        callback("progress", "Comprobando build disponible...")
+                    build_info = update_manager.check_for_update(steam_path)
+                    if not build_info["update_needed"]:
+                        self.logger.info(f"Servidor {server_name} ya actualizado (build {build_info['installed']})")
+                        if callback:
+                            callback("success", f"El servidor ya está actualizado (build {build_info['installed']})")
+                        return
+                    if callback:
+                        callback("info", f"Build instalado: {build_info['installed']} → disponible: {build_info['available']}")
                 
+                self.logger.info(f"Iniciando actualización del servidor: {server_name}")
                 if callback:
-                    callback("info", "Ejecutando SteamCMD para actualización...")
+                    callback("info", f"Iniciando actualización del servidor: {server_name}")
+                    callback("info", f"Ejecutando SteamCMD para actualización{' (con validación)' if validate else ''}...")
+                    callback("progress", "Iniciando actualización...")
                 
-                # Ejecutar el proceso de actualización
                 try:
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        cwd=os.path.dirname(steamcmd_path) if steamcmd_path != "steamcmd" else None
+                    return_code = update_manager.run_update(
+                        steam_path,
+                        lambda output: self._handle_steamcmd_output(output, callback),
+                        self._steamcmd_keepalive(callback, "🔄 Actualización en progreso..."),
+                        validate=validate
                     )
                 except Exception as e:
                     if callback:
                         callback("error", f"Error al ejecutar SteamCMD: {str(e)}")
                     return
                 
-                # Leer salida en tiempo real
-                if callback:
-                    callback("progress", "Iniciando actualización...")
-                
-                while True:
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        output = output.strip()
-                        if output:
-                            # Filtrar mensajes importantes y actualizar progreso
-                            if any(keyword in output for keyword in ["Downloading update", "Installing update", "Downloading", "Installing", "Validating", "Progress:"]):
-                                if callback:
-                                    callback("progress", output)
-                            elif "Success!" in output or "Installed" in output or "Update complete" in output:
-                                if callback:
-                                    callback("success", output)
-                            elif "ERROR" in output or "Failed" in output:
-                                if callback:
-                                    callback("error", output)
-                            elif any(keyword in output for keyword in ["Update state", "App 2430930", "Logging directory", "Loading Steam API", "Connecting anonymously", "Waiting for client config"]):
-                                if callback:
-                                    callback("info", output)
-                            elif "Steam" in output and ("updating" in output.lower() or "installing" in output.lower()):
-                                if callback:
-                                    callback("progress", output)
-                            elif "Downloading" in output or "Installing" in output or "Validating" in output:
-                                # Capturar cualquier mensaje que contenga estas palabras
-                                if callback:
-                                    callback("progress", output)
-                            elif "Progress:" in output:
-                                # Capturar mensajes de progreso específicos
-                                if callback:
-                                    callback("progress", output)
-                            else:
-                                # Para otros mensajes, mostrarlos como información
-                                if callback and output.strip():
-                                    callback("info", output)
-                
-                # Obtener código de salida
-                return_code = process.poll()
-                
                 # SteamCMD puede devolver códigos de salida diferentes a 0 incluso cuando la operación es exitosa
                 # Código 7 es común cuando la actualización se completa correctamente
                 if return_code == 0 or return_code == 7:
+                    if shared_install:
+                        self._sync_shared_install(shared_install, callback)
+                    
                     if callback:
                         callback("info", "Buscando ejecutable del servidor...")
                     
@@ -1687,16 +1613,91 @@ class ServerManager:
                         if callback:
                             callback("warning", f"Actualización completada pero no se encontró el ejecutable del servidor en: {install_path}")
                 else:
-                    stderr_output = process.stderr.read()
-                    self.logger.error(f"Error en la actualización: {stderr_output}")
+                    self.logger.error(f"Error en la actualización. Código de salida: {return_code}")
                     if callback:
                         callback("error", f"Error en la actualización. Código de salida: {return_code}")
-                        if stderr_output:
-                            callback("error", f"Detalles: {stderr_output}")
                         
             except Exception as e:
                 self.logger.error(f"Error durante la actualización: {e}")
                 if callback:
                     callback("error", f"Error durante la actualización: {str(e)}")
         
-        threading.Thread(target=_update, daemon=True).start()
+        if wait:
+            _update()
+        else:
+            threading.Thread(target=_update, daemon=True).start()
+
+    def _prestage_for_running_overlays(self, update_manager, steam_path, running, callback=None):
+        """Descargar en staging la actualización de la maestra mientras hay capas en ejecución"""
+        names = ", ".join(running)
+        self.logger.warning(f"Servidores en ejecución sobre la instalación maestra ({names}): no se actualiza en el sitio")
+        if not update_manager.has_staged_update(steam_path):
+            if callback:
+                callback("progress", "Comprobando build disponible...")
+            build_info = update_manager.check_for_update(steam_path)
+            if not build_info["update_needed"]:
+                if callback:
+                    callback("success", f"El servidor ya está actualizado (build {build_info['installed']})")
+                return
+            if callback:
+                callback("progress", f"Pre-descargando build {build_info['available']} en staging...")
+            return_code = update_manager.prestage(
+                steam_path,
+                lambda output: self._handle_steamcmd_output(output, callback),
+                self._steamcmd_keepalive(callback, "🔄 Pre-descarga en progreso...")
+            )
+            if return_code not in (0, 7) or not update_manager.has_staged_update(steam_path):
+                if callback:
+                    callback("error", f"Error en la pre-descarga. Código de salida: {return_code}")
+                return
+        if callback:
+            callback("warning", f"Actualización preparada; se aplicará cuando se detengan los servidores de la instalación compartida: {names}")
+
+    def prestage_update(self, callback=None, server_name=None, wait=False):
+        """Pre-descargar la actualización en staging sin detener el servidor (wait=True: en el hilo actual)"""
+        def _prestage():
+            try:
+                root_path = self.config_manager.get("server", "root_path")
+                if not root_path or not server_name:
+                    if callback:
+                        callback("error", "Ruta raíz o nombre del servidor no configurado.")
+                    return
+                install_path = os.path.join(root_path, server_name)
+                steamcmd_path = self.install_steamcmd_if_needed(root_path, callback)
+                if not steamcmd_path:
+                    if callback:
+                        callback("error", "No se pudo instalar SteamCMD. Verifique su conexión a internet.")
+                    return
+                
+                update_manager = self.get_update_manager(steamcmd_path)
+                shared_install = self.get_shared_install(root_path, server_name)
+                steam_path = shared_install.master_path if shared_install else install_path
+                build_info = update_manager.check_for_update(steam_path)
+                if not build_info["update_needed"]:
+                    if callback:
+                        callback("success", f"El servidor ya está actualizado (build {build_info['installed']})")
+                    return
+                
+                if callback:
+                    callback("progress", f"Pre-descargando build {build_info['available']} en staging...")
+                return_code = update_manager.prestage(
+                    steam_path,
+                    lambda output: self._handle_steamcmd_output(output, callback),
+                    self._steamcmd_keepalive(callback, "🔄 Pre-descarga en progreso...")
+                )
+                if return_code in (0, 7) and update_manager.has_staged_update(steam_path):
+                    self.logger.info(f"Actualización pre-descargada para {server_name}")
+                    if callback:
+                        callback("success", "Actualización preparada. Se aplicará en el próximo reinicio con actualización.")
+                else:
+                    if callback:
+                        callback("error", f"Error en la pre-descarga. Código de salida: {return_code}")
+            except Exception as e:
+                self.logger.error(f"Error durante la pre-descarga: {e}")
+                if callback:
+                    callback("error", f"Error durante la pre-descarga: {str(e)}")
+        
+        if wait:
+            _prestage()
+        else:
+            threading.Thread(target=_prestage, daemon=True).start()
@@ -0,0 +1,452 @@
+"""
+Catálogo de ajustes conocidos de ARK (GameUserSettings.ini / Game.ini)
+Cada entrada es (clave, tipo, descripción) agrupada por archivo y sección;
+`LIMITS` añade rangos y valores por defecto. `SettingsSchema` lo carga una
+sola vez en un diccionario por clave para que los editores elijan el widget,
+validen valores antes de guardar y detecten claves fuera de sitio o repetidas.
+"""
+from collections import namedtuple
+
+GAME_USER_SETTINGS = {
+    "SessionSettings": [
+        ("SessionName", "str", "Nombre del servidor en la lista de sesiones"),
+        ("Port", "int", "Puerto de juego"),
+        ("QueryPort", "int", "Puerto de consulta de Steam"),
+        ("MultiHome", "str", "IP local a la que se enlaza el servidor"),
+    ],
+    "/Script/Engine.GameSession": [
+        ("MaxPlayers", "int", "Máximo de jugadores conectados"),
+    ],
+    "MessageOfTheDay": [
+        ("Message", "str", "Mensaje del día"),
+        ("Duration", "int", "Segundos que se muestra el mensaje del día"),
+    ],
+    "ServerSettings": [
+        ("ServerPassword", "str", "Contraseña para unirse al servidor"),
+        ("ServerAdminPassword", "str", "Contraseña de administrador"),
+        ("SpectatorPassword", "str", "Contraseña de espectador"),
+        ("RCONEnabled", "bool", "Habilitar RCON"),
+        ("RCONPort", "int", "Puerto RCON"),
+        ("ActiveMods", "str", "IDs de mods activos separados por comas"),
+        ("MaxNumbersofPlayersInTribe", "int", "Máximo de jugadores por tribu"),
+        ("MaxAlliancesPerTribe", "int", "Máximo de alianzas por tribu"),
+        ("MaxTribeLogs", "int", "Máximo de logs de tribu"),
+        ("PreventTribeAlliances", "bool", "Prevenir alianzas tribales"),
+        ("TribeNameChangeCooldown", "float", "Tiempo de espera para cambio de nombre de tribu"),
+        ("AllowAnyoneBabyImprintCuddle", "bool", "Permitir a cualquiera mimar bebés"),
+        ("PreventMateBoost", "bool", "Prevenir boost de pareja"),
+        ("MaxTamedDinos", "int", "Máximo de dinos domesticados"),
+        ("MaxTamedDinos_SoftTameLimit", "int", "Límite suave de dinos domesticados"),
+        ("MaxTamedDinos_SoftTameLimit_CountdownForDeletionDuration", "float", "Duración cuenta regresiva para eliminación"),
+        ("MaxPersonalTamedDinos", "int", "Máximo de dinos domesticados personales"),
+        ("DifficultyOffset", "float", "Offset de dificultad"),
+        ("OverrideOfficialDifficulty", "float", "Anular dificultad oficial"),
+        ("XPMultiplier", "float", "Multiplicador de XP"),
+        ("TamingSpeedMultiplier", "float", "Multiplicador de velocidad de domesticación"),
+        ("DinoCountMultiplier", "float", "Multiplicador de cantidad de dinos"),
+        ("OverrideSecondsUntilBuriedTreasureAutoReveals", "int", "Segundos hasta auto-revelar tesoro enterrado"),
+        ("ServerHardcore", "bool", "Servidor hardcore"),
+        ("ServerCrosshair", "bool", "Mira del servidor"),
+        ("ShowMapPlayerLocation", "bool", "Mostrar ubicación del jugador en mapa"),
+        ("serverForceNoHud", "bool", "Forzar sin HUD"),
+        ("ShowFloatingDamageText", "bool", "Mostrar texto de daño flotante"),
+        ("AllowHideDamageSourceFromLogs", "bool", "Permitir ocultar fuente de daño en logs"),
+        ("AllowHitMarkers", "bool", "Permitir marcadores de impacto"),
+        ("bShowStatusNotificationMessages", "bool", "Mostrar mensajes de notificación de estado"),
+        ("bShowChatBox", "bool", "Mostrar caja de chat"),
+        ("bShowInfoButtons", "bool", "Mostrar botones de información"),
+        ("DayCycleSpeedScale", "float", "Escala de velocidad del ciclo diario"),
+        ("NightTimeSpeedScale", "float", "Escala de velocidad nocturna"),
+        ("DayTimeSpeedScale", "float", "Escala de velocidad diurna"),
+        ("BaseTemperatureMultiplier", "float", "Multiplicador de temperatura base"),
+        ("DisableWeatherFog", "bool", "Deshabilitar niebla climática"),
+        ("EnablePVEGamma", "bool", "Habilitar gamma PVE"),
+        ("HarvestAmountMultiplier", "float", "Multiplicador de cantidad de recolección"),
+        ("HarvestHealthMultiplier", "float", "Multiplicador de salud de recolección"),
+        ("PlayerHarvestingDamageMultiplier", "float", "Multiplicador de daño de recolección del jugador"),
+        ("DinoHarvestingDamageMultiplier", "float", "Multiplicador de daño de recolección de dinos"),
+        ("ResourcesRespawnPeriodMultiplier", "float", "Multiplicador de período de respawn de recursos"),
+        ("ResourceNoReplenishRadiusPlayers", "float", "Radio de no reabastecimiento de recursos - jugadores"),
+        ("ResourceNoReplenishRadiusStructures", "float", "Radio de no reabastecimiento de recursos - estructuras"),
+        ("StructurePreventResourceRadiusMultiplier", "float", "Multiplicador de radio de prevención de recursos por estructuras"),
+        ("UseOptimizedHarvestingHealth", "bool", "Usar salud de recolección optimizada"),
+        ("ClampResourceHarvestDamage", "bool", "Limitar daño de recolección de recursos"),
+        ("CropGrowthSpeedMultiplier", "float", "Multiplicador de velocidad de crecimiento de cultivos"),
+        ("CropDecaySpeedMultiplier", "float", "Multiplicador de velocidad de descomposición de cultivos"),
+        ("PoopIntervalMultiplier", "float", "Multiplicador de intervalo de excremento"),
+        ("HairGrowthSpeedMultiplier", "float", "Multiplicador de velocidad de crecimiento de cabello"),
+        ("BabyImprintingStatScaleMultiplier", "float", "Multiplicador de escala de estadísticas de impronta de bebés"),
+        ("BabyImprintAmountMultiplier", "float", "Multiplicador de cantidad de impronta de bebés"),
+        ("MatingIntervalMultiplier", "float", "Multiplicador de intervalo de apareamiento"),
+        ("MatingSpeedMultiplier", "float", "Multiplicador de velocidad de apareamiento"),
+        ("LayEggIntervalMultiplier", "float", "Multiplicador de intervalo de puesta de huevos"),
+        ("EggHatchSpeedMultiplier", "float", "Multiplicador de velocidad de eclosión de huevos"),
+        ("BabyMatureSpeedMultiplier", "float", "Multiplicador de velocidad de maduración de bebés"),
+        ("BabyCuddleIntervalMultiplier", "float", "Multiplicador de intervalo de mimos de bebés"),
+        ("BabyCuddleGracePeriodMultiplier", "float", "Multiplicador de período de gracia de mimos de bebés"),
+        ("BabyCuddleLoseImprintQualitySpeedMultiplier", "float", "Multiplicador de velocidad de pérdida de calidad de impronta"),
+        ("BabyFoodConsumptionSpeedMultiplier", "float", "Multiplicador de velocidad de consumo de comida de bebés"),
+        ("DisableImprintDinoBuff", "bool", "Deshabilitar buff de impronta de dinos"),
+        ("PassiveTameIntervalMultiplier", "float", "Multiplicador de intervalo de domesticación pasiva"),
+        ("bAllowTamedDinoRiding", "bool", "Permitir montar dinos domesticados"),
+        ("bDisableDinoRiding", "bool", "Deshabilitar montar dinos"),
+        ("bDisableDinoTaming", "bool", "Deshabilitar domesticación de dinos"),
+        ("bUseTameLimitForStructuresOnly", "bool", "Usar límite de domesticación solo para estructuras"),
+        ("bForceCanRideFliers", "bool", "Forzar poder montar voladores"),
+        ("ForceAllowCaveFlyers", "bool", "Forzar permitir voladores en cuevas"),
+        ("AllowFlyingStaminaRecovery", "bool", "Permitir recuperación de stamina volando"),
+        ("bAllowFlyerCarryPvE", "bool", "Permitir carga de voladores en PvE"),
+        ("bFlyerPlatformAllowUnalignedDinoBasing", "bool", "Permitir dinos no alineados en plataforma de voladores"),
+        ("TamedDinoCharacterFoodDrainMultiplier", "float", "Multiplicador de drenaje de comida de dinos domesticados"),
+        ("TamedDinoTorporDrainMultiplier", "float", "Multiplicador de drenaje de torpor de dinos domesticados"),
+        ("WildDinoCharacterFoodDrainMultiplier", "float", "Multiplicador de drenaje de comida de dinos salvajes"),
+        ("WildDinoTorporDrainMultiplier", "float", "Multiplicador de drenaje de torpor de dinos salvajes"),
+        ("DinoCharacterFoodDrainMultiplier", "float", "Multiplicador de drenaje de comida de personaje dino"),
+        ("DinoCharacterStaminaDrainMultiplier", "float", "Multiplicador de drenaje de stamina de personaje dino"),
+        ("DinoCharacterHealthRecoveryMultiplier", "float", "Multiplicador de recuperación de salud de personaje dino"),
+        ("PlayerCharacterWaterDrainMultiplier", "float", "Multiplicador de drenaje de agua del jugador"),
+        ("PlayerCharacterFoodDrainMultiplier", "float", "Multiplicador de drenaje de comida del jugador"),
+        ("PlayerCharacterStaminaDrainMultiplier", "float", "Multiplicador de drenaje de stamina del jugador"),
+        ("PlayerCharacterHealthRecoveryMultiplier", "float", "Multiplicador de recuperación de salud del jugador"),
+        ("RaidDinoCharacterFoodDrainMultiplier", "float", "Multiplicador de drenaje de comida de dinos de raid"),
+        ("StructureDamageMultiplier", "float", "Multiplicador de daño a estructuras"),
+        ("StructureResistanceMultiplier", "float", "Multiplicador de resistencia de estructuras"),
+        ("StructureDamageRepairCooldown", "float", "Tiempo de espera para reparar daño a estructuras"),
+        ("MaxStructuresInRange", "int", "Máximo de estructuras en rango"),
+        ("TheMaxStructuresInRange", "int", "El máximo de estructuras en rango"),
+        ("bForceAllStructureLocking", "bool", "Forzar bloqueo de todas las estructuras"),
+        ("bDisableStructurePlacementCollision", "bool", "Deshabilitar colisión de colocación de estructuras"),
+        ("bAllowPlatformSaddleMultiFloors", "bool", "Permitir múltiples pisos en silla de plataforma"),
+        ("PlatformSaddleBuildAreaBoundsMultiplier", "float", "Multiplicador de límites de área de construcción de silla de plataforma"),
+        ("MaxPlatformSaddleStructureLimit", "int", "Límite máximo de estructuras en silla de plataforma"),
+        ("PersonalTamedDinosSaddleStructureCost", "int", "Costo de estructura de silla de dinos domesticados personales"),
+        ("DestroyUnconnectedWaterPipes", "bool", "Destruir tuberías de agua desconectadas"),
+        ("OverrideStructurePlatformPrevention", "bool", "Anular prevención de plataforma de estructuras"),
+        ("EnableExtraStructurePreventionVolumes", "bool", "Habilitar volúmenes de prevención de estructura extra"),
+        ("bIgnoreStructuresPreventionVolumes", "bool", "Ignorar volúmenes de prevención de estructuras"),
+        ("bGenesisUseStructuresPreventionVolumes", "bool", "Genesis usar volúmenes de prevención de estructuras"),
+        ("AlwaysAllowStructurePickup", "bool", "Siempre permitir recogida de estructuras"),
+        ("StructurePickupTimeAfterPlacement", "float", "Tiempo de recogida de estructura después de colocación"),
+        ("StructurePickupHoldDuration", "float", "Duración de mantener para recoger estructura"),
+        ("AllowIntegratedSPlusStructures", "bool", "Permitir estructuras S+ integradas"),
+        ("AutoDestroyOldStructuresMultiplier", "float", "Multiplicador de auto-destrucción de estructuras viejas"),
+        ("AutoDestroyStructures", "bool", "Auto-destruir estructuras"),
+        ("OnlyAutoDestroyCoreStructures", "bool", "Solo auto-destruir estructuras centrales"),
+        ("OnlyDecayUnsnappedCoreStructures", "bool", "Solo decaer estructuras centrales no conectadas"),
+        ("bPassiveDefensesDamageRiderlessDinos", "bool", "Defensas pasivas dañan dinos sin jinete"),
+        ("bLimitTurretsInRange", "bool", "Limitar torretas en rango"),
+        ("LimitTurretsRange", "int", "Rango límite de torretas"),
+        ("LimitTurretsNum", "int", "Número límite de torretas"),
+        ("bHardLimitTurretsInRange", "bool", "Límite estricto de torretas en rango"),
+        ("SupplyCrateLootQualityMultiplier", "float", "Multiplicador de calidad de loot de cajas de suministro"),
+        ("FishingLootQualityMultiplier", "float", "Multiplicador de calidad de loot de pesca"),
+        ("bDisableLootCrates", "bool", "Deshabilitar cajas de loot"),
+        ("RandomSupplyCratePoints", "bool", "Puntos de cajas de suministro aleatorias"),
+        ("ItemStackSizeMultiplier", "float", "Multiplicador de tamaño de pila de ítems"),
+        ("CraftingSkillBonusMultiplier", "float", "Multiplicador de bonus de habilidad de crafteo"),
+        ("GlobalItemDecompositionTimeMultiplier", "float", "Multiplicador de tiempo de descomposición global de ítems"),
+        ("GlobalCorpseDecompositionTimeMultiplier", "float", "Multiplicador de tiempo de descomposición global de cadáveres"),
+        ("GlobalSpoilingTimeMultiplier", "float", "Multiplicador de tiempo de descomposición global"),
+        ("UseCorpseLifeSpanMultiplier", "float", "Multiplicador de duración de vida de cadáveres"),
+        ("ClampItemSpoilingTimes", "bool", "Limitar tiempos de descomposición de ítems"),
+        ("FastDecayInterval", "float", "Intervalo de decaimiento rápido"),
+        ("AutoDestroyDecayedDinos", "bool", "Auto-destruir dinos decaídos"),
+        ("ServerPVE", "bool", "Servidor PvE"),
+        ("PvEDinoDecayPeriodMultiplier", "float", "Multiplicador de período de decaimiento de dinos PvE"),
+        ("bPvPDinoDecay", "bool", "Decaimiento de dinos PvP"),
+        ("PvEStructureDecayPeriodMultiplier", "float", "Multiplicador de período de decaimiento de estructuras PvE"),
+        ("PvEStructureDecayDestructionPeriod", "float", "Período de destrucción por decaimiento de estructuras PvE"),
+        ("PvEAllowStructuresAtSupplyDrops", "bool", "Permitir estructuras en drops de suministro PvE"),
+        ("bPvEDisableFriendlyFire", "bool", "Deshabilitar fuego amigo PvE"),
+        ("bPvEAllowTribeWar", "bool", "Permitir guerra tribal PvE"),
+        ("bPvEAllowTribeWarCancel", "bool", "Permitir cancelar guerra tribal PvE"),
+        ("AutoSavePeriodMinutes", "float", "Período de auto-guardado en minutos"),
+        ("PreventSpawnAnimations", "bool", "Prevenir animaciones de spawn"),
+        ("PreventDiseases", "bool", "Prevenir enfermedades"),
+        ("NonPermanentDiseases", "bool", "Enfermedades no permanentes"),
+        ("ServerAutoForceRespawnWildDinosInterval", "float", "Intervalo de auto-forzar respawn de dinos salvajes"),
+        ("AllowCrateSpawnsOnTopOfStructures", "bool", "Permitir spawn de cajas encima de estructuras"),
+        ("CrossARKAllowForeignDinoDownloads", "bool", "Permitir descargas de dinos extranjeros Cross-ARK"),
+        ("noTributeDownloads", "bool", "Sin descargas de tributo"),
+        ("PreventDownloadSurvivors", "bool", "Prevenir descarga de sobrevivientes"),
+        ("PreventDownloadItems", "bool", "Prevenir descarga de ítems"),
+        ("PreventDownloadDinos", "bool", "Prevenir descarga de dinos"),
+        ("PreventUploadSurvivors", "bool", "Prevenir subida de sobrevivientes"),
+        ("PreventUploadItems", "bool", "Prevenir subida de ítems"),
+        ("PreventUploadDinos", "bool", "Prevenir subida de dinos"),
+        ("MaxTributeDinos", "int", "Máximo de dinos tributo"),
+        ("MaxTributeItems", "int", "Máximo de ítems tributo"),
+        ("TributeItemExpirationSeconds", "int", "Segundos de expiración de ítems tributo"),
+        ("TributeDinoExpirationSeconds", "int", "Segundos de expiración de dinos tributo"),
+        ("TributeCharacterExpirationSeconds", "int", "Segundos de expiración de personajes tributo"),
+        ("MinimumDinoReuploadInterval", "float", "Intervalo mínimo de re-subida de dinos"),
+        ("alwaysNotifyPlayerJoined", "bool", "Siempre notificar jugador unido"),
+        ("alwaysNotifyPlayerLeft", "bool", "Siempre notificar jugador que se fue"),
+        ("AdminLogging", "bool", "Logging de administrador"),
+        ("NPCNetworkStasisRangeScalePlayerCountStart", "int", "Inicio de escala de rango de stasis de red NPC por conteo de jugadores"),
+        ("NPCNetworkStasisRangeScalePlayerCountEnd", "int", "Fin de escala de rango de stasis de red NPC por conteo de jugadores"),
+        ("NPCNetworkStasisRangeScalePercentEnd", "float", "Porcentaje final de escala de rango de stasis de red NPC"),
+    ],
+}
+
+GAME = {
+    "/Script/ShooterGame.ShooterGameMode": [
+        ("LevelExperienceRampOverrides", "str", "Curva de experiencia por nivel"),
+        ("OverrideMaxExperiencePointsPlayer", "int", "XP máximo de jugador"),
+        ("OverrideMaxExperiencePointsDino", "int", "XP máximo de dino"),
+        ("TamedDinoCharacterLevelCount", "int", "Niveles máximos de dino domesticado"),
+        ("CraftXPMultiplier", "float", "Multiplicador de XP por crafteo"),
+        ("GenericXPMultiplier", "float", "Multiplicador genérico de XP"),
+        ("HarvestXPMultiplier", "float", "Multiplicador de XP por recolección"),
+        ("KillXPMultiplier", "float", "Multiplicador de XP por matanza"),
+        ("SpecialXPMultiplier", "float", "Multiplicador especial de XP"),
+        ("TamedDinoXPMultiplier", "float", "Multiplicador de XP de dino domesticado"),
+        ("PerLevelStatsMultiplier_Player[7]", "float", "Multiplicador de estadística por nivel - Jugador [7]"),
+        ("PerLevelStatsMultiplier_DinoTamed[7]", "float", "Multiplicador de estadística por nivel - Dino domesticado [7]"),
+        ("PlayerHarvestingDamageMultiplier", "float", "Multiplicador de daño de recolección del jugador"),
+        ("DinoHarvestingDamageMultiplier", "float", "Multiplicador de daño de recolección de dinos"),
+        ("DinoTurretDamageMultiplier", "float", "Multiplicador de daño de torretas de dinos"),
+        ("BabyImprintingStatScaleMultiplier", "float", "Multiplicador de estadísticas de impronta"),
+        ("BabyImprintAmountMultiplier", "float", "Multiplicador de cantidad de impronta"),
+        ("MatingIntervalMultiplier", "float", "Multiplicador de intervalo de apareamiento"),
+        ("MatingSpeedMultiplier", "float", "Multiplicador de velocidad de apareamiento"),
+        ("LayEggIntervalMultiplier", "float", "Multiplicador de intervalo de puesta de huevos"),
+        ("EggHatchSpeedMultiplier", "float", "Multiplicador de velocidad de eclosión"),
+        ("BabyMatureSpeedMultiplier", "float", "Multiplicador de velocidad de maduración"),
+        ("BabyCuddleIntervalMultiplier", "float", "Multiplicador de intervalo de mimos"),
+        ("BabyCuddleGracePeriodMultiplier", "float", "Multiplicador de período de gracia de mimos"),
+        ("BabyCuddleLoseImprintQualitySpeedMultiplier", "float", "Multiplicador de pérdida de calidad de impronta"),
+        ("BabyFoodConsumptionSpeedMultiplier", "float", "Multiplicador de consumo de comida de bebés"),
+        ("bAllowTamedDinoRiding", "bool", "Permitir montar dinos domesticados"),
+        ("TamedDinoRidingWaitTime", "float", "Tiempo de espera para montar dino domesticado"),
+        ("bDisableDinoRiding", "bool", "Deshabilitar montar dinos"),
+        ("bDisableDinoTaming", "bool", "Deshabilitar domesticación de dinos"),
+        ("bAllowFlyerSpeedLeveling", "bool", "Permitir nivelar velocidad de voladores"),
+        ("bFlyerPlatformAllowUnalignedDinoBasing", "bool", "Permitir dinos no alineados en plataforma de voladores"),
+        ("TamedDinoCharacterFoodDrainMultiplier", "float", "Multiplicador de drenaje de comida de dino domesticado"),
+        ("TamedDinoTorporDrainMultiplier", "float", "Multiplicador de drenaje de torpor de dino domesticado"),
+        ("WildDinoCharacterFoodDrainMultiplier", "float", "Multiplicador de drenaje de comida de dino salvaje"),
+        ("WildDinoTorporDrainMultiplier", "float", "Multiplicador de drenaje de torpor de dino salvaje"),
+        ("PassiveTameIntervalMultiplier", "float", "Multiplicador de intervalo de tameo pasivo"),
+        ("ResourceNoReplenishRadiusPlayers", "float", "Radio de no reabastecimiento de recursos - jugadores"),
+        ("ResourceNoReplenishRadiusStructures", "float", "Radio de no reabastecimiento de recursos - estructuras"),
+        ("CropGrowthSpeedMultiplier", "float", "Multiplicador de crecimiento de cultivos"),
+        ("CropDecaySpeedMultiplier", "float", "Multiplicador de descomposición de cultivos"),
+        ("PoopIntervalMultiplier", "float", "Multiplicador de intervalo de excremento"),
+        ("SupplyCrateLootQualityMultiplier", "float", "Multiplicador de calidad de loot de cajas de suministro"),
+        ("FishingLootQualityMultiplier", "float", "Multiplicador de calidad de loot de pesca"),
+        ("bAllowCustomRecipes", "bool", "Permitir recetas personalizadas"),
+        ("CustomRecipeEffectivenessMultiplier", "float", "Multiplicador de efectividad de recetas personalizadas"),
+        ("CustomRecipeSkillMultiplier", "float", "Multiplicador de habilidad de recetas personalizadas"),
+        ("UseCorpseLifeSpanMultiplier", "float", "Multiplicador de duración de cadáveres"),
+        ("GlobalPoweredBatteryDurabilityDecreasePerSecond", "float", "Disminución de durabilidad de batería por segundo"),
+        ("GlobalItemDecompositionTimeMultiplier", "float", "Multiplicador de tiempo de descomposición de ítems"),
+        ("GlobalCorpseDecompositionTimeMultiplier", "float", "Multiplicador de tiempo de descomposición de cadáveres"),
+        ("GlobalSpoilingTimeMultiplier", "float", "Multiplicador de tiempo de descomposición de comida"),
+        ("StructureDamageRepairCooldown", "float", "Tiempo de espera para reparar daño a estructuras"),
+        ("FastDecayInterval", "float", "Intervalo de decaimiento rápido"),
+        ("BaseTemperatureMultiplier", "float", "Multiplicador de temperatura base"),
+        ("HairGrowthSpeedMultiplier", "float", "Multiplicador de crecimiento de cabello"),
+        ("bAllowPlatformSaddleMultiFloors", "bool", "Permitir múltiples pisos en silla de plataforma"),
+        ("PlatformSaddleBuildAreaBoundsMultiplier", "float", "Multiplicador de área de construcción en silla de plataforma"),
+        ("bDisableStructurePlacementCollision", "bool", "Deshabilitar colisión de colocación de estructuras"),
+        ("bPassiveDefensesDamageRiderlessDinos", "bool", "Defensas pasivas dañan dinos sin jinete"),
+        ("bLimitTurretsInRange", "bool", "Limitar torretas en rango"),
+        ("LimitTurretsRange", "int", "Rango de torretas"),
+        ("LimitTurretsNum", "int", "Número de torretas"),
+        ("bHardLimitTurretsInRange", "bool", "Límite estricto de torretas en rango"),
+        ("bUseTameLimitForStructuresOnly", "bool", "Usar límite de domesticación solo para estructuras"),
+        ("MaxTribeLogs", "int", "Máximo de logs de tribu"),
+        ("bDisableFriendlyFire", "bool", "Deshabilitar fuego amigo"),
+        ("bPvEDisableFriendlyFire", "bool", "Deshabilitar fuego amigo en PvE"),
+        ("bPvEAllowTribeWar", "bool", "Permitir guerra tribal en PvE"),
+        ("bPvEAllowTribeWarCancel", "bool", "Permitir cancelar guerra tribal en PvE"),
+        ("KickIdlePlayersPeriod", "int", "Período para expulsar jugadores inactivos"),
+        ("bAutoUnlockAllEngrams", "bool", "Desbloquear todos los engramas automáticamente"),
+        ("bDisableGenesisMissions", "bool", "Deshabilitar misiones Genesis"),
+        ("bShowCreativeMode", "bool", "Mostrar modo creativo"),
+        ("bAllowUnlimitedRespecs", "bool", "Permitir respecs ilimitados"),
+        ("bDisableLootCrates", "bool", "Deshabilitar cajas de loot"),
+        ("bUseCorpseLocator", "bool", "Usar localizador de cadáveres"),
+        ("bAutoPvETimer", "bool", "Auto temporizador PvE"),
+        ("bAutoPvEUseSystemTime", "bool", "Usar hora del sistema para PvE"),
+        ("AutoPvEStartTimeSeconds", "int", "Hora de inicio PvE (segundos)"),
+        ("AutoPvEStopTimeSeconds", "int", "Hora de fin PvE (segundos)"),
+    ],
+}
+
+CATALOG = {
+    "GameUserSettings": GAME_USER_SETTINGS,
+    "Game": GAME,
+}
+
+# Rangos y valores por defecto conocidos: {clave: (mínimo, máximo, por defecto)}
+LIMITS = {
+    "Port": (1024, 65535, 7777),
+    "QueryPort": (1024, 65535, 27015),
+    "RCONPort": (1024, 65535, 27020),
+    "MaxPlayers": (1, 255, 70),
+    "Duration": (0, None, 20),
+    "DifficultyOffset": (0.0, 1.0, 1.0),
+    "OverrideOfficialDifficulty": (0.0, None, 5.0),
+    "MaxNumbersofPlayersInTribe": (0, None, None),
+    "MaxAlliancesPerTribe": (0, None, None),
+    "MaxTribeLogs": (0, None, 400),
+    "MaxTamedDinos": (0, None, 5000),
+    "MaxPersonalTamedDinos": (0, None, 0),
+    "AutoSavePeriodMinutes": (1, None, 15),
+    "KickIdlePlayersPeriod": (0, None, 3600),
+    "AutoPvEStartTimeSeconds": (0, 86400, 0),
+    "AutoPvEStopTimeSeconds": (0, 86400, 0),
+    "LimitTurretsRange": (0, None, 10000),
+    "LimitTurretsNum": (0, None, 100),
+    "MaxStructuresInRange": (0, None, 10500),
+    "TheMaxStructuresInRange": (0, None, 10500),
+}
+
+TYPES = {"bool": bool, "int": int, "float": float, "str": str}
+
+SettingSpec = namedtuple(
+    "SettingSpec",
+    "key type description minimum maximum default locations",
+)
+
+
+class SettingsSchema:
+    """Esquema de ajustes conocidos indexado por clave (sin distinguir mayúsculas)"""
+
+    def __init__(self, catalog=None, limits=None):
+        catalog = CATALOG if catalog is None else catalog
+        limits = LIMITS if limits is None else limits
+        limits = {key.lower(): value for key, value in limits.items()}
+        self._specs = {}
+        for file_type, sections in catalog.items():
+            for section, entries in sections.items():
+                for key, value_type, description in entries:
+                    key_lower = key.lower()
+                    spec = self._specs.get(key_lower)
+                    if spec is not None:
+                        # Clave admitida en varios archivos/secciones
+                        self._specs[key_lower] = spec._replace(
+                            locations=spec.locations + ((file_type, section.lower()),)
+                        )
+                        continue
+                    minimum, maximum, default = limits.get(key_lower, (None, None, None))
+                    if value_type == "float" and minimum is None and key_lower.endswith(("multiplier", "scale")):
+                        minimum = 0.0
+                        default = 1.0 if key_lower.endswith("multiplier") else default
+                    self._specs[key_lower] = SettingSpec(
+                        key, TYPES.get(value_type, str), description,
+                        minimum, maximum, default, ((file_type, section.lower()),)
+                    )
+
+    def __len__(self):
+        return len(self._specs)
+
+    def __contains__(self, key):
+        return key.lower() in self._specs
+
+    def get(self, key):
+        """Especificación de una clave o None si no es un ajuste conocido"""
+        return self._specs.get(key.lower())
+
+    def value_type(self, key):
+        """Tipo Python (bool, int, float, str) de una clave conocida o None"""
+        spec = self._specs.get(key.lower())
+        return spec.type if spec else None
+
+    def describe(self, key):
+        spec = self._specs.get(key.lower())
+        return spec.description if spec else ""
+
+    def validate(self, key, value):
+        """
+        Validar un valor contra el esquema
+
+        Returns:
+            str: Mensaje de error, o None si el valor es válido o la clave es desconocida
+        """
+        spec = self._specs.get(key.lower())
+        if spec is None or spec.type is str:
+            return None
+        text = str(value).strip()
+        if spec.type is bool:
+            if text.lower() not in ("true", "false", "1", "0", "yes", "no", "on", "off"):
+                return f"{spec.key} debe ser True o False (valor: '{text}')"
+            return None
+        try:
+            number = float(text)
+        except ValueError:
+            number = None
+        # El servidor guarda a veces enteros como "10.000000"
+        if number is None or (spec.type is int and not number.is_integer()):
+            kind = "un número entero" if spec.type is int else "un número"
+            return f"{spec.key} debe ser {kind} (valor: '{text}')"
+        if spec.minimum is not None and number < spec.minimum:
+            return f"{spec.key} debe ser >= {spec.minimum} (valor: {text})"
+        if spec.maximum is not None and number > spec.maximum:
+            return f"{spec.key} debe ser <= {spec.maximum} (valor: {text})"
+        return None
+
+    def is_expected_location(self, key, file_type, section):
+        """True si la clave es desconocida o está en uno de sus archivos/secciones"""
+        spec = self._specs.get(key.lower())
+        return spec is None or (file_type, section.lower()) in spec.locations
+
+    def check_document(self, file_type, document):
+        """
+        Revisar un documento INI completo
+
+        Returns:
+            list: Diccionarios {kind, section, key, message} con kind en
+            'duplicate', 'misplaced' o 'invalid'. Solo se revisan claves
+            conocidas; las listas repetibles (ConfigOverride..., etc.) se ignoran.
+        """
+        issues = []
+        for section in document.sections():
+            seen = set()
+            for line in document.option_lines(section):
+                spec = self._specs.get(line.key.lower())
+                if spec is None:
+                    continue
+                if spec.key.lower() in seen:
+                    issues.append({
+                        'kind': 'duplicate', 'section': section, 'key': line.key,
+                        'message': f"{line.key} aparece más de una vez en [{section}]",
+                    })
+                    continue
+                seen.add(spec.key.lower())
+                if (file_type, section.lower()) not in spec.locations:
+                    expected = ", ".join(f"{f}.ini [{s}]" for f, s in spec.locations)
+                    issues.append({
+                        'kind': 'misplaced', 'section': section, 'key': line.key,
+                        'message': f"{line.key} está en {file_type}.ini [{section}]; se espera en {expected}",
+                    })
+                error = self.validate(line.key, line.value)
+                if error:
+                    issues.append({'kind': 'invalid', 'section': section, 'key': line.key, 'message': error})
+        return issues
+
+
+_schema = None
+
+
+def get_schema():
+    """Esquema compartido (se construye una sola vez)"""
+    global _schema
+    if _schema is None:
+        _schema = SettingsSchema()
+    return _schema
+
+
+def iter_settings():
+    """Recorrer el catálogo como tuplas (archivo, sección, clave, tipo, descripción)"""
+    for file_type, sections in CATALOG.items():
+        for section, entries in sections.items():
+            for key, value_type, description in entries:
+                yield file_type, section, key, value_type, description
+
+
+def describe(key):
+    """Descripción de una clave (sin distinguir mayúsculas) o cadena vacía"""
+    return get_schema().describe(key)
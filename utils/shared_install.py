@@ -0,0 +1,282 @@
+"""
+Instalación compartida de ARK Survival Ascended
+Una instalación maestra es la única que actualiza SteamCMD; cada servidor es
+una capa ligera con enlaces duros a los binarios y paks de la maestra y su
+propia carpeta ShooterGame/Saved (y Mods). Incluye un verificador de
+consistencia que detecta y repara enlaces desactualizados.
+
+Como los enlaces duros comparten contenido, la maestra debe actualizarse con
+los servidores detenidos o mediante staging (el intercambio de directorios
+deja los enlaces antiguos intactos hasta que se reparan las capas).
+"""
+import os
+import json
+import shutil
+import logging
+from datetime import datetime
+
+import psutil
+
+from .steamcmd_updater import PRESERVED_PATHS
+
+
+MASTER_DIR_NAME = "_master"
+OVERLAY_MARKER = ".shared_install.json"
+SERVER_PROCESS_NAME = "ArkAscendedServer.exe"
+
+# Directorios de la maestra que nunca se enlazan en las capas
+EXCLUDED_PATHS = PRESERVED_PATHS + (
+    os.path.join("steamapps", "downloading"),
+    os.path.join("steamapps", "temp"),
+)
+
+
+class SharedInstallManager:
+    """Gestiona la instalación maestra y las capas por servidor"""
+
+    def __init__(self, root_path, logger=None, master_name=MASTER_DIR_NAME):
+        self.root_path = root_path
+        self.master_path = os.path.join(root_path, master_name)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def get_server_path(self, server_name):
+        """Ruta de la capa de un servidor"""
+        return os.path.join(self.root_path, server_name)
+
+    def is_overlay(self, server_name):
+        """Indicar si un servidor es una capa sobre la maestra"""
+        return os.path.exists(os.path.join(self.get_server_path(server_name), OVERLAY_MARKER))
+
+    def list_overlays(self):
+        """Listar los servidores configurados como capa"""
+        if not os.path.isdir(self.root_path):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root_path)
+            if name != os.path.basename(self.master_path) and self.is_overlay(name)
+        )
+
+    @staticmethod
+    def running_server_executables():
+        """Rutas de los ejecutables del servidor en ejecución en esta máquina"""
+        paths = []
+        for proc in psutil.process_iter(['name', 'exe']):
+            try:
+                if proc.info['name'] and SERVER_PROCESS_NAME in proc.info['name'] and proc.info['exe']:
+                    paths.append(proc.info['exe'])
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return paths
+
+    def running_overlays(self, executables=None):
+        """
+        Capas (o la propia maestra) con un servidor en ejecución
+
+        Cualquiera de ellas comparte archivos con la maestra, así que mientras
+        la lista no esté vacía la maestra no se puede actualizar en el sitio.
+
+        Args:
+            executables: Rutas de ejecutables en ejecución (por defecto, las del sistema)
+        """
+        if executables is None:
+            executables = self.running_server_executables()
+        candidates = {name: self.get_server_path(name) for name in self.list_overlays()}
+        candidates[os.path.basename(self.master_path)] = self.master_path
+        running = []
+        for name, path in candidates.items():
+            prefix = os.path.normcase(os.path.abspath(path)) + os.sep
+            if any(os.path.normcase(os.path.abspath(exe)).startswith(prefix) for exe in executables):
+                running.append(name)
+        return sorted(running)
+
+    @staticmethod
+    def _is_excluded(relative_path):
+        normalized = os.path.normcase(relative_path)
+        for excluded in EXCLUDED_PATHS:
+            excluded = os.path.normcase(excluded)
+            if normalized == excluded or normalized.startswith(excluded + os.sep):
+                return True
+        return False
+
+    def iter_master_files(self):
+        """Recorrer los archivos compartidos de la maestra (rutas relativas)"""
+        for directory, dirs, files in os.walk(self.master_path):
+            relative_dir = os.path.relpath(directory, self.master_path)
+            if relative_dir == ".":
+                relative_dir = ""
+            # Podar directorios excluidos para no recorrerlos
+            dirs[:] = [d for d in dirs if not self._is_excluded(os.path.join(relative_dir, d))]
+            for name in files:
+                relative = os.path.join(relative_dir, name)
+                if not self._is_excluded(relative):
+                    yield relative
+
+    @staticmethod
+    def _same_file(master_stat, overlay_stat, mode):
+        """Comparar archivo de la capa con el de la maestra según el modo de enlace"""
+        if mode in ("hardlink", "symlink"):
+            return (master_stat.st_ino, master_stat.st_dev) == (overlay_stat.st_ino, overlay_stat.st_dev)
+        return (master_stat.st_size == overlay_stat.st_size and
+                int(master_stat.st_mtime) == int(overlay_stat.st_mtime))
+
+    def _link_file(self, source, target, mode):
+        """Crear un enlace (o copia) reemplazando el destino de forma atómica"""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_target = target + ".linktmp"
+        if os.path.lexists(tmp_target):
+            os.remove(tmp_target)
+        if mode == "hardlink":
+            os.link(source, tmp_target)
+        elif mode == "symlink":
+            os.symlink(source, tmp_target)
+        else:
+            shutil.copy2(source, tmp_target)
+        os.replace(tmp_target, target)
+
+    def _detect_link_mode(self, server_path):
+        """Elegir hardlink si la maestra y la capa están en el mismo volumen"""
+        probe_source = os.path.join(self.master_path, OVERLAY_MARKER + ".probe")
+        probe_target = os.path.join(server_path, OVERLAY_MARKER + ".probe")
+        try:
+            with open(probe_source, "w") as f:
+                f.write("probe")
+            os.link(probe_source, probe_target)
+            return "hardlink"
+        except OSError:
+            try:
+                os.symlink(probe_source, probe_target)
+                return "symlink"
+            except OSError:
+                return "copy"
+        finally:
+            for path in (probe_source, probe_target):
+                if os.path.lexists(path):
+                    os.remove(path)
+
+    def _read_marker(self, server_name):
+        try:
+            with open(os.path.join(self.get_server_path(server_name), OVERLAY_MARKER), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _write_marker(self, server_name, data):
+        path = os.path.join(self.get_server_path(server_name), OVERLAY_MARKER)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def build_overlay(self, server_name):
+        """
+        Crear o actualizar la capa de un servidor
+
+        Returns:
+            dict: Resultado del verificador tras la sincronización
+        """
+        if not os.path.isdir(self.master_path):
+            raise FileNotFoundError(f"La instalación maestra no existe: {self.master_path}")
+        server_path = self.get_server_path(server_name)
+        os.makedirs(server_path, exist_ok=True)
+        for relative in PRESERVED_PATHS:
+            os.makedirs(os.path.join(server_path, relative), exist_ok=True)
+
+        marker = self._read_marker(server_name)
+        mode = marker.get("mode") or self._detect_link_mode(server_path)
+        self._write_marker(server_name, {
+            "master": self.master_path,
+            "mode": mode,
+            "created": marker.get("created", datetime.now().isoformat()),
+        })
+        self.logger.info(f"Creando capa compartida para {server_name} (modo {mode})")
+        return self.repair(server_name)
+
+    def check_consistency(self, server_name):
+        """
+        Comparar la capa con la maestra
+
+        Returns:
+            dict: missing (faltan), stale (desactualizados), extra (sobran en la capa) y mode
+        """
+        server_path = self.get_server_path(server_name)
+        mode = self._read_marker(server_name).get("mode", "hardlink")
+        result = {"missing": [], "stale": [], "extra": [], "mode": mode}
+
+        master_files = set()
+        for relative in self.iter_master_files():
+            master_files.add(os.path.normcase(relative))
+            target = os.path.join(server_path, relative)
+            try:
+                overlay_stat = os.stat(target)
+            except OSError:
+                result["missing"].append(relative)
+                continue
+            if not self._same_file(os.stat(os.path.join(self.master_path, relative)), overlay_stat, mode):
+                result["stale"].append(relative)
+
+        for directory, dirs, files in os.walk(server_path):
+            relative_dir = os.path.relpath(directory, server_path)
+            if relative_dir == ".":
+                relative_dir = ""
+            dirs[:] = [d for d in dirs if not self._is_excluded(os.path.join(relative_dir, d))]
+            for name in files:
+                relative = os.path.join(relative_dir, name)
+                if name == OVERLAY_MARKER or self._is_excluded(relative):
+                    continue
+                if os.path.normcase(relative) not in master_files:
+                    result["extra"].append(relative)
+        return result
+
+    def repair(self, server_name, remove_extra=False):
+        """
+        Reenlazar archivos faltantes o desactualizados
+
+        Los sobrantes (plugins u otros archivos propios del servidor) solo se
+        eliminan con remove_extra, desde una reparación confirmada por el usuario.
+        """
+        server_path = self.get_server_path(server_name)
+        report = self.check_consistency(server_name)
+        mode = report["mode"]
+        failed = []
+        for relative in report["missing"] + report["stale"]:
+            try:
+                self._link_file(os.path.join(self.master_path, relative),
+                                os.path.join(server_path, relative), mode)
+            except OSError as e:
+                # En Windows un ejecutable en uso no se puede reemplazar
+                failed.append(relative)
+                self.logger.warning(f"No se pudo enlazar {relative} en {server_name}: {e}")
+        if remove_extra:
+            for relative in report["extra"]:
+                try:
+                    os.remove(os.path.join(server_path, relative))
+                except OSError as e:
+                    failed.append(relative)
+                    self.logger.warning(f"No se pudo eliminar {relative} en {server_name}: {e}")
+        report["failed"] = failed
+        linked = len(report["missing"]) + len(report["stale"]) - len(failed)
+        self.logger.info(f"Capa {server_name}: {linked} archivos enlazados, {len(failed)} errores")
+        return report
+
+    def sync_all(self):
+        """Sincronizar todas las capas tras actualizar la maestra (sin borrar sobrantes)"""
+        reports = {}
+        for server_name in self.list_overlays():
+            reports[server_name] = report = self.repair(server_name)
+            if report["extra"]:
+                self.logger.info(f"Capa {server_name}: {len(report['extra'])} archivos que no están en la maestra (se conservan)")
+        return reports
+
+    def disk_usage(self):
+        """Estimar el espacio ahorrado respecto a instalaciones completas"""
+        master_bytes = 0
+        for relative in self.iter_master_files():
+            try:
+                master_bytes += os.path.getsize(os.path.join(self.master_path, relative))
+            except OSError:
+                pass
+        overlays = self.list_overlays()
+        linked = [name for name in overlays if self._read_marker(name).get("mode") != "copy"]
+        return {
+            "master_bytes": master_bytes,
+            "overlays": len(overlays),
+            "saved_bytes": master_bytes * len(linked),
+        }
@@ -0,0 +1,531 @@
+"""
+Almacén de estado embebido (SQLite en modo WAL)
+Sustituye a los JSON sueltos de data/ (historiales, mods, favoritos y
+configuración de la aplicación). Cada cambio es una transacción pequeña en
+lugar de reescribir el archivo completo, y los historiales pueden crecer sin
+límite gracias a consultas paginadas sobre índices.
+
+Al abrir el almacén por primera vez se importan los JSON existentes; cada
+archivo se registra en la tabla `migrations` y no se vuelve a importar. Los
+JSON originales se conservan como copia de seguridad.
+"""
+import os
+import sys
+import json
+import glob
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+from .persistence import HistoryJournal, load_json
+
+
+SCHEMA_VERSION = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS backup_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    server TEXT,
+    name TEXT,
+    path TEXT,
+    date TEXT,
+    size INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_backup_history_date ON backup_history(date);
+CREATE INDEX IF NOT EXISTS idx_backup_history_server_date ON backup_history(server, date);
+CREATE TABLE IF NOT EXISTS restart_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    server TEXT NOT NULL,
+    datetime TEXT,
+    success INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_restart_history_server ON restart_history(server, id);
+CREATE TABLE IF NOT EXISTS installed_mods (
+    mods_key TEXT NOT NULL,
+    mod_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (mods_key, mod_id)
+);
+CREATE TABLE IF NOT EXISTS mod_manifests (
+    mods_key TEXT PRIMARY KEY,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mod_versions (
+    mod_id TEXT PRIMARY KEY,
+    name TEXT,
+    file_id INTEGER,
+    file_date TEXT,
+    checked_at TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS mod_pending_updates (
+    mods_key TEXT NOT NULL,
+    mod_id TEXT NOT NULL,
+    file_id INTEGER,
+    detected_at TEXT NOT NULL,
+    PRIMARY KEY (mods_key, mod_id)
+);
+CREATE TABLE IF NOT EXISTS favorite_mods (
+    mod_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS config_revisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope TEXT NOT NULL,
+    file TEXT NOT NULL,
+    created TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    base_id INTEGER,
+    sha1 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_config_revisions_target ON config_revisions(scope, file, id);
+CREATE TABLE IF NOT EXISTS launch_profiles (
+    server TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    compiled TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL
+);
+"""
+
+
+def default_data_directory():
+    """Directorio data/ junto al ejecutable o en la raíz del proyecto"""
+    if getattr(sys, 'frozen', False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, "data")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+class StateStore:
+    """Conexión SQLite compartida con esquema versionado y migración desde JSON"""
+
+    def __init__(self, data_dir=None, db_name="state.db", logger=None, migrate=True):
+        self.data_dir = data_dir or default_data_directory()
+        self.db_path = os.path.join(self.data_dir, db_name)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        # Una sola conexión protegida por lock: los hilos de backup y reinicio
+        # escriben desde fuera del hilo de la interfaz
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+        self.settings = SettingsDAO(self)
+        self.backups = BackupHistoryDAO(self)
+        self.restarts = RestartHistoryDAO(self)
+        self.mods = ModsDAO(self)
+        self.mod_versions = ModVersionsDAO(self)
+
+        if migrate:
+            self.migrate_json()
+
+    def execute(self, sql, params=()):
+        """Ejecutar una sentencia en su propia transacción"""
+        with self._lock, self.conn:
+            return self.conn.execute(sql, params)
+
+    def query(self, sql, params=()):
+        """Ejecutar una consulta y devolver todas las filas"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def transaction(self):
+        """Bloque `with` que agrupa varias sentencias en una transacción"""
+        return _Transaction(self)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # --- Migración desde los JSON de data/ ---
+
+    def _is_migrated(self, source):
+        return bool(self.query("SELECT 1 FROM migrations WHERE source = ?", (source,)))
+
+    def _mark_migrated(self, conn, source):
+        conn.execute("INSERT OR REPLACE INTO migrations (source, migrated_at) VALUES (?, ?)",
+                     (source, datetime.now().isoformat()))
+
+    def migrate_json(self):
+        """Importar los JSON existentes que aún no se hayan migrado"""
+        sources = [
+            ("app_settings.json", self._migrate_settings),
+            ("backup_history.json", self._migrate_backup_history),
+            ("restart_history.json", self._migrate_restart_history),
+            ("installed_mods_by_server.json", self._migrate_mods_by_server),
+            ("favorite_mods.json", self._migrate_favorites),
+            ("current_server_map.json", self._migrate_context),
+        ]
+        # Los archivos por servidor/mapa prevalecen sobre el consolidado antiguo
+        for path in sorted(glob.glob(os.path.join(self.data_dir, "installed_mods_*.json"))):
+            name = os.path.basename(path)
+            if name != "installed_mods_by_server.json":
+                sources.append((name, self._migrate_installed_file))
+
+        migrated = 0
+        for source, importer in sources:
+            path = os.path.join(self.data_dir, source)
+            if self._is_migrated(source) or not (os.path.exists(path) or os.path.exists(path + ".journal")):
+                continue
+            try:
+                with self.transaction() as conn:
+                    importer(conn, path)
+                    self._mark_migrated(conn, source)
+                migrated += 1
+            except Exception as e:
+                self.logger.error(f"Error migrando {source} al almacén de estado: {e}")
+        if migrated:
+            self.logger.info(f"📦 {migrated} archivos JSON migrados a {self.db_path}")
+        return migrated
+
+    def _migrate_settings(self, conn, path):
+        for key, value in (load_json(path, {}) or {}).items():
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, _dumps(value)))
+
+    def _migrate_backup_history(self, conn, path):
+        # Incluir registros pendientes del diario de solo-añadir
+        for backup in HistoryJournal(path).load([]):
+            self.backups._insert(conn, backup)
+
+    def _migrate_restart_history(self, conn, path):
+        for server, records in HistoryJournal(path).load({}).items():
+            for record in records:
+                self.restarts._insert(conn, server, record)
+
+    def _migrate_mods_by_server(self, conn, path):
+        for mods_key, mods in (load_json(path, {}) or {}).items():
+            self.mods._replace_installed(conn, mods_key, mods)
+
+    def _migrate_installed_file(self, conn, path):
+        mods_key = os.path.splitext(os.path.basename(path))[0][len("installed_mods_"):]
+        self.mods._replace_installed(conn, mods_key, load_json(path, []) or [])
+
+    def _migrate_favorites(self, conn, path):
+        self.mods._replace_favorites(conn, load_json(path, []) or [])
+
+    def _migrate_context(self, conn, path):
+        context = load_json(path)
+        if context:
+            conn.execute("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)",
+                         ("current_server_map", _dumps(context)))
+
+
+class _Transaction:
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        self.store._lock.acquire()
+        self.store.conn.execute("BEGIN")
+        return self.store.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type:
+                self.store.conn.rollback()
+            else:
+                self.store.conn.commit()
+        finally:
+            self.store._lock.release()
+        return False
+
+
+class SettingsDAO:
+    """Configuración de la aplicación (clave → valor JSON)"""
+
+    def __init__(self, store):
+        self.store = store
+        self._persisted = {}
+
+    def load(self):
+        rows = self.store.query("SELECT key, value FROM settings")
+        self._persisted = {row["key"]: json.loads(row["value"]) for row in rows}
+        return dict(self._persisted)
+
+    def save(self, settings):
+        """
+        Guardar solo las claves modificadas
+
+        Returns:
+            int: Número de claves escritas o eliminadas
+        """
+        changed = {key: value for key, value in settings.items()
+                   if key not in self._persisted or self._persisted[key] != value}
+        removed = [key for key in self._persisted if key not in settings]
+        if not changed and not removed:
+            return 0
+        with self.store.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                             [(key, _dumps(value)) for key, value in changed.items()])
+            conn.executemany("DELETE FROM settings WHERE key = ?", [(key,) for key in removed])
+        self._persisted = json.loads(_dumps(settings))
+        return len(changed) + len(removed)
+
+
+class BackupHistoryDAO:
+    """Historial de backups con consultas paginadas"""
+
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def _insert(conn, backup):
+        record = {key: value for key, value in backup.items() if key != "id"}
+        cursor = conn.execute(
+            "INSERT INTO backup_history (server, name, path, date, size, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (record.get("server"), record.get("name"), record.get("path"), record.get("date"),
+             record.get("size"), _dumps(record))
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _row_to_backup(row):
+        backup = json.loads(row["data"])
+        backup["id"] = row["id"]
+        return backup
+
+    def add(self, backup):
+        """Registrar un backup y devolver su id"""
+        with self.store.transaction() as conn:
+            backup_id = self._insert(conn, backup)
+        backup["id"] = backup_id
+        return backup_id
+
+    def count(self, server=None):
+        if server is None:
+            return self.store.query("SELECT COUNT(*) FROM backup_history")[0][0]
+        return self.store.query("SELECT COUNT(*) FROM backup_history WHERE server = ?", (server,))[0][0]
+
+    def list(self, server=None, limit=None, offset=0, newest_first=True):
+        """Página del historial ordenada por fecha"""
+        order = "DESC" if newest_first else "ASC"
+        where, params = ("WHERE server = ?", [server]) if server is not None else ("", [])
+        sql = f"SELECT id, data FROM backup_history {where} ORDER BY date {order}, id {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [self._row_to_backup(row) for row in self.store.query(sql, params)]
+
+    def oldest(self, count):
+        """Los `count` backups más antiguos (candidatos a limpieza)"""
+        return self.list(limit=max(count, 0), newest_first=False)
+
+    def remove(self, backup):
+        """Eliminar un registro por id (o por ruta si no tiene id)"""
+        if backup.get("id") is not None:
+            self.store.execute("DELETE FROM backup_history WHERE id = ?", (backup["id"],))
+        else:
+            self.store.execute("DELETE FROM backup_history WHERE path = ?", (backup.get("path"),))
+
+
+class RestartHistoryDAO:
+    """Historial de reinicios por servidor"""
+
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def _insert(conn, server, restart_info):
+        cursor = conn.execute(
+            "INSERT INTO restart_history (server, datetime, success, data) VALUES (?, ?, ?, ?)",
+            (server, restart_info.get("datetime"), int(bool(restart_info.get("success"))), _dumps(restart_info))
+        )
+        return cursor.lastrowid
+
+    def add(self, server, restart_info):
+        with self.store.transaction() as conn:
+            return self._insert(conn, server, restart_info)
+
+    def count(self, server):
+        return self.store.query("SELECT COUNT(*) FROM restart_history WHERE server = ?", (server,))[0][0]
+
+    def list(self, server, limit=20, offset=0):
+        """Reinicios de un servidor, del más reciente al más antiguo"""
+        rows = self.store.query(
+            "SELECT data FROM restart_history WHERE server = ? ORDER BY id DESC LIMIT ? OFFSET ?",
+            (server, limit, offset)
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    def clear(self, server):
+        self.store.execute("DELETE FROM restart_history WHERE server = ?", (server,))
+
+
+class ModsDAO:
+    """Mods instalados por servidor/mapa, favoritos y contexto actual"""
+
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def _replace_installed(conn, mods_key, mods):
+        conn.execute("DELETE FROM installed_mods WHERE mods_key = ?", (mods_key,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO installed_mods (mods_key, mod_id, position, data) VALUES (?, ?, ?, ?)",
+            [(mods_key, str(mod.get("id")), position, _dumps(mod)) for position, mod in enumerate(mods)]
+        )
+
+    @staticmethod
+    def _replace_favorites(conn, mods):
+        conn.execute("DELETE FROM favorite_mods")
+        conn.executemany(
+            "INSERT OR REPLACE INTO favorite_mods (mod_id, position, data) VALUES (?, ?, ?)",
+            [(str(mod.get("id")), position, _dumps(mod)) for position, mod in enumerate(mods)]
+        )
+
+    def get_installed(self, mods_key):
+        rows = self.store.query(
+            "SELECT data FROM installed_mods WHERE mods_key = ? ORDER BY position", (mods_key,)
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    def set_installed(self, mods_key, mods):
+        with self.store.transaction() as conn:
+            self._replace_installed(conn, mods_key, mods)
+
+    def add_installed(self, mods_key, mod):
+        """Añadir un mod al final de la lista sin reescribir las demás filas"""
+        with self.store.transaction() as conn:
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM installed_mods WHERE mods_key = ?", (mods_key,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO installed_mods (mods_key, mod_id, position, data) VALUES (?, ?, ?, ?)",
+                (mods_key, str(mod.get("id")), position, _dumps(mod))
+            )
+
+    def remove_installed(self, mods_key, mod_id):
+        self.store.execute("DELETE FROM installed_mods WHERE mods_key = ? AND mod_id = ?", (mods_key, str(mod_id)))
+
+    def installed_ids_by_key(self):
+        """{mods_key: [ids]} de todas las listas de mods instaladas"""
+        ids_by_key = {}
+        for row in self.store.query("SELECT mods_key, mod_id FROM installed_mods ORDER BY mods_key, position"):
+            ids_by_key.setdefault(row["mods_key"], []).append(row["mod_id"])
+        return ids_by_key
+
+    def get_favorites(self):
+        rows = self.store.query("SELECT data FROM favorite_mods ORDER BY position")
+        return [json.loads(row["data"]) for row in rows]
+
+    def set_favorites(self, mods):
+        with self.store.transaction() as conn:
+            self._replace_favorites(conn, mods)
+
+    def get_context(self):
+        rows = self.store.query("SELECT value FROM kv WHERE key = 'current_server_map'")
+        return json.loads(rows[0]["value"]) if rows else None
+
+    def set_context(self, context):
+        self.store.execute("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)",
+                           ("current_server_map", _dumps(context)))
+
+
+class ModVersionsDAO:
+    """Última versión conocida de cada mod y actualizaciones pendientes de reinicio"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def get_all(self):
+        """{mod_id: {name, file_id, file_date, checked_at, updated_at}}"""
+        rows = self.store.query("SELECT * FROM mod_versions")
+        return {row["mod_id"]: dict(row) for row in rows}
+
+    def record(self, versions, pending=()):
+        """
+        Guardar en una transacción las versiones consultadas y las actualizaciones detectadas
+
+        Args:
+            versions: [{mod_id, name, file_id, file_date, checked_at, updated_at}]
+            pending: [(mods_key, mod_id, file_id, detected_at)]
+        """
+        with self.store.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO mod_versions (mod_id, name, file_id, file_date, checked_at, updated_at) "
+                "VALUES (:mod_id, :name, :file_id, :file_date, :checked_at, :updated_at)",
+                versions
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO mod_pending_updates (mods_key, mod_id, file_id, detected_at) "
+                "VALUES (?, ?, ?, ?)",
+                pending
+            )
+
+    def pending(self, keys=None):
+        """
+        Actualizaciones sin reinicio posterior, con el nombre del mod
+
+        Args:
+            keys: Claves exactas de listas (servidor/mapa) a consultar; None = todas.
+                No se filtra por prefijo: "Srv" no debe incluir "Srv_2_TheIsland".
+        """
+        sql = (
+            "SELECT p.mods_key, p.mod_id, p.file_id, p.detected_at, v.name, v.file_date "
+            "FROM mod_pending_updates p LEFT JOIN mod_versions v ON v.mod_id = p.mod_id"
+        )
+        params = ()
+        if keys is not None:
+            keys = list(keys)
+            if not keys:
+                return []
+            sql += f" WHERE p.mods_key IN ({', '.join('?' * len(keys))})"
+            params = tuple(keys)
+        rows = self.store.query(sql + " ORDER BY p.mods_key, p.detected_at", params)
+        return [dict(row) for row in rows]
+
+    def clear_pending(self, keys):
+        """Olvidar las actualizaciones de las listas indicadas (claves exactas) tras reiniciarlas"""
+        keys = list(keys)
+        if not keys:
+            return 0
+        cursor = self.store.execute(
+            f"DELETE FROM mod_pending_updates WHERE mods_key IN ({', '.join('?' * len(keys))})",
+            tuple(keys)
+        )
+        return cursor.rowcount
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_state_store(logger=None):
+    """Almacén de estado compartido por toda la aplicación"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = StateStore(logger=logger)
+        return _default_store
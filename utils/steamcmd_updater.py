@@ -0,0 +1,402 @@
+"""
+Gestor de actualizaciones de SteamCMD para ARK Survival Ascended
+Compara el buildid instalado con el disponible, solo actualiza cuando hace
+falta, valida archivos de forma periódica o bajo demanda y permite
+pre-descargar la actualización en un directorio de staging mientras el
+servidor sigue en ejecución.
+"""
+import os
+import re
+import json
+import time
+import queue
+import shutil
+import logging
+import threading
+import subprocess
+from datetime import datetime
+
+from .persistence import get_writer
+
+
+ARK_APP_ID = "2430930"
+
+# Rutas propias de cada servidor que se conservan al intercambiar instalaciones
+PRESERVED_PATHS = (
+    os.path.join("ShooterGame", "Saved"),
+    os.path.join("ShooterGame", "Binaries", "Win64", "ShooterGame", "Mods"),
+)
+
+
+def parse_acf(text):
+    """
+    Parsear el formato KeyValues de Valve (archivos .acf / app_info_print)
+
+    Returns:
+        dict: Estructura anidada con claves y valores como cadenas
+    """
+    tokens = re.findall(r'"((?:[^"\\]|\\.)*)"|([{}])', text)
+    root = {}
+    stack = [root]
+    pending_key = None
+    for quoted, brace in tokens:
+        if brace == "{":
+            child = {}
+            if pending_key is not None:
+                stack[-1][pending_key] = child
+                pending_key = None
+            stack.append(child)
+        elif brace == "}":
+            if len(stack) > 1:
+                stack.pop()
+            pending_key = None
+        elif pending_key is None:
+            pending_key = quoted
+        else:
+            stack[-1][pending_key] = quoted
+            pending_key = None
+    return root
+
+
+def get_manifest_path(install_path, app_id=ARK_APP_ID):
+    """Ruta del appmanifest de una instalación"""
+    return os.path.join(install_path, "steamapps", f"appmanifest_{app_id}.acf")
+
+
+def read_installed_buildid(install_path, app_id=ARK_APP_ID):
+    """Leer el buildid instalado desde steamapps/appmanifest_<app>.acf"""
+    manifest_path = get_manifest_path(install_path, app_id)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8", errors="ignore") as f:
+            data = parse_acf(f.read())
+        state = data.get("AppState", {})
+        # StateFlags 4 = totalmente instalado; otro valor indica actualización incompleta
+        if state.get("StateFlags") not in (None, "4"):
+            return None
+        return state.get("buildid")
+    except Exception:
+        return None
+
+
+def parse_available_buildid(app_info_output, app_id=ARK_APP_ID, branch="public"):
+    """Extraer el buildid de una rama desde la salida de app_info_print"""
+    start = app_info_output.find(f'"{app_id}"')
+    if start < 0:
+        return None
+    data = parse_acf(app_info_output[start:])
+    try:
+        return data[app_id]["depots"]["branches"][branch]["buildid"]
+    except (KeyError, TypeError):
+        return None
+
+
+def break_hardlinks(root):
+    """
+    Sustituir por copias propias los archivos de `root` con más de un enlace
+
+    Returns:
+        int: Número de archivos copiados
+    """
+    copied = 0
+    for directory, _dirs, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if os.lstat(path).st_nlink <= 1:
+                continue
+            # La copia sustituye al enlace con un rename: el otro nombre conserva los datos originales
+            temp_path = path + ".unlink_tmp"
+            shutil.copy2(path, temp_path)
+            os.replace(temp_path, path)
+            copied += 1
+    return copied
+
+
+class SteamCMDProcess:
+    """Ejecuta SteamCMD leyendo su salida con un único hilo lector"""
+
+    def __init__(self, cmd, cwd=None, logger=None):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.logger = logger or logging.getLogger(__name__)
+        self.process = None
+
+    def run(self, on_line, on_idle=None, idle_timeout=0.5):
+        """
+        Ejecutar el comando entregando cada línea a on_line
+
+        Args:
+            on_line (callable): Recibe cada línea de salida (sin espacios finales)
+            on_idle (callable): Se llama cuando no hay salida durante idle_timeout
+
+        Returns:
+            int: Código de salida del proceso
+        """
+        env = os.environ.copy()
+        env['PYTHONUNBUFFERED'] = '1'
+        creationflags = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        self.process = subprocess.Popen(
+            self.cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="ignore",
+            env=env,
+            cwd=self.cwd,
+            creationflags=creationflags
+        )
+
+        lines = queue.Queue()
+        end_of_output = object()
+
+        def reader():
+            try:
+                for line in self.process.stdout:
+                    lines.put(line)
+            except Exception as e:
+                self.logger.debug(f"Lector de SteamCMD finalizado: {e}")
+            finally:
+                lines.put(end_of_output)
+
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+
+        while True:
+            try:
+                line = lines.get(timeout=idle_timeout)
+            except queue.Empty:
+                if on_idle:
+                    on_idle()
+                continue
+            if line is end_of_output:
+                break
+            line = line.strip()
+            if line:
+                on_line(line)
+
+        reader_thread.join(timeout=1)
+        return self.process.wait()
+
+    def capture(self, timeout=120):
+        """Ejecutar el comando y devolver toda la salida como texto"""
+        output = []
+        started = time.time()
+
+        def on_idle():
+            if time.time() - started > timeout and self.process:
+                self.process.kill()
+
+        self.run(output.append, on_idle)
+        return "\n".join(output)
+
+
+class SteamCMDUpdateManager:
+    """Decide cuándo actualizar/validar y gestiona el staging de descargas"""
+
+    def __init__(self, steamcmd_path, state_file, logger=None, app_id=ARK_APP_ID,
+                 validate_interval_days=7):
+        self.steamcmd_path = steamcmd_path
+        self.state_file = state_file
+        self.logger = logger or logging.getLogger(__name__)
+        self.app_id = app_id
+        self.validate_interval_days = validate_interval_days
+        self.state = self._load_state()
+
+    def _load_state(self):
+        """Cargar fechas de última validación por instalación"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error cargando estado de SteamCMD: {e}")
+        return {}
+
+    def _save_state(self):
+        """Guardar el estado de validaciones"""
+        try:
+            get_writer().write_json(self.state_file, self.state)
+        except Exception as e:
+            self.logger.error(f"Error guardando estado de SteamCMD: {e}")
+
+    def _steamcmd_cwd(self):
+        return os.path.dirname(self.steamcmd_path) if self.steamcmd_path != "steamcmd" else None
+
+    def get_available_buildid(self, branch="public"):
+        """Consultar a Steam el buildid disponible (sin descargar nada)"""
+        cmd = [
+            self.steamcmd_path,
+            "+login", "anonymous",
+            "+app_info_update", "1",
+            "+app_info_print", self.app_id,
+            "+quit"
+        ]
+        try:
+            output = SteamCMDProcess(cmd, self._steamcmd_cwd(), self.logger).capture()
+            return parse_available_buildid(output, self.app_id, branch)
+        except Exception as e:
+            self.logger.error(f"Error consultando buildid disponible: {e}")
+            return None
+
+    def check_for_update(self, install_path):
+        """
+        Comparar el buildid instalado con el disponible
+
+        Returns:
+            dict: installed, available y update_needed (True si no se puede determinar)
+        """
+        installed = read_installed_buildid(install_path, self.app_id)
+        available = self.get_available_buildid()
+        if installed is None or available is None:
+            update_needed = True
+        else:
+            update_needed = installed != available
+        return {"installed": installed, "available": available, "update_needed": update_needed}
+
+    def should_validate(self, install_path, force=False):
+        """Validar solo bajo demanda o si venció el intervalo periódico"""
+        if force:
+            return True
+        if read_installed_buildid(install_path, self.app_id) is None:
+            # Instalación nueva o incompleta: validar
+            return True
+        last = self.state.get(os.path.normcase(os.path.abspath(install_path)), {}).get("last_validate")
+        if not last:
+            return True
+        try:
+            elapsed = datetime.now() - datetime.fromisoformat(last)
+        except ValueError:
+            return True
+        return elapsed.days >= self.validate_interval_days
+
+    def mark_validated(self, install_path):
+        """Registrar una validación completa"""
+        key = os.path.normcase(os.path.abspath(install_path))
+        self.state.setdefault(key, {})["last_validate"] = datetime.now().isoformat()
+        self._save_state()
+
+    def build_update_command(self, install_path, validate=False):
+        """Construir el comando app_update con o sin validate"""
+        cmd = [
+            self.steamcmd_path,
+            "+login", "anonymous",
+            "+force_install_dir", install_path,
+            "+app_update", self.app_id,
+        ]
+        if validate:
+            cmd.append("validate")
+        cmd.append("+quit")
+        return cmd
+
+    def run_update(self, install_path, on_line, on_idle=None, validate=False):
+        """Ejecutar app_update sobre una ruta y devolver el código de salida"""
+        cmd = self.build_update_command(install_path, validate)
+        return_code = SteamCMDProcess(cmd, self._steamcmd_cwd(), self.logger).run(on_line, on_idle)
+        # SteamCMD devuelve 7 en algunas instalaciones correctas
+        if validate and return_code in (0, 7):
+            self.mark_validated(install_path)
+        return return_code
+
+    @staticmethod
+    def get_staging_path(install_path):
+        """Directorio de staging asociado a una instalación"""
+        return os.path.normpath(install_path) + "_staging"
+
+    def prestage(self, install_path, on_line, on_idle=None):
+        """
+        Descargar la actualización en el directorio de staging
+
+        El servidor puede seguir ejecutándose; el staging reutiliza la
+        instalación anterior para que SteamCMD descargue solo el delta. Antes
+        de app_update se rompen los hardlinks del staging: SteamCMD puede
+        escribir los archivos en el sitio y no debe tocar los de un servidor
+        en ejecución.
+        """
+        staging_path = self.get_staging_path(install_path)
+        if read_installed_buildid(staging_path, self.app_id) is None and \
+                read_installed_buildid(install_path, self.app_id) is not None:
+            # Primera vez: sembrar el staging a partir de la instalación para evitar descarga completa
+            self.seed_staging(install_path)
+        os.makedirs(staging_path, exist_ok=True)
+        unlinked = break_hardlinks(staging_path)
+        if unlinked:
+            self.logger.info(f"{unlinked} archivos del staging compartían datos con otra instalación y se copiaron")
+        return self.run_update(staging_path, on_line, on_idle, validate=False)
+
+    def seed_staging(self, install_path):
+        """
+        Sembrar el staging con una copia de la instalación
+
+        Es una copia real y no hardlinks: SteamCMD no garantiza escribir los
+        archivos que cambian como archivos nuevos, y un archivo compartido
+        modificado en el sitio cambiaría también bajo el servidor en ejecución.
+
+        Returns:
+            str: Ruta del staging
+        """
+        staging_path = self.get_staging_path(install_path)
+        if os.path.exists(staging_path):
+            shutil.rmtree(staging_path)
+        preserved = {os.path.normcase(os.path.join(install_path, p)) for p in PRESERVED_PATHS}
+        shutil.copytree(
+            install_path, staging_path,
+            ignore=lambda directory, names: [
+                name for name in names
+                if os.path.normcase(os.path.join(directory, name)) in preserved
+            ]
+        )
+        return staging_path
+
+    def has_staged_update(self, install_path):
+        """Indicar si el staging contiene un build más reciente que el instalado"""
+        staged = read_installed_buildid(self.get_staging_path(install_path), self.app_id)
+        installed = read_installed_buildid(install_path, self.app_id)
+        if staged is None:
+            return False
+        if installed is None:
+            return True
+        try:
+            # Tras un intercambio el staging contiene el build anterior
+            return int(staged) > int(installed)
+        except ValueError:
+            return staged != installed
+
+    def apply_staged(self, install_path):
+        """
+        Intercambiar la instalación por el staging (servidor detenido)
+
+        Se renombran directorios y se mueven las rutas propias del servidor,
+        de modo que la ventana de actualización es el tiempo de un rename. La
+        instalación anterior queda como nuevo staging para el próximo delta;
+        sus archivos pueden seguir enlazados con los de otras instalaciones
+        (overlays de la instalación compartida), por eso prestage rompe los
+        hardlinks antes de volver a descargar sobre ella.
+        """
+        staging_path = self.get_staging_path(install_path)
+        if read_installed_buildid(staging_path, self.app_id) is None:
+            raise RuntimeError(f"No hay actualización preparada en {staging_path}")
+
+        old_path = os.path.normpath(install_path) + "_old"
+        if os.path.exists(old_path):
+            shutil.rmtree(old_path)
+        os.rename(install_path, old_path)
+        try:
+            os.rename(staging_path, install_path)
+        except OSError:
+            os.rename(old_path, install_path)
+            raise
+
+        for relative in PRESERVED_PATHS:
+            source = os.path.join(old_path, relative)
+            target = os.path.join(install_path, relative)
+            if not os.path.exists(source):
+                continue
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(source, target)
+
+        os.rename(old_path, staging_path)
+        self.logger.info(f"Actualización preparada aplicada en {install_path}")
+        return read_installed_buildid(install_path, self.app_id)
@@ -0,0 +1,38 @@
+"""
+Cálculos de la vista virtualizada de tarjetas
+Con miles de mods solo existen las tarjetas de las filas visibles. Estas
+funciones no dependen de la interfaz: traducen la posición del scroll a las
+posiciones de la lista que hay que dibujar y cada posición a su celda.
+"""
+
+
+def row_count(total, columns):
+    """Filas necesarias para `total` elementos"""
+    return -(-max(0, total) // max(1, columns))
+
+
+def visible_range(top, height, row_height, columns, total, overscan=0):
+    """
+    Posiciones a dibujar para la parte visible del contenido
+
+    Args:
+        top: Píxeles del contenido que quedan por encima de lo visible
+            (negativo si el contenido empieza más abajo)
+        height: Alto visible en píxeles
+        overscan: Filas extra por encima y por debajo de lo visible
+
+    Returns:
+        tuple: (primera, última) con la última exclusiva; (0, 0) si no hay nada
+    """
+    if total <= 0 or row_height <= 0:
+        return 0, 0
+    columns = max(1, columns)
+    first_row = max(0, top // row_height - overscan)
+    last_row = max(first_row, (top + height) // row_height + overscan)
+    return min(total, first_row * columns), min(total, (last_row + 1) * columns)
+
+
+def cell_position(index, columns, row_height):
+    """(fila, columna, y en píxeles) de una posición de la lista"""
+    row, column = divmod(index, max(1, columns))
+    return row, column, row * row_height